@@ -1,25 +1,55 @@
 """Bot initialization and setup."""
 
+import asyncio
 import logging
 from aiogram import Bot, Dispatcher, Router, F
+from aiogram.client.session.base import BaseSession
 from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 
-from app.config import get_settings
+from app.config import Settings, get_settings
 from app.core.container import DependencyContainer
 from app.core.middleware import DependencyMiddleware
-from app.services.database import Database, ChatsRepository, LogsRepository, PermissionsRepository
-from app.services.beget import BegetClientManager
+from app.core.startup import StartupTimer
+from app.services.database import (
+    Database,
+    ChatsRepository,
+    DnsJournalRepository,
+    DnsSnapshotRepository,
+    JobsRepository,
+    LogsRepository,
+    PermissionsRepository,
+    ResponseCacheRepository,
+)
+from app.services.beget import BegetClientManager, PersistentResponseCache, PrefetchScheduler
+from app.services.beget.types import set_item_validation
+from app.services.bulk import IpMigrator, SubdomainBulk
 from app.services.permissions import PermissionChecker
+from app.services.metrics import MetricsServer
+from app.services.snapshot import DnsCrawler, DnsJournal, DriftDetector, ReverseIndex
+from app.services.tracing import SlowTraceWriter
+from app.services.zonefile import ZoneImporter
 from app.bot.middlewares.auth import AuthMiddleware
 from app.bot.middlewares.logging import LoggingMiddleware
+from app.bot.middlewares.metrics import MetricsMiddleware
+from app.bot.middlewares.ordering import ChatOrderingMiddleware
+from app.bot.middlewares.stale import StaleDataMiddleware
+from app.bot.middlewares.tracing import (
+    HandlerSpanMiddleware,
+    TelegramTracingMiddleware,
+    TracedMiddleware,
+    TracingMiddleware,
+)
 from app.bot.keyboards.common import main_menu_keyboard
 from app.bot.commands import register_bot_commands
 from app.bot.callback_data import CB_MENU_MAIN, CB_CANCEL
+from app.bot.responses import edit_message
 from app.modules.admin.router import router as admin_router, setup_admin_deps
 from app.modules.domains.router import router as domains_router
 
+logger = logging.getLogger(__name__)
+
 
 # Base handlers router
 base_router = Router(name="base")
@@ -48,6 +78,11 @@ async def cmd_help(message: Message, is_admin: bool = False) -> None:
     
     if is_admin:
         help_text += "/admin - Admin panel\n"
+        help_text += "/lookup &lt;value&gt; - Find FQDNs by IP, target or TXT token\n"
+        help_text += "/migrate_ip &lt;old&gt; &lt;new&gt; - Replace an A record IP on every FQDN\n"
+        help_text += "/history &lt;fqdn&gt; - DNS change history with rollback\n"
+        help_text += "/export [bind|csv] [live] [fqdn ...] - Export DNS records as a zone file\n"
+        help_text += "/import - Apply a BIND or CSV zone file\n"
     
     help_text += (
         "\n<b>Features:</b>\n"
@@ -107,7 +142,9 @@ async def cmd_domains(
 
     await message.answer(
         "Select a domain:",
-        reply_markup=domains_list_keyboard(domains),
+        reply_markup=domains_list_keyboard(
+            domains, catalog_version=container.beget_manager.catalog.version
+        ),
     )
 
 
@@ -126,9 +163,17 @@ async def cmd_admin(message: Message, is_admin: bool = False) -> None:
 
 
 @base_router.callback_query(F.data == CB_MENU_MAIN)
-async def main_menu(callback: CallbackQuery, is_admin: bool = False) -> None:
+async def main_menu(
+    callback: CallbackQuery,
+    container: DependencyContainer,
+    user_chat_id: int,
+    is_admin: bool = False,
+) -> None:
     """Show main menu."""
-    await callback.message.edit_text(
+    if container.prefetcher:
+        container.prefetcher.cancel(user_chat_id)
+    await edit_message(
+        callback.message,
         "Main Menu\n\nSelect an action:",
         reply_markup=main_menu_keyboard(is_admin),
     )
@@ -143,16 +188,24 @@ async def cancel_action(
 ) -> None:
     """Cancel current action and return to main menu."""
     await state.clear()
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         "Action cancelled.\n\nMain Menu:",
         reply_markup=main_menu_keyboard(is_admin),
     )
     await callback.answer()
 
 
-async def setup_bot() -> tuple[Bot, Dispatcher, DependencyContainer]:
-    """Setup and configure bot with dependency injection."""
-    settings = get_settings()
+async def setup_bot(
+    settings: Settings | None = None,
+    session: BaseSession | None = None,
+) -> tuple[Bot, Dispatcher, DependencyContainer]:
+    """Setup and configure bot with dependency injection.
+
+    settings defaults to get_settings(). session replaces the Telegram
+    HTTP session (benchmarks use an in-memory transport).
+    """
+    settings = settings or get_settings()
 
     # Configure logging
     logging.basicConfig(
@@ -160,24 +213,99 @@ async def setup_bot() -> tuple[Bot, Dispatcher, DependencyContainer]:
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     )
 
-    # Initialize database
+    timer = StartupTimer()
     db = Database(settings.db_path)
-    await db.connect()
+    beget_manager = BegetClientManager(
+        login=settings.beget_login,
+        password=settings.beget_password,
+        base_url=settings.beget_api_url,
+        cache_ttl=settings.beget_cache_ttl,
+        write_window=settings.dns_write_window_ms / 1000,
+        breaker_failures=settings.beget_breaker_failures,
+        breaker_reset=settings.beget_breaker_reset_sec,
+    )
+    bot = Bot(token=settings.telegram_bot_token, session=session)
+    metrics_server = None
+    if settings.metrics_port:
+        metrics_server = MetricsServer(settings.metrics_host, settings.metrics_port)
+
+    # Independent I/O runs concurrently: database connect and migrations,
+    # the Beget HTTP session, the command menu (skipped when unchanged)
+    # and the metrics endpoint
+    await asyncio.gather(
+        timer.run("database", db.connect()),
+        timer.run("beget_session", beget_manager.start()),
+        timer.run(
+            "bot_commands",
+            register_bot_commands(bot, settings.admin_chat_id, settings.commands_state_path),
+        ),
+        *([timer.run("metrics_server", metrics_server.start())] if metrics_server else []),
+    )
+    set_item_validation(settings.beget_validate_responses)
+    if beget_manager.cache is not None and settings.beget_l2_cache_ttl > 0:
+        beget_manager.cache.l2 = PersistentResponseCache(
+            ResponseCacheRepository(db),
+            ttl=settings.beget_l2_cache_ttl,
+            max_bytes=settings.beget_l2_cache_mb * 1024 * 1024,
+        )
 
     # Create repositories
     chats_repo = ChatsRepository(db)
     logs_repo = LogsRepository(db)
     permissions_repo = PermissionsRepository(db)
+    snapshots_repo = DnsSnapshotRepository(db)
+    jobs_repo = JobsRepository(db)
+    journal_repo = DnsJournalRepository(db)
 
     # Create permission checker
     permission_checker = PermissionChecker(permissions_repo, settings.admin_chat_id)
 
-    # Create Beget client manager
-    beget_manager = BegetClientManager(
-        login=settings.beget_login,
-        password=settings.beget_password,
+    # Warm the cache for the screen a user is likely to open next
+    prefetcher = None
+    if settings.prefetch_concurrency > 0 and settings.beget_cache_ttl > 0:
+        prefetcher = PrefetchScheduler(beget_manager, settings.prefetch_concurrency)
+
+    # DNS snapshot: reverse index loaded from SQLite, kept current by the
+    # crawler and by every record change made through the bot
+    reverse_index = ReverseIndex()
+    await timer.run("reverse_index", reverse_index.load(snapshots_repo))
+    dns_crawler = DnsCrawler(
+        beget_manager,
+        snapshots_repo,
+        concurrency=settings.crawl_concurrency,
+        rate_per_sec=settings.crawl_rate_per_sec,
+        index=reverse_index,
+    )
+
+    # The journal reads the previous records from the snapshot, so it
+    # must see a change before the crawler overwrites them
+    dns_journal = DnsJournal(beget_manager, journal_repo, snapshots_repo)
+    beget_manager.change_listeners.append(dns_journal.record_change)
+    beget_manager.change_listeners.append(dns_crawler.record_change)
+
+    # Scheduled checks for changes made outside the bot (started by main)
+    drift_detector = None
+    if settings.drift_interval_minutes > 0:
+        drift_detector = DriftDetector(
+            dns_crawler,
+            calls_per_hour=settings.drift_calls_per_hour,
+            interval=settings.drift_interval_minutes * 60,
+        )
+
+    # Bulk jobs plan from the reverse index and checkpoint to SQLite
+    ip_migrator = IpMigrator(
+        beget_manager,
+        jobs_repo,
+        reverse_index,
+        concurrency=settings.bulk_concurrency,
+        rate_per_sec=settings.bulk_rate_per_sec,
+    )
+    subdomain_bulk = SubdomainBulk(beget_manager, permissions_repo, settings.bulk_concurrency)
+    zone_importer = ZoneImporter(
+        beget_manager,
+        concurrency=settings.bulk_concurrency,
+        rate_per_sec=settings.bulk_rate_per_sec,
     )
-    await beget_manager.start()
 
     # Build dependency container
     container = DependencyContainer(
@@ -189,35 +317,68 @@ async def setup_bot() -> tuple[Bot, Dispatcher, DependencyContainer]:
         permission_checker=permission_checker,
         beget_manager=beget_manager,
         admin_chat_id=settings.admin_chat_id,
+        metrics_server=metrics_server,
+        prefetcher=prefetcher,
+        snapshots_repo=snapshots_repo,
+        dns_crawler=dns_crawler,
+        reverse_index=reverse_index,
+        jobs_repo=jobs_repo,
+        ip_migrator=ip_migrator,
+        dns_journal=dns_journal,
+        drift_detector=drift_detector,
+        subdomain_bulk=subdomain_bulk,
+        zone_importer=zone_importer,
     )
 
     # Setup module dependencies (for backward compatibility during migration)
     setup_admin_deps(chats_repo, logs_repo, permissions_repo, settings.admin_chat_id)
 
-    # Initialize bot and dispatcher
-    bot = Bot(token=settings.telegram_bot_token)
-    dp = Dispatcher(storage=MemoryStorage())
+    # Initialize dispatcher. The FSM middleware is registered by hand so it
+    # runs after per-chat ordering: it reads the chat's state up front
+    dp = Dispatcher(storage=MemoryStorage(), disable_fsm=True)
+    dp.update.outer_middleware(ChatOrderingMiddleware(settings.update_workers))
+    dp.update.outer_middleware(dp.fsm)
+    dp.update.outer_middleware(StaleDataMiddleware())
+
+    # Tracing: root span per update, slow ones go to the traces file
+    if settings.slow_update_ms > 0:
+        writer = SlowTraceWriter(settings.traces_path, settings.slow_update_ms)
+        dp.update.outer_middleware(TracingMiddleware(writer))
+        bot.session.middleware(TelegramTracingMiddleware())
 
-    # Register middlewares
+    # Register middlewares (each wrapped in a tracing span)
     # 1. Dependency injection middleware (adds container to all handlers)
-    dp.message.middleware(DependencyMiddleware(container))
-    dp.callback_query.middleware(DependencyMiddleware(container))
+    dependency_middleware = TracedMiddleware("dependency", DependencyMiddleware(container))
+    dp.message.middleware(dependency_middleware)
+    dp.callback_query.middleware(dependency_middleware)
     
     # 2. Auth middleware (checks if user is allowed)
-    auth_middleware = AuthMiddleware(chats_repo, permissions_repo, settings.admin_chat_id)
+    auth_middleware = TracedMiddleware(
+        "auth", AuthMiddleware(chats_repo, permissions_repo, settings.admin_chat_id)
+    )
     dp.message.middleware(auth_middleware)
     dp.callback_query.middleware(auth_middleware)
     
     # 3. Logging middleware
-    dp.message.middleware(LoggingMiddleware(logs_repo, bot, settings.admin_chat_id))
-    dp.callback_query.middleware(LoggingMiddleware(logs_repo, bot, settings.admin_chat_id))
+    dp.message.middleware(
+        TracedMiddleware("logging", LoggingMiddleware(logs_repo, bot, settings.admin_chat_id))
+    )
+    dp.callback_query.middleware(
+        TracedMiddleware("logging", LoggingMiddleware(logs_repo, bot, settings.admin_chat_id))
+    )
+
+    # 4. Metrics middleware (times the handler itself)
+    dp.message.middleware(TracedMiddleware("metrics", MetricsMiddleware()))
+    dp.callback_query.middleware(TracedMiddleware("metrics", MetricsMiddleware()))
+
+    # 5. Handler span (innermost)
+    dp.message.middleware(HandlerSpanMiddleware())
+    dp.callback_query.middleware(HandlerSpanMiddleware())
 
     # Register routers
     dp.include_router(base_router)
     dp.include_router(admin_router)
     dp.include_router(domains_router)
 
-    # Register bot commands menu
-    await register_bot_commands(bot, settings.admin_chat_id)
-
+    logger.info(timer.summary())
     return bot, dp, container
@@ -19,6 +19,9 @@ CB_ADD_SUB = "as"         # as:123 - add subdomain to domain
 CB_DEL_SUB = "ds"         # ds:456 - delete subdomain
 CB_DO_DEL_SUB = "dds"     # dds:456 - confirm delete subdomain
 CB_BACK_SUBS = "bs"       # bs:123 - back to subdomains list
+CB_BULK_ADD_SUB = "bas"   # bas:123 - bulk create subdomains
+CB_BULK_DEL_SUB = "bds"   # bds:123 - bulk delete subdomains
+CB_BULK_CONFIRM = "bsc"   # bsc:123 - run the confirmed bulk operation
 
 # DNS navigation
 CB_DNS = "dn"             # dn:domain.com - DNS menu
@@ -71,6 +74,23 @@ CB_PERM_VIEWUSER = "pvu"  # pvu:123 - view user permissions
 # Logs
 CB_ADMIN_LOGS = "al"      # al - view logs
 
+# DNS snapshot
+CB_ADMIN_SNAPSHOT = "asn"     # asn - snapshot status
+CB_SNAPSHOT_STALE = "asr"     # asr - re-crawl stale FQDNs
+CB_SNAPSHOT_FULL = "asf"      # asf - full crawl
+
+# Bulk IP migration (/migrate_ip)
+CB_MIGRATE_CONFIRM = "mgc"    # mgc:12 - start planned job
+CB_MIGRATE_CANCEL = "mgx"     # mgx:12 - cancel job
+CB_MIGRATE_RESUME = "mgr"     # mgr:12 - resume interrupted job
+
+# DNS journal (/history)
+CB_JOURNAL_ROLLBACK = "jrb"   # jrb:42 - preview rollback to before entry 42
+CB_JOURNAL_CONFIRM = "jrc"    # jrc:42 - apply rollback
+
+# Zone import (/import)
+CB_ZONE_IMPORT_CONFIRM = "zic"  # zic - apply the previewed import
+
 # ============ MENU ============
 
 CB_MENU_MAIN = "mm"       # mm - main menu
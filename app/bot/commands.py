@@ -1,14 +1,58 @@
 """Bot commands registration.
 
 Registers BotCommand menu with Telegram API so users can see
-available commands in the interface.
+available commands in the interface. A digest of the registered set
+is stored, so restarts with unchanged commands skip the API calls.
 """
 
+import asyncio
+import hashlib
+import json
+import logging
+from pathlib import Path
+
 from aiogram import Bot
 from aiogram.types import BotCommand, BotCommandScopeChat, BotCommandScopeDefault
 
+logger = logging.getLogger(__name__)
+
+# Commands for all users
+DEFAULT_COMMANDS = [
+    BotCommand(command="start", description="Main menu"),
+    BotCommand(command="domains", description="Domain list"),
+    BotCommand(command="help", description="Help & info"),
+]
+
+# Additional commands for admin
+ADMIN_COMMANDS = [
+    BotCommand(command="start", description="Main menu"),
+    BotCommand(command="domains", description="Domain list"),
+    BotCommand(command="admin", description="Admin panel"),
+    BotCommand(command="lookup", description="Find FQDNs by record value"),
+    BotCommand(command="migrate_ip", description="Replace an A record IP everywhere"),
+    BotCommand(command="history", description="DNS change history and rollback"),
+    BotCommand(command="export", description="Export DNS records (BIND/CSV)"),
+    BotCommand(command="import", description="Import a BIND/CSV zone file"),
+    BotCommand(command="help", description="Help & info"),
+]
+
 
-async def register_bot_commands(bot: Bot, admin_chat_id: int) -> None:
+def commands_digest(bot_id: int, admin_chat_id: int) -> str:
+    """Digest of everything register_bot_commands() sends."""
+    payload = {
+        "bot_id": bot_id,
+        "admin_chat_id": admin_chat_id,
+        "default": [c.model_dump() for c in DEFAULT_COMMANDS],
+        "admin": [c.model_dump() for c in ADMIN_COMMANDS],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+async def register_bot_commands(
+    bot: Bot,
+    admin_chat_id: int,
+    state_path: Path | None = None,
+) -> bool:
     """Register bot commands with Telegram.
     
     Sets up two command scopes:
@@ -18,30 +62,26 @@ async def register_bot_commands(bot: Bot, admin_chat_id: int) -> None:
     Args:
         bot: The Bot instance
         admin_chat_id: Chat ID of the admin
+        state_path: File with the digest of the last registered set;
+            registration is skipped while it matches
+
+    Returns:
+        True if the commands were sent to Telegram
     """
-    # Commands for all users
-    default_commands = [
-        BotCommand(command="start", description="Main menu"),
-        BotCommand(command="domains", description="Domain list"),
-        BotCommand(command="help", description="Help & info"),
-    ]
-    
-    # Additional commands for admin
-    admin_commands = [
-        BotCommand(command="start", description="Main menu"),
-        BotCommand(command="domains", description="Domain list"),
-        BotCommand(command="admin", description="Admin panel"),
-        BotCommand(command="help", description="Help & info"),
-    ]
-    
-    # Set default commands for all chats
-    await bot.set_my_commands(
-        commands=default_commands,
-        scope=BotCommandScopeDefault(),
-    )
-    
-    # Set admin commands for admin chat
-    await bot.set_my_commands(
-        commands=admin_commands,
-        scope=BotCommandScopeChat(chat_id=admin_chat_id),
+    digest = commands_digest(bot.id, admin_chat_id)
+    if state_path is not None and state_path.exists() and state_path.read_text().strip() == digest:
+        logger.info("Bot commands unchanged, registration skipped")
+        return False
+
+    await asyncio.gather(
+        bot.set_my_commands(commands=DEFAULT_COMMANDS, scope=BotCommandScopeDefault()),
+        bot.set_my_commands(
+            commands=ADMIN_COMMANDS,
+            scope=BotCommandScopeChat(chat_id=admin_chat_id),
+        ),
     )
+
+    if state_path is not None:
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        state_path.write_text(digest + "\n")
+    return True
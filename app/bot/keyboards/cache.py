@@ -0,0 +1,83 @@
+"""Memoization for keyboard builders.
+
+Large list keyboards are rebuilt on every tap although they only change
+when the catalog or the user's capabilities change. InlineKeyboardMarkup
+objects are frozen pydantic models, so a built markup can be shared by
+every user whose key matches.
+
+A key is (builder name, catalog version, fingerprint). The fingerprint
+comes from the builder's arguments: the visible item IDs, capability
+flags such as can_create, and any other argument that changes the
+output (page, back callback).
+"""
+
+import functools
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, TypeVar
+
+from aiogram.types import InlineKeyboardMarkup
+
+from app.services.metrics import record_cache
+
+F = TypeVar("F", bound=Callable[..., InlineKeyboardMarkup])
+
+
+class MarkupCache:
+    """Bounded LRU cache of built keyboards."""
+
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self._items: OrderedDict[Hashable, InlineKeyboardMarkup] = OrderedDict()
+
+    def get_or_build(
+        self, key: Hashable, build: Callable[[], InlineKeyboardMarkup]
+    ) -> InlineKeyboardMarkup:
+        """Return the cached markup for key, building it on a miss."""
+        markup = self._items.get(key)
+        record_cache("markup", hit=markup is not None)
+        if markup is not None:
+            self._items.move_to_end(key)
+            return markup
+
+        markup = build()
+        self._items[key] = markup
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+        return markup
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+MARKUP_CACHE = MarkupCache()
+
+
+def memoized_markup(
+    fingerprint: Callable[..., Hashable],
+    versioned: bool = True,
+) -> Callable[[F], F]:
+    """Memoize a keyboard builder in MARKUP_CACHE.
+
+    fingerprint receives the builder's arguments and returns the part of
+    the key that depends on them. Versioned builders render catalog data
+    and are only cached when called with catalog_version=...; without it
+    they build as before. Unversioned builders depend on their arguments
+    alone and are always cached.
+    """
+
+    def decorator(builder: F) -> F:
+        name = builder.__name__
+
+        @functools.wraps(builder)
+        def wrapper(*args: Any, catalog_version: int | None = None, **kwargs: Any) -> InlineKeyboardMarkup:
+            if versioned and catalog_version is None:
+                return builder(*args, **kwargs)
+            key = (name, catalog_version, fingerprint(*args, **kwargs))
+            return MARKUP_CACHE.get_or_build(key, lambda: builder(*args, **kwargs))
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -0,0 +1,53 @@
+"""Metrics middleware."""
+
+import time
+from typing import Any, Awaitable, Callable
+from aiogram import BaseMiddleware
+from aiogram.types import Message, CallbackQuery, TelegramObject
+
+from app.services.metrics import HANDLER_SECONDS, QUEUE_DEPTH
+
+
+def event_prefix(event: TelegramObject) -> str:
+    """Low-cardinality label for an update.
+
+    Callbacks are labelled by their short prefix (d:123 -> d),
+    messages by command (/start) or "message" for free text.
+    """
+    if isinstance(event, CallbackQuery):
+        return (event.data or "").split(":", 1)[0] or "empty"
+    if isinstance(event, Message):
+        text = event.text or ""
+        if text.startswith("/"):
+            return text.split(maxsplit=1)[0].split("@", 1)[0]
+        return "message"
+    return type(event).__name__.lower()
+
+
+class MetricsMiddleware(BaseMiddleware):
+    """Middleware recording handler durations by router and callback prefix.
+
+    Registered as an inner middleware, so it only sees updates that matched
+    a handler and aiogram has already put the owning router into
+    data["event_router"].
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        router = data.get("event_router")
+        router_name = getattr(router, "name", None) or "unknown"
+        prefix = event_prefix(event)
+
+        QUEUE_DEPTH.inc(queue="handlers")
+        start = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            HANDLER_SECONDS.observe(
+                time.perf_counter() - start, router=router_name, prefix=prefix
+            )
+            QUEUE_DEPTH.dec(queue="handlers")
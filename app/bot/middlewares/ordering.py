@@ -0,0 +1,118 @@
+"""Per-chat update ordering.
+
+aiogram handles every polled update as its own task, so two updates
+from one chat (a double tap, fast navigation) run at the same time and
+race on FSM state and Beget calls. ChatOrderingMiddleware runs the
+updates of a chat one at a time, in arrival order, while different
+chats run in parallel on a bounded number of workers.
+
+A callback query that is still waiting when a newer one arrives for
+the same message is dropped: only the last tap on a menu runs.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Hashable
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.event.bases import UNHANDLED
+from aiogram.types import Chat, TelegramObject, Update, User
+
+from app.services.metrics import QUEUE_DEPTH, UPDATES_DROPPED
+
+logger = logging.getLogger(__name__)
+
+
+class _ChatSlot:
+    """Lock of one chat and the number of its updates holding or waiting for it."""
+
+    __slots__ = ("lock", "users")
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()  # wakes waiters in FIFO order
+        self.users = 0
+
+
+class ChatOrderingMiddleware(BaseMiddleware):
+    """Outer update middleware: serial per chat, parallel across chats.
+
+    Must run before the FSM middleware, which reads the chat's state
+    before calling the next middleware.
+    """
+
+    def __init__(self, workers: int = 0):
+        # Updates running handlers at once across all chats (0 = unlimited)
+        self._workers = asyncio.Semaphore(workers) if workers > 0 else None
+        self._chats: dict[Hashable, _ChatSlot] = {}
+        # (chat ID, message ID) -> ID of the newest callback update for that message
+        self._latest_callback: dict[tuple[int, int], int] = {}
+
+    @staticmethod
+    def _chat_key(data: dict[str, Any]) -> Hashable | None:
+        chat: Chat | None = data.get("event_chat")
+        if chat is not None:
+            return chat.id
+        user: User | None = data.get("event_from_user")
+        return ("user", user.id) if user is not None else None
+
+    @staticmethod
+    def _callback_key(event: Update) -> tuple[int, int] | None:
+        query = event.callback_query
+        if query is None or query.message is None:
+            return None
+        return query.message.chat.id, query.message.message_id
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        key = self._chat_key(data)
+        if key is None or not isinstance(event, Update):
+            return await self._run(handler, event, data)
+
+        callback_key = self._callback_key(event)
+        if callback_key is not None:
+            self._latest_callback[callback_key] = event.update_id
+
+        slot = self._chats.get(key)
+        if slot is None:
+            slot = self._chats[key] = _ChatSlot()
+        slot.users += 1
+        QUEUE_DEPTH.inc(queue="chat_updates")
+        try:
+            async with slot.lock:
+                if callback_key is not None and self._is_superseded(callback_key, event.update_id):
+                    await self._drop(event)
+                    return UNHANDLED
+                return await self._run(handler, event, data)
+        finally:
+            QUEUE_DEPTH.dec(queue="chat_updates")
+            slot.users -= 1
+            if slot.users == 0:
+                del self._chats[key]
+            if callback_key is not None and self._latest_callback.get(callback_key) == event.update_id:
+                del self._latest_callback[callback_key]
+
+    async def _run(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if self._workers is None:
+            return await handler(event, data)
+        async with self._workers:
+            return await handler(event, data)
+
+    def _is_superseded(self, callback_key: tuple[int, int], update_id: int) -> bool:
+        return self._latest_callback.get(callback_key, update_id) != update_id
+
+    async def _drop(self, event: Update) -> None:
+        """Skip a superseded tap, only stopping its button's loading indicator."""
+        UPDATES_DROPPED.inc(reason="superseded_callback")
+        try:
+            await event.callback_query.answer()
+        except Exception as e:
+            logger.debug(f"Failed to answer superseded callback: {e}")
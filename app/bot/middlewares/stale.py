@@ -0,0 +1,24 @@
+"""Stale data middleware."""
+
+from typing import Any, Awaitable, Callable
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from app.services.beget.cache import track_stale_reads
+
+
+class StaleDataMiddleware(BaseMiddleware):
+    """Outer update middleware collecting reads served from last known data.
+
+    While the Beget API is unavailable, reads fall back to the last known
+    answers; edit_message() then notes how old the shown data is.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        with track_stale_reads():
+            return await handler(event, data)
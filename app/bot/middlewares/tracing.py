@@ -0,0 +1,104 @@
+"""Tracing middlewares.
+
+TracingMiddleware opens a root span per update and hands slow traces to
+SlowTraceWriter. The other classes add child spans for the stages an
+update passes through: each event middleware, the handler itself and
+every Telegram Bot API call.
+"""
+
+from typing import Any, Awaitable, Callable
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import TelegramObject, Update
+
+from app.bot.middlewares.metrics import event_prefix
+from app.services.tracing import SlowTraceWriter, span, start_trace
+
+
+class TracingMiddleware(BaseMiddleware):
+    """Outer update middleware that traces the whole update."""
+
+    def __init__(self, writer: SlowTraceWriter):
+        self.writer = writer
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        attrs: dict[str, Any] = {}
+        if isinstance(event, Update):
+            attrs["update_id"] = event.update_id
+            inner = event.event
+            attrs["type"] = event.event_type
+            attrs["prefix"] = event_prefix(inner)
+            chat = getattr(inner, "chat", None) or getattr(
+                getattr(inner, "message", None), "chat", None
+            )
+            if chat is not None:
+                attrs["chat_id"] = chat.id
+
+        root = None
+        try:
+            with start_trace("update", **attrs) as root:
+                return await handler(event, data)
+        finally:
+            # The root span is closed here, so its duration is final
+            if root is not None:
+                await self.writer.maybe_write(root)
+
+
+class TracedMiddleware(BaseMiddleware):
+    """Wrap an event middleware in a "middleware.<name>" span."""
+
+    def __init__(self, name: str, middleware: BaseMiddleware):
+        self.name = name
+        self.middleware = middleware
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        with span(f"middleware.{self.name}"):
+            return await self.middleware(handler, event, data)
+
+
+class HandlerSpanMiddleware(BaseMiddleware):
+    """Innermost middleware putting the handler call in a "handler" span."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        router = data.get("event_router")
+        handler_object = data.get("handler")
+        callback = getattr(handler_object, "callback", None)
+        with span(
+            "handler",
+            router=getattr(router, "name", None),
+            handler=getattr(callback, "__name__", None),
+        ):
+            return await handler(event, data)
+
+
+class TelegramTracingMiddleware(BaseRequestMiddleware):
+    """Bot session middleware putting each Bot API call in a "telegram.<method>" span."""
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        with span(f"telegram.{method.__api_method__}"):
+            return await make_request(bot, method)
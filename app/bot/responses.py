@@ -0,0 +1,212 @@
+"""Response helpers for handlers.
+
+edit_message() skips edits that would not change the message: the last
+rendered content of every message is hashed and kept in a bounded LRU,
+so re-rendering the same screen (a double tap, "Back" to an unchanged
+list) costs no Telegram round-trip and never raises
+"message is not modified". All handler edits go through it so the
+stored hashes always match what the user sees. While the Beget API is
+down and the update was answered from last known data, the edit ends
+with a note saying how old that data is.
+
+ThrottledEditor turns a stream of progress updates into at most one
+edit per interval, so long background jobs stay under Telegram's edit
+rate limits.
+
+StreamingDocument uploads a document produced by an async generator,
+so large exports are never held in memory as a whole.
+
+CallbackResponder answers a callback query at most once. Handlers that
+are about to call the Beget API answer with a "Loading..." toast first,
+so the button spinner stops right away instead of after the API call.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, AsyncGenerator, AsyncIterator
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InputFile, Message
+
+from app.services.beget.cache import stale_as_of
+from app.services.metrics import record_cache
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+LOADING_TEXT = "Loading..."
+
+
+class RenderedMessages:
+    """LRU of content hashes keyed by (chat_id, message_id)."""
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._hashes: OrderedDict[tuple[int, int], bytes] = OrderedDict()
+
+    def get(self, key: tuple[int, int]) -> bytes | None:
+        digest = self._hashes.get(key)
+        if digest is not None:
+            self._hashes.move_to_end(key)
+        return digest
+
+    def set(self, key: tuple[int, int], digest: bytes) -> None:
+        self._hashes[key] = digest
+        self._hashes.move_to_end(key)
+        if len(self._hashes) > self.maxsize:
+            self._hashes.popitem(last=False)
+
+    def clear(self) -> None:
+        self._hashes.clear()
+
+
+RENDERED = RenderedMessages()
+
+
+def render_digest(
+    text: str,
+    reply_markup: InlineKeyboardMarkup | None = None,
+    **kwargs: Any,
+) -> bytes:
+    """Hash of everything that determines how an edited message looks."""
+    digest = hashlib.blake2b(text.encode(), digest_size=16)
+    if reply_markup is not None:
+        digest.update(reply_markup.model_dump_json(exclude_none=True).encode())
+    for key in sorted(kwargs):
+        digest.update(f"\x00{key}={kwargs[key]!r}".encode())
+    return digest.digest()
+
+
+def stale_notice(as_of: datetime) -> str:
+    """Note appended to screens built from last known Beget data."""
+    if as_of.date() == datetime.now().date():
+        when = f"{as_of:%H:%M:%S}"
+    else:
+        when = f"{as_of:%Y-%m-%d %H:%M}"
+    return f"⚠️ Beget API is unavailable. Showing data as of {when}"
+
+
+async def edit_message(
+    message: Message,
+    text: str,
+    reply_markup: InlineKeyboardMarkup | None = None,
+    **kwargs: Any,
+) -> bool:
+    """Edit message text unless it already shows this content.
+
+    Returns True if an edit was sent.
+    """
+    as_of = stale_as_of()
+    if as_of is not None:
+        text = f"{text}\n\n{stale_notice(as_of)}"
+    key = (message.chat.id, message.message_id)
+    digest = render_digest(text, reply_markup, **kwargs)
+    unchanged = RENDERED.get(key) == digest
+    record_cache("message_render", hit=unchanged)
+    if unchanged:
+        return False
+
+    try:
+        await message.edit_text(text, reply_markup=reply_markup, **kwargs)
+    except TelegramBadRequest as e:
+        if "message is not modified" not in e.message:
+            raise
+        RENDERED.set(key, digest)
+        return False
+
+    RENDERED.set(key, digest)
+    return True
+
+
+class CallbackResponder:
+    """Answer a callback query once, as early as possible.
+
+    Usage:
+        respond = CallbackResponder(callback)
+        await respond.loading()          # before a Beget call
+        ...
+        await respond.answer()           # no-op, already answered
+        await respond.answer("Error", show_alert=True)  # sent as a message
+    """
+
+    def __init__(self, callback: CallbackQuery):
+        self.callback = callback
+        self.answered = False
+
+    async def loading(self, text: str = LOADING_TEXT) -> None:
+        """Stop the button spinner with a short "loading" toast."""
+        if not self.answered:
+            self.answered = True
+            await self.callback.answer(text)
+
+    async def answer(self, text: str | None = None, show_alert: bool = False) -> None:
+        """Answer the callback, or fall back to a message if already answered.
+
+        A callback can only be answered once. Plain toasts after the
+        loading toast are dropped; alerts carry information the user
+        must see (errors, confirmations), so they are sent as a message.
+        """
+        if not self.answered:
+            self.answered = True
+            await self.callback.answer(text, show_alert=show_alert)
+        elif text and show_alert and self.callback.message is not None:
+            await self.callback.message.answer(text)
+
+    async def edit(
+        self,
+        text: str,
+        reply_markup: InlineKeyboardMarkup | None = None,
+        **kwargs: Any,
+    ) -> bool:
+        """edit_message() on the callback's message."""
+        return await edit_message(self.callback.message, text, reply_markup, **kwargs)
+
+
+class ThrottledEditor:
+    """Edit one message with progress, at most once per interval.
+
+    Usage:
+        editor = ThrottledEditor(message, interval=3.0)
+        await editor.update(f"{done}/{total}")        # dropped if too soon
+        await editor.update("Finished", force=True)   # always sent
+    """
+
+    def __init__(self, message: Message, interval: float = 3.0):
+        self.message = message
+        self.interval = interval
+        self._last_edit = float("-inf")
+
+    async def update(
+        self,
+        text: str,
+        reply_markup: InlineKeyboardMarkup | None = None,
+        force: bool = False,
+    ) -> bool:
+        """edit_message() unless the last edit was less than interval ago.
+
+        Returns True if an edit was sent.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_edit < self.interval:
+            return False
+        self._last_edit = now
+        return await edit_message(self.message, text, reply_markup)
+
+
+class StreamingDocument(InputFile):
+    """Document whose content comes from an async byte iterator.
+
+    The iterator is consumed while the upload runs, so the document can
+    be sent only once.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], filename: str):
+        super().__init__(filename=filename)
+        self.chunks = chunks
+
+    async def read(self, bot: "Bot") -> AsyncGenerator[bytes, None]:
+        async for chunk in self.chunks:
+            if chunk:
+                yield chunk
@@ -23,9 +23,51 @@ class Settings(BaseSettings):
     # Beget API
     beget_login: str
     beget_password: str
+    # Override to point the bot at a local Beget simulator (load tests)
+    beget_api_url: str = "https://api.beget.com/api"
+    # Seconds Beget read answers are cached (0 = disabled, also disables prefetch)
+    beget_cache_ttl: int = 30
+    # Seconds domain lists, subdomain lists and DNS data are also kept in SQLite, so reads
+    # after a restart are served locally (0 = disabled; needs beget_cache_ttl)
+    beget_l2_cache_ttl: int = 300
+    beget_l2_cache_mb: int = 16  # size bound of the stored (compressed) answers
+    # Parallel background prefetches of the next screen (0 = disabled)
+    prefetch_concurrency: int = 2
+    # Strictly validate every decoded Beget item (debug; slows list parsing)
+    beget_validate_responses: bool = False
+    # Milliseconds record edits of one FQDN wait to be merged into one write (0 = merge only
+    # edits queued behind a write in flight)
+    dns_write_window_ms: int = 0
+    # Circuit breaker: after this many failed Beget requests in a row, requests fail at
+    # once and reads show the last known data (0 = disabled)
+    beget_breaker_failures: int = 5
+    beget_breaker_reset_sec: float = 30.0  # seconds before a probe request is let through
+
+    # DNS snapshot crawler
+    crawl_concurrency: int = 4
+    crawl_rate_per_sec: float = 5.0  # dns/getData calls per second (0 = unlimited)
+    snapshot_stale_minutes: int = 60  # "Refresh Stale" re-fetches entries older than this
+    # Drift detection: re-check snapshot FQDNs for changes made outside the bot
+    drift_interval_minutes: int = 15  # 0 = disabled
+    drift_calls_per_hour: int = 120  # dns/getData budget
+
+    # Bulk DNS jobs (/migrate_ip)
+    bulk_concurrency: int = 4
+    bulk_rate_per_sec: float = 5.0  # Beget calls per second (0 = unlimited)
+    progress_edit_interval: float = 3.0  # min seconds between progress message edits
 
     # Optional
     log_level: str = "INFO"
+    # Updates handled at once across all chats; each chat's updates always run one
+    # at a time (0 = unlimited)
+    update_workers: int = 16
+
+    # Metrics (Prometheus text format on http://host:port/metrics, 0 = disabled)
+    metrics_host: str = "127.0.0.1"
+    metrics_port: int = 0
+
+    # Tracing: updates slower than this are written to traces_path (0 = disabled)
+    slow_update_ms: int = 2000
 
     # Paths
     data_dir: Path = Path("data")
@@ -81,6 +123,16 @@ class Settings(BaseSettings):
         """Path to SQLite database file."""
         return self.data_dir / "bot.db"
 
+    @property
+    def traces_path(self) -> Path:
+        """Path to the JSONL file with slow update traces."""
+        return self.data_dir / "slow_updates.jsonl"
+
+    @property
+    def commands_state_path(self) -> Path:
+        """Path to the digest of the last registered bot commands."""
+        return self.data_dir / "bot_commands.sha256"
+
 
 @lru_cache
 def get_settings() -> Settings:
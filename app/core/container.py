@@ -5,12 +5,23 @@ from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from app.config import Settings
+    from app.services.bulk.ip_migration import IpMigrator
+    from app.services.bulk.subdomains import SubdomainBulk
     from app.services.database.connection import Database
     from app.services.database.chats import ChatsRepository
+    from app.services.database.jobs import JobsRepository
     from app.services.database.logs import LogsRepository
     from app.services.database.permissions import PermissionsRepository
+    from app.services.database.snapshots import DnsSnapshotRepository
     from app.services.permissions.checker import PermissionChecker
     from app.services.beget.manager import BegetClientManager
+    from app.services.beget.prefetch import PrefetchScheduler
+    from app.services.metrics.server import MetricsServer
+    from app.services.snapshot.crawler import DnsCrawler
+    from app.services.snapshot.drift import DriftDetector
+    from app.services.snapshot.index import ReverseIndex
+    from app.services.snapshot.journal import DnsJournal
+    from app.services.zonefile.importer import ZoneImporter
 
 
 @dataclass(frozen=True)
@@ -30,6 +41,17 @@ class DependencyContainer:
     permission_checker: "PermissionChecker"
     beget_manager: "BegetClientManager"
     admin_chat_id: int
+    metrics_server: "MetricsServer | None" = None
+    prefetcher: "PrefetchScheduler | None" = None
+    snapshots_repo: "DnsSnapshotRepository | None" = None
+    dns_crawler: "DnsCrawler | None" = None
+    reverse_index: "ReverseIndex | None" = None
+    jobs_repo: "JobsRepository | None" = None
+    ip_migrator: "IpMigrator | None" = None
+    dns_journal: "DnsJournal | None" = None
+    drift_detector: "DriftDetector | None" = None
+    subdomain_bulk: "SubdomainBulk | None" = None
+    zone_importer: "ZoneImporter | None" = None
     
     def is_admin(self, chat_id: int) -> bool:
         """Check if chat_id belongs to admin."""
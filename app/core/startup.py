@@ -0,0 +1,60 @@
+"""Startup phase timing."""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Iterator, TypeVar
+
+from app.services.metrics import STARTUP_PHASE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class StartupTimer:
+    """Wall-clock duration of each startup phase.
+
+    Phases may overlap (they run concurrently), so their sum can exceed
+    the total. Durations are exported as startup_phase_seconds.
+
+    Usage:
+        timer = StartupTimer()
+        await asyncio.gather(timer.run("database", db.connect()), ...)
+        with timer.phase("wiring"):
+            ...
+        logger.info(timer.summary())
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+
+    def _record(self, name: str, start: float) -> None:
+        elapsed = time.perf_counter() - start
+        self.phases[name] = elapsed
+        STARTUP_PHASE_SECONDS.set(elapsed, phase=name)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(name, start)
+
+    async def run(self, name: str, awaitable: Awaitable[T]) -> T:
+        """Await as a named phase."""
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self._record(name, start)
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def summary(self) -> str:
+        phases = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.phases.items())
+        return f"Startup took {self.total * 1000:.0f}ms ({phases})"
@@ -4,6 +4,8 @@ import asyncio
 import logging
 
 from app.bot.bot import setup_bot
+from app.modules.admin.bulk import notify_unfinished_jobs
+from app.modules.admin.snapshot import send_drift_digest
 
 # Version identifier for debugging
 APP_VERSION = "1.2.0-production"
@@ -16,11 +18,27 @@ async def main() -> None:
     logger = logging.getLogger(__name__)
     logger.info(f"App version: {APP_VERSION}")
 
+    await notify_unfinished_jobs(bot, container)
+    if container.drift_detector:
+        container.drift_detector.start(
+            lambda changes: send_drift_digest(bot, container.admin_chat_id, changes)
+        )
+
     try:
         logger.info("Starting bot...")
         await dp.start_polling(bot)
     finally:
         logger.info("Shutting down...")
+        if container.prefetcher:
+            await container.prefetcher.stop()
+        if container.drift_detector:
+            await container.drift_detector.stop()
+        if container.dns_crawler:
+            await container.dns_crawler.stop()
+        if container.ip_migrator:
+            await container.ip_migrator.stop()
+        if container.metrics_server:
+            await container.metrics_server.stop()
         await container.beget_manager.stop()
         await container.db.disconnect()
         await bot.session.close()
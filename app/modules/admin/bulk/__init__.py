@@ -0,0 +1,5 @@
+"""Admin bulk DNS jobs submodule."""
+
+from app.modules.admin.bulk.handlers import notify_unfinished_jobs, router
+
+__all__ = ["notify_unfinished_jobs", "router"]
@@ -0,0 +1,190 @@
+"""Bulk DNS job handlers."""
+
+import logging
+
+from aiogram import Bot, Router, F
+from aiogram.types import CallbackQuery, Message
+
+from app.core.container import DependencyContainer
+from app.bot.callback_data import CB_MIGRATE_CONFIRM, CB_MIGRATE_CANCEL, CB_MIGRATE_RESUME
+from app.bot.responses import CallbackResponder, ThrottledEditor, edit_message
+from app.modules.admin.bulk.keyboards import confirm_job_keyboard, resume_jobs_keyboard
+from app.services.bulk import IP_MIGRATION
+from app.services.database.jobs import (
+    ITEM_DONE,
+    ITEM_FAILED,
+    ITEM_PENDING,
+    ITEM_SKIPPED,
+    JOB_PLANNED,
+    JOB_RUNNING,
+    BulkJob,
+)
+from app.utils.helpers import is_valid_ipv4
+
+logger = logging.getLogger(__name__)
+
+router = Router(name="admin_bulk")
+
+MIGRATE_USAGE = (
+    "Usage: /migrate_ip <old_ip> <new_ip>\n\n"
+    "Replaces the A record value old_ip with new_ip on every FQDN "
+    "that points at it in the DNS snapshot, e.g. /migrate_ip 192.0.2.10 192.0.2.20"
+)
+PREVIEW_FQDNS = 10
+REPORT_FAILURES = 10
+
+
+def job_title(job: BulkJob) -> str:
+    return f"IP migration #{job.id}: {job.params['old_ip']} -> {job.params['new_ip']}"
+
+
+def format_progress(job: BulkJob) -> str:
+    """Progress text of a job."""
+    counts = job.counts
+    return (
+        f"{job_title(job)}\n\n"
+        f"Progress: {job.finished}/{job.total}\n"
+        f"Updated: {counts.get(ITEM_DONE, 0)}\n"
+        f"Skipped (no longer pointing at old IP): {counts.get(ITEM_SKIPPED, 0)}\n"
+        f"Failed: {counts.get(ITEM_FAILED, 0)}\n"
+    )
+
+
+def _job_id(callback: CallbackQuery) -> int:
+    return int(callback.data.split(":")[1])
+
+
+async def _start_job(container: DependencyContainer, message: Message, job: BulkJob) -> bool:
+    """Run a job in the background with throttled progress edits."""
+    editor = ThrottledEditor(message, container.settings.progress_edit_interval)
+    jobs_repo = container.jobs_repo
+
+    async def progress(job: BulkJob) -> None:
+        await editor.update(format_progress(job) + "\nRunning...")
+
+    async def report(job: BulkJob) -> None:
+        text = format_progress(job) + "\nFinished."
+        failed = await jobs_repo.get_items(job.id, ITEM_FAILED)
+        if failed:
+            text += "\n\nFailed FQDNs:\n" + "\n".join(
+                f"  {item.fqdn}: {item.error}" for item in failed[:REPORT_FAILURES]
+            )
+            if len(failed) > REPORT_FAILURES:
+                text += f"\n  ...and {len(failed) - REPORT_FAILURES} more"
+        await editor.update(text, force=True)
+
+    if not container.ip_migrator.start(job.id, on_progress=progress, on_done=report):
+        return False
+    await editor.update(format_progress(job) + "\nStarting...", force=True)
+    return True
+
+
+@router.message(F.text.startswith("/migrate_ip"))
+async def cmd_migrate_ip(message: Message, container: DependencyContainer) -> None:
+    """Plan an IP migration: /migrate_ip <old_ip> <new_ip>."""
+    jobs_repo = container.jobs_repo
+    parts = message.text.split()
+
+    if len(parts) == 1:
+        jobs = await jobs_repo.get_unfinished(IP_MIGRATION)
+        if not jobs:
+            await message.answer(MIGRATE_USAGE)
+            return
+        text = MIGRATE_USAGE + "\n\nInterrupted jobs:\n\n" + "\n".join(
+            format_progress(job) for job in jobs
+        )
+        await message.answer(text, reply_markup=resume_jobs_keyboard(jobs))
+        return
+
+    if len(parts) != 3:
+        await message.answer(MIGRATE_USAGE)
+        return
+
+    old_ip, new_ip = parts[1], parts[2]
+    if not is_valid_ipv4(old_ip) or not is_valid_ipv4(new_ip):
+        await message.answer("Invalid IP address. Both IPs must be valid IPv4.")
+        return
+    if old_ip == new_ip:
+        await message.answer("Old and new IP are the same.")
+        return
+
+    created_by = str(message.from_user.id) if message.from_user else str(message.chat.id)
+    job = await container.ip_migrator.create(old_ip, new_ip, created_by)
+    if job is None:
+        await message.answer(
+            f"No A records with value {old_ip} in the DNS snapshot.\n\n"
+            "Run a crawl first if the snapshot is outdated."
+        )
+        return
+
+    items = await jobs_repo.get_items(job.id)
+    preview = "\n".join(f"  {item.fqdn}" for item in items[:PREVIEW_FQDNS])
+    if job.total > PREVIEW_FQDNS:
+        preview += f"\n  ...and {job.total - PREVIEW_FQDNS} more"
+    await message.answer(
+        f"{job_title(job)}\n\n"
+        f"{job.total} FQDN(s) will be updated:\n{preview}\n\n"
+        "Each FQDN is re-read before writing; FQDNs that no longer point "
+        "at the old IP are skipped.",
+        reply_markup=confirm_job_keyboard(job.id),
+    )
+
+
+@router.callback_query(F.data.startswith(f"{CB_MIGRATE_CONFIRM}:"))
+async def confirm_job(callback: CallbackQuery, container: DependencyContainer) -> None:
+    """Start a planned job."""
+    respond = CallbackResponder(callback)
+    job = await container.jobs_repo.get(_job_id(callback))
+    if job is None or job.status != JOB_PLANNED:
+        await respond.answer("This job is no longer pending.", show_alert=True)
+        return
+    if not await _start_job(container, callback.message, job):
+        await respond.answer("This job is already running.", show_alert=True)
+        return
+    await respond.answer("Migration started")
+
+
+@router.callback_query(F.data.startswith(f"{CB_MIGRATE_RESUME}:"))
+async def resume_job(callback: CallbackQuery, container: DependencyContainer) -> None:
+    """Resume an interrupted job with its pending items."""
+    respond = CallbackResponder(callback)
+    job = await container.jobs_repo.get(_job_id(callback))
+    if job is None or job.status != JOB_RUNNING:
+        await respond.answer("This job is not interrupted.", show_alert=True)
+        return
+    if not await _start_job(container, callback.message, job):
+        await respond.answer("This job is already running.", show_alert=True)
+        return
+    await respond.answer("Migration resumed")
+
+
+@router.callback_query(F.data.startswith(f"{CB_MIGRATE_CANCEL}:"))
+async def cancel_job(callback: CallbackQuery, container: DependencyContainer) -> None:
+    """Cancel a planned or interrupted job."""
+    job = await container.jobs_repo.get(_job_id(callback))
+    if job is None or job.status not in (JOB_PLANNED, JOB_RUNNING):
+        await callback.answer("This job is already finished.", show_alert=True)
+        return
+    await container.ip_migrator.cancel(job.id)
+    job = await container.jobs_repo.get(job.id)
+    text = format_progress(job) + "\nCancelled."
+    if job.counts.get(ITEM_DONE):
+        text += " FQDNs already updated keep the new IP."
+    await edit_message(callback.message, text)
+    await callback.answer("Job cancelled")
+
+
+async def notify_unfinished_jobs(bot: Bot, container: DependencyContainer) -> None:
+    """Offer to resume jobs interrupted by a restart in the admin chat."""
+    jobs = await container.jobs_repo.get_unfinished(IP_MIGRATION)
+    if not jobs:
+        return
+    pending = sum(job.counts.get(ITEM_PENDING, 0) for job in jobs)
+    text = (
+        f"{len(jobs)} IP migration job(s) were interrupted, {pending} FQDN(s) pending.\n\n"
+        + "\n".join(format_progress(job) for job in jobs)
+    )
+    try:
+        await bot.send_message(container.admin_chat_id, text, reply_markup=resume_jobs_keyboard(jobs))
+    except Exception as e:
+        logger.warning(f"Failed to notify about interrupted jobs: {e}")
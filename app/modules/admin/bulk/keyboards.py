@@ -0,0 +1,28 @@
+"""Bulk job keyboards."""
+
+from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+from aiogram.utils.keyboard import InlineKeyboardBuilder
+
+from app.bot.callback_data import CB_MIGRATE_CONFIRM, CB_MIGRATE_CANCEL, CB_MIGRATE_RESUME
+from app.services.database import BulkJob
+
+
+def confirm_job_keyboard(job_id: int) -> InlineKeyboardMarkup:
+    """Start or drop a planned job."""
+    builder = InlineKeyboardBuilder()
+    builder.row(
+        InlineKeyboardButton(text="Confirm", callback_data=f"{CB_MIGRATE_CONFIRM}:{job_id}"),
+        InlineKeyboardButton(text="Cancel", callback_data=f"{CB_MIGRATE_CANCEL}:{job_id}"),
+    )
+    return builder.as_markup()
+
+
+def resume_jobs_keyboard(jobs: list[BulkJob]) -> InlineKeyboardMarkup:
+    """Resume or cancel interrupted jobs."""
+    builder = InlineKeyboardBuilder()
+    for job in jobs:
+        builder.row(
+            InlineKeyboardButton(text=f"Resume #{job.id}", callback_data=f"{CB_MIGRATE_RESUME}:{job.id}"),
+            InlineKeyboardButton(text=f"Cancel #{job.id}", callback_data=f"{CB_MIGRATE_CANCEL}:{job.id}"),
+        )
+    return builder.as_markup()
@@ -5,6 +5,7 @@ from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 
 from app.core.container import DependencyContainer
+from app.bot.responses import edit_message
 from app.bot.callback_data import (
     CB_ADMIN_CHATS, CB_ADMIN_CHAT, CB_ADMIN_ADD_CHAT,
     CB_ADMIN_REMOVE, CB_ADMIN_CONFIRM_RM,
@@ -40,7 +41,7 @@ async def list_chats(
     else:
         text += "No allowed chats yet."
 
-    await callback.message.edit_text(text, reply_markup=chats_list_keyboard(chats))
+    await edit_message(callback.message, text, reply_markup=chats_list_keyboard(chats))
     await callback.answer()
 
 
@@ -48,7 +49,8 @@ async def list_chats(
 async def start_add_chat(callback: CallbackQuery, state: FSMContext) -> None:
     """Start adding a new chat."""
     await state.set_state(AdminStates.waiting_chat_id)
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         "Enter the Chat ID to add:\n\n"
         "(You can get it by forwarding a message from the chat to @userinfobot)",
     )
@@ -101,7 +103,8 @@ async def receive_chat_note(
 async def show_chat_actions(callback: CallbackQuery) -> None:
     """Show actions for a specific chat (ach:chat_id)."""
     chat_id = int(callback.data.split(":")[1])
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         f"Chat ID: {chat_id}\n\nSelect action:",
         reply_markup=chat_actions_keyboard(chat_id),
     )
@@ -112,7 +115,8 @@ async def show_chat_actions(callback: CallbackQuery) -> None:
 async def confirm_remove_chat(callback: CallbackQuery) -> None:
     """Confirm chat removal (arc:chat_id)."""
     chat_id = int(callback.data.split(":")[1])
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         f"Are you sure you want to remove Chat ID: {chat_id}?",
         reply_markup=confirm_remove_keyboard(chat_id),
     )
@@ -146,4 +150,4 @@ async def do_remove_chat(
     else:
         text += "No allowed chats yet."
 
-    await callback.message.edit_text(text, reply_markup=chats_list_keyboard(chats))
+    await edit_message(callback.message, text, reply_markup=chats_list_keyboard(chats))
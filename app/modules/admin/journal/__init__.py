@@ -0,0 +1,5 @@
+"""Admin DNS journal submodule."""
+
+from app.modules.admin.journal.handlers import router
+
+__all__ = ["router"]
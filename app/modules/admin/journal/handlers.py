@@ -0,0 +1,106 @@
+"""DNS journal handlers."""
+
+from aiogram import Router, F
+from aiogram.types import CallbackQuery, Message
+
+from app.core.container import DependencyContainer
+from app.bot.callback_data import CB_JOURNAL_ROLLBACK, CB_JOURNAL_CONFIRM
+from app.bot.responses import CallbackResponder, edit_message
+from app.modules.admin.journal.keyboards import confirm_rollback_keyboard, history_keyboard
+from app.services.database import JournalEntry
+from app.services.snapshot import JournalError
+from app.utils.helpers import format_datetime, format_record
+
+router = Router(name="admin_journal")
+
+HISTORY_USAGE = (
+    "Usage: /history <fqdn>\n\n"
+    "Shows the latest DNS changes made through the bot, e.g. /history example.com"
+)
+HISTORY_ENTRIES = 8
+
+
+def format_entry(entry: JournalEntry) -> str:
+    """One journal entry as removed/added lines."""
+    lines = [f"#{entry.id} {format_datetime(entry.created_at)} UTC"]
+    if not entry.complete:
+        lines.append("  (previous records unknown)")
+    lines += [f"  - {format_record(r)}" for r in entry.removed]
+    lines += [f"  + {format_record(r)}" for r in entry.added]
+    return "\n".join(lines)
+
+
+@router.message(F.text.startswith("/history"))
+async def cmd_history(message: Message, container: DependencyContainer) -> None:
+    """Show DNS change history of an FQDN: /history <fqdn>."""
+    parts = message.text.split()
+    if len(parts) != 2:
+        await message.answer(HISTORY_USAGE)
+        return
+
+    fqdn = parts[1].strip().lower().rstrip(".")
+    entries = await container.dns_journal.repo.get_entries(fqdn, HISTORY_ENTRIES)
+    if not entries:
+        await message.answer(f"No recorded DNS changes for {fqdn}.")
+        return
+
+    text = f"DNS history of {fqdn}, newest first:\n\n" + "\n\n".join(
+        format_entry(entry) for entry in entries
+    )
+    await message.answer(text, reply_markup=history_keyboard(entries))
+
+
+async def _get_entry(callback: CallbackQuery, container: DependencyContainer) -> JournalEntry | None:
+    entry_id = int(callback.data.split(":")[1])
+    return await container.dns_journal.repo.get_entry(entry_id)
+
+
+@router.callback_query(F.data.startswith(f"{CB_JOURNAL_ROLLBACK}:"))
+async def preview_rollback(callback: CallbackQuery, container: DependencyContainer) -> None:
+    """Show the records a rollback would restore."""
+    entry = await _get_entry(callback, container)
+    if entry is None:
+        await callback.answer("Journal entry not found.", show_alert=True)
+        return
+
+    try:
+        records, record_types = await container.dns_journal.rebuild(entry.fqdn, entry.id)
+    except JournalError as e:
+        await callback.answer(str(e), show_alert=True)
+        return
+
+    restored = [r for r in records if r[0] in record_types]
+    lines = "\n".join(f"  {format_record(r)}" for r in restored) or "  (no records)"
+    await edit_message(
+        callback.message,
+        f"Roll back {entry.fqdn} to before #{entry.id}?\n\n"
+        f"{', '.join(sorted(record_types))} records will be set to:\n{lines}",
+        reply_markup=confirm_rollback_keyboard(entry.id),
+    )
+    await callback.answer()
+
+
+@router.callback_query(F.data.startswith(f"{CB_JOURNAL_CONFIRM}:"))
+async def apply_rollback(callback: CallbackQuery, container: DependencyContainer) -> None:
+    """Write the rebuilt records."""
+    respond = CallbackResponder(callback)
+    entry = await _get_entry(callback, container)
+    if entry is None:
+        await respond.answer("Journal entry not found.", show_alert=True)
+        return
+
+    await respond.loading()
+    try:
+        await container.dns_journal.rollback(entry.fqdn, entry.id)
+    except JournalError as e:
+        await respond.answer(str(e), show_alert=True)
+        return
+    except Exception as e:
+        await respond.answer(f"Error: {e}", show_alert=True)
+        return
+
+    await edit_message(
+        callback.message,
+        f"{entry.fqdn} rolled back to before #{entry.id}.\n\n"
+        f"The rollback is journaled too: /history {entry.fqdn}",
+    )
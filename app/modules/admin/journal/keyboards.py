@@ -0,0 +1,30 @@
+"""DNS journal keyboards."""
+
+from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+from aiogram.utils.keyboard import InlineKeyboardBuilder
+
+from app.bot.callback_data import CB_JOURNAL_ROLLBACK, CB_JOURNAL_CONFIRM, CB_CANCEL
+from app.services.database import JournalEntry
+
+
+def history_keyboard(entries: list[JournalEntry]) -> InlineKeyboardMarkup:
+    """One rollback button per entry."""
+    builder = InlineKeyboardBuilder()
+    for entry in entries:
+        builder.row(
+            InlineKeyboardButton(
+                text=f"Undo #{entry.id} and later",
+                callback_data=f"{CB_JOURNAL_ROLLBACK}:{entry.id}",
+            )
+        )
+    return builder.as_markup()
+
+
+def confirm_rollback_keyboard(entry_id: int) -> InlineKeyboardMarkup:
+    """Apply or cancel a rollback."""
+    builder = InlineKeyboardBuilder()
+    builder.row(
+        InlineKeyboardButton(text="Roll Back", callback_data=f"{CB_JOURNAL_CONFIRM}:{entry_id}"),
+        InlineKeyboardButton(text="Cancel", callback_data=CB_CANCEL),
+    )
+    return builder.as_markup()
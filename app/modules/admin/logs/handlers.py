@@ -5,6 +5,7 @@ from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InlineKeyboardBut
 
 from app.core.container import DependencyContainer
 from app.bot.callback_data import CB_ADMIN_LOGS, CB_MENU_ADMIN
+from app.bot.responses import edit_message
 from app.utils.helpers import format_datetime
 
 router = Router(name="admin_logs")
@@ -27,7 +28,8 @@ async def show_logs(
     else:
         text += "No actions recorded yet."
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         text,
         reply_markup=InlineKeyboardMarkup(
             inline_keyboard=[
@@ -7,6 +7,7 @@ from aiogram.fsm.context import FSMContext
 from app.core.container import DependencyContainer
 from app.core.state_helpers import StateContext
 from app.services.beget import DomainsService
+from app.bot.responses import CallbackResponder, edit_message
 from app.bot.callback_data import (
     CB_PERM_DOMAINS, CB_PERM_DOMAIN, CB_PERM_ITEM,
     CB_PERM_GRANT, CB_PERM_CANCEL_GRANT, CB_PERM_USER,
@@ -41,7 +42,8 @@ router = Router(name="admin_permissions")
 async def show_permissions_menu(callback: CallbackQuery, state: FSMContext) -> None:
     """Show permissions management menu."""
     await state.clear()
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         "Permission Management\n\nSelect an option:",
         reply_markup=permissions_menu_keyboard(),
     )
@@ -55,27 +57,32 @@ async def show_domains_for_permissions(
     container: DependencyContainer,
 ) -> None:
     """Show list of domains for permission management."""
+    respond = CallbackResponder(callback)
+    await respond.loading()
     try:
         async with container.beget_manager.client() as client:
             domains_service = DomainsService(client)
             domains = await domains_service.get_domains()
     except Exception as e:
-        await callback.answer(f"Error: {e}", show_alert=True)
+        await respond.answer(f"Error: {e}", show_alert=True)
         return
 
     if not domains:
-        await callback.answer("No domains found.", show_alert=True)
+        await respond.answer("No domains found.", show_alert=True)
         return
 
     # Store domains in state for index-based access
     ctx = StateContext(state)
     await ctx.set_perm_domains([(d.id, d.fqdn) for d in domains])
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         "Select a domain to manage permissions:",
-        reply_markup=domains_for_permissions_keyboard(domains),
+        reply_markup=domains_for_permissions_keyboard(
+            domains, catalog_version=container.beget_manager.catalog.version
+        ),
     )
-    await callback.answer()
+    await respond.answer()
 
 
 @router.callback_query(F.data.startswith(f"{CB_PERM_DOMAIN}:"))
@@ -85,12 +92,13 @@ async def show_domain_items(
     container: DependencyContainer,
 ) -> None:
     """Show domain and its subdomains for permission assignment (pdo:index)."""
+    respond = CallbackResponder(callback)
     domain_index = int(callback.data.split(":")[1])
     ctx = StateContext(state)
     
     domain_data = await ctx.get_perm_domain(domain_index)
     if not domain_data:
-        await callback.answer("Domain not found", show_alert=True)
+        await respond.answer("Domain not found", show_alert=True)
         return
     
     domain_id, domain_fqdn = domain_data
@@ -98,23 +106,25 @@ async def show_domain_items(
     # Store current domain for later use
     await ctx.set_current_perm_domain(domain_index, domain_fqdn)
 
+    await respond.loading()
     try:
         async with container.beget_manager.client() as client:
             domains_service = DomainsService(client)
             subdomains = await domains_service.get_subdomains(domain_id)
     except Exception as e:
-        await callback.answer(f"Error: {e}", show_alert=True)
+        await respond.answer(f"Error: {e}", show_alert=True)
         return
 
     # Store subdomains in state
     await ctx.set_perm_subdomains([(s.id, s.fqdn) for s in subdomains])
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         f"Domain: {domain_fqdn}\n\n"
         "Select an item to manage access:",
         reply_markup=domain_items_keyboard(domain_index, subdomains),
     )
-    await callback.answer()
+    await respond.answer()
 
 
 # ============ ITEM USERS ============
@@ -171,7 +181,8 @@ async def show_item_users(
         text += "No users have access yet.\n"
 
     domain_idx, _ = await ctx.get_current_perm_domain()
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         text,
         reply_markup=item_users_keyboard(domain_idx, is_domain, users, chat_notes),
     )
@@ -204,7 +215,8 @@ async def start_grant_access(
     else:
         await state.set_state(PermissionStates.waiting_subdomain_chat_id)
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         f"Grant access to {'domain' if is_domain else 'subdomain'}: {item_fqdn}\n\n"
         "Enter the Chat ID of the user to grant access to:\n\n"
         "(User must be in the Allowed Chats list)",
@@ -253,7 +265,8 @@ async def cancel_grant_access(
         text += "No users have access yet.\n"
 
     domain_idx, _ = await ctx.get_current_perm_domain()
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         text,
         reply_markup=item_users_keyboard(domain_idx, is_domain, users, chat_notes),
     )
@@ -313,7 +326,8 @@ async def receive_domain_dns_permissions(
     data = await state.get_data()
     item_fqdn = data["grant_item_fqdn"]
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         f"Step 2/2: Select subdomain management permissions for {item_fqdn}:",
         reply_markup=subdomain_permission_keyboard(),
     )
@@ -388,7 +402,8 @@ async def receive_domain_subdomain_permissions(
         text += "No users have access yet.\n"
 
     domain_idx, _ = await ctx.get_current_perm_domain()
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         text,
         reply_markup=item_users_keyboard(domain_idx, True, users, chat_notes),
     )
@@ -450,7 +465,8 @@ async def receive_subdomain_dns_permissions(
     data = await state.get_data()
     item_fqdn = data["grant_item_fqdn"]
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         f"Step 2/2: Can user delete the subdomain {item_fqdn}?",
         reply_markup=subdomain_item_delete_permission_keyboard(),
     )
@@ -521,7 +537,8 @@ async def receive_subdomain_delete_permission(
         text += "No users have access yet.\n"
 
     domain_idx, _ = await ctx.get_current_perm_domain()
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         text,
         reply_markup=item_users_keyboard(domain_idx, False, users, chat_notes),
     )
@@ -549,7 +566,8 @@ async def show_user_permission_actions(
     
     chat_id, item_fqdn = user_data
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         f"User Chat ID: {chat_id}\n"
         f"{'Domain' if is_domain else 'Subdomain'}: {item_fqdn}\n\n"
         "Select action:",
@@ -577,7 +595,8 @@ async def confirm_revoke_access(
     
     chat_id, item_fqdn = user_data
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         f"Revoke access for Chat {chat_id} to {item_fqdn}?",
         reply_markup=confirm_revoke_keyboard(user_index, is_domain),
     )
@@ -638,7 +657,8 @@ async def do_revoke_access(
         text += "No users have access yet.\n"
 
     domain_idx, _ = await ctx.get_current_perm_domain()
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         text,
         reply_markup=item_users_keyboard(domain_idx, is_domain, users, chat_notes),
     )
@@ -659,7 +679,8 @@ async def show_users_list(
         await callback.answer("No users in the system.", show_alert=True)
         return
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         "Select a user to view their permissions:",
         reply_markup=users_list_keyboard(chats),
     )
@@ -719,7 +740,8 @@ async def show_user_permissions_detail(
     if not domain_perms and not subdomain_perms and not created_subs:
         text += "No permissions assigned."
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         text,
         reply_markup=user_permissions_detail_keyboard(),
     )
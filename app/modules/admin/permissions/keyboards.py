@@ -10,6 +10,7 @@ from aiogram.utils.keyboard import InlineKeyboardBuilder
 from app.services.database.chats import AllowedChat
 from app.services.database.permissions import DomainPermission, SubdomainPermission
 from app.services.beget.types import Domain, Subdomain
+from app.bot.keyboards.cache import memoized_markup
 from app.bot.callback_data import (
     CB_PERM_DOMAINS, CB_PERM_DOMAIN, CB_PERM_ITEM,
     CB_PERM_GRANT, CB_PERM_CANCEL_GRANT, CB_PERM_USER,
@@ -34,8 +35,12 @@ def permissions_menu_keyboard() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@memoized_markup(lambda domains: tuple(d.id for d in domains))
 def domains_for_permissions_keyboard(domains: list[Domain]) -> InlineKeyboardMarkup:
-    """List of domains for permission management (uses index, fqdn stored in state)."""
+    """List of domains for permission management (uses index, fqdn stored in state).
+
+    Memoized per catalog version when called with catalog_version=...
+    """
     builder = InlineKeyboardBuilder()
     
     for i, domain in enumerate(domains):
@@ -5,10 +5,11 @@ from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InlineKeyboardBut
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from app.bot.callback_data import (
-    CB_ADMIN_CHATS, CB_ADMIN_LOGS, CB_MENU_MAIN, CB_MENU_ADMIN,
+    CB_ADMIN_CHATS, CB_ADMIN_LOGS, CB_ADMIN_SNAPSHOT, CB_MENU_MAIN, CB_MENU_ADMIN,
 )
+from app.bot.responses import edit_message
 from app.modules.admin.filters import IsAdminFilter
-from app.modules.admin import chats, permissions, logs
+from app.modules.admin import chats, permissions, logs, snapshot, bulk, journal, zones
 
 # Create main admin router
 router = Router(name="admin")
@@ -17,6 +18,10 @@ router = Router(name="admin")
 router.include_router(chats.router)
 router.include_router(permissions.router)
 router.include_router(logs.router)
+router.include_router(snapshot.router)
+router.include_router(bulk.router)
+router.include_router(journal.router)
+router.include_router(zones.router)
 
 
 def admin_menu_keyboard() -> InlineKeyboardMarkup:
@@ -31,6 +36,9 @@ def admin_menu_keyboard() -> InlineKeyboardMarkup:
     builder.row(
         InlineKeyboardButton(text="Action Logs", callback_data=CB_ADMIN_LOGS)
     )
+    builder.row(
+        InlineKeyboardButton(text="DNS Snapshot", callback_data=CB_ADMIN_SNAPSHOT)
+    )
     builder.row(
         InlineKeyboardButton(text="Back", callback_data=CB_MENU_MAIN)
     )
@@ -40,19 +48,30 @@ def admin_menu_keyboard() -> InlineKeyboardMarkup:
 @router.callback_query(F.data == CB_MENU_ADMIN)
 async def admin_menu(callback: CallbackQuery) -> None:
     """Show admin panel menu."""
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         "Admin Panel\n\nSelect an option:",
         reply_markup=admin_menu_keyboard(),
     )
     await callback.answer()
 
 
+_admin_filter: IsAdminFilter | None = None
+
+
 def setup_admin_deps(chats_repo, logs_repo, permissions_repo, admin_chat_id: int) -> None:
     """Setup admin filter with actual admin_chat_id.
     
     This must be called during bot initialization to configure
     the admin filter with the correct admin_chat_id value.
+    Calling it again (tests, benchmarks) only updates the chat ID.
     """
+    global _admin_filter
+    if _admin_filter is not None:
+        _admin_filter.admin_chat_id = admin_chat_id
+        return
+
     admin_filter = IsAdminFilter(admin_chat_id=admin_chat_id)
+    _admin_filter = admin_filter
     router.message.filter(admin_filter)
     router.callback_query.filter(admin_filter)
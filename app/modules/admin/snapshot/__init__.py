@@ -0,0 +1,5 @@
+"""Admin DNS snapshot submodule."""
+
+from app.modules.admin.snapshot.handlers import router, send_drift_digest
+
+__all__ = ["router", "send_drift_digest"]
@@ -0,0 +1,168 @@
+"""DNS snapshot handlers."""
+
+import logging
+import time
+from datetime import timedelta
+
+from aiogram import Bot, Router, F
+from aiogram.types import CallbackQuery, Message
+
+from app.core.container import DependencyContainer
+from app.bot.callback_data import CB_ADMIN_SNAPSHOT, CB_SNAPSHOT_STALE, CB_SNAPSHOT_FULL
+from app.bot.responses import CallbackResponder, edit_message
+from app.modules.admin.snapshot.keyboards import snapshot_keyboard
+from app.services.database import SnapshotStats
+from app.services.snapshot import CrawlResult, DriftChange
+from app.utils.helpers import format_datetime, format_record
+
+logger = logging.getLogger(__name__)
+
+router = Router(name="admin_snapshot")
+
+LOOKUP_USAGE = (
+    "Usage: /lookup <value>\n\n"
+    "Finds FQDNs with a record pointing at an IP or target, "
+    "or with a TXT token, e.g. /lookup 192.0.2.10"
+)
+# Telegram message limit with room for the footer
+MESSAGE_MAX_CHARS = 3800
+
+
+def format_stats(stats: SnapshotStats) -> str:
+    """Snapshot status text."""
+    text = (
+        "DNS Snapshot\n\n"
+        f"FQDNs: {stats.fqdns}\n"
+        f"Records: {stats.records}\n"
+        f"Failed last fetch: {stats.errors}\n"
+    )
+    if stats.newest:
+        text += (
+            f"Oldest: {format_datetime(stats.oldest)} UTC\n"
+            f"Newest: {format_datetime(stats.newest)} UTC\n"
+        )
+    else:
+        text += "\nNo snapshot yet. Run a full crawl.\n"
+    return text
+
+
+def format_result(result: CrawlResult) -> str:
+    """Crawl summary text."""
+    return (
+        f"Crawl finished in {result.duration:.1f}s\n"
+        f"Fetched: {result.fetched} of {result.total} FQDNs\n"
+        f"Changed: {result.changed}\n"
+        f"Failed: {result.failed}\n"
+        f"Removed: {result.removed}\n\n"
+    )
+
+
+@router.callback_query(F.data == CB_ADMIN_SNAPSHOT)
+async def show_snapshot(
+    callback: CallbackQuery,
+    container: DependencyContainer,
+) -> None:
+    """Show snapshot status."""
+    stats = await container.snapshots_repo.get_stats()
+    text = format_stats(stats)
+    if container.dns_crawler.running:
+        text += "\nCrawl in progress..."
+    await edit_message(callback.message, text, reply_markup=snapshot_keyboard())
+    await callback.answer()
+
+
+@router.callback_query(F.data.in_({CB_SNAPSHOT_STALE, CB_SNAPSHOT_FULL}))
+async def start_crawl(
+    callback: CallbackQuery,
+    container: DependencyContainer,
+) -> None:
+    """Start a background crawl and report when it finishes."""
+    respond = CallbackResponder(callback)
+    stale_after = None
+    if callback.data == CB_SNAPSHOT_STALE:
+        stale_after = timedelta(minutes=container.settings.snapshot_stale_minutes)
+
+    message = callback.message
+    repo = container.snapshots_repo
+
+    async def report(result: CrawlResult | None, error: Exception | None) -> None:
+        stats = await repo.get_stats()
+        summary = format_result(result) if result else f"Crawl failed: {error}\n\n"
+        await edit_message(message, summary + format_stats(stats), reply_markup=snapshot_keyboard())
+
+    if not container.dns_crawler.start(stale_after, on_done=report):
+        await respond.answer("A crawl is already running.", show_alert=True)
+        return
+
+    kind = "stale FQDNs" if stale_after else "all FQDNs"
+    await edit_message(message, f"Crawling {kind}...\n\nThis message updates when done.")
+    await respond.answer("Crawl started")
+
+
+def format_lookup(value: str, found: dict[str, list[str]]) -> str:
+    """Lookup result text, truncated to fit one message."""
+    if not found:
+        return f"No records with value {value} in the DNS snapshot."
+
+    total = sum(len(fqdns) for fqdns in found.values())
+    lines = [f"{value}: {total} record(s)\n"]
+    length = len(lines[0])
+    shown = 0
+    for record_type, fqdns in found.items():
+        lines.append(f"{record_type}:")
+        for fqdn in fqdns:
+            line = f"  {fqdn}"
+            length += len(line) + 1
+            if length > MESSAGE_MAX_CHARS:
+                lines.append(f"\n...and {total - shown} more")
+                return "\n".join(lines)
+            lines.append(line)
+            shown += 1
+    return "\n".join(lines)
+
+
+@router.message(F.text.startswith("/lookup"))
+async def cmd_lookup(message: Message, container: DependencyContainer) -> None:
+    """Find FQDNs by record value: /lookup <ip | target | TXT token>."""
+    parts = message.text.split(maxsplit=1)
+    if len(parts) < 2 or not parts[1].strip():
+        await message.answer(LOOKUP_USAGE)
+        return
+
+    value = parts[1].strip()
+    start = time.perf_counter()
+    found = container.reverse_index.lookup(value)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    text = format_lookup(value, found)
+    stats = await container.snapshots_repo.get_stats()
+    if stats.oldest:
+        text += f"\n\nSnapshot from {format_datetime(stats.oldest)} UTC, lookup {elapsed_ms:.1f} ms"
+    else:
+        text += "\n\nThe DNS snapshot is empty. Run a full crawl first."
+    await message.answer(text)
+
+
+def format_drift(changes: list[DriftChange]) -> str:
+    """Drift digest text, truncated to fit one message."""
+    lines = [f"DNS changed outside the bot on {len(changes)} FQDN(s):"]
+    length = len(lines[0])
+    for i, change in enumerate(changes):
+        block = [f"\n{change.fqdn}"]
+        block += [f"  - {format_record(r)}" for r in change.removed]
+        block += [f"  + {format_record(r)}" for r in change.added]
+        text = "\n".join(block)
+        length += len(text) + 1
+        if length > MESSAGE_MAX_CHARS:
+            lines.append(f"\n...and {len(changes) - i} more FQDN(s)")
+            break
+        lines.append(text)
+    return "\n".join(lines)
+
+
+async def send_drift_digest(bot: Bot, admin_chat_id: int, changes: list[DriftChange]) -> None:
+    """Report one drift check to the admin chat."""
+    try:
+        await bot.send_message(admin_chat_id, format_drift(changes))
+    except Exception as e:
+        logger.warning(f"Failed to send DNS drift digest: {e}")
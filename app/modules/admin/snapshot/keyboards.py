@@ -0,0 +1,24 @@
+"""DNS snapshot keyboards."""
+
+from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+from aiogram.utils.keyboard import InlineKeyboardBuilder
+
+from app.bot.callback_data import (
+    CB_ADMIN_SNAPSHOT, CB_SNAPSHOT_STALE, CB_SNAPSHOT_FULL, CB_MENU_ADMIN,
+)
+
+
+def snapshot_keyboard() -> InlineKeyboardMarkup:
+    """Snapshot status actions."""
+    builder = InlineKeyboardBuilder()
+    builder.row(
+        InlineKeyboardButton(text="Refresh Stale", callback_data=CB_SNAPSHOT_STALE),
+        InlineKeyboardButton(text="Full Crawl", callback_data=CB_SNAPSHOT_FULL),
+    )
+    builder.row(
+        InlineKeyboardButton(text="Update Status", callback_data=CB_ADMIN_SNAPSHOT)
+    )
+    builder.row(
+        InlineKeyboardButton(text="Back", callback_data=CB_MENU_ADMIN)
+    )
+    return builder.as_markup()
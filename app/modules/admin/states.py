@@ -11,6 +11,13 @@ class AdminStates(StatesGroup):
     confirm_remove_chat = State()
 
 
+class ZoneStates(StatesGroup):
+    """FSM states for zone file import."""
+
+    waiting_file = State()
+    confirm_import = State()
+
+
 class PermissionStates(StatesGroup):
     """FSM states for permission management."""
 
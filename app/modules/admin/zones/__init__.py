@@ -0,0 +1,5 @@
+"""Admin zone file export/import submodule."""
+
+from app.modules.admin.zones.handlers import router
+
+__all__ = ["router"]
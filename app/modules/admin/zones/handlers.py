@@ -0,0 +1,209 @@
+"""Zone file export and import handlers."""
+
+import logging
+from dataclasses import asdict
+from datetime import datetime, timezone
+
+from aiogram import Bot, Router, F
+from aiogram.fsm.context import FSMContext
+from aiogram.types import CallbackQuery, Message
+
+from app.core.container import DependencyContainer
+from app.bot.callback_data import CB_ZONE_IMPORT_CONFIRM
+from app.bot.responses import CallbackResponder, StreamingDocument, edit_message
+from app.modules.admin.states import ZoneStates
+from app.modules.admin.zones.keyboards import cancel_import_keyboard, confirm_import_keyboard
+from app.services.zonefile import (
+    BIND,
+    CSV,
+    ExportStats,
+    ImportPlan,
+    ZoneChange,
+    ZoneParseError,
+    encode_chunks,
+    live_records,
+    parse,
+    render,
+    snapshot_records,
+)
+from app.utils.helpers import format_record
+from app.utils.rate_limit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+router = Router(name="admin_zones")
+
+EXPORT_USAGE = (
+    "Usage: /export [bind|csv] [live] [fqdn ...]\n\n"
+    "Exports DNS records from the snapshot, or from the Beget API with 'live'. "
+    "Without FQDNs every FQDN is exported, e.g. /export csv live example.com"
+)
+IMPORT_PROMPT = (
+    "Send a BIND or CSV zone file (as a document).\n\n"
+    "CSV columns: fqdn,type,value,priority\n"
+    "A, MX and TXT records are imported: for every FQDN in the file they "
+    "replace the current A, MX and TXT records. Other types are skipped."
+)
+MAX_IMPORT_BYTES = 20 * 1024 * 1024  # Bot API download limit
+PREVIEW_FQDNS = 10
+PREVIEW_RECORDS = 3
+REPORT_FAILURES = 10
+
+
+# ============ EXPORT ============
+
+
+@router.message(F.text.startswith("/export"))
+async def cmd_export(message: Message, container: DependencyContainer) -> None:
+    """Export DNS records: /export [bind|csv] [live] [fqdn ...]."""
+    fmt, live, fqdns = BIND, False, []
+    for arg in message.text.split()[1:]:
+        lowered = arg.lower()
+        if lowered in (BIND, CSV):
+            fmt = lowered
+        elif lowered == "live":
+            live = True
+        elif "." in arg:
+            fqdns.append(lowered.rstrip("."))
+        else:
+            await message.answer(EXPORT_USAGE)
+            return
+
+    stats = ExportStats()
+    if live:
+        if not fqdns:
+            fqdns = sorted(await container.dns_crawler.list_fqdns())
+        settings = container.settings
+        limiter = RateLimiter(settings.bulk_rate_per_sec, burst=max(settings.bulk_concurrency, 1))
+        records = live_records(
+            container.beget_manager, fqdns, limiter, settings.bulk_concurrency, stats
+        )
+    else:
+        if not fqdns and (await container.snapshots_repo.get_stats()).fqdns == 0:
+            await message.answer(
+                "The DNS snapshot is empty. Run a crawl from Admin Panel -> DNS Snapshot, "
+                "or export from the API with /export live"
+            )
+            return
+        records = snapshot_records(container.snapshots_repo, fqdns or None, stats)
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    extension = "csv" if fmt == CSV else "zone"
+    document = StreamingDocument(encode_chunks(render(records, fmt)), f"dns-{stamp}.{extension}")
+    try:
+        await message.answer_document(document)
+    except Exception as e:
+        logger.error(f"Zone export failed: {e}")
+        await message.answer(f"Export failed: {e}")
+        return
+
+    text = f"Exported {stats.records} records of {stats.fqdns} FQDNs ({'live' if live else 'snapshot'})."
+    if stats.failed:
+        text += f"\n\nCould not read {len(stats.failed)} FQDNs:\n" + "\n".join(
+            stats.failed[:REPORT_FAILURES]
+        )
+    await message.answer(text)
+
+
+# ============ IMPORT ============
+
+
+def format_plan(plan: ImportPlan) -> str:
+    """Preview of an import plan."""
+    lines = [
+        "Zone import preview\n",
+        f"FQDNs to change: {len(plan.changes)}",
+        f"Already up to date: {plan.unchanged}",
+    ]
+    if plan.skipped_records:
+        lines.append(f"Skipped records (not A/MX/TXT): {plan.skipped_records}")
+    if plan.failed:
+        lines.append(f"Could not read (left out): {len(plan.failed)}")
+        lines += [f"  {fqdn}: {error}" for fqdn, error in list(plan.failed.items())[:REPORT_FAILURES]]
+
+    for change in plan.changes[:PREVIEW_FQDNS]:
+        lines.append(f"\n{change.fqdn}")
+        lines += [f"  - {format_record(r)}" for r in change.removed[:PREVIEW_RECORDS]]
+        lines += [f"  + {format_record(r)}" for r in change.added[:PREVIEW_RECORDS]]
+        hidden = len(change.removed) + len(change.added) - 2 * PREVIEW_RECORDS
+        if hidden > 0:
+            lines.append(f"  ... and {hidden} more")
+    if len(plan.changes) > PREVIEW_FQDNS:
+        lines.append(f"\n... and {len(plan.changes) - PREVIEW_FQDNS} more FQDNs")
+    return "\n".join(lines)
+
+
+@router.message(F.text == "/import")
+async def cmd_import(message: Message, state: FSMContext) -> None:
+    """Ask for a zone file."""
+    await state.set_state(ZoneStates.waiting_file)
+    await message.answer(IMPORT_PROMPT, reply_markup=cancel_import_keyboard())
+
+
+@router.message(ZoneStates.waiting_file, F.document)
+async def receive_zone_file(
+    message: Message,
+    state: FSMContext,
+    bot: Bot,
+    container: DependencyContainer,
+) -> None:
+    """Parse the uploaded file while downloading it and preview the changes."""
+    document = message.document
+    if document.file_size and document.file_size > MAX_IMPORT_BYTES:
+        await message.answer("The file is too large (20 MB max).")
+        return
+
+    status = await message.answer("Reading the file and comparing with the current records...")
+    file = await bot.get_file(document.file_id)
+    chunks = bot.session.stream_content(
+        url=bot.session.api.file_url(bot.token, file.file_path),
+        timeout=120,
+    )
+    try:
+        plan = await container.zone_importer.plan(parse(chunks, document.file_name))
+    except ZoneParseError as e:
+        await edit_message(status, f"The file was not imported: {e}\n\nFix it and send it again.")
+        return
+
+    if not plan.changes:
+        await state.clear()
+        await edit_message(status, format_plan(plan) + "\n\nNothing to change.")
+        return
+
+    await state.update_data(zone_changes=[asdict(change) for change in plan.changes])
+    await state.set_state(ZoneStates.confirm_import)
+    await edit_message(status, format_plan(plan), reply_markup=confirm_import_keyboard())
+
+
+@router.message(ZoneStates.waiting_file)
+async def receive_not_a_file(message: Message) -> None:
+    await message.answer(
+        "Send the zone file as a document, or press Cancel.",
+        reply_markup=cancel_import_keyboard(),
+    )
+
+
+@router.callback_query(ZoneStates.confirm_import, F.data == CB_ZONE_IMPORT_CONFIRM)
+async def confirm_import(
+    callback: CallbackQuery,
+    state: FSMContext,
+    container: DependencyContainer,
+) -> None:
+    """Apply the previewed changes."""
+    respond = CallbackResponder(callback)
+    data = await state.get_data()
+    await state.clear()
+    changes = [ZoneChange(**change) for change in data.get("zone_changes", [])]
+    if not changes:
+        await respond.answer("Nothing to import.", show_alert=True)
+        return
+
+    await respond.loading("Importing...")
+    failed = await container.zone_importer.apply(changes)
+
+    text = f"Zone import finished: {len(changes) - len(failed)} of {len(changes)} FQDNs updated."
+    if failed:
+        text += "\n\nFailed:\n" + "\n".join(
+            f"{fqdn}: {error}" for fqdn, error in list(failed.items())[:REPORT_FAILURES]
+        )
+    await edit_message(callback.message, text)
@@ -0,0 +1,23 @@
+"""Zone import keyboards."""
+
+from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+from aiogram.utils.keyboard import InlineKeyboardBuilder
+
+from app.bot.callback_data import CB_ZONE_IMPORT_CONFIRM, CB_CANCEL
+
+
+def cancel_import_keyboard() -> InlineKeyboardMarkup:
+    """Cancel while waiting for the file."""
+    builder = InlineKeyboardBuilder()
+    builder.row(InlineKeyboardButton(text="Cancel", callback_data=CB_CANCEL))
+    return builder.as_markup()
+
+
+def confirm_import_keyboard() -> InlineKeyboardMarkup:
+    """Apply or cancel a previewed import."""
+    builder = InlineKeyboardBuilder()
+    builder.row(
+        InlineKeyboardButton(text="Apply", callback_data=CB_ZONE_IMPORT_CONFIRM),
+        InlineKeyboardButton(text="Cancel", callback_data=CB_CANCEL),
+    )
+    return builder.as_markup()
@@ -7,7 +7,9 @@ from aiogram.fsm.context import FSMContext
 from app.core.container import DependencyContainer
 from app.core.state_helpers import StateContext
 from app.services.beget import DnsService
+from app.bot.responses import CallbackResponder, edit_message
 from app.modules.domains.states import DnsStates
+from app.utils.helpers import is_valid_ipv4
 from app.modules.domains.dns.keyboards import (
     dns_menu_keyboard,
     a_records_keyboard,
@@ -45,8 +47,11 @@ async def show_subdomain_dns_menu(
     
     # Store DNS context
     await ctx.set_dns(subdomain_fqdn, back_callback=f"s:{subdomain_id}")
+    if container.drift_detector:
+        container.drift_detector.touch(subdomain_fqdn)
     
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         f"DNS Management for {subdomain_fqdn}\n\nSelect an option:",
         reply_markup=dns_menu_keyboard(subdomain_id, back_callback=f"s:{subdomain_id}"),
     )
@@ -85,8 +90,11 @@ async def show_dns_menu(
     
     # Store DNS context
     await ctx.set_dns(fqdn, back_callback=f"d:{domain_id}")
+    if container.drift_detector:
+        container.drift_detector.touch(fqdn)
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         f"DNS Management for {fqdn}\n\nSelect an option:",
         reply_markup=dns_menu_keyboard(domain_id),
     )
@@ -103,20 +111,22 @@ async def view_dns_records(
     container: DependencyContainer,
 ) -> None:
     """View all DNS records (dnv:domain_id)."""
+    respond = CallbackResponder(callback)
     domain_id = int(callback.data.split(":")[1])
     ctx = StateContext(state)
     fqdn, _ = await ctx.get_dns()
     
     if not fqdn:
-        await callback.answer("Domain data not found", show_alert=True)
+        await respond.answer("Domain data not found", show_alert=True)
         return
 
+    await respond.loading()
     try:
         async with container.beget_manager.client() as client:
             dns_service = DnsService(client)
             dns_data = await dns_service.get_dns_data(fqdn)
     except Exception as e:
-        await callback.answer(f"Error: {e}", show_alert=True)
+        await respond.answer(f"Error: {e}", show_alert=True)
         return
 
     text = f"DNS Records for {fqdn}:\n\n"
@@ -157,7 +167,8 @@ async def view_dns_records(
         for r in dns_data.ns:
             text += f"  {r.value}\n"
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         text,
         reply_markup=InlineKeyboardMarkup(
             inline_keyboard=[
@@ -165,7 +176,7 @@ async def view_dns_records(
             ]
         ),
     )
-    await callback.answer()
+    await respond.answer()
 
 
 # ============ A RECORDS ============
@@ -178,20 +189,22 @@ async def show_a_records(
     container: DependencyContainer,
 ) -> None:
     """Show A records management (dna:domain_id)."""
+    respond = CallbackResponder(callback)
     domain_id = int(callback.data.split(":")[1])
     ctx = StateContext(state)
     fqdn, _ = await ctx.get_dns()
     
     if not fqdn:
-        await callback.answer("Domain data not found", show_alert=True)
+        await respond.answer("Domain data not found", show_alert=True)
         return
 
+    await respond.loading()
     try:
         async with container.beget_manager.client() as client:
             dns_service = DnsService(client)
             dns_data = await dns_service.get_dns_data(fqdn)
     except Exception as e:
-        await callback.answer(f"Error: {e}", show_alert=True)
+        await respond.answer(f"Error: {e}", show_alert=True)
         return
 
     # Store A records in state for index-based access
@@ -207,11 +220,12 @@ async def show_a_records(
     else:
         text += "No A records."
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         text,
         reply_markup=a_records_keyboard(domain_id, dns_data.a),
     )
-    await callback.answer()
+    await respond.answer()
 
 
 @router.callback_query(F.data.startswith("ea:"))
@@ -231,7 +245,8 @@ async def edit_a_record(
         await callback.answer("Record not found", show_alert=True)
         return
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         f"A Record: {ip}\n\nSelect action:",
         reply_markup=edit_a_record_keyboard(domain_id, index),
     )
@@ -262,7 +277,8 @@ async def start_add_a_record(
     await state.update_data(dns_domain_id=domain_id)
     await state.set_state(DnsStates.waiting_a_record_ip)
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         f"Enter IP address for new A record on {fqdn}:",
         reply_markup=cancel_keyboard(f"dna:{domain_id}"),
     )
@@ -283,9 +299,7 @@ async def receive_new_a_ip(
     ctx = StateContext(state)
     fqdn, _ = await ctx.get_dns()
 
-    # Basic IP validation
-    parts = ip.split(".")
-    if len(parts) != 4 or not all(p.isdigit() and 0 <= int(p) <= 255 for p in parts):
+    if not is_valid_ipv4(ip):
         await message.answer("Invalid IP address. Please enter a valid IPv4:")
         return
 
@@ -334,7 +348,8 @@ async def start_change_a_record(
     )
     await state.set_state(DnsStates.waiting_new_a_ip)
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         f"Current IP: {old_ip}\n\nEnter new IP address:",
         reply_markup=cancel_keyboard(f"ea:{domain_id}:{index}"),
     )
@@ -354,9 +369,7 @@ async def receive_changed_a_ip(
     data = await state.get_data()
     old_ip = data.get("dns_old_ip", "")
 
-    # Basic IP validation
-    parts = new_ip.split(".")
-    if len(parts) != 4 or not all(p.isdigit() and 0 <= int(p) <= 255 for p in parts):
+    if not is_valid_ipv4(new_ip):
         await message.answer("Invalid IP address. Please enter a valid IPv4:")
         return
 
@@ -396,7 +409,8 @@ async def confirm_delete_a(
         await callback.answer("No permission to delete DNS records", show_alert=True)
         return
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         f"Delete A record: {ip}?",
         reply_markup=confirm_keyboard(
             f"dda:{domain_id}:{index}",
@@ -413,6 +427,7 @@ async def do_delete_a(
     container: DependencyContainer,
 ) -> None:
     """Delete A record (dda:domain_id:index)."""
+    respond = CallbackResponder(callback)
     parts = callback.data.split(":")
     domain_id = int(parts[1])
     index = int(parts[2])
@@ -422,9 +437,10 @@ async def do_delete_a(
     ip = await ctx.get_a_record(index)
     
     if not fqdn or ip is None:
-        await callback.answer("Record not found", show_alert=True)
+        await respond.answer("Record not found", show_alert=True)
         return
 
+    await respond.loading()
     try:
         async with container.beget_manager.client() as client:
             dns_service = DnsService(client)
@@ -432,7 +448,7 @@ async def do_delete_a(
             # Fetch updated records
             dns_data = await dns_service.get_dns_data(fqdn)
         
-        await callback.answer("A record deleted!", show_alert=True)
+        await respond.answer("A record deleted!", show_alert=True)
         
         # Update state with new records
         await ctx.set_dns_records(
@@ -448,12 +464,13 @@ async def do_delete_a(
         else:
             text += "No A records."
 
-        await callback.message.edit_text(
+        await edit_message(
+            callback.message,
             text,
             reply_markup=a_records_keyboard(domain_id, dns_data.a),
         )
     except Exception as e:
-        await callback.answer(f"Error: {e}", show_alert=True)
+        await respond.answer(f"Error: {e}", show_alert=True)
 
 
 # ============ TXT RECORDS ============
@@ -466,20 +483,22 @@ async def show_txt_records(
     container: DependencyContainer,
 ) -> None:
     """Show TXT records management (dnt:domain_id)."""
+    respond = CallbackResponder(callback)
     domain_id = int(callback.data.split(":")[1])
     ctx = StateContext(state)
     fqdn, _ = await ctx.get_dns()
     
     if not fqdn:
-        await callback.answer("Domain data not found", show_alert=True)
+        await respond.answer("Domain data not found", show_alert=True)
         return
 
+    await respond.loading()
     try:
         async with container.beget_manager.client() as client:
             dns_service = DnsService(client)
             dns_data = await dns_service.get_dns_data(fqdn)
     except Exception as e:
-        await callback.answer(f"Error: {e}", show_alert=True)
+        await respond.answer(f"Error: {e}", show_alert=True)
         return
 
     # Store TXT records in state for index-based access
@@ -496,11 +515,12 @@ async def show_txt_records(
     else:
         text += "No TXT records."
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         text,
         reply_markup=txt_records_keyboard(domain_id, dns_data.txt),
     )
-    await callback.answer()
+    await respond.answer()
 
 
 @router.callback_query(F.data.startswith("tr:"))
@@ -527,7 +547,8 @@ async def show_txt_record_detail(
     can_delete = await container.permission_checker.can_delete_dns(user_chat_id, fqdn)
 
     if can_delete:
-        await callback.message.edit_text(
+        await edit_message(
+            callback.message,
             f"TXT Record:\n\n{value}",
             reply_markup=confirm_keyboard(
                 f"dt:{domain_id}:{index}",
@@ -536,7 +557,8 @@ async def show_txt_record_detail(
         )
     else:
         # View-only mode
-        await callback.message.edit_text(
+        await edit_message(
+            callback.message,
             f"TXT Record:\n\n{value}",
             reply_markup=InlineKeyboardMarkup(
                 inline_keyboard=[
@@ -571,7 +593,8 @@ async def start_add_txt_record(
     await state.update_data(dns_domain_id=domain_id)
     await state.set_state(DnsStates.waiting_txt_value)
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         f"Enter TXT record value for {fqdn}:\n\n"
         "Example: v=spf1 include:_spf.google.com ~all",
         reply_markup=cancel_keyboard(f"dnt:{domain_id}"),
@@ -612,6 +635,7 @@ async def do_delete_txt(
     container: DependencyContainer,
 ) -> None:
     """Delete TXT record (dt:domain_id:index)."""
+    respond = CallbackResponder(callback)
     parts = callback.data.split(":")
     domain_id = int(parts[1])
     index = int(parts[2])
@@ -621,9 +645,10 @@ async def do_delete_txt(
     value = await ctx.get_txt_record(index)
 
     if value is None:
-        await callback.answer("Record not found", show_alert=True)
+        await respond.answer("Record not found", show_alert=True)
         return
 
+    await respond.loading()
     try:
         async with container.beget_manager.client() as client:
             dns_service = DnsService(client)
@@ -631,7 +656,7 @@ async def do_delete_txt(
             # Fetch updated records
             dns_data = await dns_service.get_dns_data(fqdn)
         
-        await callback.answer("TXT record deleted!", show_alert=True)
+        await respond.answer("TXT record deleted!", show_alert=True)
         
         # Update state with new records
         await ctx.set_dns_records(
@@ -648,9 +673,10 @@ async def do_delete_txt(
         else:
             text += "No TXT records."
 
-        await callback.message.edit_text(
+        await edit_message(
+            callback.message,
             text,
             reply_markup=txt_records_keyboard(domain_id, dns_data.txt),
         )
     except Exception as e:
-        await callback.answer(f"Error: {e}", show_alert=True)
+        await respond.answer(f"Error: {e}", show_alert=True)
@@ -4,11 +4,13 @@ from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from app.services.beget.types import DnsRecord
+from app.bot.keyboards.cache import memoized_markup
 from app.bot.callback_data import CB_DOMAIN
 
 
+@memoized_markup(lambda domain_id, back_callback="": (domain_id, back_callback), versioned=False)
 def dns_menu_keyboard(domain_id: int, back_callback: str = "") -> InlineKeyboardMarkup:
-    """DNS management menu with short callbacks."""
+    """DNS management menu with short callbacks (memoized, depends on arguments only)."""
     if not back_callback:
         back_callback = f"{CB_DOMAIN}:{domain_id}"
     
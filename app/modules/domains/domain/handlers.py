@@ -7,7 +7,9 @@ from aiogram.fsm.context import FSMContext
 from app.core.container import DependencyContainer
 from app.core.state_helpers import StateContext
 from app.services.beget import DomainsService
+from app.services.metrics import record_cache
 from app.bot.callback_data import CB_DOMAIN, CB_MENU_DOMAINS
+from app.bot.responses import CallbackResponder, edit_message
 from app.modules.domains.domain.keyboards import (
     domains_list_keyboard,
     domain_menu_keyboard,
@@ -24,26 +26,31 @@ async def show_domains(
     user_chat_id: int,
 ) -> None:
     """Show list of domains."""
+    respond = CallbackResponder(callback)
     await state.clear()
+    if container.prefetcher:
+        container.prefetcher.cancel(user_chat_id)
 
+    await respond.loading()
     try:
         async with container.beget_manager.client() as client:
             domains_service = DomainsService(client)
             all_domains = await domains_service.get_domains()
     except Exception as e:
-        await callback.message.edit_text(f"Error loading domains: {e}")
-        await callback.answer()
+        await edit_message(callback.message, f"Error loading domains: {e}")
+        await respond.answer()
         return
 
     # Filter domains by user permissions
     domains = await container.permission_checker.filter_domains(user_chat_id, all_domains)
 
     if not domains:
-        await callback.message.edit_text(
+        await edit_message(
+            callback.message,
             "No domains available.\n\n"
             "Contact administrator to get access to domains."
         )
-        await callback.answer()
+        await respond.answer()
         return
 
     # Store domain list in state for ID->FQDN lookup
@@ -51,11 +58,14 @@ async def show_domains(
     domain_map = {d.id: d.fqdn for d in domains}
     await state.update_data(domain_map=domain_map)
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         "Select a domain:",
-        reply_markup=domains_list_keyboard(domains),
+        reply_markup=domains_list_keyboard(
+            domains, catalog_version=container.beget_manager.catalog.version
+        ),
     )
-    await callback.answer()
+    await respond.answer()
 
 
 @router.callback_query(F.data.startswith(f"{CB_DOMAIN}:"))
@@ -66,6 +76,7 @@ async def show_domain_menu(
     user_chat_id: int,
 ) -> None:
     """Show domain management menu."""
+    respond = CallbackResponder(callback)
     # Parse short callback: d:123
     domain_id = int(callback.data.split(":")[1])
     
@@ -73,9 +84,11 @@ async def show_domain_menu(
     data = await state.get_data()
     domain_map = data.get("domain_map", {})
     fqdn = domain_map.get(domain_id, "")
+    record_cache("fsm_domain_map", hit=bool(fqdn))
     
     if not fqdn:
         # Fallback: fetch from API
+        await respond.loading()
         try:
             async with container.beget_manager.client() as client:
                 domains_service = DomainsService(client)
@@ -88,20 +101,23 @@ async def show_domain_menu(
             pass
     
     if not fqdn:
-        await callback.answer("Domain not found", show_alert=True)
+        await respond.answer("Domain not found", show_alert=True)
         return
 
     # Check permission
     if not await container.permission_checker.can_view_domain(user_chat_id, fqdn):
-        await callback.answer("You don't have access to this domain.", show_alert=True)
+        await respond.answer("You don't have access to this domain.", show_alert=True)
         return
 
     # Store domain context for child handlers
     ctx = StateContext(state)
     await ctx.set_domain(domain_id, fqdn)
+    if container.prefetcher:
+        container.prefetcher.prefetch_domain(user_chat_id, domain_id, fqdn)
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         f"Domain: {fqdn}\n\nSelect an option:",
         reply_markup=domain_menu_keyboard(domain_id),
     )
-    await callback.answer()
+    await respond.answer()
@@ -4,14 +4,17 @@ from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from app.services.beget.types import Domain
+from app.bot.keyboards.cache import memoized_markup
 from app.bot.callback_data import CB_DOMAIN, CB_MENU_MAIN, CB_MENU_DOMAINS
 
 
+@memoized_markup(lambda domains: tuple(d.id for d in domains))
 def domains_list_keyboard(domains: list[Domain]) -> InlineKeyboardMarkup:
     """List of domains to select.
     
     Uses short callback: d:{id} instead of domain:{id}:{fqdn}
     FQDN is stored in FSM state by handler.
+    Memoized per catalog version when called with catalog_version=...
     """
     builder = InlineKeyboardBuilder()
 
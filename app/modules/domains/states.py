@@ -9,6 +9,9 @@ class SubdomainStates(StatesGroup):
     waiting_subdomain_name = State()
     confirm_create_subdomain = State()
     confirm_delete_subdomain = State()
+    waiting_bulk_add_names = State()
+    waiting_bulk_delete_names = State()
+    confirm_bulk = State()
 
 
 class DnsStates(StatesGroup):
@@ -1,6 +1,5 @@
 """Subdomain management handlers with optimized callback_data."""
 
-import re
 from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
@@ -8,13 +7,19 @@ from aiogram.fsm.context import FSMContext
 from app.core.container import DependencyContainer
 from app.core.state_helpers import StateContext
 from app.services.beget import DomainsService
+from app.services.bulk import MAX_BULK_NAMES, BulkResult, parse_names
+from app.services.metrics import record_cache
+from app.bot.callback_data import CB_BULK_ADD_SUB, CB_BULK_DEL_SUB, CB_BULK_CONFIRM
+from app.bot.responses import CallbackResponder, edit_message
 from app.modules.domains.states import SubdomainStates
 from app.modules.domains.subdomain.keyboards import (
     subdomains_list_keyboard,
     subdomain_actions_keyboard,
     confirm_keyboard,
     cancel_keyboard,
+    back_keyboard,
 )
+from app.utils.helpers import is_valid_subdomain_name
 
 router = Router(name="domains_subdomain")
 
@@ -27,13 +32,17 @@ async def show_subdomains(
     user_chat_id: int,
 ) -> None:
     """Show subdomains for a domain. Callback: ss:{domain_id}"""
+    respond = CallbackResponder(callback)
     domain_id = int(callback.data.split(":")[1])
     
     # Get FQDN from state
     ctx = StateContext(state)
     stored_id, fqdn = await ctx.get_domain()
+    context_hit = stored_id == domain_id and bool(fqdn)
+    record_cache("fsm_domain_context", hit=context_hit)
     
-    if stored_id != domain_id or not fqdn:
+    await respond.loading()
+    if not context_hit:
         # Fetch from API
         try:
             async with container.beget_manager.client() as client:
@@ -45,7 +54,7 @@ async def show_subdomains(
                         await ctx.set_domain(domain_id, fqdn)
                         break
         except Exception as e:
-            await callback.answer(f"Error: {e}", show_alert=True)
+            await respond.answer(f"Error: {e}", show_alert=True)
             return
 
     try:
@@ -53,7 +62,7 @@ async def show_subdomains(
             domains_service = DomainsService(client)
             all_subdomains = await domains_service.get_subdomains(domain_id)
     except Exception as e:
-        await callback.answer(f"Error: {e}", show_alert=True)
+        await respond.answer(f"Error: {e}", show_alert=True)
         return
 
     # Filter and check permissions
@@ -73,11 +82,15 @@ async def show_subdomains(
     else:
         text += "No subdomains yet."
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         text,
-        reply_markup=subdomains_list_keyboard(subdomains, domain_id, can_create),
+        reply_markup=subdomains_list_keyboard(
+            subdomains, domain_id, can_create,
+            catalog_version=container.beget_manager.catalog.version,
+        ),
     )
-    await callback.answer()
+    await respond.answer()
 
 
 @router.callback_query(F.data.startswith("s:") & ~F.data.startswith("ss:") & ~F.data.startswith("sdn:"))
@@ -118,7 +131,8 @@ async def show_subdomain_actions(
     can_delete = await container.permission_checker.can_delete_subdomain(user_chat_id, fqdn)
     can_dns = await container.permission_checker.can_manage_dns(user_chat_id, fqdn)
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         f"Subdomain: {fqdn}\n\nSelect action:",
         reply_markup=subdomain_actions_keyboard(
             subdomain_id, parent_domain_id,
@@ -152,7 +166,8 @@ async def start_add_subdomain(
     )
     await state.set_state(SubdomainStates.waiting_subdomain_name)
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         f"Creating subdomain for {fqdn}\n\n"
         "Enter subdomain name (without the domain part):\n"
         "Example: 'api' for api.example.com",
@@ -174,7 +189,7 @@ async def receive_subdomain_name(message: Message, state: FSMContext) -> None:
         await message.answer("Subdomain name cannot contain spaces. Please enter a valid name:")
         return
     
-    if not re.match(r'^[a-z0-9]([a-z0-9-]*[a-z0-9])?$', subdomain_name):
+    if not is_valid_subdomain_name(subdomain_name):
         await message.answer(
             "Invalid subdomain name.\n\n"
             "Allowed: lowercase letters (a-z), numbers (0-9), hyphens (-)\n"
@@ -204,6 +219,7 @@ async def confirm_create_subdomain(
     container: DependencyContainer,
 ) -> None:
     """Confirm and create subdomain. Callback: cs:{name}"""
+    respond = CallbackResponder(callback)
     data = await state.get_data()
     domain_id = data["domain_id"]
     subdomain_name = data["subdomain_name"]
@@ -211,6 +227,7 @@ async def confirm_create_subdomain(
     creator_chat_id = data.get("creator_chat_id")
     full_subdomain = f"{subdomain_name}.{fqdn}"
 
+    await respond.loading()
     try:
         async with container.beget_manager.client() as client:
             domains_service = DomainsService(client)
@@ -223,7 +240,7 @@ async def confirm_create_subdomain(
             )
         
         await callback.message.delete()
-        await callback.answer(f"Subdomain {full_subdomain} created!", show_alert=True)
+        await respond.answer(f"Subdomain {full_subdomain} created!", show_alert=True)
         
         # Update subdomain map
         subdomain_map = {s.id: s.fqdn for s in subdomains}
@@ -235,10 +252,13 @@ async def confirm_create_subdomain(
         
         await callback.message.answer(
             text,
-            reply_markup=subdomains_list_keyboard(subdomains, domain_id, can_create=True),
+            reply_markup=subdomains_list_keyboard(
+                subdomains, domain_id, can_create=True,
+                catalog_version=container.beget_manager.catalog.version,
+            ),
         )
     except Exception as e:
-        await callback.answer(f"Error: {e}", show_alert=True)
+        await respond.answer(f"Error: {e}", show_alert=True)
 
     await state.set_state(None)
 
@@ -260,7 +280,8 @@ async def confirm_delete_subdomain(
         await callback.answer("You don't have permission to delete this subdomain.", show_alert=True)
         return
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         f"Delete subdomain: {fqdn}?\n\nThis action cannot be undone!",
         reply_markup=confirm_keyboard(f"dds:{subdomain_id}", f"ss:{parent_domain_id}"),
     )
@@ -275,15 +296,17 @@ async def do_delete_subdomain(
     user_chat_id: int,
 ) -> None:
     """Delete subdomain. Callback: dds:{subdomain_id}"""
+    respond = CallbackResponder(callback)
     subdomain_id = int(callback.data.split(":")[1])
     
     ctx = StateContext(state)
     _, subdomain_fqdn, parent_domain_id, parent_fqdn = await ctx.get_subdomain()
 
     if not await container.permission_checker.can_delete_subdomain(user_chat_id, subdomain_fqdn):
-        await callback.answer("You don't have permission.", show_alert=True)
+        await respond.answer("You don't have permission.", show_alert=True)
         return
 
+    await respond.loading()
     try:
         async with container.beget_manager.client() as client:
             domains_service = DomainsService(client)
@@ -293,7 +316,7 @@ async def do_delete_subdomain(
         await container.permissions_repo.delete_subdomain_record(subdomain_fqdn)
         
         await callback.message.delete()
-        await callback.answer("Subdomain deleted!", show_alert=True)
+        await respond.answer("Subdomain deleted!", show_alert=True)
         
         can_create = await container.permission_checker.can_create_subdomain(user_chat_id, parent_fqdn)
         
@@ -306,9 +329,176 @@ async def do_delete_subdomain(
         
         await callback.message.answer(
             text,
-            reply_markup=subdomains_list_keyboard(subdomains, parent_domain_id, can_create),
+            reply_markup=subdomains_list_keyboard(
+                subdomains, parent_domain_id, can_create,
+                catalog_version=container.beget_manager.catalog.version,
+            ),
         )
     except Exception as e:
-        await callback.answer(f"Error: {e}", show_alert=True)
+        await respond.answer(f"Error: {e}", show_alert=True)
 
     await ctx.clear_context()
+
+
+# ============ BULK CREATE / DELETE ============
+
+BULK_PROMPT = (
+    "Send the subdomain names, one per line or separated by spaces or commas "
+    f"(up to {MAX_BULK_NAMES}).\n"
+    "Example:\napi\nadmin\nstatic"
+)
+BULK_REPORT_ITEMS = 20
+
+
+def format_bulk_result(action: str, parent_fqdn: str, total: int, result: BulkResult) -> str:
+    """Summary of a bulk operation."""
+    text = f"{action} {len(result.succeeded)} of {total} subdomain(s) of {parent_fqdn}."
+    if result.failed:
+        failed = list(result.failed.items())
+        text += "\n\nFailed:\n" + "\n".join(
+            f"- {fqdn}: {error}" for fqdn, error in failed[:BULK_REPORT_ITEMS]
+        )
+        if len(failed) > BULK_REPORT_ITEMS:
+            text += f"\n...and {len(failed) - BULK_REPORT_ITEMS} more"
+    return text
+
+
+@router.callback_query(F.data.startswith(f"{CB_BULK_ADD_SUB}:") | F.data.startswith(f"{CB_BULK_DEL_SUB}:"))
+async def start_bulk(
+    callback: CallbackQuery,
+    state: FSMContext,
+    container: DependencyContainer,
+    user_chat_id: int,
+) -> None:
+    """Ask for a list of names. Callback: bas:{domain_id} or bds:{domain_id}"""
+    prefix, domain_id = callback.data.split(":")
+    domain_id = int(domain_id)
+    creating = prefix == CB_BULK_ADD_SUB
+
+    ctx = StateContext(state)
+    _, fqdn = await ctx.get_domain()
+    if creating and not await container.permission_checker.can_create_subdomain(user_chat_id, fqdn):
+        await callback.answer("You don't have permission to create subdomains.", show_alert=True)
+        return
+
+    await state.update_data(domain_id=domain_id, parent_fqdn=fqdn, bulk_names=None)
+    await state.set_state(
+        SubdomainStates.waiting_bulk_add_names if creating
+        else SubdomainStates.waiting_bulk_delete_names
+    )
+    action = "Creating" if creating else "Deleting"
+    await edit_message(
+        callback.message,
+        f"{action} subdomains of {fqdn}\n\n{BULK_PROMPT}",
+        reply_markup=cancel_keyboard(f"ss:{domain_id}"),
+    )
+    await callback.answer()
+
+
+@router.message(SubdomainStates.waiting_bulk_add_names)
+@router.message(SubdomainStates.waiting_bulk_delete_names)
+async def receive_bulk_names(
+    message: Message,
+    state: FSMContext,
+    container: DependencyContainer,
+    user_chat_id: int,
+) -> None:
+    """Validate every name up front and ask for confirmation."""
+    creating = await state.get_state() == SubdomainStates.waiting_bulk_add_names.state
+    data = await state.get_data()
+    domain_id, parent_fqdn = data["domain_id"], data["parent_fqdn"]
+    suffix = f".{parent_fqdn}"
+
+    # Full FQDNs are accepted too
+    names = [
+        name[: -len(suffix)] if name.endswith(suffix) else name
+        for name in parse_names(message.text or "")
+    ]
+    if not names:
+        await message.answer(f"No names found.\n\n{BULK_PROMPT}")
+        return
+    if len(names) > MAX_BULK_NAMES:
+        await message.answer(f"Too many names ({len(names)}), the limit is {MAX_BULK_NAMES}.")
+        return
+
+    try:
+        async with container.beget_manager.client() as client:
+            existing = {
+                s.fqdn: s.id
+                for s in await DomainsService(client).get_subdomains(domain_id, fresh=True)
+            }
+    except Exception as e:
+        await message.answer(f"Error loading subdomains: {e}")
+        return
+
+    problems = [f"- {name}: invalid name" for name in names if not is_valid_subdomain_name(name)]
+    valid = [name for name in names if is_valid_subdomain_name(name)]
+    if creating:
+        problems += [f"- {name}: already exists" for name in valid if f"{name}{suffix}" in existing]
+    else:
+        for name in valid:
+            fqdn = f"{name}{suffix}"
+            if fqdn not in existing:
+                problems.append(f"- {name}: not found")
+            elif not await container.permission_checker.can_delete_subdomain(user_chat_id, fqdn):
+                problems.append(f"- {name}: no permission to delete")
+
+    if problems:
+        await message.answer(
+            "Nothing was changed. Fix these names and send the whole list again:\n\n"
+            + "\n".join(problems[:BULK_REPORT_ITEMS])
+            + (f"\n...and {len(problems) - BULK_REPORT_ITEMS} more" if len(problems) > BULK_REPORT_ITEMS else ""),
+            reply_markup=cancel_keyboard(f"ss:{domain_id}"),
+        )
+        return
+
+    # Deletion needs subdomain IDs; keep them so confirming costs no extra listing
+    targets = {} if creating else {f"{name}{suffix}": existing[f"{name}{suffix}"] for name in names}
+    await state.update_data(bulk_names=names, bulk_create=creating, bulk_targets=targets)
+    await state.set_state(SubdomainStates.confirm_bulk)
+    action = "Create" if creating else "Delete"
+    listing = "\n".join(f"- {name}{suffix}" for name in names[:BULK_REPORT_ITEMS])
+    if len(names) > BULK_REPORT_ITEMS:
+        listing += f"\n...and {len(names) - BULK_REPORT_ITEMS} more"
+    warning = "" if creating else "\n\nThis action cannot be undone!"
+    await message.answer(
+        f"{action} {len(names)} subdomain(s)?\n\n{listing}{warning}",
+        reply_markup=confirm_keyboard(f"{CB_BULK_CONFIRM}:{domain_id}", f"ss:{domain_id}"),
+    )
+
+
+@router.callback_query(F.data.startswith(f"{CB_BULK_CONFIRM}:"))
+async def confirm_bulk(
+    callback: CallbackQuery,
+    state: FSMContext,
+    container: DependencyContainer,
+    user_chat_id: int,
+) -> None:
+    """Run the bulk operation and send one summary. Callback: bsc:{domain_id}"""
+    respond = CallbackResponder(callback)
+    data = await state.get_data()
+    names = data.get("bulk_names")
+    if not names:
+        await respond.answer("Nothing to do, start again.", show_alert=True)
+        return
+    domain_id, parent_fqdn = data["domain_id"], data["parent_fqdn"]
+    creating = data.get("bulk_create", True)
+    # A second tap must not run the batch twice
+    await state.update_data(bulk_names=None)
+    await state.set_state(None)
+
+    await respond.loading("Working...")
+    await edit_message(callback.message, f"Processing {len(names)} subdomain(s) of {parent_fqdn}...")
+    bulk = container.subdomain_bulk
+    if creating:
+        result = await bulk.create(domain_id, parent_fqdn, names, user_chat_id)
+        action = "Created"
+    else:
+        result = await bulk.delete(data["bulk_targets"])
+        action = "Deleted"
+
+    await edit_message(
+        callback.message,
+        format_bulk_result(action, parent_fqdn, len(names), result),
+        reply_markup=back_keyboard(f"ss:{domain_id}"),
+    )
@@ -4,9 +4,15 @@ from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from app.services.beget.types import Subdomain
-from app.bot.callback_data import CB_DOMAIN
+from app.bot.keyboards.cache import memoized_markup
+from app.bot.callback_data import CB_DOMAIN, CB_BULK_ADD_SUB, CB_BULK_DEL_SUB
 
 
+@memoized_markup(
+    lambda subdomains, domain_id, can_create=True: (
+        domain_id, can_create, tuple(s.id for s in subdomains)
+    )
+)
 def subdomains_list_keyboard(
     subdomains: list[Subdomain],
     domain_id: int,
@@ -15,6 +21,7 @@ def subdomains_list_keyboard(
     """List of subdomains with management options.
     
     Uses short callbacks: s:{id} for subdomain view
+    Memoized per catalog version when called with catalog_version=...
     """
     builder = InlineKeyboardBuilder()
 
@@ -33,6 +40,17 @@ def subdomains_list_keyboard(
                 callback_data=f"as:{domain_id}",
             )
         )
+    bulk_buttons = []
+    if can_create:
+        bulk_buttons.append(
+            InlineKeyboardButton(text="Bulk Add", callback_data=f"{CB_BULK_ADD_SUB}:{domain_id}")
+        )
+    if subdomains:
+        bulk_buttons.append(
+            InlineKeyboardButton(text="Bulk Delete", callback_data=f"{CB_BULK_DEL_SUB}:{domain_id}")
+        )
+    if bulk_buttons:
+        builder.row(*bulk_buttons)
     builder.row(
         InlineKeyboardButton(
             text="Back",
@@ -96,3 +114,12 @@ def cancel_keyboard(cancel_data: str) -> InlineKeyboardMarkup:
             [InlineKeyboardButton(text="Cancel", callback_data=cancel_data)]
         ]
     )
+
+
+def back_keyboard(back_data: str) -> InlineKeyboardMarkup:
+    """Single "Back" button."""
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [InlineKeyboardButton(text="Back", callback_data=back_data)]
+        ]
+    )
@@ -1,14 +1,33 @@
 """Beget API services."""
 
-from app.services.beget.client import BegetClient, BegetApiError
+from app.services.beget.cache import ResponseCache
+from app.services.beget.catalog import CatalogVersion
+from app.services.beget.breaker import CircuitBreaker
+from app.services.beget.client import (
+    BegetApiError,
+    BegetClient,
+    BegetUnavailableError,
+    CircuitOpenError,
+)
 from app.services.beget.domains import DomainsService
 from app.services.beget.dns import DnsService
 from app.services.beget.manager import BegetClientManager
+from app.services.beget.persistent import PersistentResponseCache
+from app.services.beget.prefetch import PrefetchScheduler
+from app.services.beget.writes import WriteQueue
 
 __all__ = [
     "BegetClient",
     "BegetApiError",
     "BegetClientManager",
+    "BegetUnavailableError",
+    "CatalogVersion",
+    "CircuitBreaker",
+    "CircuitOpenError",
     "DomainsService",
     "DnsService",
+    "PersistentResponseCache",
+    "PrefetchScheduler",
+    "ResponseCache",
+    "WriteQueue",
 ]
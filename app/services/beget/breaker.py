@@ -0,0 +1,88 @@
+"""Circuit breaker for the Beget API.
+
+When Beget is down every request waits for the full timeout, handlers
+pile up and users keep retrying. After `failure_threshold` consecutive
+failures (timeouts, connection errors, non-JSON answers) the breaker
+opens and requests fail at once. After `reset_timeout` seconds one
+request is let through as a probe: success closes the breaker, failure
+keeps it open for another `reset_timeout`.
+
+Beget answering with an API error (wrong parameters, unknown domain)
+counts as success: the service is up.
+"""
+
+import logging
+import time
+
+from app.services.metrics import BEGET_CIRCUIT_OPEN
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None  # monotonic time the breaker opened
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """closed, open or half_open (a probe may go or is in flight)."""
+        if self.opened_at is None:
+            return "closed"
+        if self._probing or time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until the next probe is let through (0 when closed)."""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now.
+
+        A True in half-open state makes that request the probe; no other
+        request is let through until it reports its outcome.
+        """
+        if self.opened_at is None:
+            return True
+        if self._probing or time.monotonic() - self.opened_at < self.reset_timeout:
+            return False
+        self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            logger.info("Beget API responds again, circuit breaker closed")
+            BEGET_CIRCUIT_OPEN.set(0)
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probing or (self.opened_at is None and self.failures >= self.failure_threshold):
+            if not self._probing:
+                logger.warning(
+                    f"Beget API failed {self.failures} times in a row, circuit breaker open "
+                    f"for {self.reset_timeout:g}s"
+                )
+            self.opened_at = time.monotonic()
+            self._probing = False
+            BEGET_CIRCUIT_OPEN.set(1)
+
+    def release(self, probe: bool) -> None:
+        """End a request without an outcome (cancelled).
+
+        Frees the half-open slot only if that request was the probe, so
+        a cancelled ordinary request cannot let a second probe through.
+        """
+        if probe:
+            self._probing = False
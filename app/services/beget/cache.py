@@ -0,0 +1,222 @@
+"""Shared cache for Beget API read responses.
+
+Owned by BegetClientManager and used through BegetClient.fetch(). Entries
+expire after a TTL, concurrent misses for the same request share a
+single API call (single-flight), and mutations invalidate the entries
+they affect. With an `l2` (PersistentResponseCache) misses are looked up
+in SQLite before the API, so answers survive restarts.
+
+LastKnownAnswers keeps the last answer of every read without a TTL, so
+reads can be served while the Beget API is unavailable. Such reads are
+recorded in the current update's StaleReads so the reply can say how
+old the data is.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterator
+
+from app.services.metrics import record_cache
+
+if TYPE_CHECKING:
+    from app.services.beget.persistent import PersistentResponseCache
+
+logger = logging.getLogger(__name__)
+
+CacheKey = tuple[str, str]
+
+
+def cache_key(endpoint: str, params: dict[str, Any] | None = None) -> CacheKey:
+    """Key for an endpoint call, independent of parameter order."""
+    return endpoint, json.dumps(params or {}, sort_keys=True, ensure_ascii=False)
+
+
+@dataclass
+class _Inflight:
+    task: asyncio.Future
+    generation: int
+    waiters: int = 0
+
+
+class ResponseCache:
+    """TTL cache of API answers with single-flight fetching."""
+
+    def __init__(self, ttl: float = 30.0, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: dict[CacheKey, tuple[float, Any]] = {}
+        self._inflight: dict[CacheKey, _Inflight] = {}
+        # Bumped on invalidation so fetches started earlier don't store stale data
+        self._generation = 0
+        # Second level in SQLite, attached once the database is connected
+        self.l2: "PersistentResponseCache | None" = None
+
+    def get(self, key: CacheKey) -> tuple[bool, Any]:
+        """Return (found, value) for a fresh entry."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return False, None
+        return True, value
+
+    def set(self, key: CacheKey, value: Any) -> None:
+        if self.ttl <= 0:
+            return
+        if len(self._entries) >= self.maxsize and key not in self._entries:
+            # Drop the entry closest to expiry
+            oldest = min(self._entries, key=lambda k: self._entries[k][0])
+            del self._entries[oldest]
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    async def get_or_fetch(
+        self, key: CacheKey, fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return a cached value or fetch it, sharing the call with concurrent misses.
+
+        The fetch runs in its own task. A waiter being cancelled only
+        cancels the fetch if nobody else is waiting for it.
+        """
+        found, value = self.get(key)
+        record_cache("beget_response", hit=found)
+        if found:
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            generation = self._generation
+            task = asyncio.ensure_future(self._load(key, fetch, generation))
+            inflight = _Inflight(task, generation)
+            self._inflight[key] = inflight
+            inflight.task.add_done_callback(lambda task: self._store(key, inflight, task))
+
+        inflight.waiters += 1
+        try:
+            return await asyncio.shield(inflight.task)
+        except asyncio.CancelledError:
+            if inflight.waiters == 1 and not inflight.task.done():
+                inflight.task.cancel()
+            raise
+        finally:
+            inflight.waiters -= 1
+
+    async def _load(
+        self, key: CacheKey, fetch: Callable[[], Awaitable[Any]], generation: int
+    ) -> Any:
+        """Answer from the second level, else from fetch (stored in the second level)."""
+        l2 = self.l2 if self.l2 is not None and self.l2.handles(key) else None
+        if l2 is not None:
+            found, value = await l2.get(key)
+            if found:
+                return value
+        value = await fetch()
+        if l2 is not None and generation == self._generation:
+            await l2.set(key, value)
+        return value
+
+    async def put(self, key: CacheKey, value: Any) -> None:
+        """Store a freshly fetched answer in both levels."""
+        self.set(key, value)
+        if self.l2 is not None and self.l2.handles(key):
+            await self.l2.set(key, value)
+
+    def _store(self, key: CacheKey, inflight: _Inflight, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is inflight:
+            del self._inflight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        if inflight.generation == self._generation:
+            self.set(key, task.result())
+
+    def invalidate(self, endpoint: str, params: dict[str, Any] | None = None) -> None:
+        """Drop cached answers of an endpoint, or of one call if params are given."""
+        self._generation += 1
+        if params is not None:
+            keys = [cache_key(endpoint, params)]
+        else:
+            keys = [k for k in self._entries if k[0] == endpoint]
+            keys += [k for k in self._inflight if k[0] == endpoint]
+        for key in keys:
+            self._entries.pop(key, None)
+            # Later callers start a new fetch instead of joining a stale one
+            self._inflight.pop(key, None)
+        if self.l2 is not None:
+            self.l2.invalidate(endpoint, keys[0][1] if params is not None else None)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+        self._inflight.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LastKnownAnswers:
+    """LRU of the last answer of each read, with the time it was received."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._answers: OrderedDict[CacheKey, tuple[datetime, Any]] = OrderedDict()
+
+    def remember(self, key: CacheKey, value: Any) -> None:
+        self._answers[key] = (datetime.now(), value)
+        self._answers.move_to_end(key)
+        if len(self._answers) > self.maxsize:
+            self._answers.popitem(last=False)
+
+    def recall(self, key: CacheKey) -> tuple[datetime, Any] | None:
+        """(received at, answer), or None if this read never succeeded."""
+        known = self._answers.get(key)
+        record_cache("beget_last_known", hit=known is not None)
+        return known
+
+    def __len__(self) -> int:
+        return len(self._answers)
+
+
+@dataclass
+class StaleReads:
+    """Reads of the current update served from LastKnownAnswers."""
+
+    as_of: datetime | None = None  # time of the oldest answer served
+
+    def add(self, received_at: datetime) -> None:
+        if self.as_of is None or received_at < self.as_of:
+            self.as_of = received_at
+
+
+_stale_reads: ContextVar[StaleReads | None] = ContextVar("stale_reads", default=None)
+
+
+@contextmanager
+def track_stale_reads() -> Iterator[StaleReads]:
+    """Collect stale reads made inside the block (one update)."""
+    reads = StaleReads()
+    token = _stale_reads.set(reads)
+    try:
+        yield reads
+    finally:
+        _stale_reads.reset(token)
+
+
+def mark_stale(received_at: datetime) -> None:
+    """Note that the current update is shown data received at received_at."""
+    reads = _stale_reads.get()
+    if reads is not None:
+        reads.add(received_at)
+
+
+def stale_as_of() -> datetime | None:
+    """Time of the oldest stale answer used by the current update, if any."""
+    reads = _stale_reads.get()
+    return reads.as_of if reads is not None else None
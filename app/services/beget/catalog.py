@@ -0,0 +1,35 @@
+"""Catalog version tracking.
+
+The catalog is the account's domain and subdomain lists. Anything
+derived from it (rendered keyboards, for instance) can be keyed on
+CatalogVersion.version and reused until the catalog changes.
+"""
+
+from typing import Hashable
+
+
+class CatalogVersion:
+    """Monotonic version of the domain/subdomain catalog.
+
+    The version is bumped when a refresh returns different content than
+    the previous refresh of the same list, and on every mutation.
+    """
+
+    def __init__(self) -> None:
+        self.version = 0
+        self._fingerprints: dict[str, Hashable] = {}
+
+    def observe(self, kind: str, fingerprint: Hashable) -> int:
+        """Record a fresh fetch of a catalog list. Returns the current version."""
+        previous = self._fingerprints.get(kind)
+        if previous != fingerprint:
+            if kind in self._fingerprints:
+                self.version += 1
+            self._fingerprints[kind] = fingerprint
+        return self.version
+
+    def invalidate(self) -> int:
+        """Bump the version after a catalog mutation. Returns the new version."""
+        self.version += 1
+        self._fingerprints.clear()
+        return self.version
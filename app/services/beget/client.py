@@ -4,11 +4,31 @@ import asyncio
 import aiohttp
 import json
 import logging
-from typing import Any
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable
 from urllib.parse import urlencode
 
+from app.services.beget.breaker import CircuitBreaker
+from app.services.beget.cache import LastKnownAnswers, ResponseCache, cache_key, mark_stale
+from app.services.beget.catalog import CatalogVersion
+from app.services.beget.stream import ResultItemParser, iter_result_items
+from app.services.beget.writes import WriteQueue
+from app.services.metrics import BEGET_REQUEST_SECONDS
+from app.services.tracing import span
+
+if TYPE_CHECKING:
+    from app.services.beget.types import DnsData
+
 logger = logging.getLogger(__name__)
 
+STREAM_CHUNK_SIZE = 65536
+
+# Called with (fqdn, records, before) after a successful dns/changeRecords;
+# before is the DnsData the change was built from, None if not read first
+ChangeListener = Callable[
+    [str, dict[str, list[dict[str, Any]]], "DnsData | None"], Awaitable[None]
+]
+
 
 class BegetApiError(Exception):
     """Beget API error."""
@@ -34,15 +54,45 @@ class BegetApiError(Exception):
         return f"{self.message}. Details: {', '.join(error_strs)}"
 
 
+class BegetUnavailableError(BegetApiError):
+    """Beget API did not answer (timeout, connection error, non-JSON answer)."""
+
+
+class CircuitOpenError(BegetUnavailableError):
+    """Request not sent: the circuit breaker is open after repeated failures."""
+
+
 class BegetClient:
     """HTTP client for Beget API."""
 
     BASE_URL = "https://api.beget.com/api"
     DEFAULT_TIMEOUT = 15  # seconds
 
-    def __init__(self, login: str, password: str, timeout: int = DEFAULT_TIMEOUT):
+    def __init__(
+        self,
+        login: str,
+        password: str,
+        timeout: int = DEFAULT_TIMEOUT,
+        base_url: str = BASE_URL,
+        catalog: CatalogVersion | None = None,
+        cache: ResponseCache | None = None,
+        listeners: list[ChangeListener] | None = None,
+        writes: WriteQueue | None = None,
+        breaker: CircuitBreaker | None = None,
+        last_known: LastKnownAnswers | None = None,
+    ):
         self.login = login
         self.password = password
+        self.base_url = base_url.rstrip("/")
+        self.catalog = catalog or CatalogVersion()
+        self.cache = cache
+        self.listeners = listeners if listeners is not None else []
+        # Serializes record edits per FQDN; shared so all clients see one queue
+        self.writes = writes or WriteQueue()
+        # Shared outage handling: fail fast while Beget is down and serve
+        # reads from the last known answers (None disables each)
+        self.breaker = breaker
+        self.last_known = last_known
         self.timeout = aiohttp.ClientTimeout(total=timeout)
         self._session: aiohttp.ClientSession | None = None
 
@@ -76,7 +126,7 @@ class BegetClient:
             # Use separators to remove spaces after : and ,
             base_params["input_data"] = json.dumps(params, ensure_ascii=False, separators=(',', ':'))
         
-        url = f"{self.BASE_URL}/{endpoint}?{urlencode(base_params)}"
+        url = f"{self.base_url}/{endpoint}?{urlencode(base_params)}"
         # Log URL with masked password for debugging
         safe_url = url.replace(self.password, "***MASKED***")
         logger.info(f"API Request URL: {safe_url}")
@@ -88,7 +138,161 @@ class BegetClient:
         endpoint: str,
         params: dict[str, Any] | None = None,
     ) -> Any:
-        """Make API request."""
+        """Make API request.
+
+        Latency is recorded per endpoint and outcome (ok, api_error,
+        timeout, unavailable, circuit_open, error) in
+        beget_request_duration_seconds.
+        """
+        start = time.perf_counter()
+        status = "error"
+        probe = False
+        try:
+            probe = self._check_breaker()
+            with span("beget.request", endpoint=endpoint):
+                result = await self._send(endpoint, params)
+            status = "ok"
+            return result
+        except BegetApiError as e:
+            status = self._error_status(e)
+            raise
+        finally:
+            self._record_outcome(status, probe)
+            BEGET_REQUEST_SECONDS.observe(
+                time.perf_counter() - start, endpoint=endpoint, status=status
+            )
+
+    def _check_breaker(self) -> bool:
+        """Raise if the breaker is open. Returns True if this request is its probe."""
+        if self.breaker is None:
+            return False
+        if not self.breaker.allow():
+            raise CircuitOpenError(
+                f"Beget API is unavailable, next attempt in {self.breaker.retry_in:.0f}s"
+            )
+        # allow() lets a request through in half-open state only as the probe
+        return self.breaker.state == "half_open"
+
+    @staticmethod
+    def _error_status(error: BegetApiError) -> str:
+        if isinstance(error, CircuitOpenError):
+            return "circuit_open"
+        if isinstance(error.__cause__, asyncio.TimeoutError):
+            return "timeout"
+        if isinstance(error, BegetUnavailableError):
+            return "unavailable"
+        return "api_error"
+
+    def _record_outcome(self, status: str, probe: bool) -> None:
+        """Feed a request outcome to the circuit breaker."""
+        if self.breaker is None or status == "circuit_open":
+            return
+        if status in ("ok", "api_error"):
+            self.breaker.record_success()
+        elif status in ("timeout", "unavailable"):
+            self.breaker.record_failure()
+        else:
+            self.breaker.release(probe)  # cancelled or unexpected, no verdict
+
+    async def fetch(
+        self,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        fresh: bool = False,
+    ) -> Any:
+        """Make a read request through the shared response cache.
+
+        fresh=True skips the cached answer (read-modify-write paths) and
+        stores the new one. Without a cache this is request().
+        """
+        try:
+            return await self._fetch(endpoint, params, fresh)
+        except BegetUnavailableError:
+            # Beget is down: show the last known answer, unless the caller
+            # is about to write it back
+            if fresh:
+                raise
+            found, result = self.recall(endpoint, params)
+            if not found:
+                raise
+            return result
+
+    async def _fetch(self, endpoint: str, params: dict[str, Any] | None, fresh: bool) -> Any:
+        if self.cache is None:
+            return await self._load(endpoint, params)
+
+        key = cache_key(endpoint, params)
+        # The fetch may outlive this client (single-flight, prefetch), so it
+        # runs on a detached client sharing the same session
+        detached = self._detached()
+        if fresh:
+            result = await detached._load(endpoint, params)
+            await self.cache.put(key, result)
+            return result
+        return await self.cache.get_or_fetch(key, lambda: detached._load(endpoint, params))
+
+    async def _load(self, endpoint: str, params: dict[str, Any] | None) -> Any:
+        result = await self.request(endpoint, params)
+        self.remember(endpoint, params, result)
+        return result
+
+    def remember(self, endpoint: str, params: dict[str, Any] | None, result: Any) -> None:
+        """Keep a read answer as the fallback for outages."""
+        if self.last_known is not None:
+            self.last_known.remember(cache_key(endpoint, params), result)
+
+    def recall(self, endpoint: str, params: dict[str, Any] | None = None) -> tuple[bool, Any]:
+        """(found, answer) of the last successful read, marking the update as stale."""
+        if self.last_known is None:
+            return False, None
+        known = self.last_known.recall(cache_key(endpoint, params))
+        if known is None:
+            return False, None
+        received_at, result = known
+        logger.warning(f"Beget API unavailable, serving {endpoint} as of {received_at:%H:%M:%S}")
+        mark_stale(received_at)
+        return True, result
+
+    def invalidate(self, endpoint: str, params: dict[str, Any] | None = None) -> None:
+        """Drop cached answers after a mutation."""
+        if self.cache is not None:
+            self.cache.invalidate(endpoint, params)
+
+    async def notify_change(
+        self,
+        fqdn: str,
+        records: dict[str, list[dict[str, Any]]],
+        before: "DnsData | None" = None,
+    ) -> None:
+        """Tell change listeners about applied records. Listener errors are logged."""
+        for listener in self.listeners:
+            try:
+                await listener(fqdn, records, before)
+            except Exception as e:
+                logger.warning(f"DNS change listener failed for {fqdn}: {e}")
+
+    def _detached(self) -> "BegetClient":
+        client = type(self)(
+            self.login,
+            self.password,
+            base_url=self.base_url,
+            catalog=self.catalog,
+            cache=self.cache,
+            listeners=self.listeners,
+            writes=self.writes,
+            breaker=self.breaker,
+            last_known=self.last_known,
+        )
+        client.timeout = self.timeout
+        client._session = self._session
+        return client
+
+    async def _send(
+        self,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+    ) -> Any:
+        """Send the HTTP request and unwrap the Beget response envelope."""
         url = self._build_url(endpoint, params)
         try:
             async with self.session.get(url) as response:
@@ -104,36 +308,103 @@ class BegetClient:
                 except Exception as e:
                     text = await response.text()
                     logger.error(f"Failed to parse response as JSON. First 500 chars: {text[:500]}")
-                    raise BegetApiError(
+                    raise BegetUnavailableError(
                         f"Invalid API response. Expected JSON but got parsing error: {e}. "
                         f"Please ensure you're using valid API credentials from: "
                         f"https://cp.beget.com/api"
                     )
 
-                # Check top-level error
-                if data.get("status") == "error":
-                    errors = data.get("errors", [])
-                    error_messages = self._extract_error_messages(errors)
-                    raise BegetApiError(
-                        f"API error: {error_messages or 'Unknown error'}",
-                        errors,
-                    )
-                
-                answer = data.get("answer")
-                
-                # Check nested error in answer
-                if isinstance(answer, dict) and answer.get("status") == "error":
-                    errors = answer.get("errors", [])
-                    error_messages = self._extract_error_messages(errors)
-                    raise BegetApiError(
-                        f"API error: {error_messages or 'Unknown error'}",
-                        errors,
-                    )
+                return self._unwrap(data)
+        except asyncio.TimeoutError as e:
+            logger.error(f"API request timeout for endpoint: {endpoint}")
+            raise BegetUnavailableError(
+                f"Request timeout. Beget API did not respond within {self.timeout.total}s"
+            ) from e
+        except aiohttp.ClientError as e:
+            logger.error(f"API request failed for endpoint {endpoint}: {e}")
+            raise BegetUnavailableError(f"Beget API is unreachable: {e}") from e
 
-                return answer
-        except asyncio.TimeoutError:
+    async def stream(
+        self,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        predicate: Callable[[Any], bool] | None = None,
+    ) -> AsyncIterator[Any]:
+        """Items of a list answer (answer.result), decoded as the body arrives.
+
+        Only items matching predicate are yielded and nothing is cached,
+        so memory scales with the matches rather than the whole list.
+        API errors are raised once the body ends, after any items.
+        """
+        start = time.perf_counter()
+        status = "error"
+        url = self._build_url(endpoint, params)
+        parser = ResultItemParser()
+        probe = False
+        try:
+            probe = self._check_breaker()
+            # No tracing span: it would stay active in the consumer across yields
+            async with self.session.get(url) as response:
+                chunks = response.content.iter_chunked(STREAM_CHUNK_SIZE)
+                async for item in iter_result_items(chunks, parser):
+                    if predicate is None or predicate(item):
+                        yield item
+                try:
+                    data = parser.close()
+                except ValueError as e:
+                    raise BegetUnavailableError(f"Invalid API response. Expected JSON: {e}") from e
+                answer = self._unwrap(data)
+            if not parser.found and isinstance(answer, list):
+                # A bare list answer is not streamed, it was decoded in one piece
+                for item in answer:
+                    if predicate is None or predicate(item):
+                        yield item
+            status = "ok"
+        except GeneratorExit:
+            status = "ok"  # the consumer stopped early
+            raise
+        except asyncio.TimeoutError as e:
+            status = "timeout"
             logger.error(f"API request timeout for endpoint: {endpoint}")
-            raise BegetApiError(f"Request timeout. Beget API did not respond within {self.timeout.total}s")
+            raise BegetUnavailableError(
+                f"Request timeout. Beget API did not respond within {self.timeout.total}s"
+            ) from e
+        except aiohttp.ClientError as e:
+            status = "unavailable"
+            logger.error(f"API request failed for endpoint {endpoint}: {e}")
+            raise BegetUnavailableError(f"Beget API is unreachable: {e}") from e
+        except BegetApiError as e:
+            status = self._error_status(e)
+            raise
+        finally:
+            self._record_outcome(status, probe)
+            BEGET_REQUEST_SECONDS.observe(
+                time.perf_counter() - start, endpoint=endpoint, status=status
+            )
+
+    def _unwrap(self, data: Any) -> Any:
+        """Answer of a Beget response envelope. Raises BegetApiError on errors."""
+        # Check top-level error
+        if data.get("status") == "error":
+            errors = data.get("errors", [])
+            error_messages = self._extract_error_messages(errors)
+            raise BegetApiError(
+                f"API error: {error_messages or 'Unknown error'}",
+                errors,
+            )
+
+        answer = data.get("answer")
+
+        # Check nested error in answer
+        if isinstance(answer, dict) and answer.get("status") == "error":
+            errors = answer.get("errors", [])
+            error_messages = self._extract_error_messages(errors)
+            raise BegetApiError(
+                f"API error: {error_messages or 'Unknown error'}",
+                errors,
+            )
+
+        return answer
     
     def _extract_error_messages(self, errors: list) -> str:
         """Extract readable error messages from Beget API errors."""
@@ -1,8 +1,51 @@
 """DNS management service."""
 
+from functools import partial
 from typing import Any
 from app.services.beget.client import BegetClient
-from app.services.beget.types import DnsData, DnsRecord
+from app.services.beget.types import DnsData, DnsRecord, checked
+from app.services.beget.writes import RecordEdit
+
+# API record type -> (DnsData field, value key, fallback value key,
+#                     strip trailing dot, priority key)
+# e.g. {"ttl": 300, "exchange": "mx.domain.ru.", "preference": 10}
+RECORD_FIELDS: dict[str, tuple[str, str, str | None, bool, str | None]] = {
+    "A": ("a", "address", None, False, None),
+    "AAAA": ("aaaa", "address", None, False, None),
+    "MX": ("mx", "exchange", None, True, "preference"),
+    "TXT": ("txt", "txtdata", None, False, None),
+    "CNAME": ("cname", "cname", None, True, None),
+    "NS": ("ns", "nsdname", "value", False, None),
+}
+
+
+def decode_dns_data(fqdn: str, result: dict[str, Any]) -> DnsData:
+    """Build DnsData from a dns/getData result, driven by RECORD_FIELDS."""
+    records = result.get("records") or {}
+    fields: dict[str, list[DnsRecord]] = {}
+    for api_type, (field, key, fallback, strip_dot, priority_key) in RECORD_FIELDS.items():
+        raw = records.get(api_type)
+        if not raw:
+            continue
+        items = []
+        append = items.append
+        for r in raw:
+            value = r.get(key, "") if fallback is None else r.get(key, r.get(fallback, ""))
+            if strip_dot:
+                value = value.rstrip(".")
+            priority = int(r.get(priority_key, 10)) if priority_key else 10
+            append(DnsRecord(value, priority))
+        fields[field] = checked(DnsRecord, items)
+
+    return DnsData(
+        fqdn=fqdn,
+        is_subdomain=bool(result.get("is_subdomain", 0)),
+        set_type=int(result.get("set_type", 1)),
+        # Nameservers: {"value": "ns1.beget.com"}
+        dns=[r.get("value", "") for r in records.get("DNS", [])],
+        dns_ip=[r.get("value", "") for r in records.get("DNS_IP", [])],
+        **fields,
+    )
 
 
 class DnsService:
@@ -43,9 +86,13 @@ class DnsService:
         
         return records
 
-    async def get_dns_data(self, fqdn: str) -> DnsData:
-        """Get DNS records for a domain."""
-        result = await self.client.request("dns/getData", {"fqdn": fqdn})
+    async def get_dns_data(self, fqdn: str, fresh: bool = False) -> DnsData:
+        """Get DNS records for a domain.
+
+        fresh=True bypasses the response cache; record changes use it so
+        they never rewrite the zone from a stale copy.
+        """
+        result = await self.client.fetch("dns/getData", {"fqdn": fqdn}, fresh=fresh)
         
         if not result:
             return DnsData(fqdn=fqdn)
@@ -57,68 +104,13 @@ class DnsService:
         if not result:
             return DnsData(fqdn=fqdn)
         
-        # Records are inside "records" key
-        records = result.get("records", {})
-
-        # Parse A records: {"ttl": 600, "address": "1.2.3.4"} -> DnsRecord
-        a_records = []
-        for r in records.get("A", []):
-            a_records.append(DnsRecord(value=r.get("address", ""), priority=10))
-        
-        # Parse AAAA records: {"ttl": 600, "address": "::1"} -> DnsRecord
-        aaaa_records = []
-        for r in records.get("AAAA", []):
-            aaaa_records.append(DnsRecord(value=r.get("address", ""), priority=10))
-        
-        # Parse MX records: {"ttl": 300, "exchange": "mx.domain.ru.", "preference": 10}
-        mx_records = []
-        for r in records.get("MX", []):
-            mx_records.append(DnsRecord(
-                value=r.get("exchange", "").rstrip("."),
-                priority=r.get("preference", 10)
-            ))
-        
-        # Parse TXT records: {"ttl": 300, "txtdata": "v=spf1..."}
-        txt_records = []
-        for r in records.get("TXT", []):
-            txt_records.append(DnsRecord(value=r.get("txtdata", ""), priority=10))
-        
-        # Parse CNAME records: {"ttl": 600, "cname": "target.domain.ru."}
-        cname_records = []
-        for r in records.get("CNAME", []):
-            cname_records.append(DnsRecord(value=r.get("cname", "").rstrip("."), priority=10))
-        
-        # Parse NS records: {"value": "ns1.domain.ru"}
-        ns_records = []
-        for r in records.get("NS", []):
-            ns_records.append(DnsRecord(value=r.get("nsdname", r.get("value", "")), priority=10))
-        
-        # Parse DNS records (nameservers): {"value": "ns1.beget.com"}
-        dns_list = [r.get("value", "") for r in records.get("DNS", [])]
-        dns_ip_list = [r.get("value", "") for r in records.get("DNS_IP", [])]
-
-        # Get subdomain and set_type info from API response
-        is_subdomain = bool(result.get("is_subdomain", 0))
-        set_type = int(result.get("set_type", 1))
-
-        return DnsData(
-            fqdn=fqdn,
-            is_subdomain=is_subdomain,
-            set_type=set_type,
-            dns_ip=dns_ip_list,
-            dns=dns_list,
-            a=a_records,
-            aaaa=aaaa_records,
-            mx=mx_records,
-            txt=txt_records,
-            cname=cname_records,
-            ns=ns_records,
-        )
+        return decode_dns_data(fqdn, result)
 
     async def change_records(
         self,
         fqdn: str,
         records: dict[str, list[dict[str, Any]]],
+        before: DnsData | None = None,
     ) -> bool:
         """
         Change DNS records for a domain.
@@ -131,10 +123,17 @@ class DnsService:
             fqdn: Domain FQDN
             records: Dict with record types as keys (A, AAAA, MX, TXT, CNAME, NS)
                     and lists of {"value": str, "priority": int} as values
+            before: The DnsData the records were built from, passed on to
+                    change listeners (the DNS journal records it as history)
         """
         # Beget API requires "records" wrapper
         params = {"fqdn": fqdn, "records": records}
-        result = await self.client.request("dns/changeRecords", params)
+        try:
+            result = await self.client.request("dns/changeRecords", params)
+        finally:
+            # Even a failed call may have changed the zone
+            self.client.invalidate("dns/getData", {"fqdn": fqdn})
+        await self.client.notify_change(fqdn, records, before)
         
         # API returns result structure, check if it's successful
         if isinstance(result, dict):
@@ -178,100 +177,111 @@ class DnsService:
             # Log only errors, not successful syncs
             logger.warning(f"Failed to sync www subdomain {www_fqdn}: {e}")
 
+    # ============ RECORD EDITS ============
+    # Edits go through the client's WriteQueue: edits of one FQDN never
+    # overlap, and edits queued behind a write are merged into the next one
+
+    async def _edit(self, fqdn: str, edit: RecordEdit, sync_www: bool) -> bool:
+        """Apply one edit to the fqdn's group 1 records. Returns False if nothing changed."""
+        return await self.client.writes.submit(
+            fqdn, edit, partial(self._apply_edits, sync_www=sync_www), group=sync_www
+        )
+
+    async def _apply_edits(
+        self, fqdn: str, edits: list[RecordEdit], sync_www: bool
+    ) -> list[bool | Exception]:
+        """Read the zone once, apply all edits in order and write it once."""
+        current = await self.get_dns_data(fqdn, fresh=True)
+        records = self._build_all_records(current)
+        results: list[bool | Exception] = []
+        for edit in edits:
+            try:
+                results.append(edit(records))
+            except Exception as e:
+                results.append(e)
+        if any(result is True for result in results):
+            await self.change_records(fqdn, records, before=current)
+            if sync_www:
+                await self._apply_to_www(fqdn, records)
+        return results
+
     async def add_a_record(self, fqdn: str, ip: str, sync_www: bool = True) -> bool:
         """Add A record. Also updates www version if sync_www=True."""
-        current = await self.get_dns_data(fqdn)
-        
-        # Build records with priority
-        a_records = [{"value": r.value, "priority": max(r.priority, 10)} for r in current.a]
-        next_priority = (len(a_records) + 1) * 10
-        a_records.append({"value": ip, "priority": next_priority})
-        
-        records = self._build_all_records(current)
-        records["A"] = a_records
-        
-        result = await self.change_records(fqdn, records)
-        
-        # Sync to www version
-        if sync_www:
-            await self._apply_to_www(fqdn, records)
-        
-        return result
-
-    async def update_a_record(self, fqdn: str, old_ip: str, new_ip: str, sync_www: bool = True) -> bool:
-        """Update an existing A record. Also updates www version if sync_www=True."""
-        current = await self.get_dns_data(fqdn)
-        a_records = []
-        for i, r in enumerate(current.a):
-            priority = max(r.priority, (i + 1) * 10)
-            if r.value == old_ip:
-                a_records.append({"value": new_ip, "priority": priority})
-            else:
-                a_records.append({"value": r.value, "priority": priority})
-        
-        records = self._build_all_records(current)
-        records["A"] = a_records
-        
-        result = await self.change_records(fqdn, records)
-        
-        if sync_www:
-            await self._apply_to_www(fqdn, records)
-        
-        return result
+        return await self._edit(fqdn, partial(_add_record, "A", ip), sync_www)
+
+    async def update_a_record(
+        self, fqdn: str, old_ip: str, new_ip: str, sync_www: bool = True
+    ) -> bool:
+        """Update an existing A record. Also updates www version if sync_www=True.
+
+        Returns False without writing if old_ip is not set.
+        """
+        return await self._edit(fqdn, partial(_update_a_record, old_ip, new_ip), sync_www)
 
     async def delete_a_record(self, fqdn: str, ip: str, sync_www: bool = True) -> bool:
         """Delete an A record. Also updates www version if sync_www=True."""
-        current = await self.get_dns_data(fqdn)
-        a_records = []
-        priority = 10
-        for r in current.a:
-            if r.value != ip:
-                a_records.append({"value": r.value, "priority": priority})
-                priority += 10
-        
-        records = self._build_all_records(current)
-        records["A"] = a_records
-        
-        result = await self.change_records(fqdn, records)
-        
-        if sync_www:
-            await self._apply_to_www(fqdn, records)
-        
-        return result
+        return await self._edit(fqdn, partial(_delete_record, "A", ip), sync_www)
 
     async def add_txt_record(self, fqdn: str, value: str, sync_www: bool = True) -> bool:
         """Add a TXT record. Also updates www version if sync_www=True."""
-        current = await self.get_dns_data(fqdn)
-        txt_records = [{"value": r.value, "priority": max(r.priority, 10)} for r in current.txt]
-        next_priority = (len(txt_records) + 1) * 10
-        txt_records.append({"value": value, "priority": next_priority})
-        
-        records = self._build_all_records(current)
-        records["TXT"] = txt_records
-        
-        result = await self.change_records(fqdn, records)
-        
-        if sync_www:
-            await self._apply_to_www(fqdn, records)
-        
-        return result
+        return await self._edit(fqdn, partial(_add_record, "TXT", value), sync_www)
 
     async def delete_txt_record(self, fqdn: str, value: str, sync_www: bool = True) -> bool:
         """Delete a TXT record. Also updates www version if sync_www=True."""
-        current = await self.get_dns_data(fqdn)
-        txt_records = []
-        priority = 10
-        for r in current.txt:
-            if r.value != value:
-                txt_records.append({"value": r.value, "priority": priority})
-                priority += 10
-        
-        records = self._build_all_records(current)
-        records["TXT"] = txt_records
-        
-        result = await self.change_records(fqdn, records)
-        
-        if sync_www:
-            await self._apply_to_www(fqdn, records)
-        
-        return result
+        return await self._edit(fqdn, partial(_delete_record, "TXT", value), sync_www)
+
+    async def replace_records(
+        self, fqdn: str, records: dict[str, list[dict[str, Any]]], sync_www: bool = False
+    ) -> bool:
+        """Replace the group 1 records with records (rollbacks, zone imports).
+
+        Queued like the other edits, so it never overwrites an edit in
+        flight. Returns False without writing if the records already match.
+        """
+        return await self._edit(fqdn, partial(_replace_records, records), sync_www)
+
+
+# ============ EDITS ============
+# Pure functions over group 1 records, see RecordEdit
+
+
+def _add_record(record_type: str, value: str, records: dict[str, list[dict[str, Any]]]) -> bool:
+    items = records.setdefault(record_type, [])
+    items.append({"value": value, "priority": (len(items) + 1) * 10})
+    return True
+
+
+def _update_a_record(old_ip: str, new_ip: str, records: dict[str, list[dict[str, Any]]]) -> bool:
+    items = records.get("A", [])
+    if not any(r["value"] == old_ip for r in items):
+        return False
+    records["A"] = [
+        {
+            "value": new_ip if r["value"] == old_ip else r["value"],
+            "priority": max(r["priority"], (i + 1) * 10),
+        }
+        for i, r in enumerate(items)
+    ]
+    return True
+
+
+def _replace_records(
+    new: dict[str, list[dict[str, Any]]], records: dict[str, list[dict[str, Any]]]
+) -> bool:
+    if records == new:
+        return False
+    records.clear()
+    # Copies: later edits of the batch change the lists in place
+    records.update({t: [dict(r) for r in items] for t, items in new.items()})
+    return True
+
+
+def _delete_record(record_type: str, value: str, records: dict[str, list[dict[str, Any]]]) -> bool:
+    items = records.get(record_type, [])
+    kept = [r for r in items if r["value"] != value]
+    if len(kept) == len(items):
+        return False
+    records[record_type] = [
+        {"value": r["value"], "priority": (i + 1) * 10} for i, r in enumerate(kept)
+    ]
+    return True
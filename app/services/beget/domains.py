@@ -1,7 +1,28 @@
 """Domain management service."""
 
-from app.services.beget.client import BegetClient
-from app.services.beget.types import Domain, Subdomain
+from typing import Any
+
+from app.services.beget.client import BegetClient, BegetUnavailableError
+from app.services.beget.types import Domain, Subdomain, checked
+
+
+def decode_domains(result: list[dict[str, Any]]) -> list[Domain]:
+    """Build Domain items from a domain/getList result."""
+    return checked(Domain, [Domain(d["id"], d["fqdn"]) for d in result])
+
+
+def decode_subdomains(result: list[dict[str, Any]]) -> dict[int, list[Subdomain]]:
+    """Build Subdomain items from a domain/getSubdomainList result, grouped by domain_id."""
+    grouped: dict[int, list[Subdomain]] = {}
+    for s in result:
+        domain_id = s.get("domain_id")
+        group = grouped.get(domain_id)
+        if group is None:
+            group = grouped[domain_id] = []
+        group.append(Subdomain(s["id"], s["fqdn"]))
+    for group in grouped.values():
+        checked(Subdomain, group)
+    return grouped
 
 
 class DomainsService:
@@ -10,9 +31,9 @@ class DomainsService:
     def __init__(self, client: BegetClient):
         self.client = client
 
-    async def get_domains(self) -> list[Domain]:
+    async def get_domains(self, fresh: bool = False) -> list[Domain]:
         """Get all domains."""
-        result = await self.client.request("domain/getList")
+        result = await self.client.fetch("domain/getList", fresh=fresh)
         if not result:
             return []
         # Beget API returns nested structure: answer -> result -> list
@@ -20,25 +41,60 @@ class DomainsService:
             result = result.get("result", [])
         if not result:
             return []
-        return [Domain(id=d["id"], fqdn=d["fqdn"]) for d in result]
+        self.client.catalog.observe("domains", tuple((d["id"], d["fqdn"]) for d in result))
+        return decode_domains(result)
+
+    async def get_subdomains(self, domain_id: int, fresh: bool = False) -> list[Subdomain]:
+        """Get subdomains for a domain.
+
+        With a response cache the whole list is read once and shared by
+        every domain. Without one, or with fresh=True, the list is
+        streamed and only this domain's subdomains are kept.
+        """
+        if self.client.cache is not None and not fresh:
+            all_subdomains = await self.get_all_subdomains()
+            return all_subdomains.get(domain_id, [])
+        try:
+            return await self.stream_subdomains(domain_id)
+        except BegetUnavailableError:
+            if fresh:
+                raise
+            found, items = self.client.recall("domain/getSubdomainList", {"domain_id": domain_id})
+            if not found:
+                raise
+            return decode_subdomains(items).get(domain_id, [])
 
-    async def get_subdomains(self, domain_id: int) -> list[Subdomain]:
-        """Get subdomains for a domain."""
+    async def stream_subdomains(self, domain_id: int) -> list[Subdomain]:
+        """Get subdomains of one domain, decoding the list as it arrives."""
+        seen: list[tuple[int, int | None]] = []  # (id, domain_id) of all, for the catalog
+
+        def keep(item: dict[str, Any]) -> bool:
+            seen.append((item["id"], item.get("domain_id")))
+            return item.get("domain_id") == domain_id
+
+        items = [s async for s in self.client.stream("domain/getSubdomainList", predicate=keep)]
+        self.client.catalog.observe("subdomains", tuple(seen))
+        # Kept per domain: the fallback while Beget is unavailable
+        self.client.remember("domain/getSubdomainList", {"domain_id": domain_id}, items)
+        return decode_subdomains(items).get(domain_id, [])
+
+    async def get_all_subdomains(self, fresh: bool = False) -> dict[int, list[Subdomain]]:
+        """Get subdomains of all domains, grouped by domain_id."""
         # Beget API getSubdomainList doesn't accept parameters
-        # It returns all subdomains, we need to filter by domain_id
-        result = await self.client.request("domain/getSubdomainList")
+        # It returns all subdomains, we need to group them by domain_id
+        result = await self.client.fetch("domain/getSubdomainList", fresh=fresh)
         
         if not result:
-            return []
+            return {}
         # Beget API returns nested structure: answer -> result -> list
         if isinstance(result, dict):
             result = result.get("result", [])
         if not result:
-            return []
-        
-        # Filter subdomains by domain_id
-        filtered = [s for s in result if s.get("domain_id") == domain_id]
-        return [Subdomain(id=s["id"], fqdn=s["fqdn"]) for s in filtered]
+            return {}
+        self.client.catalog.observe(
+            "subdomains", tuple((s["id"], s.get("domain_id")) for s in result)
+        )
+        return decode_subdomains(result)
 
     async def add_subdomain(self, domain_id: int, subdomain: str) -> bool:
         """Add a virtual subdomain."""
@@ -46,6 +102,8 @@ class DomainsService:
             "domain/addSubdomainVirtual",
             {"domain_id": domain_id, "subdomain": subdomain},
         )
+        self.client.invalidate("domain/getSubdomainList")
+        self.client.catalog.invalidate()
         return True
 
     async def delete_subdomain(self, subdomain_id: int) -> bool:
@@ -54,4 +112,6 @@ class DomainsService:
             "domain/deleteSubdomain",
             {"id": subdomain_id},
         )
+        self.client.invalidate("domain/getSubdomainList")
+        self.client.catalog.invalidate()
         return True
@@ -4,7 +4,11 @@ import aiohttp
 from contextlib import asynccontextmanager
 from typing import AsyncIterator
 
-from app.services.beget.client import BegetClient
+from app.services.beget.breaker import CircuitBreaker
+from app.services.beget.cache import LastKnownAnswers, ResponseCache
+from app.services.beget.catalog import CatalogVersion
+from app.services.beget.client import BegetClient, ChangeListener
+from app.services.beget.writes import WriteQueue
 
 
 class BegetClientManager:
@@ -15,10 +19,38 @@ class BegetClientManager:
     all requests during the application lifecycle.
     """
     
-    def __init__(self, login: str, password: str, timeout: int = 15):
+    def __init__(
+        self,
+        login: str,
+        password: str,
+        timeout: int = 15,
+        base_url: str = BegetClient.BASE_URL,
+        cache_ttl: float = 30.0,
+        write_window: float = 0.0,
+        breaker_failures: int = 5,
+        breaker_reset: float = 30.0,
+    ):
         self.login = login
         self.password = password
         self.timeout = timeout
+        self.base_url = base_url
+        # Shared by all clients so the version survives across requests
+        self.catalog = CatalogVersion()
+        # Shared read cache, filled by handlers and by prefetching (0 disables it)
+        self.cache = ResponseCache(ttl=cache_ttl) if cache_ttl > 0 else None
+        # Notified of every applied record change (snapshot, reverse index)
+        self.change_listeners: list[ChangeListener] = []
+        # Record edits of one FQDN run one at a time and are merged when they
+        # queue up; write_window (seconds) waits for more edits to merge
+        self.writes = WriteQueue(window=write_window)
+        # After breaker_failures failed requests in a row, requests fail at once
+        # for breaker_reset seconds and reads are answered with the last known
+        # data (0 disables both)
+        self.breaker = None
+        self.last_known = None
+        if breaker_failures > 0:
+            self.breaker = CircuitBreaker(breaker_failures, breaker_reset)
+            self.last_known = LastKnownAnswers()
         self._session: aiohttp.ClientSession | None = None
     
     async def start(self) -> None:
@@ -30,6 +62,7 @@ class BegetClientManager:
     
     async def stop(self) -> None:
         """Close the shared aiohttp session."""
+        await self.writes.stop()
         if self._session:
             await self._session.close()
             self._session = None
@@ -50,6 +83,13 @@ class BegetClientManager:
             login=self.login,
             password=self.password,
             timeout=self.timeout,
+            base_url=self.base_url,
+            catalog=self.catalog,
+            cache=self.cache,
+            listeners=self.change_listeners,
+            writes=self.writes,
+            breaker=self.breaker,
+            last_known=self.last_known,
         )
         # Inject our managed session
         beget_client._session = self._session
@@ -0,0 +1,140 @@
+"""Persistent second-level cache for Beget read responses.
+
+The in-memory ResponseCache starts empty after every restart, so the
+first screens after a deploy all go to the Beget API. Answers of
+PERSISTED_ENDPOINTS are also stored in SQLite: compressed JSON with a
+SHA-256 content hash, a TTL and a size bound on the stored payloads.
+An in-memory miss reads SQLite before the API.
+
+Re-storing an unchanged answer only extends its TTL (the content hash
+matches), so a stable account does not rewrite its payloads. Oldest
+answers are evicted once the payloads exceed max_bytes.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import zlib
+from typing import TYPE_CHECKING, Any
+
+from app.services.beget.cache import CacheKey
+from app.services.metrics import record_cache
+
+if TYPE_CHECKING:
+    from app.services.database.response_cache import ResponseCacheRepository
+
+logger = logging.getLogger(__name__)
+
+PERSISTED_ENDPOINTS = frozenset({"domain/getList", "domain/getSubdomainList", "dns/getData"})
+
+COMPRESS_LEVEL = 6
+EVICT_EVERY = 32  # stores between eviction passes
+
+
+def encode_answer(value: Any) -> tuple[str, bytes]:
+    """(content hash, compressed payload) of an answer."""
+    data = json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+    return hashlib.sha256(data).hexdigest(), zlib.compress(data, COMPRESS_LEVEL)
+
+
+def decode_answer(payload: bytes) -> Any:
+    return json.loads(zlib.decompress(payload))
+
+
+class PersistentResponseCache:
+    """SQLite-backed answers for ResponseCache misses."""
+
+    def __init__(
+        self,
+        repo: "ResponseCacheRepository",
+        ttl: float = 300.0,
+        max_bytes: int = 16 * 1024 * 1024,
+    ):
+        self.repo = repo
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._hashes: dict[CacheKey, str] = {}  # content hash stored per key
+        # Invalidations whose DELETE has not run yet: (endpoint, params or None) -> time
+        self._invalidated: dict[tuple[str, str | None], float] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._stores = 0
+
+    @staticmethod
+    def handles(key: CacheKey) -> bool:
+        return key[0] in PERSISTED_ENDPOINTS
+
+    async def get(self, key: CacheKey) -> tuple[bool, Any]:
+        """Return (found, value) for a stored answer that has not expired."""
+        endpoint, params = key
+        try:
+            stored = await self.repo.get(endpoint, params, time.time())
+        except Exception as e:
+            logger.warning(f"Persistent cache read failed for {endpoint}: {e}")
+            return False, None
+        if stored is not None and self._is_invalidated(key, stored.stored_at):
+            stored = None
+        record_cache("beget_response_l2", hit=stored is not None)
+        if stored is None:
+            return False, None
+        self._hashes[key] = stored.content_hash
+        return True, decode_answer(stored.payload)
+
+    async def set(self, key: CacheKey, value: Any) -> None:
+        """Store an answer. Errors are logged, the read itself already succeeded."""
+        endpoint, params = key
+        now = time.time()
+        content_hash, payload = encode_answer(value)
+        try:
+            if self._hashes.get(key) != content_hash or not await self.repo.refresh(
+                endpoint, params, content_hash, now, now + self.ttl
+            ):
+                await self.repo.put(endpoint, params, content_hash, payload, now, now + self.ttl)
+                self._hashes[key] = content_hash
+            self._stores += 1
+            if self._stores % EVICT_EVERY == 0:
+                await self.repo.evict(now, self.max_bytes)
+        except Exception as e:
+            logger.warning(f"Persistent cache write failed for {endpoint}: {e}")
+
+    def invalidate(self, endpoint: str, params: str | None = None) -> None:
+        """Drop stored answers of an endpoint, or of one call (params as in the cache key)."""
+        if endpoint not in PERSISTED_ENDPOINTS:
+            return
+        tombstone = (endpoint, params)
+        self._invalidated[tombstone] = time.time()
+        for key in [k for k in self._hashes if k[0] == endpoint and params in (None, k[1])]:
+            del self._hashes[key]
+
+        # The DELETE runs in the background; until it does, reads skip the
+        # answers stored before the invalidation
+        async def delete() -> None:
+            try:
+                await self.repo.delete(endpoint, params)
+            except Exception as e:
+                logger.warning(f"Persistent cache invalidation failed for {endpoint}: {e}")
+
+        task = asyncio.ensure_future(delete())
+        self._tasks.add(task)
+        invalidated_at = self._invalidated[tombstone]
+
+        def done(task: asyncio.Task) -> None:
+            self._tasks.discard(task)
+            if self._invalidated.get(tombstone) == invalidated_at:
+                del self._invalidated[tombstone]
+
+        task.add_done_callback(done)
+
+    def _is_invalidated(self, key: CacheKey, stored_at: float) -> bool:
+        endpoint, params = key
+        for tombstone in ((endpoint, None), (endpoint, params)):
+            invalidated_at = self._invalidated.get(tombstone)
+            if invalidated_at is not None and stored_at <= invalidated_at:
+                return True
+        return False
+
+    async def drain(self) -> None:
+        """Wait for pending invalidations (tests, shutdown)."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
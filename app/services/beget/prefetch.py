@@ -0,0 +1,101 @@
+"""Speculative prefetch of the next screen's Beget data.
+
+When a user opens a domain menu, the next tap is almost always
+"Subdomains" or "DNS". PrefetchScheduler warms the shared response cache
+with both answers in the background so that tap is served without an
+API round-trip. Prefetches run with bounded concurrency, are cancelled
+when the user navigates away, and never surface errors to the user.
+"""
+
+import asyncio
+import contextvars
+import logging
+from typing import TYPE_CHECKING, Coroutine
+
+from app.services.beget.dns import DnsService
+from app.services.beget.domains import DomainsService
+from app.services.metrics import QUEUE_DEPTH
+
+if TYPE_CHECKING:
+    from app.services.beget.manager import BegetClientManager
+
+logger = logging.getLogger(__name__)
+
+
+class PrefetchScheduler:
+    """Background cache warm-up, one batch per chat."""
+
+    def __init__(self, manager: "BegetClientManager", max_concurrency: int = 2):
+        self.manager = manager
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # chat_id -> (domain_id, tasks)
+        self._pending: dict[int, tuple[int, list[asyncio.Task]]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.manager.cache is not None
+
+    def prefetch_domain(self, chat_id: int, domain_id: int, fqdn: str) -> None:
+        """Warm subdomain list and DNS data for the domain menu just shown."""
+        if not self.enabled:
+            return
+        pending = self._pending.get(chat_id)
+        if pending and pending[0] == domain_id and not all(t.done() for t in pending[1]):
+            return
+        self.cancel(chat_id)
+        self._pending[chat_id] = (
+            domain_id,
+            [
+                self._spawn(self._subdomains(domain_id)),
+                self._spawn(self._dns(fqdn)),
+            ],
+        )
+
+    def cancel(self, chat_id: int) -> None:
+        """Cancel unfinished prefetches of a chat (user navigated away)."""
+        pending = self._pending.pop(chat_id, None)
+        if pending:
+            for task in pending[1]:
+                task.cancel()
+
+    async def drain(self) -> None:
+        """Wait for all scheduled prefetches to finish."""
+        tasks = [t for _, batch in self._pending.values() for t in batch]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._pending = {
+            chat_id: entry
+            for chat_id, entry in self._pending.items()
+            if not all(t.done() for t in entry[1])
+        }
+
+    async def stop(self) -> None:
+        """Cancel everything; call before closing the Beget session."""
+        for chat_id in list(self._pending):
+            self.cancel(chat_id)
+        await self.drain()
+
+    def _spawn(self, coro: Coroutine) -> asyncio.Task:
+        # Empty context: prefetch work must not show up in the update's trace
+        return asyncio.create_task(self._run(coro), context=contextvars.Context())
+
+    async def _run(self, coro: Coroutine) -> None:
+        QUEUE_DEPTH.inc(queue="prefetch")
+        try:
+            async with self._semaphore:
+                await coro
+        except asyncio.CancelledError:
+            coro.close()
+            raise
+        except Exception as e:
+            logger.debug(f"Prefetch failed: {e}")
+        finally:
+            QUEUE_DEPTH.dec(queue="prefetch")
+
+    async def _subdomains(self, domain_id: int) -> None:
+        async with self.manager.client() as client:
+            await DomainsService(client).get_subdomains(domain_id)
+
+    async def _dns(self, fqdn: str) -> None:
+        async with self.manager.client() as client:
+            await DnsService(client).get_dns_data(fqdn)
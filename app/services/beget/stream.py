@@ -0,0 +1,106 @@
+"""Incremental decoding of Beget list answers.
+
+A list answer looks like
+    {"status": "success", "answer": {"status": "success", "result": [...]}}
+ResultItemParser is fed the body piece by piece and hands out the items
+of the "result" array one at a time, decoded with the C JSON decoder.
+Everything outside the array (the small envelope) is kept so errors
+can still be checked once the body ends; the array itself is never
+held as a whole, so memory scales with the largest item.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, AsyncIterable, AsyncIterator
+
+# The result array opens in the envelope read so far
+_RESULT_START = re.compile(r'"result"\s*:\s*\[')
+_WHITESPACE = re.compile(r"\s*")
+# A number or literal runs until whitespace, "," or "]"
+_BARE_TOKEN = re.compile(r"[^\s,\]]*")
+
+
+class ResultItemParser:
+    """Push parser yielding the items of answer.result."""
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._envelope: list[str] = []  # text outside the result array
+        self._state = "prefix"  # prefix -> items -> suffix
+        self._expect_item = True
+        self._empty = True  # no item read yet, "]" may close the array
+
+    @property
+    def found(self) -> bool:
+        """Whether the body had a result array (streamed item by item)."""
+        return self._state != "prefix"
+
+    def feed(self, data: bytes) -> list[Any]:
+        """Add a piece of the body. Returns the items completed by it."""
+        self._buffer += self._text_decoder.decode(data)
+        items: list[Any] = []
+        if self._state == "prefix":
+            match = _RESULT_START.search(self._buffer)
+            if match is None:
+                return items
+            self._envelope.append(self._buffer[:match.end()])
+            self._buffer = self._buffer[match.end():]
+            self._state = "items"
+        if self._state == "items":
+            self._read_items(items)
+        return items
+
+    def _read_items(self, items: list[Any]) -> None:
+        buffer = self._buffer
+        pos = 0
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            if char == "]" and (not self._expect_item or self._empty):
+                self._state = "suffix"
+                pos += 1
+                break
+            if not self._expect_item:
+                if char != ",":
+                    raise ValueError(f"expected ',' or ']' in result array, got {char!r}")
+                self._expect_item = True
+                pos += 1
+                continue
+            try:
+                item, end = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # item not complete yet
+            if not isinstance(item, (dict, list, str)) and (
+                _BARE_TOKEN.match(buffer, pos).end() == len(buffer)
+            ):
+                break  # a number or literal may continue in the next piece ("2." + "5")
+            items.append(item)
+            self._expect_item = self._empty = False
+            pos = end
+        self._buffer = buffer[pos:]
+
+    def close(self) -> Any:
+        """Finish the body. Returns the envelope with an empty result array.
+
+        Raises ValueError if the body is not valid JSON.
+        """
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        if self._state == "items":
+            self._read_items([])
+            if self._state == "items":
+                raise ValueError("unterminated result array")
+        if self._state == "prefix":
+            return json.loads(self._buffer)  # no result array, e.g. an error
+        return json.loads("".join(self._envelope) + "]" + self._buffer)
+
+
+async def iter_result_items(chunks: AsyncIterable[bytes], parser: ResultItemParser) -> AsyncIterator[Any]:
+    """Items of answer.result as the body arrives. Call parser.close() after."""
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
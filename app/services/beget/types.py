@@ -1,6 +1,50 @@
-"""Beget API type definitions."""
+"""Beget API type definitions.
 
-from pydantic import BaseModel
+Domain, Subdomain and DnsRecord are the per-item types of list
+responses (thousands of subdomains, every DNS record), so they are
+slotted dataclasses built without validation. Debug mode
+(BEGET_VALIDATE_RESPONSES) re-checks every decoded item with pydantic
+in strict mode, so an API format change fails loudly instead of
+leaking wrong types into handlers.
+"""
+
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import TypeVar, get_type_hints
+
+from pydantic import BaseModel, TypeAdapter, create_model
+
+T = TypeVar("T")
+
+_validate_items = False
+
+
+def set_item_validation(enabled: bool) -> None:
+    """Enable strict validation of decoded items (debug mode)."""
+    global _validate_items
+    _validate_items = enabled
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(item_type: type) -> TypeAdapter:
+    """Adapter checking a list of item field dicts."""
+    fields = create_model(
+        item_type.__name__,
+        **{name: (hint, ...) for name, hint in get_type_hints(item_type).items()},
+    )
+    return TypeAdapter(list[fields])
+
+
+def checked(item_type: type[T], items: list[T]) -> list[T]:
+    """Return items; in debug mode validate their fields first.
+
+    Raises pydantic.ValidationError if an item has a wrong field type.
+    """
+    if _validate_items and items:
+        _list_adapter(item_type).validate_python(
+            [asdict(item) for item in items], strict=True
+        )
+    return items
 
 
 class BegetResponse(BaseModel):
@@ -11,21 +55,24 @@ class BegetResponse(BaseModel):
     errors: list[str] | None = None
 
 
-class Domain(BaseModel):
+@dataclass(slots=True)
+class Domain:
     """Domain information."""
 
     id: int
     fqdn: str
 
 
-class Subdomain(BaseModel):
+@dataclass(slots=True)
+class Subdomain:
     """Subdomain information."""
 
     id: int
     fqdn: str
 
 
-class DnsRecord(BaseModel):
+@dataclass(slots=True)
+class DnsRecord:
     """DNS record."""
 
     value: str
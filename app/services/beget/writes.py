@@ -0,0 +1,123 @@
+"""Per-FQDN write queue for DNS record edits.
+
+Every record edit is a read-modify-write of the FQDN's zone. Without
+coordination two concurrent edits of one FQDN both read the same zone
+and the second write silently drops the first edit.
+
+WriteQueue runs one worker per FQDN, so writes to an FQDN never
+overlap. Edits that arrive while a write is in flight (or within
+`window` seconds of the first one) are merged: one fresh read, all
+edits applied in arrival order, one write. Each caller still gets its
+own result or exception.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable
+
+from app.services.metrics import QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+# Changes group 1 records ({"A": [{"value", "priority"}], ...}) in place.
+# Returns False if there was nothing to change. Must not raise after
+# changing anything, the records are shared with the rest of the batch.
+RecordEdit = Callable[[dict[str, list[dict[str, Any]]]], bool]
+
+# Applies a batch of edits to an FQDN; returns one result or exception per edit
+BatchApply = Callable[[str, list[RecordEdit]], Awaitable[list[Any]]]
+
+
+@dataclass
+class _Pending:
+    edit: RecordEdit
+    apply: BatchApply
+    group: Hashable  # only edits of the same group are merged
+    future: asyncio.Future
+
+
+class WriteQueue:
+    """Serialize and coalesce record edits per FQDN."""
+
+    def __init__(self, window: float = 0.0):
+        self.window = window
+        self._pending: dict[str, deque[_Pending]] = {}
+        self._workers: dict[str, asyncio.Task] = {}
+
+    def queued(self, fqdn: str) -> int:
+        """Edits of fqdn waiting for a write."""
+        return len(self._pending.get(fqdn, ()))
+
+    async def submit(
+        self,
+        fqdn: str,
+        edit: RecordEdit,
+        apply: BatchApply,
+        group: Hashable = None,
+    ) -> Any:
+        """Queue an edit and wait for the write that includes it."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(fqdn, deque()).append(_Pending(edit, apply, group, future))
+        QUEUE_DEPTH.inc(queue="dns_writes")
+        if fqdn not in self._workers:
+            self._workers[fqdn] = asyncio.create_task(self._drain(fqdn))
+        return await future
+
+    def _next_batch(self, pending: deque[_Pending]) -> list[_Pending]:
+        batch = [pending.popleft()]
+        while pending and pending[0].group == batch[0].group:
+            batch.append(pending.popleft())
+        QUEUE_DEPTH.dec(len(batch), queue="dns_writes")
+        # Callers that gave up are dropped, their edits are not applied
+        return [p for p in batch if not p.future.done()]
+
+    async def _drain(self, fqdn: str) -> None:
+        pending = self._pending[fqdn]
+        batch: list[_Pending] = []
+        try:
+            while pending:
+                if self.window > 0:
+                    await asyncio.sleep(self.window)
+                batch = self._next_batch(pending)
+                if not batch:
+                    continue
+                if len(batch) > 1:
+                    logger.debug(f"Merged {len(batch)} edits of {fqdn} into one write")
+                try:
+                    results = await batch[0].apply(fqdn, [p.edit for p in batch])
+                except Exception as e:
+                    results = [e] * len(batch)
+                for p, result in zip(batch, results):
+                    if p.future.done():
+                        continue
+                    if isinstance(result, BaseException):
+                        p.future.set_exception(result)
+                    else:
+                        p.future.set_result(result)
+        finally:
+            # Idle: drop the queue. Cancelled (shutdown): also fail the edits not written
+            self._fail(fqdn, batch)
+
+    def _fail(self, fqdn: str, batch: list[_Pending]) -> None:
+        error = RuntimeError(f"DNS write queue for {fqdn} stopped")
+        for p in batch:
+            if not p.future.done():
+                p.future.set_exception(error)
+        pending = self._pending.pop(fqdn, deque())
+        QUEUE_DEPTH.dec(len(pending), queue="dns_writes")
+        for p in pending:
+            if not p.future.done():
+                p.future.set_exception(error)
+        self._workers.pop(fqdn, None)
+
+    async def stop(self) -> None:
+        """Cancel all workers and fail the edits they had not written."""
+        workers = list(self._workers.values())
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        # Workers cancelled before they started never ran their cleanup
+        for fqdn in list(self._pending):
+            self._fail(fqdn, [])
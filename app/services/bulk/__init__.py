@@ -0,0 +1,18 @@
+"""Bulk DNS operations."""
+
+from app.services.bulk.ip_migration import IP_MIGRATION, IpMigrator
+from app.services.bulk.subdomains import (
+    MAX_BULK_NAMES,
+    BulkResult,
+    SubdomainBulk,
+    parse_names,
+)
+
+__all__ = [
+    "IP_MIGRATION",
+    "IpMigrator",
+    "MAX_BULK_NAMES",
+    "BulkResult",
+    "SubdomainBulk",
+    "parse_names",
+]
@@ -0,0 +1,175 @@
+"""Bulk replacement of an A record value across the account.
+
+A job is planned from the reverse index (every FQDN with an A record
+pointing at the old IP) and stored in bulk_jobs/bulk_job_items before
+anything is written. Running it re-reads each FQDN, replaces the value
+with one dns/changeRecords call, and checkpoints the item. A job
+interrupted by a restart keeps status "running" and resumes with its
+pending items; already migrated FQDNs read back without the old IP and
+are skipped, so resuming is safe.
+"""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+from app.services.beget.dns import DnsService
+from app.services.database.jobs import (
+    ITEM_DONE,
+    ITEM_FAILED,
+    ITEM_PENDING,
+    ITEM_SKIPPED,
+    JOB_CANCELLED,
+    JOB_DONE,
+    JOB_PLANNED,
+    JOB_RUNNING,
+    BulkJob,
+    JobsRepository,
+)
+from app.services.snapshot.index import ReverseIndex
+from app.utils.rate_limit import RateLimiter
+
+if TYPE_CHECKING:
+    from app.services.beget.manager import BegetClientManager
+
+logger = logging.getLogger(__name__)
+
+IP_MIGRATION = "ip_migration"
+
+ProgressCallback = Callable[[BulkJob], Awaitable[None]]
+
+
+class IpMigrator:
+    """Plan and run "replace A value X with Y" jobs."""
+
+    def __init__(
+        self,
+        manager: "BegetClientManager",
+        jobs_repo: JobsRepository,
+        index: ReverseIndex,
+        concurrency: int = 4,
+        rate_per_sec: float = 5.0,
+    ):
+        self.manager = manager
+        self.jobs_repo = jobs_repo
+        self.index = index
+        self.concurrency = max(concurrency, 1)
+        self.limiter = RateLimiter(rate_per_sec, burst=self.concurrency)
+        self._tasks: dict[int, asyncio.Task] = {}
+
+    def plan(self, old_ip: str) -> list[str]:
+        """FQDNs with an A record pointing at old_ip, from the snapshot."""
+        return self.index.lookup(old_ip).get("A", [])
+
+    async def create(self, old_ip: str, new_ip: str, created_by: str) -> BulkJob | None:
+        """Store a planned job. Returns None if nothing points at old_ip."""
+        fqdns = self.plan(old_ip)
+        if not fqdns:
+            return None
+        job_id = await self.jobs_repo.create(
+            IP_MIGRATION, {"old_ip": old_ip, "new_ip": new_ip}, fqdns, created_by
+        )
+        return await self.jobs_repo.get(job_id)
+
+    async def cancel(self, job_id: int) -> None:
+        """Cancel a planned or running job. Finished items stay migrated."""
+        task = self._tasks.pop(job_id, None)
+        if task is not None:
+            task.cancel()
+        await self.jobs_repo.set_status(job_id, JOB_CANCELLED)
+
+    def is_running(self, job_id: int) -> bool:
+        task = self._tasks.get(job_id)
+        return task is not None and not task.done()
+
+    def start(
+        self,
+        job_id: int,
+        on_progress: ProgressCallback | None = None,
+        on_done: ProgressCallback | None = None,
+    ) -> bool:
+        """Run a job in the background. Returns False if it is already running."""
+        if self.is_running(job_id):
+            return False
+        self._tasks[job_id] = asyncio.create_task(self._run_background(job_id, on_progress, on_done))
+        return True
+
+    async def _run_background(
+        self,
+        job_id: int,
+        on_progress: ProgressCallback | None,
+        on_done: ProgressCallback | None,
+    ) -> None:
+        try:
+            job = await self.run(job_id, on_progress)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"IP migration job {job_id} failed: {e}")
+            return
+        finally:
+            self._tasks.pop(job_id, None)
+        if on_done is not None and job is not None:
+            try:
+                await on_done(job)
+            except Exception as e:
+                logger.warning(f"IP migration job {job_id} report failed: {e}")
+
+    async def run(self, job_id: int, on_progress: ProgressCallback | None = None) -> BulkJob | None:
+        """Run the pending items of a job and return it with final counts."""
+        job = await self.jobs_repo.get(job_id)
+        if job is None or job.status not in (JOB_PLANNED, JOB_RUNNING):
+            return job
+        await self.jobs_repo.set_status(job_id, JOB_RUNNING)
+
+        old_ip, new_ip = job.params["old_ip"], job.params["new_ip"]
+        planned = {item.fqdn for item in await self.jobs_repo.get_items(job_id)}
+        pending = await self.jobs_repo.get_items(job_id, ITEM_PENDING)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def migrate(fqdn: str) -> None:
+            # The www twin is synced with its parent unless it is planned itself
+            sync_www = not fqdn.startswith("www.") and f"www.{fqdn}" not in planned
+            async with semaphore:
+                status, error = await self._migrate_one(fqdn, old_ip, new_ip, sync_www)
+            await self.jobs_repo.mark_item(job_id, fqdn, status, error)
+            job.counts[ITEM_PENDING] -= 1
+            job.counts[status] = job.counts.get(status, 0) + 1
+            if on_progress is not None:
+                try:
+                    await on_progress(job)
+                except Exception as e:
+                    logger.debug(f"IP migration progress report failed: {e}")
+
+        await asyncio.gather(*(migrate(item.fqdn) for item in pending))
+
+        await self.jobs_repo.set_status(job_id, JOB_DONE)
+        job = await self.jobs_repo.get(job_id)
+        logger.info(f"IP migration job {job_id} {old_ip} -> {new_ip} finished: {job.counts}")
+        return job
+
+    async def _migrate_one(
+        self, fqdn: str, old_ip: str, new_ip: str, sync_www: bool
+    ) -> tuple[str, str | None]:
+        """Replace old_ip on one FQDN. Returns (item status, error)."""
+        try:
+            async with self.manager.client() as client:
+                dns_service = DnsService(client)
+                # One token per Beget call: the fresh read, the write and the
+                # www twin's write (charged up front, even if old_ip is gone)
+                await self.limiter.acquire(3 if sync_www else 2)
+                changed = await dns_service.update_a_record(
+                    fqdn, old_ip, new_ip, sync_www=sync_www
+                )
+            return (ITEM_DONE if changed else ITEM_SKIPPED), None
+        except Exception as e:
+            logger.warning(f"IP migration failed for {fqdn}: {e}")
+            return ITEM_FAILED, str(e)
+
+    async def stop(self) -> None:
+        """Stop running jobs; they stay "running" and can be resumed."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
@@ -0,0 +1,107 @@
+"""Bulk subdomain creation and deletion.
+
+Runs domain/addSubdomainVirtual or domain/deleteSubdomain for a whole
+list of names concurrently, at most `concurrency` calls at a time, and
+updates created_subdomains for all of them in one transaction.
+"""
+
+import asyncio
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+from app.services.beget.domains import DomainsService
+from app.services.database.permissions import PermissionsRepository
+
+if TYPE_CHECKING:
+    from app.services.beget.client import BegetClient
+    from app.services.beget.manager import BegetClientManager
+
+logger = logging.getLogger(__name__)
+
+# Separators accepted between names in a pasted list
+_NAME_SPLIT = re.compile(r"[\s,;]+")
+
+MAX_BULK_NAMES = 100
+
+
+def parse_names(text: str) -> list[str]:
+    """Names from free text, lowercased, duplicates dropped, order kept."""
+    names = [name.strip().lower().rstrip(".") for name in _NAME_SPLIT.split(text)]
+    return list(dict.fromkeys(name for name in names if name))
+
+
+@dataclass
+class BulkResult:
+    """Outcome of a bulk operation per FQDN."""
+
+    succeeded: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+
+
+class SubdomainBulk:
+    """Create or delete many subdomains of a domain at once."""
+
+    def __init__(
+        self,
+        manager: "BegetClientManager",
+        permissions_repo: PermissionsRepository,
+        concurrency: int = 4,
+    ):
+        self.manager = manager
+        self.permissions_repo = permissions_repo
+        self.concurrency = max(concurrency, 1)
+
+    async def _run(
+        self,
+        fqdns: list[str],
+        call: Callable[["BegetClient", str], Awaitable[object]],
+    ) -> BulkResult:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        result = BulkResult()
+
+        async def run_one(fqdn: str) -> None:
+            async with semaphore:
+                try:
+                    async with self.manager.client() as client:
+                        await call(client, fqdn)
+                except Exception as e:
+                    logger.warning(f"Bulk subdomain operation failed for {fqdn}: {e}")
+                    result.failed[fqdn] = str(e)
+                    return
+            result.succeeded.append(fqdn)
+
+        await asyncio.gather(*(run_one(fqdn) for fqdn in fqdns))
+        # Report in input order, not completion order
+        order = {fqdn: i for i, fqdn in enumerate(fqdns)}
+        result.succeeded.sort(key=order.__getitem__)
+        return result
+
+    async def create(
+        self, domain_id: int, parent_fqdn: str, names: list[str], created_by: int
+    ) -> BulkResult:
+        """Create subdomains and record created_by as their creator."""
+        labels = {f"{name}.{parent_fqdn}": name for name in names}
+        result = await self._run(
+            list(labels),
+            lambda client, fqdn: DomainsService(client).add_subdomain(domain_id, labels[fqdn]),
+        )
+        await self.permissions_repo.record_subdomain_creations(result.succeeded, created_by)
+        logger.info(
+            f"Bulk create under {parent_fqdn}: {len(result.succeeded)} created, "
+            f"{len(result.failed)} failed"
+        )
+        return result
+
+    async def delete(self, subdomain_ids: dict[str, int]) -> BulkResult:
+        """Delete subdomains given as FQDN -> subdomain ID."""
+        result = await self._run(
+            list(subdomain_ids),
+            lambda client, fqdn: DomainsService(client).delete_subdomain(subdomain_ids[fqdn]),
+        )
+        await self.permissions_repo.delete_subdomain_records(result.succeeded)
+        logger.info(
+            f"Bulk delete: {len(result.succeeded)} deleted, {len(result.failed)} failed"
+        )
+        return result
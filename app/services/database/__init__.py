@@ -2,18 +2,40 @@
 
 from app.services.database.connection import Database
 from app.services.database.chats import ChatsRepository
+from app.services.database.jobs import BulkJob, BulkJobItem, JobsRepository
+from app.services.database.journal import DnsJournalRepository, JournalEntry
 from app.services.database.logs import LogsRepository
 from app.services.database.permissions import (
+    Capability,
     PermissionsRepository,
     DomainPermission,
     SubdomainPermission,
 )
+from app.services.database.response_cache import CachedResponse, ResponseCacheRepository
+from app.services.database.snapshots import (
+    DnsSnapshotRepository,
+    SnapshotEntry,
+    SnapshotRecord,
+    SnapshotStats,
+)
 
 __all__ = [
     "Database",
     "ChatsRepository",
     "LogsRepository",
+    "Capability",
     "PermissionsRepository",
     "DomainPermission",
     "SubdomainPermission",
+    "BulkJob",
+    "BulkJobItem",
+    "JobsRepository",
+    "DnsJournalRepository",
+    "JournalEntry",
+    "CachedResponse",
+    "ResponseCacheRepository",
+    "DnsSnapshotRepository",
+    "SnapshotEntry",
+    "SnapshotRecord",
+    "SnapshotStats",
 ]
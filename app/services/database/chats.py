@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from datetime import datetime
 
 from app.services.database.connection import Database
+from app.services.database.rows import RowMapper
+from app.services.metrics import track_queries
 
 
 @dataclass
@@ -17,6 +19,10 @@ class AllowedChat:
     note: str | None
 
 
+_ALLOWED_CHAT = RowMapper(AllowedChat, added_at=datetime.fromisoformat)
+
+
+@track_queries
 class ChatsRepository:
     """Repository for managing allowed chats."""
 
@@ -28,17 +34,7 @@ class ChatsRepository:
         cursor = await self.db.connection.execute(
             "SELECT * FROM allowed_chats ORDER BY added_at DESC"
         )
-        rows = await cursor.fetchall()
-        return [
-            AllowedChat(
-                id=row["id"],
-                chat_id=row["chat_id"],
-                added_by=row["added_by"],
-                added_at=datetime.fromisoformat(row["added_at"]),
-                note=row["note"],
-            )
-            for row in rows
-        ]
+        return await _ALLOWED_CHAT.fetchall(cursor)
 
     async def get_chat_ids(self) -> set[int]:
         """Get set of allowed chat IDs."""
@@ -59,20 +55,20 @@ class ChatsRepository:
     async def add(self, chat_id: int, added_by: str, note: str | None = None) -> bool:
         """Add a chat to allowed list. Returns True if added, False if exists."""
         try:
-            await self.db.connection.execute(
-                "INSERT INTO allowed_chats (chat_id, added_by, note) VALUES (?, ?, ?)",
-                (chat_id, added_by, note),
-            )
-            await self.db.connection.commit()
+            async with self.db.transaction() as connection:
+                await connection.execute(
+                    "INSERT INTO allowed_chats (chat_id, added_by, note) VALUES (?, ?, ?)",
+                    (chat_id, added_by, note),
+                )
             return True
         except Exception:
             return False
 
     async def remove(self, chat_id: int) -> bool:
         """Remove a chat from allowed list. Returns True if removed."""
-        cursor = await self.db.connection.execute(
-            "DELETE FROM allowed_chats WHERE chat_id = ?",
-            (chat_id,),
-        )
-        await self.db.connection.commit()
+        async with self.db.transaction() as connection:
+            cursor = await connection.execute(
+                "DELETE FROM allowed_chats WHERE chat_id = ?",
+                (chat_id,),
+            )
         return cursor.rowcount > 0
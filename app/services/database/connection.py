@@ -1,8 +1,12 @@
 """Database connection manager."""
 
+import asyncio
 import logging
-import aiosqlite
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import AsyncIterator
+
+import aiosqlite
 
 from app.services.database.migrations import MigrationManager
 
@@ -14,11 +18,17 @@ class Database:
     
     Uses MigrationManager for schema management instead of hardcoded schema.
     All schema changes should be done via migration files in versions/.
+
+    Every repository shares one connection, and so one transaction: all
+    writes go through transaction(), which lets one writer at a time run
+    its statements and commit, so no writer commits another's half-done
+    change.
     """
 
     def __init__(self, db_path: Path):
         self.db_path = db_path
         self._connection: aiosqlite.Connection | None = None
+        self._write_lock = asyncio.Lock()
 
     async def connect(self) -> None:
         """Connect to database and run migrations."""
@@ -44,3 +54,18 @@ class Database:
         if not self._connection:
             raise RuntimeError("Database not connected")
         return self._connection
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Run a write as one transaction, serialized with every other write.
+
+        Commits when the block exits and rolls back if it raises.
+        """
+        async with self._write_lock:
+            connection = self.connection
+            try:
+                yield connection
+            except BaseException:
+                await connection.rollback()
+                raise
+            await connection.commit()
@@ -0,0 +1,147 @@
+"""Bulk jobs repository."""
+
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from app.services.database.connection import Database
+from app.services.database.rows import RowMapper
+from app.services.metrics import track_queries
+
+# Job statuses
+JOB_PLANNED = "planned"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_CANCELLED = "cancelled"
+
+# Item statuses
+ITEM_PENDING = "pending"
+ITEM_DONE = "done"
+ITEM_SKIPPED = "skipped"
+ITEM_FAILED = "failed"
+
+
+@dataclass
+class BulkJob:
+    """Bulk job entity with item counts per status."""
+
+    id: int
+    kind: str
+    params: dict[str, Any]
+    status: str
+    created_by: str
+    created_at: datetime
+    counts: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    @property
+    def finished(self) -> int:
+        return self.total - self.counts.get(ITEM_PENDING, 0)
+
+
+@dataclass
+class BulkJobItem:
+    """One FQDN of a bulk job."""
+
+    job_id: int
+    fqdn: str
+    status: str
+    error: str | None
+
+
+_BULK_JOB = RowMapper(
+    BulkJob, params=json.loads, created_at=datetime.fromisoformat
+)
+_BULK_JOB_ITEM = RowMapper(BulkJobItem)
+
+
+@track_queries
+class JobsRepository:
+    """Repository for bulk job checkpoints."""
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    async def create(
+        self,
+        kind: str,
+        params: dict[str, Any],
+        fqdns: list[str],
+        created_by: str,
+    ) -> int:
+        """Create a planned job with its items in one transaction. Returns the job ID."""
+        async with self.db.transaction() as connection:
+            cursor = await connection.execute(
+                "INSERT INTO bulk_jobs (kind, params, created_by) VALUES (?, ?, ?)",
+                (kind, json.dumps(params), created_by),
+            )
+            job_id = cursor.lastrowid
+            await connection.executemany(
+                "INSERT OR IGNORE INTO bulk_job_items (job_id, fqdn) VALUES (?, ?)",
+                [(job_id, fqdn) for fqdn in fqdns],
+            )
+        return job_id
+
+    async def get(self, job_id: int) -> BulkJob | None:
+        """Get a job with its item counts."""
+        cursor = await self.db.connection.execute(
+            "SELECT * FROM bulk_jobs WHERE id = ?", (job_id,)
+        )
+        job = await _BULK_JOB.fetchone(cursor)
+        if not job:
+            return None
+        cursor = await self.db.connection.execute(
+            "SELECT status, COUNT(*) FROM bulk_job_items WHERE job_id = ? GROUP BY status",
+            (job_id,),
+        )
+        job.counts = {status: count for status, count in await cursor.fetchall()}
+        return job
+
+    async def get_unfinished(self, kind: str) -> list[BulkJob]:
+        """Get jobs of a kind that were started but not finished (e.g. interrupted by a restart)."""
+        cursor = await self.db.connection.execute(
+            "SELECT id FROM bulk_jobs WHERE kind = ? AND status = ? ORDER BY id",
+            (kind, JOB_RUNNING),
+        )
+        jobs = []
+        for (job_id,) in await cursor.fetchall():
+            job = await self.get(job_id)
+            if job:
+                jobs.append(job)
+        return jobs
+
+    async def get_items(self, job_id: int, status: str | None = None) -> list[BulkJobItem]:
+        """Get items of a job, optionally only those with a status."""
+        query = "SELECT * FROM bulk_job_items WHERE job_id = ?"
+        params: tuple = (job_id,)
+        if status is not None:
+            query += " AND status = ?"
+            params += (status,)
+        cursor = await self.db.connection.execute(query + " ORDER BY fqdn", params)
+        return await _BULK_JOB_ITEM.fetchall(cursor)
+
+    async def set_status(self, job_id: int, status: str) -> None:
+        """Update job status."""
+        async with self.db.transaction() as connection:
+            await connection.execute(
+                "UPDATE bulk_jobs SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (status, job_id),
+            )
+
+    async def mark_item(
+        self, job_id: int, fqdn: str, status: str, error: str | None = None
+    ) -> None:
+        """Checkpoint one item."""
+        async with self.db.transaction() as connection:
+            await connection.execute(
+                """
+                UPDATE bulk_job_items
+                SET status = ?, error = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE job_id = ? AND fqdn = ?
+                """,
+                (status, error, job_id, fqdn),
+            )
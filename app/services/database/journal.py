@@ -0,0 +1,112 @@
+"""DNS change journal repository."""
+
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+from app.services.database.connection import Database
+from app.services.database.rows import RowMapper
+from app.services.database.snapshots import RecordTuple
+from app.services.metrics import track_queries
+
+
+@dataclass
+class JournalEntry:
+    """One record change: what it removed and added within record_types."""
+
+    id: int
+    fqdn: str
+    record_types: list[str]
+    removed: list[RecordTuple]
+    added: list[RecordTuple]
+    complete: bool  # False if the records before the change were unknown
+    created_at: datetime
+
+
+def _dump(records: list[RecordTuple]) -> str:
+    return json.dumps(records, separators=(",", ":"), ensure_ascii=False)
+
+
+def _load(payload: str) -> list[RecordTuple]:
+    return [(t, v, p) for t, v, p in json.loads(payload)]
+
+
+_JOURNAL_ENTRY = RowMapper(
+    JournalEntry,
+    record_types=json.loads,
+    removed=_load,
+    added=_load,
+    complete=bool,
+    created_at=datetime.fromisoformat,
+)
+
+
+@track_queries
+class DnsJournalRepository:
+    """Repository for DNS change history."""
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    async def append(
+        self,
+        fqdn: str,
+        record_types: list[str],
+        removed: list[RecordTuple],
+        added: list[RecordTuple],
+        complete: bool,
+        state: list[RecordTuple],
+    ) -> int:
+        """Store a change and the resulting state in one transaction. Returns the entry ID."""
+        async with self.db.transaction() as connection:
+            cursor = await connection.execute(
+                """
+                INSERT INTO dns_journal (fqdn, record_types, removed, added, complete)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (fqdn, json.dumps(record_types), _dump(removed), _dump(added), int(complete)),
+            )
+            entry_id = cursor.lastrowid
+            await connection.execute(
+                """
+                INSERT INTO dns_journal_state (fqdn, records, journal_id)
+                VALUES (?, ?, ?)
+                ON CONFLICT(fqdn) DO UPDATE SET
+                    records = excluded.records,
+                    journal_id = excluded.journal_id,
+                    updated_at = CURRENT_TIMESTAMP
+                """,
+                (fqdn, _dump(state), entry_id),
+            )
+        return entry_id
+
+    async def get_state(self, fqdn: str) -> list[RecordTuple] | None:
+        """Latest known records of an FQDN, None if it was never changed."""
+        cursor = await self.db.connection.execute(
+            "SELECT records FROM dns_journal_state WHERE fqdn = ?", (fqdn,)
+        )
+        row = await cursor.fetchone()
+        return _load(row["records"]) if row else None
+
+    async def get_entry(self, entry_id: int) -> JournalEntry | None:
+        """Get a single entry."""
+        cursor = await self.db.connection.execute(
+            "SELECT * FROM dns_journal WHERE id = ?", (entry_id,)
+        )
+        return await _JOURNAL_ENTRY.fetchone(cursor)
+
+    async def get_entries(self, fqdn: str, limit: int = 10) -> list[JournalEntry]:
+        """Latest entries of an FQDN, newest first."""
+        cursor = await self.db.connection.execute(
+            "SELECT * FROM dns_journal WHERE fqdn = ? ORDER BY id DESC LIMIT ?",
+            (fqdn, limit),
+        )
+        return await _JOURNAL_ENTRY.fetchall(cursor)
+
+    async def get_entries_since(self, fqdn: str, entry_id: int) -> list[JournalEntry]:
+        """Entries of an FQDN from entry_id on, newest first."""
+        cursor = await self.db.connection.execute(
+            "SELECT * FROM dns_journal WHERE fqdn = ? AND id >= ? ORDER BY id DESC",
+            (fqdn, entry_id),
+        )
+        return await _JOURNAL_ENTRY.fetchall(cursor)
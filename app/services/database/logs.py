@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from datetime import datetime
 
 from app.services.database.connection import Database
+from app.services.database.rows import RowMapper
+from app.services.metrics import track_queries
 
 
 @dataclass
@@ -19,6 +21,10 @@ class ActionLog:
     created_at: datetime
 
 
+_ACTION_LOG = RowMapper(ActionLog, created_at=datetime.fromisoformat)
+
+
+@track_queries
 class LogsRepository:
     """Repository for managing action logs."""
 
@@ -34,14 +40,14 @@ class LogsRepository:
         details: str | None = None,
     ) -> None:
         """Add an action log entry."""
-        await self.db.connection.execute(
-            """
-            INSERT INTO action_logs (chat_id, user_id, username, action, details)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (chat_id, user_id, username, action, details),
-        )
-        await self.db.connection.commit()
+        async with self.db.transaction() as connection:
+            await connection.execute(
+                """
+                INSERT INTO action_logs (chat_id, user_id, username, action, details)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (chat_id, user_id, username, action, details),
+            )
 
     async def get_recent(self, limit: int = 20) -> list[ActionLog]:
         """Get recent action logs."""
@@ -49,19 +55,7 @@ class LogsRepository:
             "SELECT * FROM action_logs ORDER BY created_at DESC LIMIT ?",
             (limit,),
         )
-        rows = await cursor.fetchall()
-        return [
-            ActionLog(
-                id=row["id"],
-                chat_id=row["chat_id"],
-                user_id=row["user_id"],
-                username=row["username"],
-                action=row["action"],
-                details=row["details"],
-                created_at=datetime.fromisoformat(row["created_at"]),
-            )
-            for row in rows
-        ]
+        return await _ACTION_LOG.fetchall(cursor)
 
     async def get_by_chat(self, chat_id: int, limit: int = 20) -> list[ActionLog]:
         """Get action logs for a specific chat."""
@@ -74,16 +68,4 @@ class LogsRepository:
             """,
             (chat_id, limit),
         )
-        rows = await cursor.fetchall()
-        return [
-            ActionLog(
-                id=row["id"],
-                chat_id=row["chat_id"],
-                user_id=row["user_id"],
-                username=row["username"],
-                action=row["action"],
-                details=row["details"],
-                created_at=datetime.fromisoformat(row["created_at"]),
-            )
-            for row in rows
-        ]
+        return await _ACTION_LOG.fetchall(cursor)
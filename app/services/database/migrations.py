@@ -3,18 +3,83 @@
 A lightweight migration system for SQLite that:
 - Tracks applied migrations in a schema_version table
 - Discovers migration files from the versions/ directory
-- Applies pending migrations on startup
+- Applies pending migrations on startup, all in one transaction
+
+The versions are read from the file names (vNNN_name.py) once per
+process, so a boot with a current schema costs one MAX(version) query
+and imports no migration module.
 """
 
+import functools
 import importlib
 import logging
+import re
+import sqlite3
 from pathlib import Path
-from typing import Protocol, runtime_checkable
+from typing import Any, Iterable, Protocol, runtime_checkable
 
 import aiosqlite
 
 logger = logging.getLogger(__name__)
 
+VERSIONS_DIR = Path(__file__).parent / "versions"
+_VERSION_FILE = re.compile(r"^v(\d+)_\w+\.py$")
+
+
+@functools.cache
+def migration_manifest() -> dict[int, str]:
+    """Migration version -> module name, from the versions/ file names."""
+    manifest: dict[int, str] = {}
+    for file_path in VERSIONS_DIR.iterdir():
+        match = _VERSION_FILE.match(file_path.name)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in manifest:
+            raise RuntimeError(f"Duplicate migration version {version}: {file_path.name}")
+        manifest[version] = file_path.stem
+    return dict(sorted(manifest.items()))
+
+
+def split_script(script: str) -> list[str]:
+    """Split an SQL script into complete statements."""
+    statements = []
+    current = ""
+    for part in script.split(";"):
+        current += part + ";"
+        if sqlite3.complete_statement(current):
+            if current.strip(" \t\r\n;"):
+                statements.append(current.strip())
+            current = ""
+    return statements
+
+
+class TransactionConnection:
+    """Connection handed to migrations that run inside one transaction.
+
+    commit() is left to the manager, and executescript() runs statement
+    by statement because sqlite3's executescript() commits first.
+    """
+
+    def __init__(self, connection: aiosqlite.Connection):
+        self._connection = connection
+
+    async def execute(self, sql: str, parameters: Iterable[Any] = ()) -> aiosqlite.Cursor:
+        return await self._connection.execute(sql, parameters)
+
+    async def executemany(self, sql: str, parameters: Iterable[Iterable[Any]]) -> aiosqlite.Cursor:
+        return await self._connection.executemany(sql, parameters)
+
+    async def executescript(self, script: str) -> None:
+        for statement in split_script(script):
+            await self._connection.execute(statement)
+
+    async def commit(self) -> None:
+        pass
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._connection, name)
+
 
 @runtime_checkable
 class Migration(Protocol):
@@ -37,8 +102,27 @@ class MigrationManager:
     
     VERSIONS_PACKAGE = "app.services.database.versions"
     
-    def __init__(self, connection: aiosqlite.Connection):
+    def __init__(
+        self,
+        connection: aiosqlite.Connection,
+        manifest: dict[int, str] | None = None,
+    ):
         self.connection = connection
+        self.manifest = manifest if manifest is not None else migration_manifest()
+
+    @property
+    def latest_version(self) -> int:
+        """Newest version in the manifest."""
+        return max(self.manifest, default=0)
+
+    def load_migration(self, version: int) -> Migration:
+        """Import one migration module. Raises if it doesn't match the manifest."""
+        module = importlib.import_module(f"{self.VERSIONS_PACKAGE}.{self.manifest[version]}")
+        if getattr(module, "VERSION", None) != version or not hasattr(module, "upgrade"):
+            raise RuntimeError(
+                f"Migration {self.manifest[version]} must define VERSION = {version} and upgrade()"
+            )
+        return module
     
     async def init_schema_version_table(self) -> None:
         """Create the schema_version table if it doesn't exist."""
@@ -63,69 +147,58 @@ class MigrationManager:
             return 0
     
     def discover_migrations(self) -> list[Migration]:
-        """Discover all migration modules in the versions directory."""
-        migrations = []
-        versions_dir = Path(__file__).parent / "versions"
-        
-        for file_path in sorted(versions_dir.glob("v*.py")):
-            if file_path.name.startswith("__"):
-                continue
-            
-            module_name = f"{self.VERSIONS_PACKAGE}.{file_path.stem}"
-            try:
-                module = importlib.import_module(module_name)
-                if hasattr(module, "VERSION") and hasattr(module, "upgrade"):
-                    migrations.append(module)
-            except Exception as e:
-                logger.error(f"Failed to load migration {module_name}: {e}")
-        
-        # Sort by version number
-        migrations.sort(key=lambda m: m.VERSION)
-        return migrations
+        """Import all migration modules of the manifest, sorted by version."""
+        return [self.load_migration(version) for version in self.manifest]
     
     async def get_pending_migrations(self) -> list[Migration]:
-        """Get migrations that haven't been applied yet."""
+        """Get migrations that haven't been applied yet (only these are imported)."""
         current_version = await self.get_current_version()
-        all_migrations = self.discover_migrations()
-        return [m for m in all_migrations if m.VERSION > current_version]
+        return [
+            self.load_migration(version)
+            for version in self.manifest
+            if version > current_version
+        ]
     
     async def apply_migration(self, migration: Migration) -> None:
-        """Apply a single migration."""
-        logger.info(f"Applying migration v{migration.VERSION}: {migration.DESCRIPTION}")
-        
+        """Apply a single migration in its own transaction."""
+        await self.apply_migrations([migration])
+    
+    async def apply_migrations(self, migrations: list[Migration]) -> None:
+        """Apply migrations in one transaction: all of them or none."""
+        await self.connection.execute("BEGIN")
         try:
-            await migration.upgrade(self.connection)
-            
-            # Record the migration
-            await self.connection.execute(
-                "INSERT INTO schema_version (version, description) VALUES (?, ?)",
-                (migration.VERSION, migration.DESCRIPTION),
-            )
+            scoped = TransactionConnection(self.connection)
+            for migration in migrations:
+                logger.info(f"Applying migration v{migration.VERSION}: {migration.DESCRIPTION}")
+                await migration.upgrade(scoped)
+                await self.connection.execute(
+                    "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                    (migration.VERSION, migration.DESCRIPTION),
+                )
             await self.connection.commit()
-            
-            logger.info(f"Migration v{migration.VERSION} applied successfully")
         except Exception as e:
-            logger.error(f"Migration v{migration.VERSION} failed: {e}")
+            await self.connection.rollback()
+            logger.error(f"Migrations rolled back: {e}")
             raise
-    
+
     async def run_migrations(self) -> int:
         """Run all pending migrations.
         
         Returns:
             Number of migrations applied.
         """
+        # Fast path: schema_version is current, nothing to import
+        if await self.get_current_version() >= self.latest_version:
+            logger.info("Database is up to date")
+            return 0
+
         await self.init_schema_version_table()
-        
         pending = await self.get_pending_migrations()
         if not pending:
-            logger.info("Database is up to date")
             return 0
         
         logger.info(f"Found {len(pending)} pending migration(s)")
-        
-        for migration in pending:
-            await self.apply_migration(migration)
-        
+        await self.apply_migrations(pending)
         logger.info(f"Applied {len(pending)} migration(s)")
         return len(pending)
     
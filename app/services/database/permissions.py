@@ -2,8 +2,11 @@
 
 from dataclasses import dataclass
 from datetime import datetime
+from enum import IntFlag
 
 from app.services.database.connection import Database
+from app.services.database.rows import RowMapper
+from app.services.metrics import track_queries
 
 
 @dataclass
@@ -35,12 +38,150 @@ class SubdomainPermission:
     granted_at: datetime
 
 
+# Columns added by later migrations read as False on an older schema
+_DOMAIN_PERMISSION = RowMapper(
+    DomainPermission,
+    can_edit_dns=bool,
+    can_delete_dns=bool,
+    can_create_subdomain=bool,
+    can_delete_subdomain=bool,
+    granted_at=datetime.fromisoformat,
+)
+_SUBDOMAIN_PERMISSION = RowMapper(
+    SubdomainPermission,
+    can_edit_dns=bool,
+    can_delete_dns=bool,
+    can_delete_subdomain=bool,
+    granted_at=datetime.fromisoformat,
+)
+
+
+class Capability(IntFlag):
+    """Bits of effective_permissions.capability_bits."""
+
+    VIEW = 1
+    EDIT_DNS = 2
+    DELETE_DNS = 4
+    CREATE_SUBDOMAIN = 8
+    DELETE_SUBDOMAIN = 16
+    DOMAIN = 32  # direct domain grant
+    SUBDOMAIN = 64  # explicit subdomain grant
+    CREATOR = 128  # recorded creator of the subdomain
+
+
+# A domain grant also applies to every subdomain, including ones the bot
+# has never seen; those bits live on the domain's row, shifted by this
+SUBDOMAIN_SHIFT = 8
+OWN_BITS = (1 << SUBDOMAIN_SHIFT) - 1
+
+# What a parent domain grant or creating a subdomain may allow on a subdomain
+SUBDOMAIN_CAPABILITIES = (
+    Capability.VIEW | Capability.EDIT_DNS | Capability.DELETE_DNS | Capability.DELETE_SUBDOMAIN
+)
+
+# Capability bits contributed by each grant and creator record, per (chat, FQDN)
+_SOURCES = f"""
+    SELECT chat_id, domain_fqdn AS fqdn,
+        {Capability.DOMAIN | Capability.VIEW} | can_edit_dns * {Capability.EDIT_DNS}
+        | can_delete_dns * {Capability.DELETE_DNS}
+        | can_create_subdomain * {Capability.CREATE_SUBDOMAIN}
+        | (({Capability.VIEW} | can_edit_dns * {Capability.EDIT_DNS}
+            | can_delete_dns * {Capability.DELETE_DNS}
+            | can_delete_subdomain * {Capability.DELETE_SUBDOMAIN}) << {SUBDOMAIN_SHIFT}) AS bits
+    FROM domain_permissions
+    UNION ALL
+    SELECT chat_id, subdomain_fqdn,
+        {Capability.SUBDOMAIN | Capability.VIEW} | can_edit_dns * {Capability.EDIT_DNS}
+        | can_delete_dns * {Capability.DELETE_DNS}
+        | can_delete_subdomain * {Capability.DELETE_SUBDOMAIN}
+    FROM subdomain_permissions
+    UNION ALL
+    SELECT created.created_by_chat_id, created.subdomain_fqdn,
+        {Capability.CREATOR}
+        | CASE WHEN parent.can_create_subdomain THEN {SUBDOMAIN_CAPABILITIES} ELSE 0 END
+    FROM created_subdomains AS created
+    LEFT JOIN domain_permissions AS parent
+        ON parent.chat_id = created.created_by_chat_id
+        AND parent.domain_fqdn = substr(
+            created.subdomain_fqdn, instr(created.subdomain_fqdn, '.') + 1
+        )
+"""
+
+# SQLite has no bitwise OR aggregate: OR together the MAX of every single bit
+_BIT_OR = " | ".join(f"MAX(bits & {1 << bit})" for bit in range(2 * SUBDOMAIN_SHIFT))
+
+
+@track_queries
 class PermissionsRepository:
-    """Repository for managing domain/subdomain permissions."""
+    """Repository for managing domain/subdomain permissions.
+
+    Every grant, revoke and creator change also rebuilds the user's rows
+    in effective_permissions before committing, so checks read the
+    resolved capabilities with one lookup.
+    """
 
     def __init__(self, db: Database):
         self.db = db
 
+    # ============ Effective Permissions ============
+
+    async def get_capabilities(self, chat_id: int, fqdn: str) -> Capability:
+        """Get what a user may do on a domain or subdomain, inherited bits included."""
+        parent = self.extract_parent_domain(fqdn)
+        cursor = await self.db.connection.execute(
+            """
+            SELECT fqdn, capability_bits FROM effective_permissions
+            WHERE chat_id = ? AND fqdn IN (?, ?)
+            """,
+            (chat_id, fqdn, parent),
+        )
+        bits = 0
+        for row in await cursor.fetchall():
+            if row["fqdn"] == fqdn:
+                bits |= row["capability_bits"] & OWN_BITS
+            if row["fqdn"] == parent:
+                bits |= (row["capability_bits"] >> SUBDOMAIN_SHIFT) & SUBDOMAIN_CAPABILITIES
+        return Capability(bits)
+
+    async def get_effective_permissions(self, chat_id: int) -> dict[str, Capability]:
+        """Get the capabilities of a user on every FQDN they have a row for."""
+        cursor = await self.db.connection.execute(
+            "SELECT fqdn, capability_bits FROM effective_permissions WHERE chat_id = ?",
+            (chat_id,),
+        )
+        return {
+            row["fqdn"]: Capability(row["capability_bits"] & OWN_BITS)
+            for row in await cursor.fetchall()
+        }
+
+    async def _refresh_effective(self, chat_ids: set[int]) -> None:
+        """Rebuild effective_permissions rows of users (uncommitted)."""
+        for chat_id in chat_ids:
+            await self.db.connection.execute(
+                "DELETE FROM effective_permissions WHERE chat_id = ?", (chat_id,)
+            )
+            await self.db.connection.execute(
+                f"""
+                INSERT INTO effective_permissions (chat_id, fqdn, capability_bits)
+                SELECT chat_id, fqdn, {_BIT_OR} FROM ({_SOURCES})
+                WHERE chat_id = ?
+                GROUP BY fqdn
+                """,
+                (chat_id,),
+            )
+
+    async def _creators(self, subdomain_fqdns: list[str]) -> set[int]:
+        """Get the chats recorded as creators of subdomains."""
+        placeholders = ", ".join("?" * len(subdomain_fqdns))
+        cursor = await self.db.connection.execute(
+            f"""
+            SELECT DISTINCT created_by_chat_id FROM created_subdomains
+            WHERE subdomain_fqdn IN ({placeholders})
+            """,
+            subdomain_fqdns,
+        )
+        return {row["created_by_chat_id"] for row in await cursor.fetchall()}
+
     # ============ Domain Permissions ============
 
     async def grant_domain_access(
@@ -55,35 +196,37 @@ class PermissionsRepository:
     ) -> bool:
         """Grant or update domain access for a user. Returns True if successful."""
         try:
-            await self.db.connection.execute(
-                """
-                INSERT INTO domain_permissions 
+            async with self.db.transaction() as connection:
+                await connection.execute(
+                    """
+                    INSERT INTO domain_permissions 
+                        (chat_id, domain_fqdn, can_edit_dns, can_delete_dns, 
+                         can_create_subdomain, can_delete_subdomain, granted_by)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(chat_id, domain_fqdn) DO UPDATE SET
+                        can_edit_dns = excluded.can_edit_dns,
+                        can_delete_dns = excluded.can_delete_dns,
+                        can_create_subdomain = excluded.can_create_subdomain,
+                        can_delete_subdomain = excluded.can_delete_subdomain,
+                        granted_by = excluded.granted_by,
+                        granted_at = CURRENT_TIMESTAMP
+                    """,
                     (chat_id, domain_fqdn, can_edit_dns, can_delete_dns, 
-                     can_create_subdomain, can_delete_subdomain, granted_by)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(chat_id, domain_fqdn) DO UPDATE SET
-                    can_edit_dns = excluded.can_edit_dns,
-                    can_delete_dns = excluded.can_delete_dns,
-                    can_create_subdomain = excluded.can_create_subdomain,
-                    can_delete_subdomain = excluded.can_delete_subdomain,
-                    granted_by = excluded.granted_by,
-                    granted_at = CURRENT_TIMESTAMP
-                """,
-                (chat_id, domain_fqdn, can_edit_dns, can_delete_dns, 
-                 can_create, can_delete, granted_by),
-            )
-            await self.db.connection.commit()
+                     can_create, can_delete, granted_by),
+                )
+                await self._refresh_effective({chat_id})
             return True
         except Exception:
             return False
 
     async def revoke_domain_access(self, chat_id: int, domain_fqdn: str) -> bool:
         """Remove domain access from a user. Returns True if removed."""
-        cursor = await self.db.connection.execute(
-            "DELETE FROM domain_permissions WHERE chat_id = ? AND domain_fqdn = ?",
-            (chat_id, domain_fqdn),
-        )
-        await self.db.connection.commit()
+        async with self.db.transaction() as connection:
+            cursor = await connection.execute(
+                "DELETE FROM domain_permissions WHERE chat_id = ? AND domain_fqdn = ?",
+                (chat_id, domain_fqdn),
+            )
+            await self._refresh_effective({chat_id})
         return cursor.rowcount > 0
 
     async def get_user_domain_permissions(self, chat_id: int) -> list[DomainPermission]:
@@ -92,8 +235,7 @@ class PermissionsRepository:
             "SELECT * FROM domain_permissions WHERE chat_id = ? ORDER BY domain_fqdn",
             (chat_id,),
         )
-        rows = await cursor.fetchall()
-        return [self._row_to_domain_permission(row) for row in rows]
+        return await _DOMAIN_PERMISSION.fetchall(cursor)
 
     async def has_domain_access(self, chat_id: int, domain_fqdn: str) -> bool:
         """Check if user has access to a domain."""
@@ -111,10 +253,7 @@ class PermissionsRepository:
             "SELECT * FROM domain_permissions WHERE chat_id = ? AND domain_fqdn = ?",
             (chat_id, domain_fqdn),
         )
-        row = await cursor.fetchone()
-        if not row:
-            return None
-        return self._row_to_domain_permission(row)
+        return await _DOMAIN_PERMISSION.fetchone(cursor)
 
     async def get_domain_users(self, domain_fqdn: str) -> list[DomainPermission]:
         """Get all users with access to a domain."""
@@ -122,22 +261,7 @@ class PermissionsRepository:
             "SELECT * FROM domain_permissions WHERE domain_fqdn = ? ORDER BY chat_id",
             (domain_fqdn,),
         )
-        rows = await cursor.fetchall()
-        return [self._row_to_domain_permission(row) for row in rows]
-
-    def _row_to_domain_permission(self, row) -> DomainPermission:
-        """Convert database row to DomainPermission."""
-        return DomainPermission(
-            id=row["id"],
-            chat_id=row["chat_id"],
-            domain_fqdn=row["domain_fqdn"],
-            can_edit_dns=bool(row["can_edit_dns"]) if "can_edit_dns" in row.keys() else False,
-            can_delete_dns=bool(row["can_delete_dns"]) if "can_delete_dns" in row.keys() else False,
-            can_create_subdomain=bool(row["can_create_subdomain"]),
-            can_delete_subdomain=bool(row["can_delete_subdomain"]),
-            granted_by=row["granted_by"],
-            granted_at=datetime.fromisoformat(row["granted_at"]),
-        )
+        return await _DOMAIN_PERMISSION.fetchall(cursor)
 
     # ============ Subdomain Permissions ============
 
@@ -152,34 +276,36 @@ class PermissionsRepository:
     ) -> bool:
         """Grant subdomain-only access for a user. Returns True if successful."""
         try:
-            await self.db.connection.execute(
-                """
-                INSERT INTO subdomain_permissions 
+            async with self.db.transaction() as connection:
+                await connection.execute(
+                    """
+                    INSERT INTO subdomain_permissions 
+                        (chat_id, subdomain_fqdn, can_edit_dns, can_delete_dns, 
+                         can_delete_subdomain, granted_by)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(chat_id, subdomain_fqdn) DO UPDATE SET
+                        can_edit_dns = excluded.can_edit_dns,
+                        can_delete_dns = excluded.can_delete_dns,
+                        can_delete_subdomain = excluded.can_delete_subdomain,
+                        granted_by = excluded.granted_by,
+                        granted_at = CURRENT_TIMESTAMP
+                    """,
                     (chat_id, subdomain_fqdn, can_edit_dns, can_delete_dns, 
-                     can_delete_subdomain, granted_by)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ON CONFLICT(chat_id, subdomain_fqdn) DO UPDATE SET
-                    can_edit_dns = excluded.can_edit_dns,
-                    can_delete_dns = excluded.can_delete_dns,
-                    can_delete_subdomain = excluded.can_delete_subdomain,
-                    granted_by = excluded.granted_by,
-                    granted_at = CURRENT_TIMESTAMP
-                """,
-                (chat_id, subdomain_fqdn, can_edit_dns, can_delete_dns, 
-                 can_delete_subdomain, granted_by),
-            )
-            await self.db.connection.commit()
+                     can_delete_subdomain, granted_by),
+                )
+                await self._refresh_effective({chat_id})
             return True
         except Exception:
             return False
 
     async def revoke_subdomain_access(self, chat_id: int, subdomain_fqdn: str) -> bool:
         """Remove subdomain access from a user. Returns True if removed."""
-        cursor = await self.db.connection.execute(
-            "DELETE FROM subdomain_permissions WHERE chat_id = ? AND subdomain_fqdn = ?",
-            (chat_id, subdomain_fqdn),
-        )
-        await self.db.connection.commit()
+        async with self.db.transaction() as connection:
+            cursor = await connection.execute(
+                "DELETE FROM subdomain_permissions WHERE chat_id = ? AND subdomain_fqdn = ?",
+                (chat_id, subdomain_fqdn),
+            )
+            await self._refresh_effective({chat_id})
         return cursor.rowcount > 0
 
     async def get_user_subdomain_permissions(
@@ -190,8 +316,7 @@ class PermissionsRepository:
             "SELECT * FROM subdomain_permissions WHERE chat_id = ? ORDER BY subdomain_fqdn",
             (chat_id,),
         )
-        rows = await cursor.fetchall()
-        return [self._row_to_subdomain_permission(row) for row in rows]
+        return await _SUBDOMAIN_PERMISSION.fetchall(cursor)
 
     async def has_subdomain_access(self, chat_id: int, subdomain_fqdn: str) -> bool:
         """Check if user has explicit subdomain-only access."""
@@ -209,10 +334,7 @@ class PermissionsRepository:
             "SELECT * FROM subdomain_permissions WHERE chat_id = ? AND subdomain_fqdn = ?",
             (chat_id, subdomain_fqdn),
         )
-        row = await cursor.fetchone()
-        if not row:
-            return None
-        return self._row_to_subdomain_permission(row)
+        return await _SUBDOMAIN_PERMISSION.fetchone(cursor)
 
     async def get_subdomain_users(self, subdomain_fqdn: str) -> list[SubdomainPermission]:
         """Get all users with explicit access to a subdomain."""
@@ -220,21 +342,7 @@ class PermissionsRepository:
             "SELECT * FROM subdomain_permissions WHERE subdomain_fqdn = ? ORDER BY chat_id",
             (subdomain_fqdn,),
         )
-        rows = await cursor.fetchall()
-        return [self._row_to_subdomain_permission(row) for row in rows]
-
-    def _row_to_subdomain_permission(self, row) -> SubdomainPermission:
-        """Convert database row to SubdomainPermission."""
-        return SubdomainPermission(
-            id=row["id"],
-            chat_id=row["chat_id"],
-            subdomain_fqdn=row["subdomain_fqdn"],
-            can_edit_dns=bool(row["can_edit_dns"]) if "can_edit_dns" in row.keys() else False,
-            can_delete_dns=bool(row["can_delete_dns"]) if "can_delete_dns" in row.keys() else False,
-            can_delete_subdomain=bool(row["can_delete_subdomain"]) if "can_delete_subdomain" in row.keys() else False,
-            granted_by=row["granted_by"],
-            granted_at=datetime.fromisoformat(row["granted_at"]),
-        )
+        return await _SUBDOMAIN_PERMISSION.fetchall(cursor)
 
     # ============ Creator Tracking ============
 
@@ -243,18 +351,36 @@ class PermissionsRepository:
     ) -> bool:
         """Record who created a subdomain. Returns True if successful."""
         try:
-            await self.db.connection.execute(
+            async with self.db.transaction() as connection:
+                await connection.execute(
+                    """
+                    INSERT INTO created_subdomains (subdomain_fqdn, created_by_chat_id)
+                    VALUES (?, ?)
+                    ON CONFLICT(subdomain_fqdn) DO NOTHING
+                    """,
+                    (subdomain_fqdn, created_by_chat_id),
+                )
+                await self._refresh_effective({created_by_chat_id})
+            return True
+        except Exception:
+            return False
+
+    async def record_subdomain_creations(
+        self, subdomain_fqdns: list[str], created_by_chat_id: int
+    ) -> None:
+        """Record the creator of several subdomains in one transaction."""
+        if not subdomain_fqdns:
+            return
+        async with self.db.transaction() as connection:
+            await connection.executemany(
                 """
                 INSERT INTO created_subdomains (subdomain_fqdn, created_by_chat_id)
                 VALUES (?, ?)
                 ON CONFLICT(subdomain_fqdn) DO NOTHING
                 """,
-                (subdomain_fqdn, created_by_chat_id),
+                [(fqdn, created_by_chat_id) for fqdn in subdomain_fqdns],
             )
-            await self.db.connection.commit()
-            return True
-        except Exception:
-            return False
+            await self._refresh_effective({created_by_chat_id})
 
     async def get_subdomain_creator(self, subdomain_fqdn: str) -> int | None:
         """Get the chat_id of who created a subdomain."""
@@ -267,13 +393,27 @@ class PermissionsRepository:
 
     async def delete_subdomain_record(self, subdomain_fqdn: str) -> bool:
         """Remove creator record when subdomain is deleted. Returns True if removed."""
-        cursor = await self.db.connection.execute(
-            "DELETE FROM created_subdomains WHERE subdomain_fqdn = ?",
-            (subdomain_fqdn,),
-        )
-        await self.db.connection.commit()
+        async with self.db.transaction() as connection:
+            creators = await self._creators([subdomain_fqdn])
+            cursor = await connection.execute(
+                "DELETE FROM created_subdomains WHERE subdomain_fqdn = ?",
+                (subdomain_fqdn,),
+            )
+            await self._refresh_effective(creators)
         return cursor.rowcount > 0
 
+    async def delete_subdomain_records(self, subdomain_fqdns: list[str]) -> None:
+        """Remove creator records of several subdomains in one transaction."""
+        if not subdomain_fqdns:
+            return
+        async with self.db.transaction() as connection:
+            creators = await self._creators(subdomain_fqdns)
+            await connection.executemany(
+                "DELETE FROM created_subdomains WHERE subdomain_fqdn = ?",
+                [(fqdn,) for fqdn in subdomain_fqdns],
+            )
+            await self._refresh_effective(creators)
+
     async def get_user_created_subdomains(self, chat_id: int) -> list[str]:
         """Get all subdomains created by a user."""
         cursor = await self.db.connection.execute(
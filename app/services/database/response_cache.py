@@ -0,0 +1,122 @@
+"""Persistent Beget response cache repository."""
+
+from dataclasses import dataclass
+
+from app.services.database.connection import Database
+from app.services.database.rows import RowMapper
+from app.services.metrics import track_queries
+
+
+@dataclass
+class CachedResponse:
+    """A stored API answer. payload is compressed; times are Unix timestamps."""
+
+    content_hash: str
+    payload: bytes
+    stored_at: float
+    expires_at: float
+
+
+_CACHED_RESPONSE = RowMapper(CachedResponse)
+
+
+@track_queries
+class ResponseCacheRepository:
+    """Repository for the second-level Beget response cache."""
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    async def get(self, endpoint: str, params: str, now: float) -> CachedResponse | None:
+        """Get an answer that has not expired at now."""
+        cursor = await self.db.connection.execute(
+            """
+            SELECT content_hash, payload, stored_at, expires_at FROM beget_response_cache
+            WHERE endpoint = ? AND params = ? AND expires_at > ?
+            """,
+            (endpoint, params, now),
+        )
+        return await _CACHED_RESPONSE.fetchone(cursor)
+
+    async def put(
+        self,
+        endpoint: str,
+        params: str,
+        content_hash: str,
+        payload: bytes,
+        stored_at: float,
+        expires_at: float,
+    ) -> None:
+        """Store an answer, replacing the previous one."""
+        async with self.db.transaction() as connection:
+            await connection.execute(
+                """
+                INSERT INTO beget_response_cache
+                    (endpoint, params, content_hash, payload, size, stored_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(endpoint, params) DO UPDATE SET
+                    content_hash = excluded.content_hash,
+                    payload = excluded.payload,
+                    size = excluded.size,
+                    stored_at = excluded.stored_at,
+                    expires_at = excluded.expires_at
+                """,
+                (endpoint, params, content_hash, payload, len(payload), stored_at, expires_at),
+            )
+
+    async def refresh(
+        self, endpoint: str, params: str, content_hash: str, stored_at: float, expires_at: float
+    ) -> bool:
+        """Extend an answer whose content did not change. Returns False if it is not stored."""
+        async with self.db.transaction() as connection:
+            cursor = await connection.execute(
+                """
+                UPDATE beget_response_cache SET stored_at = ?, expires_at = ?
+                WHERE endpoint = ? AND params = ? AND content_hash = ?
+                """,
+                (stored_at, expires_at, endpoint, params, content_hash),
+            )
+        return cursor.rowcount > 0
+
+    async def delete(self, endpoint: str, params: str | None = None) -> None:
+        """Delete the answers of an endpoint, or of one call if params are given."""
+        query = "DELETE FROM beget_response_cache WHERE endpoint = ?"
+        args: tuple = (endpoint,)
+        if params is not None:
+            query += " AND params = ?"
+            args += (params,)
+        async with self.db.transaction() as connection:
+            await connection.execute(query, args)
+
+    async def evict(self, now: float, max_bytes: int) -> int:
+        """Delete expired answers, then the oldest until payloads fit max_bytes.
+
+        Returns the number of deleted answers.
+        """
+        async with self.db.transaction() as connection:
+            cursor = await connection.execute(
+                "DELETE FROM beget_response_cache WHERE expires_at <= ?", (now,)
+            )
+            deleted = cursor.rowcount
+            cursor = await connection.execute(
+                """
+                DELETE FROM beget_response_cache WHERE rowid IN (
+                    SELECT rowid FROM (
+                        SELECT rowid, SUM(size) OVER (ORDER BY stored_at DESC, rowid DESC) AS total
+                        FROM beget_response_cache
+                    )
+                    WHERE total > ?
+                )
+                """,
+                (max_bytes,),
+            )
+            deleted += cursor.rowcount
+        return deleted
+
+    async def total_size(self) -> int:
+        """Total size of stored payloads in bytes."""
+        cursor = await self.db.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM beget_response_cache"
+        )
+        (total,) = await cursor.fetchone()
+        return total
@@ -0,0 +1,81 @@
+"""Row mapping helpers for the repositories.
+
+RowMapper is installed as a cursor's row_factory, so sqlite3 builds the
+entity straight from the row tuple (in aiosqlite's worker thread) instead
+of going through aiosqlite.Row and a per-column name lookup. The column
+positions are resolved once per column set, i.e. once per query shape
+and schema version, into a list of (field, position, converter) sources.
+"""
+
+import dataclasses
+import sqlite3
+from typing import Any, Callable, Generic, TypeVar
+
+import aiosqlite
+
+T = TypeVar("T")
+
+
+class RowMapper(Generic[T]):
+    """Row factory mapping rows to a dataclass by column position.
+
+    Columns named like a field fill it, through its converter if one is
+    given. A field without a column gets its default, or None (so a
+    converter such as bool sees None) if it has none.
+    """
+
+    def __init__(self, entity: type[T], **converters: Callable[[Any], Any]):
+        self.entity = entity
+        self.converters = converters
+        self._fields = [field for field in dataclasses.fields(entity) if field.init]
+        self._compiled: dict[tuple[str, ...], Callable[[tuple], T]] = {}
+        self._last: tuple[Any, Callable[[tuple], T]] | None = None
+
+    def __call__(self, cursor: sqlite3.Cursor, row: tuple) -> T:
+        description = cursor.description
+        last = self._last
+        if last is None or last[0] is not description:
+            last = self._last = (description, self._compile(description))
+        return last[1](row)
+
+    def _compile(self, description: tuple) -> Callable[[tuple], T]:
+        """Build the constructor call for a column set."""
+        columns = tuple(column[0] for column in description)
+        build = self._compiled.get(columns)
+        if build is not None:
+            return build
+
+        # (name, column index or None, converter or None) per field to fill
+        sources = []
+        for field in self._fields:
+            if field.name in columns:
+                index = columns.index(field.name)
+            elif field.default is not dataclasses.MISSING or (
+                field.default_factory is not dataclasses.MISSING
+            ):
+                continue
+            else:
+                index = None
+            sources.append((field.name, index, self.converters.get(field.name)))
+
+        entity = self.entity
+
+        def build(row: tuple) -> T:
+            kwargs = {}
+            for name, index, convert in sources:
+                value = None if index is None else row[index]
+                kwargs[name] = value if convert is None else convert(value)
+            return entity(**kwargs)
+
+        self._compiled[columns] = build
+        return build
+
+    async def fetchone(self, cursor: aiosqlite.Cursor) -> T | None:
+        """Fetch the next row of an executed query as an entity."""
+        cursor.row_factory = self
+        return await cursor.fetchone()
+
+    async def fetchall(self, cursor: aiosqlite.Cursor) -> list[T]:
+        """Fetch the remaining rows of an executed query as entities."""
+        cursor.row_factory = self
+        return list(await cursor.fetchall())
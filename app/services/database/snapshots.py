@@ -0,0 +1,208 @@
+"""DNS snapshot repository."""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator
+
+from app.services.database.connection import Database
+from app.services.database.rows import RowMapper
+from app.services.metrics import track_queries
+
+# (record_type, value, priority)
+RecordTuple = tuple[str, str, int]
+
+
+@dataclass
+class SnapshotRecord:
+    """A single DNS record from the snapshot."""
+
+    fqdn: str
+    record_type: str
+    value: str
+    priority: int
+    fetched_at: datetime
+
+
+@dataclass
+class SnapshotEntry:
+    """Crawl state of one FQDN."""
+
+    fqdn: str
+    domain_id: int | None
+    content_hash: str | None
+    fetched_at: datetime | None
+    error: str | None
+
+
+@dataclass
+class SnapshotStats:
+    """Summary of the stored snapshot."""
+
+    fqdns: int
+    records: int
+    errors: int
+    oldest: datetime | None
+    newest: datetime | None
+
+
+def _format_ts(value: datetime) -> str:
+    return value.isoformat(sep=" ", timespec="seconds")
+
+
+def _parse_ts(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+_SNAPSHOT_ENTRY = RowMapper(SnapshotEntry, fetched_at=_parse_ts)
+_SNAPSHOT_RECORD = RowMapper(SnapshotRecord, fetched_at=datetime.fromisoformat)
+
+
+@track_queries
+class DnsSnapshotRepository:
+    """Repository for the account-wide DNS snapshot."""
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    async def save_records(
+        self,
+        fqdn: str,
+        domain_id: int | None,
+        records: list[RecordTuple],
+        content_hash: str,
+        fetched_at: datetime,
+    ) -> bool:
+        """Store the records of an FQDN. Returns True if its content changed.
+
+        Unchanged content only refreshes fetched_at, so re-crawls of a
+        stable zone don't rewrite its records.
+        """
+        async with self.db.transaction() as connection:
+            cursor = await connection.execute(
+                "SELECT content_hash FROM dns_snapshot_fqdns WHERE fqdn = ?", (fqdn,)
+            )
+            row = await cursor.fetchone()
+            changed = row is None or row["content_hash"] != content_hash
+            ts = _format_ts(fetched_at)
+
+            if changed:
+                await connection.execute(
+                    "DELETE FROM dns_snapshot_records WHERE fqdn = ?", (fqdn,)
+                )
+                await connection.executemany(
+                    """
+                    INSERT INTO dns_snapshot_records (fqdn, record_type, value, priority, fetched_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    [(fqdn, rtype, value, priority, ts) for rtype, value, priority in records],
+                )
+            await connection.execute(
+                """
+                INSERT INTO dns_snapshot_fqdns (fqdn, domain_id, content_hash, fetched_at, error)
+                VALUES (?, ?, ?, ?, NULL)
+                ON CONFLICT(fqdn) DO UPDATE SET
+                    domain_id = COALESCE(excluded.domain_id, dns_snapshot_fqdns.domain_id),
+                    content_hash = excluded.content_hash,
+                    fetched_at = excluded.fetched_at,
+                    error = NULL
+                """,
+                (fqdn, domain_id, content_hash, ts),
+            )
+        return changed
+
+    async def save_error(self, fqdn: str, domain_id: int | None, error: str) -> None:
+        """Remember a failed fetch, keeping the last good records."""
+        async with self.db.transaction() as connection:
+            await connection.execute(
+                """
+                INSERT INTO dns_snapshot_fqdns (fqdn, domain_id, error)
+                VALUES (?, ?, ?)
+                ON CONFLICT(fqdn) DO UPDATE SET
+                    domain_id = excluded.domain_id,
+                    error = excluded.error
+                """,
+                (fqdn, domain_id, error),
+            )
+
+    async def get_entries(self) -> dict[str, SnapshotEntry]:
+        """Get crawl state of all known FQDNs."""
+        cursor = await self.db.connection.execute("SELECT * FROM dns_snapshot_fqdns")
+        return {entry.fqdn: entry for entry in await _SNAPSHOT_ENTRY.fetchall(cursor)}
+
+    async def get_entry(self, fqdn: str) -> SnapshotEntry | None:
+        """Get crawl state of one FQDN."""
+        cursor = await self.db.connection.execute(
+            "SELECT * FROM dns_snapshot_fqdns WHERE fqdn = ?", (fqdn,)
+        )
+        return await _SNAPSHOT_ENTRY.fetchone(cursor)
+
+    async def get_records(self, fqdn: str) -> list[SnapshotRecord]:
+        """Get stored records of an FQDN."""
+        cursor = await self.db.connection.execute(
+            """
+            SELECT * FROM dns_snapshot_records
+            WHERE fqdn = ?
+            ORDER BY record_type, priority, id
+            """,
+            (fqdn,),
+        )
+        return await _SNAPSHOT_RECORD.fetchall(cursor)
+
+    async def get_all_records(self) -> list[SnapshotRecord]:
+        """Get every stored record."""
+        cursor = await self.db.connection.execute(
+            "SELECT * FROM dns_snapshot_records ORDER BY fqdn, record_type, priority, id"
+        )
+        return await _SNAPSHOT_RECORD.fetchall(cursor)
+
+    async def iter_records(
+        self, fqdns: list[str] | None = None
+    ) -> AsyncIterator[SnapshotRecord]:
+        """Stream stored records ordered by FQDN without loading them all."""
+        query = "SELECT * FROM dns_snapshot_records"
+        params: tuple = ()
+        if fqdns is not None:
+            query += f" WHERE fqdn IN ({','.join('?' * len(fqdns))})"
+            params = tuple(fqdns)
+        cursor = await self.db.connection.execute(
+            query + " ORDER BY fqdn, record_type, priority, id", params
+        )
+        cursor.row_factory = _SNAPSHOT_RECORD
+        try:
+            async for record in cursor:
+                yield record
+        finally:
+            await cursor.close()
+
+    async def remove_fqdns(self, fqdns: list[str]) -> int:
+        """Drop FQDNs that no longer exist in the account."""
+        if not fqdns:
+            return 0
+        params = [(fqdn,) for fqdn in fqdns]
+        async with self.db.transaction() as connection:
+            await connection.executemany(
+                "DELETE FROM dns_snapshot_records WHERE fqdn = ?", params
+            )
+            await connection.executemany(
+                "DELETE FROM dns_snapshot_fqdns WHERE fqdn = ?", params
+            )
+        return len(fqdns)
+
+    async def get_stats(self) -> SnapshotStats:
+        """Get snapshot totals and age."""
+        cursor = await self.db.connection.execute(
+            """
+            SELECT COUNT(*), COUNT(error), MIN(fetched_at), MAX(fetched_at)
+            FROM dns_snapshot_fqdns
+            """
+        )
+        fqdns, errors, oldest, newest = await cursor.fetchone()
+        cursor = await self.db.connection.execute("SELECT COUNT(*) FROM dns_snapshot_records")
+        (records,) = await cursor.fetchone()
+        return SnapshotStats(
+            fqdns=fqdns,
+            records=records,
+            errors=errors,
+            oldest=_parse_ts(oldest),
+            newest=_parse_ts(newest),
+        )
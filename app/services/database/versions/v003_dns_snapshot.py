@@ -0,0 +1,50 @@
+"""Migration 003: DNS snapshot.
+
+Adds tables for the account-wide DNS snapshot written by the crawler:
+- dns_snapshot_fqdns: one row per crawled FQDN with fetch time and content hash
+- dns_snapshot_records: normalized records (type, value, priority) per FQDN
+"""
+
+VERSION = 3
+DESCRIPTION = "Add DNS snapshot tables"
+
+
+async def upgrade(connection) -> None:
+    """Apply migration."""
+    await connection.executescript("""
+        CREATE TABLE IF NOT EXISTS dns_snapshot_fqdns (
+            fqdn TEXT PRIMARY KEY,
+            domain_id INTEGER,
+            content_hash TEXT,
+            fetched_at DATETIME,
+            error TEXT
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_dns_snapshot_fqdns_fetched_at
+        ON dns_snapshot_fqdns(fetched_at);
+
+        CREATE TABLE IF NOT EXISTS dns_snapshot_records (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            fqdn TEXT NOT NULL,
+            record_type TEXT NOT NULL,
+            value TEXT NOT NULL,
+            priority INTEGER NOT NULL DEFAULT 0,
+            fetched_at DATETIME NOT NULL
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_dns_snapshot_records_fqdn
+        ON dns_snapshot_records(fqdn);
+
+        CREATE INDEX IF NOT EXISTS idx_dns_snapshot_records_value
+        ON dns_snapshot_records(record_type, value);
+    """)
+    await connection.commit()
+
+
+async def downgrade(connection) -> None:
+    """Revert migration."""
+    await connection.executescript("""
+        DROP TABLE IF EXISTS dns_snapshot_records;
+        DROP TABLE IF EXISTS dns_snapshot_fqdns;
+    """)
+    await connection.commit()
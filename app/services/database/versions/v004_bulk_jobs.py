@@ -0,0 +1,46 @@
+"""Migration 004: Bulk jobs.
+
+Adds checkpoint tables for long-running bulk DNS jobs:
+- bulk_jobs: one row per job with its kind, parameters and status
+- bulk_job_items: one row per FQDN of a job with its progress
+"""
+
+VERSION = 4
+DESCRIPTION = "Add bulk job checkpoint tables"
+
+
+async def upgrade(connection) -> None:
+    """Apply migration."""
+    await connection.executescript("""
+        CREATE TABLE IF NOT EXISTS bulk_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            params TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'planned',
+            created_by TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_bulk_jobs_status
+        ON bulk_jobs(status);
+
+        CREATE TABLE IF NOT EXISTS bulk_job_items (
+            job_id INTEGER NOT NULL REFERENCES bulk_jobs(id) ON DELETE CASCADE,
+            fqdn TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            error TEXT,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (job_id, fqdn)
+        );
+    """)
+    await connection.commit()
+
+
+async def downgrade(connection) -> None:
+    """Revert migration."""
+    await connection.executescript("""
+        DROP TABLE IF EXISTS bulk_job_items;
+        DROP TABLE IF EXISTS bulk_jobs;
+    """)
+    await connection.commit()
@@ -0,0 +1,44 @@
+"""Migration 005: DNS change journal.
+
+Adds history for record changes made through the bot:
+- dns_journal: one row per change with the records it removed and added
+- dns_journal_state: latest known record set per FQDN
+"""
+
+VERSION = 5
+DESCRIPTION = "Add DNS change journal tables"
+
+
+async def upgrade(connection) -> None:
+    """Apply migration."""
+    await connection.executescript("""
+        CREATE TABLE IF NOT EXISTS dns_journal (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            fqdn TEXT NOT NULL,
+            record_types TEXT NOT NULL,
+            removed TEXT NOT NULL,
+            added TEXT NOT NULL,
+            complete INTEGER NOT NULL DEFAULT 1,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_dns_journal_fqdn
+        ON dns_journal(fqdn, id);
+
+        CREATE TABLE IF NOT EXISTS dns_journal_state (
+            fqdn TEXT PRIMARY KEY,
+            records TEXT NOT NULL,
+            journal_id INTEGER NOT NULL,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+    await connection.commit()
+
+
+async def downgrade(connection) -> None:
+    """Revert migration."""
+    await connection.executescript("""
+        DROP TABLE IF EXISTS dns_journal_state;
+        DROP TABLE IF EXISTS dns_journal;
+    """)
+    await connection.commit()
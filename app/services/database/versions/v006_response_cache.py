@@ -0,0 +1,36 @@
+"""Migration 006: persistent Beget response cache.
+
+Adds beget_response_cache, the second-level cache behind the in-memory
+response cache, so reads after a restart are served locally.
+"""
+
+VERSION = 6
+DESCRIPTION = "Add persistent Beget response cache"
+
+
+async def upgrade(connection) -> None:
+    """Apply migration."""
+    await connection.executescript("""
+        CREATE TABLE IF NOT EXISTS beget_response_cache (
+            endpoint TEXT NOT NULL,
+            params TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            payload BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            stored_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            PRIMARY KEY (endpoint, params)
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_beget_response_cache_stored
+        ON beget_response_cache(stored_at);
+    """)
+    await connection.commit()
+
+
+async def downgrade(connection) -> None:
+    """Revert migration."""
+    await connection.executescript("""
+        DROP TABLE IF EXISTS beget_response_cache;
+    """)
+    await connection.commit()
@@ -0,0 +1,66 @@
+"""Migration 007: materialized effective permissions.
+
+Adds effective_permissions, one row per (chat, FQDN) holding the
+capability bits resolved from domain grants, subdomain grants and
+subdomain creators, and fills it from the existing grants.
+PermissionsRepository keeps it current from then on.
+"""
+
+VERSION = 7
+DESCRIPTION = "Add materialized effective permissions"
+
+# Capability bits as of this migration (see permissions.Capability):
+# VIEW=1, EDIT_DNS=2, DELETE_DNS=4, CREATE_SUBDOMAIN=8, DELETE_SUBDOMAIN=16,
+# DOMAIN=32, SUBDOMAIN=64, CREATOR=128; bits a domain grant passes on
+# to its subdomains are stored shifted left by 8.
+BACKFILL = """
+    INSERT INTO effective_permissions (chat_id, fqdn, capability_bits)
+    SELECT chat_id, fqdn,
+        MAX(bits & 1) | MAX(bits & 2) | MAX(bits & 4) | MAX(bits & 8)
+        | MAX(bits & 16) | MAX(bits & 32) | MAX(bits & 64) | MAX(bits & 128)
+        | MAX(bits & 256) | MAX(bits & 512) | MAX(bits & 1024) | MAX(bits & 4096)
+    FROM (
+        SELECT chat_id, domain_fqdn AS fqdn,
+            32 | 1 | can_edit_dns * 2 | can_delete_dns * 4 | can_create_subdomain * 8
+            | ((1 | can_edit_dns * 2 | can_delete_dns * 4 | can_delete_subdomain * 16) << 8)
+            AS bits
+        FROM domain_permissions
+        UNION ALL
+        SELECT chat_id, subdomain_fqdn,
+            64 | 1 | can_edit_dns * 2 | can_delete_dns * 4 | can_delete_subdomain * 16
+        FROM subdomain_permissions
+        UNION ALL
+        SELECT created.created_by_chat_id, created.subdomain_fqdn,
+            128 | CASE WHEN parent.can_create_subdomain THEN 1 | 2 | 4 | 16 ELSE 0 END
+        FROM created_subdomains AS created
+        LEFT JOIN domain_permissions AS parent
+            ON parent.chat_id = created.created_by_chat_id
+            AND parent.domain_fqdn = substr(
+                created.subdomain_fqdn, instr(created.subdomain_fqdn, '.') + 1
+            )
+    )
+    GROUP BY chat_id, fqdn
+"""
+
+
+async def upgrade(connection) -> None:
+    """Apply migration."""
+    await connection.executescript("""
+        CREATE TABLE IF NOT EXISTS effective_permissions (
+            chat_id INTEGER NOT NULL,
+            fqdn TEXT NOT NULL,
+            capability_bits INTEGER NOT NULL,
+            PRIMARY KEY (chat_id, fqdn)
+        ) WITHOUT ROWID;
+    """)
+    await connection.execute("DELETE FROM effective_permissions")
+    await connection.execute(BACKFILL)
+    await connection.commit()
+
+
+async def downgrade(connection) -> None:
+    """Revert migration."""
+    await connection.executescript("""
+        DROP TABLE IF EXISTS effective_permissions;
+    """)
+    await connection.commit()
@@ -0,0 +1,41 @@
+"""Metrics services."""
+
+from app.services.metrics.registry import (
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+)
+from app.services.metrics.instruments import (
+    BEGET_CIRCUIT_OPEN,
+    BEGET_REQUEST_SECONDS,
+    CACHE_REQUESTS,
+    DB_QUERY_SECONDS,
+    HANDLER_SECONDS,
+    QUEUE_DEPTH,
+    STARTUP_PHASE_SECONDS,
+    UPDATES_DROPPED,
+    record_cache,
+    track_queries,
+)
+from app.services.metrics.server import MetricsServer
+
+__all__ = [
+    "REGISTRY",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "MetricsServer",
+    "BEGET_CIRCUIT_OPEN",
+    "BEGET_REQUEST_SECONDS",
+    "CACHE_REQUESTS",
+    "DB_QUERY_SECONDS",
+    "HANDLER_SECONDS",
+    "QUEUE_DEPTH",
+    "STARTUP_PHASE_SECONDS",
+    "UPDATES_DROPPED",
+    "record_cache",
+    "track_queries",
+]
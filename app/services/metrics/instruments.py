@@ -0,0 +1,102 @@
+"""Application metrics and instrumentation helpers.
+
+All metric families the bot exports are declared here so they can be
+found in one place. Components import the family they need and record
+into it directly.
+"""
+
+import functools
+import inspect
+import time
+from typing import Any, Callable, TypeVar
+
+from app.services.metrics.registry import REGISTRY
+from app.services.tracing import span
+
+T = TypeVar("T")
+
+BEGET_REQUEST_SECONDS = REGISTRY.histogram(
+    "beget_request_duration_seconds",
+    "Latency of Beget API requests by endpoint and outcome.",
+    ("endpoint", "status"),
+)
+
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    "db_query_duration_seconds",
+    "Latency of SQLite repository calls by repository and method.",
+    ("repository", "method"),
+)
+
+HANDLER_SECONDS = REGISTRY.histogram(
+    "handler_duration_seconds",
+    "Duration of update handlers by router and callback prefix or command.",
+    ("router", "prefix"),
+)
+
+CACHE_REQUESTS = REGISTRY.counter(
+    "cache_requests_total",
+    "Cache lookups by cache name and result (hit or miss).",
+    ("cache", "result"),
+)
+
+QUEUE_DEPTH = REGISTRY.gauge(
+    "queue_depth",
+    "Number of items currently waiting or in progress per queue.",
+    ("queue",),
+)
+
+BEGET_CIRCUIT_OPEN = REGISTRY.gauge(
+    "beget_circuit_open",
+    "1 while the Beget API circuit breaker is open, else 0.",
+)
+
+UPDATES_DROPPED = REGISTRY.counter(
+    "updates_dropped_total",
+    "Updates skipped without running a handler, by reason.",
+    ("reason",),
+)
+
+STARTUP_PHASE_SECONDS = REGISTRY.gauge(
+    "startup_phase_seconds",
+    "Duration of each phase of the last startup.",
+    ("phase",),
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a cache lookup."""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def track_queries(cls: type[T]) -> type[T]:
+    """Class decorator timing every public coroutine method of a repository.
+
+    Each call is recorded in db_query_duration_seconds labelled with the
+    repository class name and the method name, and runs inside a
+    "db.<Repository>.<method>" tracing span.
+    """
+    repository = cls.__name__
+    for name, func in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(func):
+            continue
+        setattr(cls, name, _timed_method(repository, name, func))
+    return cls
+
+
+def _timed_method(
+    repository: str, method: str, func: Callable[..., Any]
+) -> Callable[..., Any]:
+    span_name = f"db.{repository}.{method}"
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            with span(span_name):
+                return await func(*args, **kwargs)
+        finally:
+            DB_QUERY_SECONDS.observe(
+                time.perf_counter() - start, repository=repository, method=method
+            )
+
+    return wrapper
@@ -0,0 +1,240 @@
+"""Minimal in-process metrics registry with Prometheus text exposition.
+
+Implements just enough of the Prometheus data model for the bot:
+counters, gauges and histograms with string labels. Values live in
+plain dicts keyed by label tuples, so recording a sample is a dict
+lookup and an addition - cheap enough for every API call and query.
+"""
+
+import math
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+# Latency buckets in seconds, tuned for Telegram/Beget round-trips
+# (tens of milliseconds) up to the 15s Beget client timeout.
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 30.0,
+)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value for the text exposition format."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class Metric:
+    """Base class for a labelled metric family."""
+
+    TYPE = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        """Build the storage key for a set of labels."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"Metric {self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _format_labels(self, key: tuple[str, ...], extra: str = "") -> str:
+        """Render a label set as {a="x",b="y"}."""
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> list[str]:
+        """Render HELP/TYPE headers and samples."""
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.TYPE}",
+            *self._samples(),
+        ]
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Monotonically increasing counter."""
+
+    TYPE = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increase the counter."""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Current value for a label set."""
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> list[str]:
+        return [
+            f"{self.name}{self._format_labels(key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(Metric):
+    """Value that can go up and down (queue depths, in-flight work)."""
+
+    TYPE = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the gauge to a value."""
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increase the gauge."""
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        """Decrease the gauge."""
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        """Current value for a label set."""
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> list[str]:
+        return [
+            f"{self.name}{self._format_labels(key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Histogram(Metric):
+    """Cumulative histogram of observed values (usually seconds)."""
+
+    TYPE = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts..., sum, count]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record a single observation."""
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            state = [0.0] * (len(self.buckets) + 2)
+            self._values[key] = state
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                state[i] += 1
+                break
+        state[-2] += value
+        state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of a block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        """Number of observations for a label set."""
+        state = self._values.get(self._key(labels))
+        return int(state[-1]) if state else 0
+
+    def _samples(self) -> list[str]:
+        lines = []
+        for key, state in sorted(self._values.items()):
+            cumulative = 0.0
+            for bound, bucket_count in zip(self.buckets, state):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{self._format_labels(key, le)} {_format_value(cumulative)}"
+                )
+            inf = self._format_labels(key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf} {_format_value(state[-1])}")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {_format_value(state[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metric families rendered together.
+
+    Usage:
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests", ("endpoint",))
+        requests.inc(endpoint="domain/getList")
+        text = registry.render()
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def _register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        """Create and register a counter."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        """Create and register a gauge."""
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text format (version 0.0.4)."""
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide default registry, like prometheus_client.REGISTRY
+REGISTRY = MetricsRegistry()
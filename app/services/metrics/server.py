@@ -0,0 +1,56 @@
+"""HTTP endpoint serving metrics in Prometheus text format."""
+
+import logging
+
+from aiohttp import web
+
+from app.services.metrics.registry import REGISTRY, MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsServer:
+    """Small aiohttp server exposing GET /metrics.
+
+    Usage:
+        server = MetricsServer(host="127.0.0.1", port=9100)
+        await server.start()
+        ...
+        await server.stop()
+    """
+
+    def __init__(self, host: str, port: int, registry: MetricsRegistry = REGISTRY):
+        self.host = host
+        self.port = port
+        self.registry = registry
+        self._runner: web.AppRunner | None = None
+
+    def build_app(self) -> web.Application:
+        """Build the aiohttp application."""
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle_metrics)
+        return app
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(
+            body=self.registry.render().encode("utf-8"),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+    async def start(self) -> None:
+        """Start listening."""
+        if self._runner is not None:
+            return
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        logger.info(f"Metrics server listening on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -1,9 +1,11 @@
 """Permission checker for role-based access control."""
 
-from app.services.database.permissions import PermissionsRepository
+from app.services.database.permissions import Capability, PermissionsRepository
 from app.services.beget.types import Domain, Subdomain
+from app.services.tracing import trace_methods
 
 
+@trace_methods("permission")
 class PermissionChecker:
     """Central permission checking logic."""
 
@@ -19,7 +21,7 @@ class PermissionChecker:
         """Check if user can view a domain."""
         if self.is_admin(chat_id):
             return True
-        return await self.repo.has_domain_access(chat_id, domain_fqdn)
+        return Capability.DOMAIN in await self.repo.get_capabilities(chat_id, domain_fqdn)
 
     async def can_view_subdomain(self, chat_id: int, subdomain_fqdn: str) -> bool:
         """Check if user can view a subdomain.
@@ -30,34 +32,11 @@ class PermissionChecker:
         3. User has explicit subdomain-only access
         4. User created the subdomain (and has create permission on parent domain)
         """
-        if self.is_admin(chat_id):
-            return True
-
-        # Check parent domain access (inherits subdomain access)
-        parent_domain = self.repo.extract_parent_domain(subdomain_fqdn)
-        if await self.repo.has_domain_access(chat_id, parent_domain):
-            return True
-
-        # Check explicit subdomain-only access
-        if await self.repo.has_subdomain_access(chat_id, subdomain_fqdn):
-            return True
-
-        # Check creator privilege
-        perm = await self.repo.get_domain_permission(chat_id, parent_domain)
-        if perm and perm.can_create_subdomain:
-            creator = await self.repo.get_subdomain_creator(subdomain_fqdn)
-            if creator == chat_id:
-                return True
-
-        return False
+        return await self._allows(chat_id, subdomain_fqdn, Capability.VIEW)
 
     async def can_create_subdomain(self, chat_id: int, domain_fqdn: str) -> bool:
         """Check if user can create subdomains under a domain."""
-        if self.is_admin(chat_id):
-            return True
-
-        perm = await self.repo.get_domain_permission(chat_id, domain_fqdn)
-        return perm is not None and perm.can_create_subdomain
+        return await self._allows(chat_id, domain_fqdn, Capability.CREATE_SUBDOMAIN)
 
     async def can_delete_subdomain(self, chat_id: int, subdomain_fqdn: str) -> bool:
         """Check if user can delete a subdomain.
@@ -68,43 +47,14 @@ class PermissionChecker:
         3. User has explicit subdomain permission with can_delete_subdomain
         4. User created the subdomain AND has create permission on parent domain
         """
-        if self.is_admin(chat_id):
-            return True
-
-        parent_domain = self.repo.extract_parent_domain(subdomain_fqdn)
-        
-        # Check parent domain permission
-        perm = await self.repo.get_domain_permission(chat_id, parent_domain)
-        if perm and perm.can_delete_subdomain:
-            return True
-
-        # Check explicit subdomain permission
-        sub_perm = await self.repo.get_subdomain_permission(chat_id, subdomain_fqdn)
-        if sub_perm and sub_perm.can_delete_subdomain:
-            return True
-
-        # Creator privilege: can delete own subdomains if has create permission
-        if perm and perm.can_create_subdomain:
-            creator = await self.repo.get_subdomain_creator(subdomain_fqdn)
-            if creator == chat_id:
-                return True
-
-        return False
+        return await self._allows(chat_id, subdomain_fqdn, Capability.DELETE_SUBDOMAIN)
 
     async def can_view_dns(self, chat_id: int, fqdn: str) -> bool:
         """Check if user can view DNS records for a domain or subdomain.
         
         Viewing is allowed if user has any access to the domain/subdomain.
         """
-        if self.is_admin(chat_id):
-            return True
-
-        # Try as domain first
-        if await self.repo.has_domain_access(chat_id, fqdn):
-            return True
-
-        # Try as subdomain
-        return await self.can_view_subdomain(chat_id, fqdn)
+        return await self._allows(chat_id, fqdn, Capability.VIEW)
 
     async def can_edit_dns(self, chat_id: int, fqdn: str) -> bool:
         """Check if user can edit (add/change) DNS records.
@@ -113,36 +63,9 @@ class PermissionChecker:
         1. User is admin
         2. User has edit DNS permission on the domain
         3. For subdomains: user has edit DNS on subdomain OR inherits from parent domain
+        4. For subdomains: user created it and has create permission on parent domain
         """
-        if self.is_admin(chat_id):
-            return True
-
-        # Check as domain
-        domain_perm = await self.repo.get_domain_permission(chat_id, fqdn)
-        if domain_perm and domain_perm.can_edit_dns:
-            return True
-
-        # Check as subdomain
-        sub_perm = await self.repo.get_subdomain_permission(chat_id, fqdn)
-        if sub_perm and sub_perm.can_edit_dns:
-            return True
-
-        # Check parent domain permission for subdomains
-        parent_domain = self.repo.extract_parent_domain(fqdn)
-        if parent_domain != fqdn:
-            parent_perm = await self.repo.get_domain_permission(chat_id, parent_domain)
-            if parent_perm and parent_perm.can_edit_dns:
-                return True
-
-        # Creator privilege: can edit DNS of own subdomains
-        if parent_domain != fqdn:
-            parent_perm = await self.repo.get_domain_permission(chat_id, parent_domain)
-            if parent_perm and parent_perm.can_create_subdomain:
-                creator = await self.repo.get_subdomain_creator(fqdn)
-                if creator == chat_id:
-                    return True
-
-        return False
+        return await self._allows(chat_id, fqdn, Capability.EDIT_DNS)
 
     async def can_delete_dns(self, chat_id: int, fqdn: str) -> bool:
         """Check if user can delete DNS records.
@@ -151,36 +74,9 @@ class PermissionChecker:
         1. User is admin
         2. User has delete DNS permission on the domain
         3. For subdomains: user has delete DNS on subdomain OR inherits from parent domain
+        4. For subdomains: user created it and has create permission on parent domain
         """
-        if self.is_admin(chat_id):
-            return True
-
-        # Check as domain
-        domain_perm = await self.repo.get_domain_permission(chat_id, fqdn)
-        if domain_perm and domain_perm.can_delete_dns:
-            return True
-
-        # Check as subdomain
-        sub_perm = await self.repo.get_subdomain_permission(chat_id, fqdn)
-        if sub_perm and sub_perm.can_delete_dns:
-            return True
-
-        # Check parent domain permission for subdomains
-        parent_domain = self.repo.extract_parent_domain(fqdn)
-        if parent_domain != fqdn:
-            parent_perm = await self.repo.get_domain_permission(chat_id, parent_domain)
-            if parent_perm and parent_perm.can_delete_dns:
-                return True
-
-        # Creator privilege: can delete DNS of own subdomains
-        if parent_domain != fqdn:
-            parent_perm = await self.repo.get_domain_permission(chat_id, parent_domain)
-            if parent_perm and parent_perm.can_create_subdomain:
-                creator = await self.repo.get_subdomain_creator(fqdn)
-                if creator == chat_id:
-                    return True
-
-        return False
+        return await self._allows(chat_id, fqdn, Capability.DELETE_DNS)
 
     async def can_manage_dns(self, chat_id: int, fqdn: str) -> bool:
         """Check if user can manage (view) DNS records for a domain or subdomain.
@@ -190,6 +86,12 @@ class PermissionChecker:
         """
         return await self.can_view_dns(chat_id, fqdn)
 
+    async def _allows(self, chat_id: int, fqdn: str, capability: Capability) -> bool:
+        """Check one capability against the materialized effective permissions."""
+        if self.is_admin(chat_id):
+            return True
+        return capability in await self.repo.get_capabilities(chat_id, fqdn)
+
     async def filter_domains(
         self, chat_id: int, all_domains: list[Domain]
     ) -> list[Domain]:
@@ -197,26 +99,18 @@ class PermissionChecker:
         
         User can see a domain if they have:
         1. Direct domain permission, OR
-        2. Subdomain-only permission for any subdomain of that domain
+        2. Subdomain-only permission for any subdomain of that domain, OR
+        3. Created any subdomain of that domain
         """
         if self.is_admin(chat_id):
             return all_domains
 
-        # Get domains with direct access
-        user_permissions = await self.repo.get_user_domain_permissions(chat_id)
-        allowed_fqdns = {p.domain_fqdn for p in user_permissions}
-
-        # Also include parent domains of subdomain-only permissions
-        subdomain_perms = await self.repo.get_user_subdomain_permissions(chat_id)
-        for sp in subdomain_perms:
-            parent = self.repo.extract_parent_domain(sp.subdomain_fqdn)
-            allowed_fqdns.add(parent)
-
-        # Also include parent domains of created subdomains
-        created_subs = await self.repo.get_user_created_subdomains(chat_id)
-        for sub_fqdn in created_subs:
-            parent = self.repo.extract_parent_domain(sub_fqdn)
-            allowed_fqdns.add(parent)
+        allowed_fqdns = set()
+        for fqdn, capabilities in (await self.repo.get_effective_permissions(chat_id)).items():
+            if Capability.DOMAIN in capabilities:
+                allowed_fqdns.add(fqdn)
+            if capabilities & (Capability.SUBDOMAIN | Capability.CREATOR):
+                allowed_fqdns.add(self.repo.extract_parent_domain(fqdn))
 
         return [d for d in all_domains if d.fqdn in allowed_fqdns]
 
@@ -234,19 +128,19 @@ class PermissionChecker:
         if self.is_admin(chat_id):
             return all_subdomains
 
+        effective = await self.repo.get_effective_permissions(chat_id)
+        domain = effective.get(domain_fqdn, Capability(0))
+
         # User with domain access can see all subdomains
-        if await self.repo.has_domain_access(chat_id, domain_fqdn):
+        if Capability.DOMAIN in domain:
             return all_subdomains
 
-        # Otherwise, filter to permitted subdomains
-        user_subdomain_perms = await self.repo.get_user_subdomain_permissions(chat_id)
-        allowed_fqdns = {p.subdomain_fqdn for p in user_subdomain_perms}
-
-        # Also include created subdomains if user has create permission
-        perm = await self.repo.get_domain_permission(chat_id, domain_fqdn)
-        if perm and perm.can_create_subdomain:
-            created = await self.repo.get_user_created_subdomains(chat_id)
-            allowed_fqdns.update(created)
+        # Otherwise, filter to permitted subdomains, and created ones if user
+        # has create permission
+        shown = Capability.SUBDOMAIN
+        if Capability.CREATE_SUBDOMAIN in domain:
+            shown |= Capability.CREATOR
+        allowed_fqdns = {fqdn for fqdn, capabilities in effective.items() if capabilities & shown}
 
         return [s for s in all_subdomains if s.fqdn in allowed_fqdns]
 
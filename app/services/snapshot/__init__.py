@@ -0,0 +1,23 @@
+"""DNS snapshot services."""
+
+from app.services.snapshot.crawler import (
+    CrawlResult,
+    DnsCrawler,
+    content_hash,
+    normalize_records,
+)
+from app.services.snapshot.drift import DriftChange, DriftDetector
+from app.services.snapshot.index import ReverseIndex
+from app.services.snapshot.journal import DnsJournal, JournalError
+
+__all__ = [
+    "CrawlResult",
+    "DnsCrawler",
+    "content_hash",
+    "DriftChange",
+    "DriftDetector",
+    "normalize_records",
+    "ReverseIndex",
+    "DnsJournal",
+    "JournalError",
+]
@@ -0,0 +1,254 @@
+"""Account-wide DNS snapshot crawler.
+
+Lists every domain and subdomain of the Beget account, fetches
+dns/getData for each FQDN concurrently under a shared rate limit and
+stores the normalized records in DnsSnapshotRepository. An incremental
+crawl only re-fetches FQDNs that are new, failed last time or older
+than the given age.
+
+record_change() is registered as a BegetClientManager change listener,
+so records changed through the bot update the snapshot and the reverse
+index right away instead of at the next crawl.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+from app.services.beget.dns import DnsService
+from app.services.beget.domains import DomainsService
+from app.services.beget.types import DnsData
+from app.services.database.snapshots import DnsSnapshotRepository, RecordTuple
+from app.services.snapshot.index import ReverseIndex
+from app.utils.rate_limit import RateLimiter
+
+if TYPE_CHECKING:
+    from app.services.beget.manager import BegetClientManager
+
+logger = logging.getLogger(__name__)
+
+# Record types kept in the snapshot, in DnsData attribute order
+SNAPSHOT_TYPES = ("A", "AAAA", "MX", "TXT", "CNAME", "NS")
+
+# Types replaced by a dns/changeRecords call with A/MX/TXT records (group 1)
+CHANGE_GROUP = ("A", "MX", "TXT")
+
+
+def utcnow() -> datetime:
+    """Naive UTC timestamp, same convention as SQLite CURRENT_TIMESTAMP."""
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+def normalize_records(dns_data: DnsData) -> list[RecordTuple]:
+    """Flatten DnsData into sorted (type, value, priority) tuples."""
+    records = []
+    for record_type in SNAPSHOT_TYPES:
+        for r in getattr(dns_data, record_type.lower()):
+            records.append((record_type, r.value, r.priority))
+    records.sort()
+    return records
+
+
+def records_from_change(records: dict[str, list[dict[str, Any]]]) -> list[RecordTuple]:
+    """Normalize a changeRecords payload the way get_dns_data() reads it back.
+
+    Only MX priorities survive a round-trip; other types read back as 10.
+    """
+    normalized = [
+        (record_type, str(r["value"]), int(r.get("priority", 10)) if record_type == "MX" else 10)
+        for record_type, items in records.items()
+        for r in items
+    ]
+    normalized.sort()
+    return normalized
+
+
+def content_hash(records: list[RecordTuple]) -> str:
+    """Stable hash of normalized records."""
+    payload = json.dumps(records, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+@dataclass
+class CrawlResult:
+    """Outcome of one crawl."""
+
+    total: int  # FQDNs in the account
+    fetched: int
+    changed: int
+    failed: int
+    removed: int
+    duration: float
+
+
+class DnsCrawler:
+    """Fetch DNS of all FQDNs into the snapshot tables."""
+
+    def __init__(
+        self,
+        manager: "BegetClientManager",
+        repo: DnsSnapshotRepository,
+        concurrency: int = 4,
+        rate_per_sec: float = 5.0,
+        index: ReverseIndex | None = None,
+    ):
+        self.manager = manager
+        self.repo = repo
+        self.index = index
+        self.concurrency = max(concurrency, 1)
+        self.limiter = RateLimiter(rate_per_sec, burst=self.concurrency)
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def list_fqdns(self) -> dict[str, int]:
+        """All domain and subdomain FQDNs of the account -> domain_id."""
+        async with self.manager.client() as client:
+            service = DomainsService(client)
+            domains = await service.get_domains(fresh=True)
+            subdomains = await service.get_all_subdomains(fresh=True)
+
+        fqdns = {d.fqdn: d.id for d in domains}
+        for domain_id, subs in subdomains.items():
+            for sub in subs:
+                fqdns.setdefault(sub.fqdn, domain_id)
+        return fqdns
+
+    async def crawl(self, stale_after: timedelta | None = None) -> CrawlResult:
+        """Crawl the account.
+
+        With stale_after set, FQDNs fetched successfully within that
+        window are skipped. FQDNs no longer in the account are removed.
+        """
+        start = time.perf_counter()
+        fqdns = await self.list_fqdns()
+        entries = await self.repo.get_entries()
+
+        gone = [fqdn for fqdn in entries if fqdn not in fqdns]
+        removed = await self.repo.remove_fqdns(gone)
+        if self.index is not None:
+            for fqdn in gone:
+                self.index.remove(fqdn)
+
+        targets = list(fqdns)
+        if stale_after is not None:
+            cutoff = utcnow() - stale_after
+            targets = [
+                fqdn for fqdn in targets
+                if (entry := entries.get(fqdn)) is None
+                or entry.error
+                or entry.fetched_at is None
+                or entry.fetched_at < cutoff
+            ]
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        outcomes = await asyncio.gather(
+            *(self._crawl_one(semaphore, fqdn, fqdns[fqdn]) for fqdn in targets)
+        )
+
+        result = CrawlResult(
+            total=len(fqdns),
+            fetched=sum(1 for o in outcomes if o is not None),
+            changed=sum(1 for o in outcomes if o),
+            failed=sum(1 for o in outcomes if o is None),
+            removed=removed,
+            duration=time.perf_counter() - start,
+        )
+        logger.info(
+            f"DNS crawl: {result.fetched}/{len(targets)} fetched, {result.changed} changed, "
+            f"{result.failed} failed, {result.removed} removed in {result.duration:.1f}s"
+        )
+        return result
+
+    async def _crawl_one(
+        self, semaphore: asyncio.Semaphore, fqdn: str, domain_id: int
+    ) -> bool | None:
+        """Fetch and store one FQDN. Returns changed flag, None on failure."""
+        async with semaphore:
+            try:
+                async with self.limiter:
+                    async with self.manager.client() as client:
+                        dns_data = await DnsService(client).get_dns_data(fqdn, fresh=True)
+            except Exception as e:
+                logger.warning(f"DNS crawl failed for {fqdn}: {e}")
+                await self.repo.save_error(fqdn, domain_id, str(e))
+                return None
+
+        records = normalize_records(dns_data)
+        changed = await self.repo.save_records(
+            fqdn, domain_id, records, content_hash(records), utcnow()
+        )
+        if changed and self.index is not None:
+            self.index.replace(fqdn, records)
+        return changed
+
+    async def record_change(
+        self,
+        fqdn: str,
+        records: dict[str, list[dict[str, Any]]],
+        before: DnsData | None = None,
+    ) -> None:
+        """Change listener: apply records written through the bot.
+
+        FQDNs not in the snapshot yet are only indexed; their other
+        record groups are unknown until they are crawled. before is
+        not needed, the kept groups come from the snapshot itself.
+        """
+        replaced = set(CHANGE_GROUP) | set(records)
+        changed = records_from_change(records)
+
+        if await self.repo.get_entry(fqdn) is None:
+            if self.index is not None:
+                self.index.replace(fqdn, changed, record_types=replaced)
+            return
+
+        kept = [
+            (r.record_type, r.value, r.priority)
+            for r in await self.repo.get_records(fqdn)
+            if r.record_type not in replaced
+        ]
+        merged = sorted(kept + changed)
+        await self.repo.save_records(fqdn, None, merged, content_hash(merged), utcnow())
+        if self.index is not None:
+            self.index.replace(fqdn, merged)
+
+    def start(
+        self,
+        stale_after: timedelta | None = None,
+        on_done: Callable[[CrawlResult | None, Exception | None], Awaitable[None]] | None = None,
+    ) -> bool:
+        """Run a crawl in the background. Returns False if one is already running."""
+        if self.running:
+            return False
+        self._task = asyncio.create_task(self._run(stale_after, on_done))
+        return True
+
+    async def _run(self, stale_after, on_done) -> None:
+        result, error = None, None
+        try:
+            result = await self.crawl(stale_after)
+        except Exception as e:
+            logger.error(f"DNS crawl failed: {e}")
+            error = e
+        if on_done is not None:
+            try:
+                await on_done(result, error)
+            except Exception as e:
+                logger.warning(f"DNS crawl report failed: {e}")
+
+    async def stop(self) -> None:
+        """Cancel a running background crawl."""
+        if self.running:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
@@ -0,0 +1,169 @@
+"""Scheduled DNS drift detection.
+
+Changes made in the Beget control panel bypass the bot's change
+listeners, so the snapshot silently goes stale. DriftDetector re-fetches
+dns/getData on a schedule within a budget of calls per hour, recently
+used FQDNs first (at most half of each run, and each only once per use)
+and then those checked longest ago, compares content hashes with the
+snapshot and only writes FQDNs whose records changed.
+The changes of one run are handed to on_drift as a single digest.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from app.services.beget.dns import DnsService
+from app.services.database.snapshots import RecordTuple, SnapshotEntry
+from app.services.snapshot.crawler import DnsCrawler, content_hash, normalize_records, utcnow
+from app.services.snapshot.journal import diff_records
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DriftChange:
+    """Records of an FQDN changed outside the bot."""
+
+    fqdn: str
+    removed: list[RecordTuple]
+    added: list[RecordTuple]
+
+
+DriftCallback = Callable[[list[DriftChange]], Awaitable[None]]
+
+
+class DriftDetector:
+    """Re-check snapshot FQDNs against the live zone on a schedule."""
+
+    def __init__(
+        self,
+        crawler: DnsCrawler,
+        calls_per_hour: int = 120,
+        interval: float = 900.0,
+        max_recent: int = 1000,
+    ):
+        self.crawler = crawler
+        self.repo = crawler.repo
+        self.calls_per_hour = calls_per_hour
+        self.interval = interval
+        self.max_recent = max_recent
+        # fqdn -> monotonic time of last use, most recent last; dropped once
+        # the FQDN has been checked after that use
+        self._recent: OrderedDict[str, float] = OrderedDict()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def budget(self) -> int:
+        """dns/getData calls per run."""
+        return max(1, round(self.calls_per_hour * self.interval / 3600))
+
+    def touch(self, fqdn: str) -> None:
+        """Mark an FQDN as recently used so it is checked first."""
+        self._recent[fqdn] = time.monotonic()
+        self._recent.move_to_end(fqdn)
+        if len(self._recent) > self.max_recent:
+            self._recent.popitem(last=False)
+
+    def priority_order(self, entries: dict[str, SnapshotEntry]) -> list[str]:
+        """Recently used FQDNs (newest first), then the rest by last fetch.
+
+        Only half of a run's budget goes to recent FQDNs, so the others keep
+        rotating however many FQDNs are in use; the remaining recent ones
+        queue up with the rest by their last fetch.
+        """
+        recent = list(reversed(self._recent))[: max(1, self.budget // 2)]
+        seen = set(recent)
+
+        def last_fetch(fqdn: str) -> tuple:
+            entry = entries.get(fqdn)
+            fetched_at = entry.fetched_at if entry else None
+            return (fetched_at is not None, fetched_at or 0)
+
+        rest = sorted(
+            (fqdn for fqdn in entries.keys() | self._recent.keys() if fqdn not in seen),
+            key=lambda fqdn: (last_fetch(fqdn), fqdn),
+        )
+        return recent + rest
+
+    async def run_once(self) -> list[DriftChange]:
+        """Check the next budget of FQDNs. Returns detected changes."""
+        entries = await self.repo.get_entries()
+        targets = self.priority_order(entries)[: self.budget]
+        semaphore = asyncio.Semaphore(self.crawler.concurrency)
+        results = await asyncio.gather(
+            *(self._check_one(semaphore, fqdn, entries.get(fqdn)) for fqdn in targets)
+        )
+        changes = [change for change in results if change is not None]
+        logger.info(f"DNS drift check: {len(targets)} FQDNs checked, {len(changes)} changed")
+        return changes
+
+    async def _check_one(
+        self, semaphore: asyncio.Semaphore, fqdn: str, entry: SnapshotEntry | None
+    ) -> DriftChange | None:
+        """Fetch one FQDN and store it if its content hash changed."""
+        touched = self._recent.get(fqdn)
+        async with semaphore:
+            try:
+                async with self.crawler.limiter:
+                    async with self.crawler.manager.client() as client:
+                        dns_data = await DnsService(client).get_dns_data(fqdn, fresh=True)
+            except Exception as e:
+                logger.warning(f"DNS drift check failed for {fqdn}: {e}")
+                return None
+        if touched is not None and self._recent.get(fqdn) == touched:
+            del self._recent[fqdn]  # checked since its last use
+
+        records = normalize_records(dns_data)
+        digest = content_hash(records)
+        if entry is None or entry.content_hash is None or entry.content_hash == digest:
+            # No baseline to compare with, or unchanged: store and move on
+            await self.repo.save_records(fqdn, None, records, digest, utcnow())
+            if entry is None and self.crawler.index is not None:
+                self.crawler.index.replace(fqdn, records)
+            return None
+
+        old = [(r.record_type, r.value, r.priority) for r in await self.repo.get_records(fqdn)]
+        await self.repo.save_records(fqdn, None, records, digest, utcnow())
+        if self.crawler.index is not None:
+            self.crawler.index.replace(fqdn, records)
+        removed, added = diff_records(old, records)
+        return DriftChange(fqdn=fqdn, removed=removed, added=added)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, on_drift: DriftCallback | None = None) -> None:
+        """Run checks every interval in the background."""
+        if not self.running:
+            self._task = asyncio.create_task(self._loop(on_drift))
+
+    async def _loop(self, on_drift: DriftCallback | None) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            if self.crawler.running:
+                continue  # a crawl is refreshing the snapshot anyway
+            try:
+                changes = await self.run_once()
+            except Exception as e:
+                logger.error(f"DNS drift check failed: {e}")
+                continue
+            if changes and on_drift is not None:
+                try:
+                    await on_drift(changes)
+                except Exception as e:
+                    logger.warning(f"DNS drift report failed: {e}")
+
+    async def stop(self) -> None:
+        """Stop scheduled checks."""
+        if self.running:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
@@ -0,0 +1,112 @@
+"""Reverse index from DNS record values to FQDNs.
+
+Answers "which FQDNs point at 1.2.3.4" (or at a CNAME target, or carry
+a TXT token) from memory. It is loaded from the DNS snapshot at startup,
+updated by the crawler, and kept current on every change_records()
+through a BegetClientManager change listener.
+"""
+
+import re
+from collections import defaultdict
+from typing import Iterable
+
+from app.services.database.snapshots import DnsSnapshotRepository, RecordTuple
+
+_TOKEN_SPLIT = re.compile(r"[\s;,\"]+")
+
+
+def normalize_value(value: str) -> str:
+    """Lookup form of a record value: lowercase, no trailing dot."""
+    return value.strip().lower().rstrip(".")
+
+
+def value_terms(record_type: str, value: str) -> set[str]:
+    """Terms a record is found by: its value, plus tokens for TXT records.
+
+    "v=spf1 include:_spf.example.com ~all" is also found by
+    "include:_spf.example.com" and "_spf.example.com".
+    """
+    normalized = normalize_value(value)
+    terms = {normalized}
+    if record_type == "TXT":
+        for token in _TOKEN_SPLIT.split(normalized):
+            if not token:
+                continue
+            terms.add(token)
+            for sep in (":", "="):
+                if sep in token:
+                    tail = token.rsplit(sep, 1)[1]
+                    if tail:
+                        terms.add(tail)
+    return terms
+
+
+class ReverseIndex:
+    """In-memory value -> FQDN index."""
+
+    def __init__(self) -> None:
+        # term -> {(record_type, fqdn)}
+        self._terms: dict[str, set[tuple[str, str]]] = defaultdict(set)
+        # fqdn -> {record_type: [terms]} for removal on update
+        self._fqdns: dict[str, dict[str, list[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._fqdns)
+
+    async def load(self, repo: DnsSnapshotRepository) -> None:
+        """Rebuild from the stored snapshot."""
+        by_fqdn: dict[str, list[RecordTuple]] = defaultdict(list)
+        for r in await repo.get_all_records():
+            by_fqdn[r.fqdn].append((r.record_type, r.value, r.priority))
+        self._terms.clear()
+        self._fqdns.clear()
+        for fqdn, records in by_fqdn.items():
+            self.replace(fqdn, records)
+
+    def replace(
+        self,
+        fqdn: str,
+        records: Iterable[RecordTuple],
+        record_types: Iterable[str] | None = None,
+    ) -> None:
+        """Set the records of an FQDN.
+
+        With record_types, only those types are replaced and the others
+        are kept (a changeRecords call only touches its record group).
+        """
+        fqdn = normalize_value(fqdn)
+        current = self._fqdns.setdefault(fqdn, {})
+        replaced = set(record_types) if record_types is not None else set(current)
+
+        for record_type in replaced:
+            for term in current.pop(record_type, []):
+                self._discard(term, record_type, fqdn)
+
+        for record_type, value, _ in records:
+            if record_types is not None and record_type not in replaced:
+                continue
+            for term in value_terms(record_type, value):
+                self._terms[term].add((record_type, fqdn))
+                current.setdefault(record_type, []).append(term)
+
+        if not current:
+            del self._fqdns[fqdn]
+
+    def remove(self, fqdn: str) -> None:
+        """Forget an FQDN."""
+        self.replace(fqdn, [])
+
+    def lookup(self, value: str) -> dict[str, list[str]]:
+        """FQDNs having a record with this value or TXT token, by record type."""
+        found: dict[str, set[str]] = defaultdict(set)
+        for record_type, fqdn in self._terms.get(normalize_value(value), ()):
+            found[record_type].add(fqdn)
+        return {record_type: sorted(fqdns) for record_type, fqdns in sorted(found.items())}
+
+    def _discard(self, term: str, record_type: str, fqdn: str) -> None:
+        entries = self._terms.get(term)
+        if entries is None:
+            return
+        entries.discard((record_type, fqdn))
+        if not entries:
+            del self._terms[term]
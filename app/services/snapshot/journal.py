@@ -0,0 +1,157 @@
+"""DNS change journal with point-in-time rollback.
+
+dns/changeRecords replaces whole record groups and Beget keeps no
+history. DnsJournal is registered as a BegetClientManager change
+listener and stores every change as the records it removed and added
+within the groups it replaced, plus the resulting record set per FQDN.
+
+Rolling back to before entry N starts from that latest state and undoes
+N and every later entry of the FQDN in reverse order, then writes the
+rebuilt groups with a single dns/changeRecords call. The rollback is
+itself journaled, so it can be undone the same way.
+"""
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from app.services.beget.dns import DnsService
+from app.services.beget.types import DnsData
+from app.services.database.journal import DnsJournalRepository, JournalEntry
+from app.services.database.snapshots import DnsSnapshotRepository, RecordTuple
+from app.services.snapshot.crawler import (
+    CHANGE_GROUP,
+    SNAPSHOT_TYPES,
+    normalize_records,
+    records_from_change,
+)
+
+if TYPE_CHECKING:
+    from app.services.beget.manager import BegetClientManager
+
+logger = logging.getLogger(__name__)
+
+
+class JournalError(Exception):
+    """A past record set cannot be rebuilt from the journal."""
+
+
+def diff_records(
+    before: list[RecordTuple], after: list[RecordTuple]
+) -> tuple[list[RecordTuple], list[RecordTuple]]:
+    """Records removed and added between two record sets."""
+    old, new = set(before), set(after)
+    return sorted(old - new), sorted(new - old)
+
+
+def undo_entry(state: list[RecordTuple], entry: JournalEntry) -> list[RecordTuple]:
+    """Record set as it was before an entry was applied."""
+    return sorted((set(state) - set(entry.added)) | set(entry.removed))
+
+
+def build_payload(
+    records: list[RecordTuple], record_types: set[str]
+) -> dict[str, list[dict[str, Any]]]:
+    """changeRecords payload writing record_types from a record set.
+
+    Only MX priorities are meaningful; other types are numbered in
+    order the same way DnsService builds them.
+    """
+    payload: dict[str, list[dict[str, Any]]] = {}
+    for record_type in SNAPSHOT_TYPES:
+        if record_type not in record_types:
+            continue
+        values = [(value, priority) for t, value, priority in records if t == record_type]
+        if not values:
+            continue
+        payload[record_type] = [
+            {"value": value, "priority": priority if record_type == "MX" else (i + 1) * 10}
+            for i, (value, priority) in enumerate(values)
+        ]
+    return payload
+
+
+class DnsJournal:
+    """Record DNS changes and roll FQDNs back to earlier states."""
+
+    def __init__(
+        self,
+        manager: "BegetClientManager",
+        repo: DnsJournalRepository,
+        snapshots_repo: DnsSnapshotRepository | None = None,
+    ):
+        self.manager = manager
+        self.repo = repo
+        self.snapshots_repo = snapshots_repo
+
+    async def _known_records(self, fqdn: str) -> list[RecordTuple] | None:
+        """Latest records from the journal, else from the DNS snapshot."""
+        state = await self.repo.get_state(fqdn)
+        if state is not None or self.snapshots_repo is None:
+            return state
+        entry = await self.snapshots_repo.get_entry(fqdn)
+        if entry is None or entry.error:
+            return None
+        return [
+            (r.record_type, r.value, r.priority)
+            for r in await self.snapshots_repo.get_records(fqdn)
+        ]
+
+    async def record_change(
+        self,
+        fqdn: str,
+        records: dict[str, list[dict[str, Any]]],
+        before: DnsData | None = None,
+    ) -> None:
+        """Change listener: journal records written through the bot.
+
+        Without before (www syncs), the previous records come from the
+        journal or the snapshot. Must run before the crawler's listener,
+        which overwrites the snapshot with the new records.
+        """
+        replaced = set(CHANGE_GROUP) | set(records)
+        after = records_from_change(records)
+        known = normalize_records(before) if before is not None else await self._known_records(fqdn)
+
+        complete = known is not None
+        known = known or []
+        removed, added = diff_records([r for r in known if r[0] in replaced], after)
+        if complete and not removed and not added:
+            return
+
+        state = sorted([r for r in known if r[0] not in replaced] + after)
+        await self.repo.append(fqdn, sorted(replaced), removed, added, complete, state)
+
+    async def rebuild(self, fqdn: str, entry_id: int) -> tuple[list[RecordTuple], set[str]]:
+        """Records of an FQDN as they were before entry_id.
+
+        Returns the records and the record types changed since then.
+        Raises JournalError if the entry is unknown or an entry to undo
+        has no known previous state.
+        """
+        state = await self.repo.get_state(fqdn)
+        entries = await self.repo.get_entries_since(fqdn, entry_id)
+        if state is None or not entries or entries[-1].id != entry_id:
+            raise JournalError(f"No journal entry #{entry_id} for {fqdn}")
+
+        record_types: set[str] = set()
+        for entry in entries:
+            if not entry.complete:
+                raise JournalError(
+                    f"Records of {fqdn} before entry #{entry.id} are unknown"
+                )
+            state = undo_entry(state, entry)
+            record_types.update(entry.record_types)
+        return state, record_types
+
+    async def rollback(self, fqdn: str, entry_id: int) -> dict[str, list[dict[str, Any]]]:
+        """Restore an FQDN to before entry_id with one changeRecords call.
+
+        The write goes through the FQDN's write queue, so it is journaled
+        against the records it actually replaced. Returns the written records.
+        """
+        records, record_types = await self.rebuild(fqdn, entry_id)
+        payload = build_payload(records, record_types)
+        async with self.manager.client() as client:
+            await DnsService(client).replace_records(fqdn, payload)
+        logger.info(f"Rolled back {fqdn} to before journal entry #{entry_id}")
+        return payload
@@ -0,0 +1,22 @@
+"""Tracing services."""
+
+from app.services.tracing.spans import (
+    Span,
+    current_span,
+    span,
+    start_trace,
+    trace_methods,
+    traced,
+)
+from app.services.tracing.writer import SlowTraceWriter, trace_to_dict
+
+__all__ = [
+    "Span",
+    "SlowTraceWriter",
+    "current_span",
+    "span",
+    "start_trace",
+    "trace_methods",
+    "trace_to_dict",
+    "traced",
+]
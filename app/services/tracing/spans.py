@@ -0,0 +1,123 @@
+"""Contextvar-based tracing spans.
+
+A trace is a tree of spans rooted at one Telegram update. The active span
+lives in a ContextVar, so nested awaits (and tasks created inside them)
+attach their spans to the right parent without passing anything around.
+Outside of a trace every helper here is a cheap no-op.
+"""
+
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+_current_span: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+
+@dataclass
+class Span:
+    """A timed unit of work inside a trace."""
+
+    name: str
+    attrs: dict[str, Any] = field(default_factory=dict)
+    start: float = field(default_factory=time.perf_counter)
+    end: float | None = None
+    error: str | None = None
+    children: list["Span"] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds (up to now if still running)."""
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    @property
+    def self_time(self) -> float:
+        """Time spent in this span excluding its children."""
+        return max(0.0, self.duration - sum(child.duration for child in self.children))
+
+    @property
+    def stage(self) -> str:
+        """Stage name used for the per-stage breakdown (beget.request -> beget)."""
+        return self.name.split(".", 1)[0]
+
+    def walk(self, depth: int = 0) -> Iterator[tuple[int, "Span"]]:
+        """Iterate over (depth, span) pairs depth-first."""
+        yield depth, self
+        for child in self.children:
+            yield from child.walk(depth + 1)
+
+
+def current_span() -> Span | None:
+    """Get the active span, if any."""
+    return _current_span.get()
+
+
+@contextmanager
+def start_trace(name: str, **attrs: Any) -> Iterator[Span]:
+    """Start a new root span, detached from any trace already in progress."""
+    root = Span(name=name, attrs=attrs)
+    token = _current_span.set(root)
+    try:
+        yield root
+    except BaseException as e:
+        root.error = type(e).__name__
+        raise
+    finally:
+        root.end = time.perf_counter()
+        _current_span.reset(token)
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Span | None]:
+    """Record a child span of the active span. No-op outside of a trace."""
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    child = Span(name=name, attrs=attrs)
+    parent.children.append(child)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.error = type(e).__name__
+        raise
+    finally:
+        child.end = time.perf_counter()
+        _current_span.reset(token)
+
+
+def traced(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator wrapping a coroutine function in a span."""
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def trace_methods(stage: str) -> Callable[[type[T]], type[T]]:
+    """Class decorator wrapping every public coroutine method in a span.
+
+    Spans are named "{stage}.{method}", e.g. "permission.can_edit_dns".
+    """
+
+    def decorator(cls: type[T]) -> type[T]:
+        for name, func in list(vars(cls).items()):
+            if name.startswith("_") or not inspect.iscoroutinefunction(func):
+                continue
+            setattr(cls, name, traced(f"{stage}.{name}")(func))
+        return cls
+
+    return decorator
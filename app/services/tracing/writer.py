@@ -0,0 +1,85 @@
+"""JSONL writer for slow update traces."""
+
+import asyncio
+import json
+import logging
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from app.services.tracing.spans import Span
+
+logger = logging.getLogger(__name__)
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+def trace_to_dict(root: Span) -> dict[str, Any]:
+    """Serialize a finished trace with a per-stage breakdown.
+
+    "stages" sums the self time of every span by stage (middleware,
+    permission, db, beget, telegram, handler, ...), so the slowest part
+    of an update is visible at a glance. "spans" keeps the full tree in
+    depth-first order for drilling down.
+    """
+    stages: dict[str, float] = {}
+    spans = []
+    for depth, node in root.walk():
+        stages[node.stage] = stages.get(node.stage, 0.0) + node.self_time
+        entry: dict[str, Any] = {
+            "name": node.name,
+            "depth": depth,
+            "offset_ms": _ms(node.start - root.start),
+            "duration_ms": _ms(node.duration),
+            "self_ms": _ms(node.self_time),
+        }
+        if node.attrs:
+            entry["attrs"] = node.attrs
+        if node.error:
+            entry["error"] = node.error
+        spans.append(entry)
+
+    ranked = sorted(stages.items(), key=lambda item: item[1], reverse=True)
+    return {
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "name": root.name,
+        "attrs": root.attrs,
+        "duration_ms": _ms(root.duration),
+        "error": root.error,
+        "stages": {name: _ms(value) for name, value in ranked},
+        "spans": spans,
+    }
+
+
+class SlowTraceWriter:
+    """Append traces slower than a threshold to a JSONL file."""
+
+    def __init__(self, path: Path, threshold_ms: int):
+        self.path = path
+        self.threshold = threshold_ms / 1000
+        self._lock = threading.Lock()
+
+    def is_slow(self, root: Span) -> bool:
+        """Check if a trace exceeded the threshold."""
+        return root.duration >= self.threshold
+
+    async def maybe_write(self, root: Span) -> bool:
+        """Write the trace if it is slow. Returns True if written."""
+        if not self.is_slow(root):
+            return False
+        line = json.dumps(trace_to_dict(root), ensure_ascii=False, default=str)
+        try:
+            await asyncio.to_thread(self._append, line)
+        except OSError as e:
+            logger.warning(f"Failed to write slow trace to {self.path}: {e}")
+            return False
+        return True
+
+    def _append(self, line: str) -> None:
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
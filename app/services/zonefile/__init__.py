@@ -0,0 +1,29 @@
+"""Zone file export and import."""
+
+from app.services.zonefile.export import ExportStats, live_records, snapshot_records
+from app.services.zonefile.formats import (
+    BIND,
+    CSV,
+    FORMATS,
+    ZoneParseError,
+    encode_chunks,
+    parse,
+    render,
+)
+from app.services.zonefile.importer import ImportPlan, ZoneChange, ZoneImporter
+
+__all__ = [
+    "BIND",
+    "CSV",
+    "FORMATS",
+    "ExportStats",
+    "ImportPlan",
+    "ZoneChange",
+    "ZoneImporter",
+    "ZoneParseError",
+    "encode_chunks",
+    "live_records",
+    "parse",
+    "render",
+    "snapshot_records",
+]
@@ -0,0 +1,96 @@
+"""Record sources for zone export.
+
+Both sources are async generators yielding (fqdn, record) ordered by
+FQDN: from the stored DNS snapshot (no API calls) or live from
+dns/getData, fetched a few FQDNs ahead under a rate limit.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, AsyncIterator
+
+from app.services.beget.dns import DnsService
+from app.services.database.snapshots import DnsSnapshotRepository
+from app.services.snapshot.crawler import normalize_records
+from app.services.zonefile.formats import ZoneRecord
+from app.utils.rate_limit import RateLimiter
+
+if TYPE_CHECKING:
+    from app.services.beget.manager import BegetClientManager
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ExportStats:
+    """Counters filled in while an export streams."""
+
+    fqdns: int = 0
+    records: int = 0
+    failed: list[str] = field(default_factory=list)
+
+
+async def snapshot_records(
+    repo: DnsSnapshotRepository,
+    fqdns: list[str] | None = None,
+    stats: ExportStats | None = None,
+) -> AsyncIterator[ZoneRecord]:
+    """Records from the DNS snapshot."""
+    stats = stats or ExportStats()
+    current = None
+    async for r in repo.iter_records(fqdns):
+        if r.fqdn != current:
+            current = r.fqdn
+            stats.fqdns += 1
+        stats.records += 1
+        yield r.fqdn, (r.record_type, r.value, r.priority)
+
+
+async def live_records(
+    manager: "BegetClientManager",
+    fqdns: list[str],
+    limiter: RateLimiter,
+    concurrency: int = 4,
+    stats: ExportStats | None = None,
+) -> AsyncIterator[ZoneRecord]:
+    """Records fetched from dns/getData, in the order of fqdns.
+
+    Up to `concurrency` FQDNs are fetched ahead of the consumer, so
+    memory stays bounded however many FQDNs are exported.
+    """
+    stats = stats or ExportStats()
+
+    async def fetch(fqdn: str):
+        async with limiter:
+            async with manager.client() as client:
+                return normalize_records(await DnsService(client).get_dns_data(fqdn, fresh=True))
+
+    remaining = iter(fqdns)
+    window: deque[tuple[str, asyncio.Task]] = deque()
+
+    def schedule() -> None:
+        fqdn = next(remaining, None)
+        if fqdn is not None:
+            window.append((fqdn, asyncio.create_task(fetch(fqdn))))
+
+    for _ in range(max(concurrency, 1)):
+        schedule()
+    try:
+        while window:
+            fqdn, task = window.popleft()
+            schedule()
+            try:
+                records = await task
+            except Exception as e:
+                logger.warning(f"Export failed for {fqdn}: {e}")
+                stats.failed.append(fqdn)
+                continue
+            stats.fqdns += 1
+            for record in records:
+                stats.records += 1
+                yield fqdn, record
+    finally:
+        for _, task in window:
+            task.cancel()
@@ -0,0 +1,256 @@
+"""BIND and CSV zone file rendering and parsing.
+
+Records are (fqdn, (record_type, value, priority)) pairs, the same
+normalized tuples the DNS snapshot stores. Rendering works one record
+at a time and parsing one line at a time, so files of any size stream
+through without being held in memory.
+"""
+
+import codecs
+import csv
+import io
+import re
+from dataclasses import dataclass
+from typing import AsyncIterable, AsyncIterator
+
+from app.services.database.snapshots import RecordTuple
+
+BIND = "bind"
+CSV = "csv"
+FORMATS = (BIND, CSV)
+
+CSV_HEADER = ("fqdn", "type", "value", "priority")
+SUPPORTED_TYPES = ("A", "AAAA", "MX", "TXT", "CNAME", "NS")
+
+ZoneRecord = tuple[str, RecordTuple]
+
+# A quoted string (with escapes) or a bare token
+_BIND_TOKEN = re.compile(r'"((?:[^"\\]|\\.)*)"|(\S+)')
+_CLASSES = {"IN", "CH", "HS"}
+
+
+class ZoneParseError(Exception):
+    """A line of an imported file could not be parsed."""
+
+    def __init__(self, line_no: int, message: str):
+        super().__init__(f"line {line_no}: {message}")
+        self.line_no = line_no
+
+
+@dataclass
+class ParseState:
+    """Position of the BIND parser: $ORIGIN and the last owner name."""
+
+    origin: str | None = None
+    last_name: str | None = None
+
+
+# ============ RENDERING ============
+
+
+def _quote_txt(value: str) -> str:
+    """TXT data as quoted strings of at most 255 characters."""
+    escaped = [value[i:i + 255] for i in range(0, len(value), 255)] or [""]
+    return " ".join(
+        '"' + part.replace("\\", "\\\\").replace('"', '\\"') + '"' for part in escaped
+    )
+
+
+def bind_line(fqdn: str, record: RecordTuple) -> str:
+    """One record as a BIND zone file line."""
+    record_type, value, priority = record
+    if record_type == "MX":
+        rdata = f"{priority} {value}."
+    elif record_type == "TXT":
+        rdata = _quote_txt(value)
+    elif record_type in ("CNAME", "NS"):
+        rdata = f"{value}."
+    else:
+        rdata = value
+    return f"{fqdn}.\tIN\t{record_type}\t{rdata}\n"
+
+
+def csv_line(fqdn: str, record: RecordTuple) -> str:
+    """One record as a CSV row."""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerow((fqdn, *record))
+    return buffer.getvalue()
+
+
+def csv_header() -> str:
+    return ",".join(CSV_HEADER) + "\n"
+
+
+async def render(records: AsyncIterable[ZoneRecord], fmt: str) -> AsyncIterator[str]:
+    """Zone file text, line by line."""
+    if fmt == CSV:
+        yield csv_header()
+        async for fqdn, record in records:
+            yield csv_line(fqdn, record)
+        return
+
+    yield "; DNS records exported by Beget Manager Bot\n"
+    current = None
+    async for fqdn, record in records:
+        if fqdn != current:
+            yield f"\n; {fqdn}\n"
+            current = fqdn
+        yield bind_line(fqdn, record)
+
+
+async def encode_chunks(lines: AsyncIterable[str], chunk_size: int = 65536) -> AsyncIterator[bytes]:
+    """UTF-8 bytes in chunks of about chunk_size."""
+    buffer: list[bytes] = []
+    size = 0
+    async for line in lines:
+        data = line.encode()
+        buffer.append(data)
+        size += len(data)
+        if size >= chunk_size:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+# ============ PARSING ============
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Decode UTF-8 chunks into lines without joining the whole file."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+def detect_format(filename: str | None, first_line: str) -> str:
+    """CSV if the file name or header says so, BIND otherwise."""
+    if filename and filename.lower().endswith(".csv"):
+        return CSV
+    if first_line.strip().lower().startswith(",".join(CSV_HEADER[:2])):
+        return CSV
+    return BIND
+
+
+def _normalize(record_type: str, value: str, priority: int) -> RecordTuple:
+    """Same normalization get_dns_data() applies: only MX keeps a priority."""
+    value = value if record_type == "TXT" else value.strip().rstrip(".")
+    return record_type, value, priority if record_type == "MX" else 10
+
+
+def _absolute(name: str, state: ParseState, line_no: int) -> str:
+    if name == "@":
+        if state.origin is None:
+            raise ZoneParseError(line_no, "@ used without $ORIGIN")
+        return state.origin
+    if name.endswith("."):
+        return name.rstrip(".").lower()
+    if state.origin is None:
+        raise ZoneParseError(line_no, f"relative name {name} without $ORIGIN")
+    return f"{name.lower()}.{state.origin}"
+
+
+def parse_bind_line(line: str, line_no: int, state: ParseState) -> ZoneRecord | None:
+    """Parse one BIND line. Returns None for blank, comment and directive lines."""
+    tokens: list[tuple[str, bool]] = []  # (text, quoted)
+    for match in _BIND_TOKEN.finditer(line):
+        quoted, bare = match.groups()
+        if bare is not None and bare.startswith(";"):
+            break
+        if quoted is not None:
+            tokens.append((re.sub(r"\\(.)", r"\1", quoted), True))
+        else:
+            tokens.append((bare, False))
+    if not tokens:
+        return None
+
+    first = tokens[0][0]
+    if first.upper() == "$ORIGIN" and len(tokens) > 1:
+        state.origin = tokens[1][0].rstrip(".").lower()
+        return None
+    if first.startswith("$"):
+        return None  # $TTL and other directives
+
+    # A line starting with whitespace reuses the previous owner name
+    if line[:1].isspace():
+        if state.last_name is None:
+            raise ZoneParseError(line_no, "record without owner name")
+        name = state.last_name
+    else:
+        name = _absolute(first, state, line_no)
+        tokens = tokens[1:]
+    state.last_name = name
+
+    # Skip optional TTL and class in either order
+    while tokens and not tokens[0][1] and (
+        tokens[0][0].isdigit() or tokens[0][0].upper() in _CLASSES
+    ):
+        tokens = tokens[1:]
+    if not tokens:
+        raise ZoneParseError(line_no, "missing record type")
+
+    record_type = tokens[0][0].upper()
+    rdata = tokens[1:]
+    if record_type not in SUPPORTED_TYPES:
+        raise ZoneParseError(line_no, f"unsupported record type {record_type}")
+    if not rdata:
+        raise ZoneParseError(line_no, f"missing {record_type} data")
+
+    if record_type == "MX":
+        if len(rdata) != 2 or not rdata[0][0].isdigit():
+            raise ZoneParseError(line_no, "MX needs a preference and a host")
+        return name, _normalize("MX", rdata[1][0], int(rdata[0][0]))
+    if record_type == "TXT":
+        return name, _normalize("TXT", "".join(text for text, _ in rdata), 10)
+    if len(rdata) != 1:
+        raise ZoneParseError(line_no, f"{record_type} takes one value")
+    return name, _normalize(record_type, rdata[0][0], 10)
+
+
+def parse_csv_line(line: str, line_no: int) -> ZoneRecord | None:
+    """Parse one CSV row. Returns None for blank lines and the header."""
+    if not line.strip():
+        return None
+    row = next(csv.reader([line]))
+    if [cell.strip().lower() for cell in row] == list(CSV_HEADER):
+        return None
+    if len(row) not in (3, 4):
+        raise ZoneParseError(line_no, "expected fqdn,type,value[,priority]")
+    fqdn, record_type, value = row[0].strip().rstrip(".").lower(), row[1].strip().upper(), row[2]
+    if record_type not in SUPPORTED_TYPES:
+        raise ZoneParseError(line_no, f"unsupported record type {record_type}")
+    priority = row[3].strip() if len(row) == 4 and row[3].strip() else "10"
+    if not priority.isdigit():
+        raise ZoneParseError(line_no, f"invalid priority {priority}")
+    return fqdn, _normalize(record_type, value, int(priority))
+
+
+async def parse(
+    chunks: AsyncIterable[bytes], filename: str | None = None
+) -> AsyncIterator[ZoneRecord]:
+    """Records of a BIND or CSV file, parsed while it is read.
+
+    Raises ZoneParseError on the first invalid line.
+    """
+    fmt = None
+    state = ParseState()
+    line_no = 0
+    async for line in iter_lines(chunks):
+        line_no += 1
+        if fmt is None:
+            if not line.strip():
+                continue
+            fmt = detect_format(filename, line)
+        record = (
+            parse_csv_line(line, line_no) if fmt == CSV
+            else parse_bind_line(line, line_no, state)
+        )
+        if record is not None:
+            yield record
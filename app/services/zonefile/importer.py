@@ -0,0 +1,118 @@
+"""Zone import: diff an uploaded file against the live zone.
+
+Only A, MX and TXT records (dns/changeRecords group 1) are imported;
+for every FQDN listed with such records the file is authoritative for
+that group. FQDNs whose group already matches need no call, every
+other FQDN gets exactly one changeRecords call with its new group,
+queued behind any edit of that FQDN already in flight.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, AsyncIterable
+
+from app.services.beget.dns import DnsService
+from app.services.database.snapshots import RecordTuple
+from app.services.snapshot.crawler import CHANGE_GROUP, normalize_records
+from app.services.snapshot.journal import build_payload, diff_records
+from app.services.zonefile.formats import ZoneRecord
+from app.utils.rate_limit import RateLimiter
+
+if TYPE_CHECKING:
+    from app.services.beget.manager import BegetClientManager
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ZoneChange:
+    """Planned changeRecords call for one FQDN."""
+
+    fqdn: str
+    removed: list[RecordTuple]
+    added: list[RecordTuple]
+    payload: dict[str, list[dict[str, Any]]]
+
+
+@dataclass
+class ImportPlan:
+    """What applying an imported file would do."""
+
+    changes: list[ZoneChange] = field(default_factory=list)
+    unchanged: int = 0
+    skipped_records: int = 0  # record types outside group 1
+    failed: dict[str, str] = field(default_factory=dict)  # fqdn -> read error
+
+
+async def group_records(records: AsyncIterable[ZoneRecord]) -> tuple[dict[str, set[RecordTuple]], int]:
+    """Group 1 records per FQDN, and the number of other records skipped."""
+    grouped: dict[str, set[RecordTuple]] = {}
+    skipped = 0
+    async for fqdn, record in records:
+        if record[0] in CHANGE_GROUP:
+            grouped.setdefault(fqdn, set()).add(record)
+        else:
+            skipped += 1
+    return grouped, skipped
+
+
+class ZoneImporter:
+    """Plan and apply the minimal changeRecords calls for an imported file."""
+
+    def __init__(
+        self,
+        manager: "BegetClientManager",
+        concurrency: int = 4,
+        rate_per_sec: float = 5.0,
+    ):
+        self.manager = manager
+        self.concurrency = max(concurrency, 1)
+        self.limiter = RateLimiter(rate_per_sec, burst=self.concurrency)
+
+    async def plan(self, records: AsyncIterable[ZoneRecord]) -> ImportPlan:
+        """Parse records and diff each listed FQDN against its live zone."""
+        grouped, skipped = await group_records(records)
+        plan = ImportPlan(skipped_records=skipped)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def diff_one(fqdn: str, wanted: set[RecordTuple]) -> None:
+            async with semaphore:
+                try:
+                    async with self.limiter:
+                        async with self.manager.client() as client:
+                            current = await DnsService(client).get_dns_data(fqdn, fresh=True)
+                except Exception as e:
+                    plan.failed[fqdn] = str(e)
+                    return
+            have = [r for r in normalize_records(current) if r[0] in CHANGE_GROUP]
+            removed, added = diff_records(have, sorted(wanted))
+            if not removed and not added:
+                plan.unchanged += 1
+                return
+            plan.changes.append(
+                ZoneChange(fqdn, removed, added, build_payload(sorted(wanted), set(CHANGE_GROUP)))
+            )
+
+        await asyncio.gather(*(diff_one(fqdn, wanted) for fqdn, wanted in grouped.items()))
+        plan.changes.sort(key=lambda change: change.fqdn)
+        return plan
+
+    async def apply(self, changes: list[ZoneChange]) -> dict[str, str]:
+        """Write planned changes, one call per FQDN. Returns fqdn -> error."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        failed: dict[str, str] = {}
+
+        async def apply_one(change: ZoneChange) -> None:
+            async with semaphore:
+                try:
+                    async with self.limiter:
+                        async with self.manager.client() as client:
+                            await DnsService(client).replace_records(change.fqdn, change.payload)
+                except Exception as e:
+                    logger.warning(f"Zone import failed for {change.fqdn}: {e}")
+                    failed[change.fqdn] = str(e)
+
+        await asyncio.gather(*(apply_one(change) for change in changes))
+        logger.info(f"Zone import: {len(changes) - len(failed)} FQDNs written, {len(failed)} failed")
+        return failed
@@ -1,7 +1,10 @@
 """Helper utilities."""
 
+import re
 from datetime import datetime
 
+_SUBDOMAIN_NAME = re.compile(r"^[a-z0-9]([a-z0-9-]*[a-z0-9])?$")
+
 
 def format_datetime(dt: datetime) -> str:
     """Format datetime for display."""
@@ -13,3 +16,22 @@ def truncate(text: str, max_length: int = 50) -> str:
     if len(text) <= max_length:
         return text
     return text[: max_length - 3] + "..."
+
+
+def is_valid_ipv4(value: str) -> bool:
+    """Check dotted-quad IPv4 notation."""
+    parts = value.split(".")
+    return len(parts) == 4 and all(p.isdigit() and 0 <= int(p) <= 255 for p in parts)
+
+
+def is_valid_subdomain_name(name: str) -> bool:
+    """Check a subdomain label: lowercase letters, digits and inner hyphens."""
+    return bool(_SUBDOMAIN_NAME.match(name))
+
+
+def format_record(record: tuple[str, str, int]) -> str:
+    """Format a (type, value, priority) DNS record for display."""
+    record_type, value, priority = record
+    if record_type == "MX":
+        return f"{record_type} {priority} {truncate(value, 60)}"
+    return f"{record_type} {truncate(value, 60)}"
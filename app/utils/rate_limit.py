@@ -0,0 +1,53 @@
+"""Async rate limiting."""
+
+import asyncio
+import time
+
+
+class RateLimiter:
+    """Token bucket shared by concurrent tasks.
+
+    Allows `rate` acquisitions per second on average with bursts of up
+    to `burst`. A rate of 0 disables limiting.
+
+    Usage:
+        limiter = RateLimiter(rate=5)
+        async with limiter:
+            await client.request(...)
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int = 1) -> None:
+        """Wait until tokens are available and take them.
+
+        Taking more than `burst` tokens at once borrows the rest from the
+        future: the bucket goes negative and later callers wait longer.
+        """
+        if self.rate <= 0:
+            return
+        needed = min(tokens, self.burst)
+        # The lock makes waiters take tokens in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= needed:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((needed - self._tokens) / self.rate)
+
+    async def __aenter__(self) -> "RateLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        pass
@@ -0,0 +1,5 @@
+"""Offline benchmarks for the bot.
+
+Run from the repository root:
+    python -m benchmarks.throughput --concurrency 20 --iterations 200
+"""
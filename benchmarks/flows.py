@@ -0,0 +1,169 @@
+"""Scripted user flows.
+
+A flow is the sequence of updates a user sends to complete one task,
+exactly as the inline keyboards would produce them. Flows marked admin
+run in the admin chat; the others run in the user's private chat.
+"""
+
+from dataclasses import dataclass
+from typing import Callable
+
+from aiogram.types import Update
+
+from benchmarks.harness import BotHarness
+
+
+@dataclass(frozen=True)
+class Actor:
+    """Who runs a flow and against which domain."""
+
+    chat_id: int
+    user_id: int
+    domain_index: int
+    domain_id: int
+    domain_fqdn: str
+    target_chat_id: int  # chat granted access by admin flows
+
+
+@dataclass(frozen=True)
+class Step:
+    """One update: a button press or a text message."""
+
+    kind: str  # "callback" or "message"
+    payload: str
+
+
+@dataclass(frozen=True)
+class Flow:
+    """A named, scripted sequence of steps."""
+
+    name: str
+    admin: bool
+    steps: Callable[[Actor, int], list[Step]]
+
+
+def callback(data: str) -> Step:
+    return Step("callback", data)
+
+
+def message(text: str) -> Step:
+    return Step("message", text)
+
+
+def _browse_domains(actor: Actor, iteration: int) -> list[Step]:
+    return [
+        callback("md"),
+        callback(f"d:{actor.domain_id}"),
+        callback(f"ss:{actor.domain_id}"),
+    ]
+
+
+def _view_dns(actor: Actor, iteration: int) -> list[Step]:
+    return [
+        callback("md"),
+        callback(f"d:{actor.domain_id}"),
+        callback(f"dn:{actor.domain_id}"),
+        callback(f"dnv:{actor.domain_id}"),
+    ]
+
+
+def _add_a_record(actor: Actor, iteration: int) -> list[Step]:
+    return [
+        callback("md"),
+        callback(f"d:{actor.domain_id}"),
+        callback(f"dn:{actor.domain_id}"),
+        callback(f"aa:{actor.domain_id}"),
+        message(f"198.51.100.{iteration % 254 + 1}"),
+    ]
+
+
+def _grant_permission(actor: Actor, iteration: int) -> list[Step]:
+    return [
+        callback("ap"),
+        callback("pd"),
+        callback(f"pdo:{actor.domain_index}"),
+        callback("pi:d:0"),
+        callback("pg:d"),
+        message(str(actor.target_chat_id)),
+        callback("pdn:1:0"),
+        callback("ps:1:0"),
+    ]
+
+
+FLOWS: dict[str, Flow] = {
+    flow.name: flow
+    for flow in (
+        Flow("browse_domains", admin=False, steps=_browse_domains),
+        Flow("view_dns", admin=False, steps=_view_dns),
+        Flow("add_a_record", admin=False, steps=_add_a_record),
+        Flow("grant_permission", admin=True, steps=_grant_permission),
+    )
+}
+
+
+def actors_for(harness: BotHarness, flow: Flow) -> list[Actor]:
+    """One actor per user (or admin), spread over the simulated domains."""
+    domains = harness.domains
+    ids = harness.admin_user_ids if flow.admin else harness.user_ids
+    actors = []
+    for i, user_id in enumerate(ids):
+        index = i % len(domains)
+        domain_id, fqdn = domains[index]
+        actors.append(
+            Actor(
+                chat_id=harness.admin_chat_id if flow.admin else user_id,
+                user_id=user_id,
+                domain_index=index,
+                domain_id=domain_id,
+                domain_fqdn=fqdn,
+                target_chat_id=harness.user_ids[i % len(harness.user_ids)],
+            )
+        )
+    return actors
+
+
+def build_updates(harness: BotHarness, flow: Flow, actor: Actor, iteration: int) -> list[Update]:
+    """Materialize a flow run into updates."""
+    updates = []
+    for step in flow.steps(actor, iteration):
+        if step.kind == "callback":
+            updates.append(harness.factory.callback(actor.chat_id, step.payload, actor.user_id))
+        else:
+            updates.append(harness.factory.message(actor.chat_id, step.payload, actor.user_id))
+    return updates
+
+
+def actor_for(
+    harness: BotHarness,
+    admin: bool = False,
+    domain_index: int = 0,
+    user_index: int = 0,
+) -> Actor:
+    """An actor on the given simulated domain."""
+    user_id = harness.admin_user_ids[user_index] if admin else harness.user_ids[user_index]
+    domain_id, fqdn = harness.domains[domain_index]
+    return Actor(
+        chat_id=harness.admin_chat_id if admin else user_id,
+        user_id=user_id,
+        domain_index=domain_index,
+        domain_id=domain_id,
+        domain_fqdn=fqdn,
+        target_chat_id=harness.user_ids[-1],
+    )
+
+
+async def run_flow_once(harness: BotHarness, flow: Flow, actor: Actor) -> None:
+    """Feed every update of one flow run, in order.
+
+    Background prefetches finish before the next update, like a user
+    reading the screen before tapping, so call counts are deterministic.
+    """
+    for update in build_updates(harness, flow, actor, iteration=0):
+        await harness.dp.feed_update(harness.bot, update)
+        if harness.container.prefetcher:
+            await harness.container.prefetcher.drain()
+
+
+def steps(*items: Step) -> Callable[[Actor, int], list[Step]]:
+    """Fixed steps for an ad-hoc Flow."""
+    return lambda actor, iteration: list(items)
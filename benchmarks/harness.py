@@ -0,0 +1,302 @@
+"""Harness running the real bot wiring fully offline.
+
+BotHarness builds the bot with setup_bot() against:
+- a BegetSimulator standing in for the Beget API
+- FakeTelegramSession standing in for the Telegram Bot API
+- a throwaway SQLite database seeded with users and permissions
+
+Updates produced by UpdateFactory are fed straight into
+Dispatcher.feed_update, so every middleware, filter, handler,
+repository and Beget call runs exactly as in production.
+
+Usage:
+    async with BotHarness(users=10) as harness:
+        update = harness.factory.callback(harness.user_ids[0], "md")
+        latency = await harness.feed(update)
+"""
+
+import asyncio
+import itertools
+import tempfile
+import time
+import typing
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncGenerator
+
+from aiogram import Bot, Dispatcher
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import GetFile, TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import File, InputFile, Message, Update
+
+from app.bot.bot import setup_bot
+from app.config import Settings
+from app.core.container import DependencyContainer
+from benchmarks.simulator import BegetSimulator
+
+# Syntactically valid token, never sent anywhere
+FAKE_TOKEN = "123456789:AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA"
+
+ADMIN_CHAT_ID = -1001000000000  # group chat, admins differ by user ID
+FIRST_USER_ID = 5_000_000
+FIRST_ADMIN_USER_ID = 9_000_000
+
+
+class FakeTelegramSession(BaseSession):
+    """In-memory Telegram Bot API session.
+
+    Answers every method without network access: methods returning a
+    Message get a synthetic one, everything else gets True. Calls are
+    counted per method name. Uploaded documents are read into
+    `documents`; files registered with add_file() can be downloaded.
+    """
+
+    def __init__(self, latency_ms: float = 0.0):
+        super().__init__()
+        self.latency_ms = latency_ms
+        self.calls: Counter[str] = Counter()
+        self._message_ids = itertools.count(1_000_000)
+        self.documents: list[tuple[str | None, bytes]] = []
+        self.files: dict[str, bytes] = {}  # file_id -> content
+
+    def add_file(self, file_id: str, content: bytes) -> None:
+        """Make content downloadable as file_id (GetFile + stream_content)."""
+        self.files[file_id] = content
+
+    async def make_request(
+        self,
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+        timeout: int | None = None,
+    ) -> TelegramType:
+        self.calls[method.__api_method__] += 1
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+
+        document = getattr(method, "document", None)
+        if isinstance(document, InputFile):
+            content = b"".join([chunk async for chunk in document.read(bot)])
+            self.documents.append((document.filename, content))
+        if isinstance(method, GetFile):
+            return File(  # type: ignore[return-value]
+                file_id=method.file_id,
+                file_unique_id=method.file_id,
+                file_size=len(self.files.get(method.file_id, b"")),
+                file_path=f"documents/{method.file_id}",
+            )
+
+        returning = method.__returning__
+        if returning is Message or Message in typing.get_args(returning):
+            chat_id = getattr(method, "chat_id", None) or 0
+            return Message.model_validate(
+                {
+                    "message_id": getattr(method, "message_id", None) or next(self._message_ids),
+                    "date": datetime.now(),
+                    "chat": {"id": chat_id, "type": "group" if chat_id < 0 else "private"},
+                    "text": getattr(method, "text", None),
+                },
+                context={"bot": bot},
+            )
+        return True  # type: ignore[return-value]
+
+    async def stream_content(
+        self,
+        url: str,
+        headers: dict[str, Any] | None = None,
+        timeout: int = 30,
+        chunk_size: int = 65536,
+        raise_for_status: bool = True,
+    ) -> AsyncGenerator[bytes, None]:
+        content = self.files.get(url.rsplit("/", 1)[-1], b"")
+        for start in range(0, len(content), chunk_size):
+            yield content[start:start + chunk_size]
+
+    async def close(self) -> None:
+        pass
+
+
+class UpdateFactory:
+    """Build synthetic Telegram updates bound to a bot."""
+
+    def __init__(self, bot: Bot):
+        self.bot = bot
+        self._update_ids = itertools.count(1)
+        self._message_ids = itertools.count(1)
+
+    @staticmethod
+    def _chat(chat_id: int) -> dict[str, Any]:
+        return {"id": chat_id, "type": "group" if chat_id < 0 else "private"}
+
+    @staticmethod
+    def _user(user_id: int) -> dict[str, Any]:
+        return {"id": user_id, "is_bot": False, "first_name": f"user{user_id}"}
+
+    def _update(self, **payload: Any) -> Update:
+        return Update.model_validate(
+            {"update_id": next(self._update_ids), **payload},
+            context={"bot": self.bot},
+        )
+
+    def message(self, chat_id: int, text: str, user_id: int | None = None) -> Update:
+        """A text message from user_id (defaults to chat_id) in chat_id."""
+        return self._update(
+            message={
+                "message_id": next(self._message_ids),
+                "date": datetime.now(),
+                "chat": self._chat(chat_id),
+                "from": self._user(user_id or chat_id),
+                "text": text,
+            }
+        )
+
+    def document(
+        self, chat_id: int, file_id: str, file_name: str, user_id: int | None = None
+    ) -> Update:
+        """A document message, e.g. a file registered with FakeTelegramSession.add_file()."""
+        return self._update(
+            message={
+                "message_id": next(self._message_ids),
+                "date": datetime.now(),
+                "chat": self._chat(chat_id),
+                "from": self._user(user_id or chat_id),
+                "document": {
+                    "file_id": file_id,
+                    "file_unique_id": file_id,
+                    "file_name": file_name,
+                },
+            }
+        )
+
+    def callback(self, chat_id: int, data: str, user_id: int | None = None) -> Update:
+        """An inline button press on a bot message in chat_id."""
+        user_id = user_id or chat_id
+        return self._update(
+            callback_query={
+                "id": str(next(self._message_ids)),
+                "from": self._user(user_id),
+                "chat_instance": str(chat_id),
+                "data": data,
+                "message": {
+                    "message_id": 1,
+                    "date": datetime.now(),
+                    "chat": self._chat(chat_id),
+                    "text": "menu",
+                },
+            }
+        )
+
+
+class BotHarness:
+    """The fully wired bot running against local stand-ins."""
+
+    def __init__(
+        self,
+        users: int = 10,
+        admins: int = 1,
+        domains: int = 10,
+        subdomains_per_domain: int = 5,
+        beget_latency_ms: float = 0.0,
+        telegram_latency_ms: float = 0.0,
+        data_dir: Path | None = None,
+    ):
+        self.user_ids = [FIRST_USER_ID + i for i in range(users)]
+        self.admin_user_ids = [FIRST_ADMIN_USER_ID + i for i in range(admins)]
+        self.admin_chat_id = ADMIN_CHAT_ID
+        self.simulator = BegetSimulator(
+            domains=domains,
+            subdomains_per_domain=subdomains_per_domain,
+            latency_ms=beget_latency_ms,
+        )
+        self.session = FakeTelegramSession(latency_ms=telegram_latency_ms)
+        self._data_dir = data_dir
+        self._tmp: tempfile.TemporaryDirectory | None = None
+        self.bot: Bot
+        self.dp: Dispatcher
+        self.container: DependencyContainer
+        self.factory: UpdateFactory
+
+    @property
+    def domains(self) -> list[tuple[int, str]]:
+        """Simulated domains as (id, fqdn), in API order."""
+        return list(self.simulator.domains.items())
+
+    async def start(self) -> None:
+        """Start the simulator, build the bot and seed the database."""
+        if self._data_dir is None:
+            self._tmp = tempfile.TemporaryDirectory(prefix="bot-bench-")
+            self._data_dir = Path(self._tmp.name)
+
+        await self.simulator.start()
+        settings = Settings(
+            _env_file=None,
+            telegram_bot_token=FAKE_TOKEN,
+            admin_chat_id=self.admin_chat_id,
+            beget_login="bench",
+            beget_password="bench",
+            beget_api_url=self.simulator.api_url,
+            log_level="WARNING",
+            metrics_port=0,
+            slow_update_ms=0,
+            crawl_rate_per_sec=0,  # the simulator needs no protection
+            bulk_rate_per_sec=0,
+            data_dir=self._data_dir,
+        )
+        self.bot, self.dp, self.container = await setup_bot(settings, session=self.session)
+        self.factory = UpdateFactory(self.bot)
+        await self._seed()
+
+    async def _seed(self) -> None:
+        """Allow every user and give them full access to every domain."""
+        for user_id in self.user_ids:
+            await self.container.chats_repo.add(user_id, added_by="benchmark", note=f"user {user_id}")
+            for _, fqdn in self.domains:
+                await self.container.permissions_repo.grant_domain_access(
+                    chat_id=user_id,
+                    domain_fqdn=fqdn,
+                    can_edit_dns=True,
+                    can_delete_dns=True,
+                    can_create=True,
+                    can_delete=True,
+                    granted_by="benchmark",
+                )
+
+    async def stop(self) -> None:
+        """Shut everything down in the same order as app.main."""
+        if self.container.prefetcher:
+            await self.container.prefetcher.stop()
+        if self.container.drift_detector:
+            await self.container.drift_detector.stop()
+        if self.container.dns_crawler:
+            await self.container.dns_crawler.stop()
+        if self.container.ip_migrator:
+            await self.container.ip_migrator.stop()
+        await self.container.beget_manager.stop()
+        await self.container.db.disconnect()
+        await self.bot.session.close()
+        await self.simulator.stop()
+
+        # Routers are module-level singletons and can only have one parent;
+        # detach them so the next harness in this process can mount them again
+        for router in self.dp.sub_routers:
+            router._parent_router = None
+        self.dp.sub_routers.clear()
+
+        if self._tmp is not None:
+            self._tmp.cleanup()
+            self._tmp = None
+            self._data_dir = None
+
+    async def feed(self, update: Update) -> float:
+        """Feed one update through the dispatcher. Returns latency in seconds."""
+        start = time.perf_counter()
+        await self.dp.feed_update(self.bot, update)
+        return time.perf_counter() - start
+
+    async def __aenter__(self) -> "BotHarness":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.stop()
@@ -0,0 +1,154 @@
+"""Beget response decoding microbenchmark.
+
+Decodes synthetic domain/getSubdomainList and dns/getData results and
+reports objects/sec for:
+- pydantic: per-item pydantic model validation (the previous decoder)
+- fast: the current decoders (slotted dataclasses, no validation)
+- validated: the current decoders with BEGET_VALIDATE_RESPONSES on
+
+Usage:
+    python -m benchmarks.parsing
+    python -m benchmarks.parsing --subdomains 20000 --records 50 --repeat 5
+"""
+
+import argparse
+import time
+from typing import Any, Callable
+
+from pydantic import BaseModel
+
+from app.services.beget.dns import decode_dns_data
+from app.services.beget.domains import decode_subdomains
+from app.services.beget.types import set_item_validation
+
+
+class PydanticSubdomain(BaseModel):
+    id: int
+    fqdn: str
+
+
+class PydanticDnsRecord(BaseModel):
+    value: str
+    priority: int = 0
+
+
+def pydantic_subdomains(result: list[dict[str, Any]]) -> dict[int, list[PydanticSubdomain]]:
+    """The decoder before the fast path, for comparison."""
+    grouped: dict[int, list[PydanticSubdomain]] = {}
+    for s in result:
+        grouped.setdefault(s.get("domain_id"), []).append(
+            PydanticSubdomain(id=s["id"], fqdn=s["fqdn"])
+        )
+    return grouped
+
+
+def pydantic_dns_records(result: dict[str, Any]) -> list[PydanticDnsRecord]:
+    """The per-record decoding before the fast path, for comparison."""
+    records = result["records"]
+    decoded = [PydanticDnsRecord(value=r.get("address", ""), priority=10) for r in records["A"]]
+    decoded += [
+        PydanticDnsRecord(value=r.get("exchange", "").rstrip("."), priority=r.get("preference", 10))
+        for r in records["MX"]
+    ]
+    decoded += [PydanticDnsRecord(value=r.get("txtdata", ""), priority=10) for r in records["TXT"]]
+    return decoded
+
+
+def subdomain_list(count: int, domains: int = 50) -> list[dict[str, Any]]:
+    """A domain/getSubdomainList result."""
+    return [
+        {"id": i, "fqdn": f"sub{i}.domain{i % domains}.test", "domain_id": i % domains}
+        for i in range(count)
+    ]
+
+
+def dns_result(records: int) -> dict[str, Any]:
+    """A dns/getData result with `records` records of each of A, MX and TXT."""
+    return {
+        "is_subdomain": 0,
+        "set_type": 1,
+        "records": {
+            "A": [{"ttl": 600, "address": f"192.0.2.{i % 250}"} for i in range(records)],
+            "MX": [{"ttl": 300, "exchange": f"mx{i}.test.", "preference": i} for i in range(records)],
+            "TXT": [{"ttl": 300, "txtdata": f"token-{i}"} for i in range(records)],
+            "DNS": [{"value": "ns1.beget.com"}, {"value": "ns2.beget.com"}],
+        },
+    }
+
+
+def objects_per_sec(decode: Callable[[], Any], objects: int, repeat: int) -> float:
+    """Best of `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        decode()
+        best = min(best, time.perf_counter() - start)
+    return objects / best if best else 0.0
+
+
+def run_benchmark(subdomains: int, records: int, repeat: int) -> dict[str, dict[str, float]]:
+    """objects/sec per payload and decoder."""
+    subs = subdomain_list(subdomains)
+    dns = dns_result(records)
+    dns_objects = records * 3
+    dns_calls = max(1, subdomains // dns_objects)  # decode about as many records as subdomains
+
+    def many_dns(decode: Callable[[], Any]) -> Callable[[], None]:
+        def run() -> None:
+            for _ in range(dns_calls):
+                decode()
+        return run
+
+    cases = {
+        "subdomains": (
+            subdomains,
+            lambda: pydantic_subdomains(subs),
+            lambda: decode_subdomains(subs),
+        ),
+        "dns records": (
+            dns_objects * dns_calls,
+            many_dns(lambda: pydantic_dns_records(dns)),
+            many_dns(lambda: decode_dns_data("bench.test", dns)),
+        ),
+    }
+    report: dict[str, dict[str, float]] = {}
+    try:
+        for name, (objects, legacy, fast) in cases.items():
+            set_item_validation(False)
+            row = {
+                "pydantic": objects_per_sec(legacy, objects, repeat),
+                "fast": objects_per_sec(fast, objects, repeat),
+            }
+            set_item_validation(True)
+            row["validated"] = objects_per_sec(fast, objects, repeat)
+            report[name] = row
+    finally:
+        set_item_validation(False)
+    return report
+
+
+def print_report(report: dict[str, dict[str, float]]) -> None:
+    header = f"{'payload':<14}{'pydantic':>14}{'fast':>14}{'validated':>14}{'speedup':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, row in report.items():
+        speedup = row["fast"] / row["pydantic"] if row["pydantic"] else 0.0
+        print(
+            f"{name:<14}{row['pydantic']:>14,.0f}{row['fast']:>14,.0f}"
+            f"{row['validated']:>14,.0f}{speedup:>9.1f}x"
+        )
+    print("\nobjects/sec, best of runs")
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Beget response decoding microbenchmark")
+    parser.add_argument("--subdomains", type=int, default=10000)
+    parser.add_argument("--records", type=int, default=20, help="Records per type in dns/getData")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print_report(run_benchmark(args.subdomains, args.records, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""Local Beget API simulator for benchmarks and tests.
+
+Emulates the subset of the Beget API the bot uses, with the same
+response envelopes the real API returns:
+
+- domain/getList
+- domain/getSubdomainList
+- domain/addSubdomainVirtual
+- domain/deleteSubdomain
+- dns/getData
+- dns/changeRecords
+
+Latency, error rate and account size are configurable, so the whole bot
+can be load-tested offline by pointing BEGET_API_URL at the simulator.
+Setting `down = True` simulates an outage: every call gets an HTML 503.
+
+Usage:
+    python -m benchmarks.simulator --port 8081 --domains 50 --latency-ms 80
+
+    # then run the bot with
+    BEGET_API_URL=http://127.0.0.1:8081/api
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+from collections import Counter
+from typing import Any
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+
+class SimulatedApiError(Exception):
+    """Error returned to the client in the Beget error envelope."""
+
+    def __init__(self, code: str, text: str):
+        super().__init__(text)
+        self.code = code
+        self.text = text
+
+
+class BegetSimulator:
+    """In-memory Beget account served over aiohttp.
+
+    Usage:
+        simulator = BegetSimulator(domains=20, latency_ms=50)
+        await simulator.start(port=8081)
+        manager = BegetClientManager("login", "pass", base_url=simulator.api_url)
+        ...
+        await simulator.stop()
+    """
+
+    def __init__(
+        self,
+        domains: int = 10,
+        subdomains_per_domain: int = 5,
+        a_records: int = 1,
+        txt_records: int = 1,
+        latency_ms: float = 0.0,
+        latency_jitter: float = 0.2,
+        error_rate: float = 0.0,
+        login: str | None = None,
+        password: str | None = None,
+        seed: int = 42,
+    ):
+        self.latency_ms = latency_ms
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.login = login
+        self.password = password
+        self.random = random.Random(seed)
+
+        # Calls per endpoint, useful for asserting call budgets
+        self.calls: Counter[str] = Counter()
+        # Outage: answer every call with an HTML 503 like a failing proxy
+        self.down = False
+
+        self.domains: dict[int, str] = {}
+        self.subdomains: dict[int, tuple[int, str]] = {}  # id -> (domain_id, fqdn)
+        self.records: dict[str, dict[str, list[dict[str, Any]]]] = {}
+        self._next_subdomain_id = 1000
+        self._populate(domains, subdomains_per_domain, a_records, txt_records)
+
+        self._handlers = {
+            "domain/getList": self._get_list,
+            "domain/getSubdomainList": self._get_subdomain_list,
+            "domain/addSubdomainVirtual": self._add_subdomain,
+            "domain/deleteSubdomain": self._delete_subdomain,
+            "dns/getData": self._get_data,
+            "dns/changeRecords": self._change_records,
+        }
+        self._runner: web.AppRunner | None = None
+        self.port: int | None = None
+        self.host = "127.0.0.1"
+
+    # ============ ACCOUNT DATA ============
+
+    def _populate(
+        self,
+        domains: int,
+        subdomains_per_domain: int,
+        a_records: int,
+        txt_records: int,
+    ) -> None:
+        """Generate a deterministic account."""
+        for i in range(1, domains + 1):
+            domain_id = 100 + i
+            fqdn = f"domain{i}.test"
+            self.domains[domain_id] = fqdn
+            self.records[fqdn] = self._default_records(i, a_records, txt_records)
+            for j in range(1, subdomains_per_domain + 1):
+                self.add_subdomain(domain_id, f"sub{j}", a_records, txt_records)
+
+    def _default_records(
+        self, seed: int, a_records: int, txt_records: int
+    ) -> dict[str, list[dict[str, Any]]]:
+        return {
+            "A": [
+                {"value": f"10.{seed % 256}.{k}.{self.random.randint(1, 254)}", "priority": 10 * (k + 1)}
+                for k in range(a_records)
+            ],
+            "MX": [{"value": "mx1.beget.com", "priority": 10}],
+            "TXT": [
+                {"value": f"v=spf1 include:beget.com ~all token{k}", "priority": 10 * (k + 1)}
+                for k in range(txt_records)
+            ],
+        }
+
+    def add_subdomain(
+        self, domain_id: int, name: str, a_records: int = 1, txt_records: int = 0
+    ) -> int:
+        """Create a subdomain with default records. Returns its id."""
+        if domain_id not in self.domains:
+            raise SimulatedApiError("INVALID_DATA", f"Domain {domain_id} not found")
+        fqdn = f"{name}.{self.domains[domain_id]}"
+        if any(sub_fqdn == fqdn for _, sub_fqdn in self.subdomains.values()):
+            raise SimulatedApiError("INVALID_DATA", f"Subdomain {fqdn} already exists")
+        subdomain_id = self._next_subdomain_id
+        self._next_subdomain_id += 1
+        self.subdomains[subdomain_id] = (domain_id, fqdn)
+        self.records[fqdn] = self._default_records(subdomain_id, a_records, txt_records)
+        return subdomain_id
+
+    # ============ API METHODS ============
+
+    async def _get_list(self, params: dict[str, Any]) -> Any:
+        return [{"id": domain_id, "fqdn": fqdn} for domain_id, fqdn in self.domains.items()]
+
+    async def _get_subdomain_list(self, params: dict[str, Any]) -> Any:
+        return [
+            {"id": sub_id, "fqdn": fqdn, "domain_id": domain_id}
+            for sub_id, (domain_id, fqdn) in self.subdomains.items()
+        ]
+
+    async def _add_subdomain(self, params: dict[str, Any]) -> Any:
+        return self.add_subdomain(int(params["domain_id"]), str(params["subdomain"]))
+
+    async def _delete_subdomain(self, params: dict[str, Any]) -> Any:
+        subdomain_id = int(params["id"])
+        if subdomain_id not in self.subdomains:
+            raise SimulatedApiError("INVALID_DATA", f"Subdomain {subdomain_id} not found")
+        _, fqdn = self.subdomains.pop(subdomain_id)
+        self.records.pop(fqdn, None)
+        return True
+
+    async def _get_data(self, params: dict[str, Any]) -> Any:
+        fqdn = str(params["fqdn"])
+        records = self.records.get(fqdn)
+        if records is None:
+            # Unknown www twins and other names resolve to an empty record set
+            records = {}
+        return {
+            "is_subdomain": int(fqdn not in self.domains.values()),
+            "fqdn": fqdn,
+            "set_type": 1,
+            "records": {
+                "A": [{"ttl": 600, "address": r["value"]} for r in records.get("A", [])],
+                "MX": [
+                    {"ttl": 300, "exchange": f"{r['value']}.", "preference": r["priority"]}
+                    for r in records.get("MX", [])
+                ],
+                "TXT": [{"ttl": 300, "txtdata": r["value"]} for r in records.get("TXT", [])],
+                "DNS": [{"value": "ns1.beget.com"}, {"value": "ns2.beget.com"}],
+                "DNS_IP": [],
+            },
+        }
+
+    async def _change_records(self, params: dict[str, Any]) -> Any:
+        fqdn = str(params["fqdn"])
+        records = params.get("records") or {}
+        self.records[fqdn] = {
+            record_type: [
+                {"value": str(r["value"]), "priority": int(r.get("priority", 10))}
+                for r in values
+            ]
+            for record_type, values in records.items()
+        }
+        return True
+
+    # ============ HTTP ============
+
+    def build_app(self) -> web.Application:
+        """Build the aiohttp application."""
+        app = web.Application()
+        app.router.add_route("*", "/api/{section}/{method}", self._handle)
+        return app
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        endpoint = f"{request.match_info['section']}/{request.match_info['method']}"
+        self.calls[endpoint] += 1
+        if self.down:
+            return web.Response(
+                status=503, text="<html>503 Service Unavailable</html>", content_type="text/html"
+            )
+
+        if self.latency_ms:
+            jitter = 1 + self.random.uniform(-self.latency_jitter, self.latency_jitter)
+            await asyncio.sleep(max(0.0, self.latency_ms * jitter) / 1000)
+
+        query = request.query
+        if self.login is not None and (
+            query.get("login") != self.login or query.get("passwd") != self.password
+        ):
+            return self._error_response("AUTH_ERROR", "Authorization failed", top_level=True)
+
+        handler = self._handlers.get(endpoint)
+        if handler is None:
+            return self._error_response("METHOD_NOT_FOUND", f"Unknown method {endpoint}")
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            return self._error_response("INTERNAL_ERROR", "Simulated failure")
+
+        try:
+            params = json.loads(query["input_data"]) if "input_data" in query else {}
+            result = await handler(params)
+        except SimulatedApiError as e:
+            return self._error_response(e.code, e.text)
+        except (KeyError, ValueError, TypeError) as e:
+            return self._error_response("INVALID_DATA", f"Invalid input: {e}")
+
+        return self._json({"status": "success", "answer": {"status": "success", "result": result}})
+
+    def _error_response(self, code: str, text: str, top_level: bool = False) -> web.Response:
+        error = {"error_code": code, "error_text": text}
+        if top_level:
+            return self._json({"status": "error", "error_text": text, "errors": [error]})
+        return self._json({"status": "success", "answer": {"status": "error", "errors": [error]}})
+
+    @staticmethod
+    def _json(payload: dict[str, Any]) -> web.Response:
+        # The real API answers with text/html, the client must not rely on it
+        return web.Response(text=json.dumps(payload), content_type="text/html")
+
+    @property
+    def api_url(self) -> str:
+        """Base URL to pass as BegetClientManager(base_url=...)."""
+        if self.port is None:
+            raise RuntimeError("Simulator is not running")
+        return f"http://{self.host}:{self.port}/api"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Start serving. Port 0 picks a free port (see api_url)."""
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.host = host
+        self.port = self._runner.addresses[0][1]
+        logger.info(f"Beget simulator listening on {self.api_url}")
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+            self.port = None
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    simulator = BegetSimulator(
+        domains=args.domains,
+        subdomains_per_domain=args.subdomains,
+        a_records=args.a_records,
+        txt_records=args.txt_records,
+        latency_ms=args.latency_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    await simulator.start(args.host, args.port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.stop()
+
+
+def main() -> None:
+    """Run the simulator from the command line."""
+    parser = argparse.ArgumentParser(description="Local Beget API simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--domains", type=int, default=10)
+    parser.add_argument("--subdomains", type=int, default=5, help="Subdomains per domain")
+    parser.add_argument("--a-records", type=int, default=1)
+    parser.add_argument("--txt-records", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""End-to-end throughput benchmark.
+
+Feeds scripted flows through Dispatcher.feed_update with a configurable
+number of concurrent users and reports updates/sec and latency
+percentiles per flow. Results can be saved as a baseline and later runs
+compared against it.
+
+Usage:
+    python -m benchmarks.throughput --concurrency 20 --iterations 200
+    python -m benchmarks.throughput --save-baseline benchmarks/baseline.json
+    python -m benchmarks.throughput --beget-latency-ms 80 --fail-under 10
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from benchmarks.flows import FLOWS, Flow, actors_for, build_updates
+from benchmarks.harness import BotHarness
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class FlowResult:
+    """Measurements for one flow."""
+
+    name: str
+    runs: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+
+    @property
+    def updates(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def updates_per_sec(self) -> float:
+        return self.updates / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "updates": self.updates,
+            "errors": self.errors,
+            "updates_per_sec": round(self.updates_per_sec, 1),
+            "p50_ms": round(percentile(self.latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(self.latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(self.latencies, 99) * 1000, 2),
+        }
+
+
+async def run_flow(harness: BotHarness, flow: Flow, iterations: int) -> FlowResult:
+    """Run a flow `iterations` times, one worker per actor.
+
+    Each worker replays the flow sequentially for its own user, the
+    workers themselves run concurrently.
+    """
+    result = FlowResult(flow.name)
+    actors = actors_for(harness, flow)
+    remaining = iter(range(iterations))
+
+    async def worker(actor) -> None:
+        for iteration in remaining:
+            for update in build_updates(harness, flow, actor, iteration):
+                start = time.perf_counter()
+                try:
+                    await harness.dp.feed_update(harness.bot, update)
+                except Exception as e:
+                    result.errors += 1
+                    logger.debug(f"{flow.name}: update failed: {e}")
+                result.latencies.append(time.perf_counter() - start)
+            result.runs += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(actor) for actor in actors))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+async def run_benchmark(
+    flows: list[str],
+    concurrency: int,
+    iterations: int,
+    beget_latency_ms: float,
+    telegram_latency_ms: float,
+    domains: int,
+    subdomains: int,
+) -> dict[str, Any]:
+    """Run the selected flows and return the report."""
+    report: dict[str, Any] = {
+        "config": {
+            "concurrency": concurrency,
+            "iterations": iterations,
+            "beget_latency_ms": beget_latency_ms,
+            "telegram_latency_ms": telegram_latency_ms,
+            "domains": domains,
+            "subdomains": subdomains,
+        },
+        "flows": {},
+    }
+    async with BotHarness(
+        users=concurrency,
+        admins=concurrency,
+        domains=domains,
+        subdomains_per_domain=subdomains,
+        beget_latency_ms=beget_latency_ms,
+        telegram_latency_ms=telegram_latency_ms,
+    ) as harness:
+        for name in flows:
+            result = await run_flow(harness, FLOWS[name], iterations)
+            report["flows"][name] = result.to_dict()
+        report["beget_calls"] = dict(harness.simulator.calls)
+        report["telegram_calls"] = dict(harness.session.calls)
+    return report
+
+
+def _delta(current: float, baseline: float) -> str:
+    if not baseline:
+        return "n/a"
+    return f"{(current - baseline) / baseline * 100:+.1f}%"
+
+
+def print_report(report: dict[str, Any], baseline: dict[str, Any] | None) -> None:
+    """Print a table of results, with deltas when a baseline is given."""
+    header = f"{'flow':<18} {'upd/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}"
+    if baseline:
+        header += f" {'upd/s vs base':>14} {'p95 vs base':>12}"
+    print(header)
+    print("-" * len(header))
+    for name, stats in report["flows"].items():
+        line = (
+            f"{name:<18} {stats['updates_per_sec']:>9.1f} {stats['p50_ms']:>9.2f}"
+            f" {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} {stats['errors']:>7}"
+        )
+        base = (baseline or {}).get("flows", {}).get(name)
+        if base:
+            line += (
+                f" {_delta(stats['updates_per_sec'], base['updates_per_sec']):>14}"
+                f" {_delta(stats['p95_ms'], base['p95_ms']):>12}"
+            )
+        print(line)
+
+
+def regressions(
+    report: dict[str, Any], baseline: dict[str, Any], max_drop_pct: float
+) -> list[str]:
+    """Flows whose throughput dropped more than max_drop_pct below baseline."""
+    failed = []
+    for name, stats in report["flows"].items():
+        base = baseline.get("flows", {}).get(name)
+        if not base or not base["updates_per_sec"]:
+            continue
+        drop = (base["updates_per_sec"] - stats["updates_per_sec"]) / base["updates_per_sec"] * 100
+        if drop > max_drop_pct:
+            failed.append(f"{name}: {drop:.1f}% slower than baseline")
+    return failed
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="End-to-end bot throughput benchmark")
+    parser.add_argument("--flows", nargs="+", choices=sorted(FLOWS), default=list(FLOWS))
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent users per flow")
+    parser.add_argument("--iterations", type=int, default=100, help="Flow runs per flow")
+    parser.add_argument("--beget-latency-ms", type=float, default=0.0)
+    parser.add_argument("--telegram-latency-ms", type=float, default=0.0)
+    parser.add_argument("--domains", type=int, default=10)
+    parser.add_argument("--subdomains", type=int, default=5, help="Subdomains per domain")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", type=Path, help="Write results to this file")
+    parser.add_argument(
+        "--fail-under",
+        type=float,
+        help="Exit with status 1 if any flow is this many percent slower than baseline",
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run_benchmark(
+            flows=args.flows,
+            concurrency=args.concurrency,
+            iterations=args.iterations,
+            beget_latency_ms=args.beget_latency_ms,
+            telegram_latency_ms=args.telegram_latency_ms,
+            domains=args.domains,
+            subdomains=args.subdomains,
+        )
+    )
+
+    baseline = None
+    if args.baseline.exists() and args.save_baseline is None:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("config") != report["config"]:
+            print(f"Note: baseline {args.baseline} was recorded with a different config\n")
+
+    print_report(report, baseline)
+
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nBaseline saved to {args.save_baseline}")
+
+    if baseline and args.fail_under is not None:
+        failed = regressions(report, baseline, args.fail_under)
+        if failed:
+            print("\nRegressions:\n  " + "\n  ".join(failed))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Fixtures for integration tests running the full bot offline."""
+
+import inspect
+from typing import Any
+
+import pytest
+
+from app.services.beget.client import BegetClient
+from app.services.database import (
+    ChatsRepository,
+    LogsRepository,
+    PermissionsRepository,
+    ResponseCacheRepository,
+)
+from benchmarks.harness import BotHarness
+from tests.integration.helpers import CallCounter, counting
+
+COUNTED_REPOSITORIES = (
+    ChatsRepository,
+    LogsRepository,
+    PermissionsRepository,
+    ResponseCacheRepository,
+)
+
+
+@pytest.fixture
+def call_counter(monkeypatch) -> CallCounter:
+    """Count BegetClient.request and repository calls for the test."""
+    counter = CallCounter()
+
+    original_request = BegetClient.request
+
+    async def request(self, endpoint: str, params: dict[str, Any] | None = None) -> Any:
+        counter.calls[f"beget:{endpoint}"] += 1
+        return await original_request(self, endpoint, params)
+
+    monkeypatch.setattr(BegetClient, "request", request)
+
+    for repository in COUNTED_REPOSITORIES:
+        for name, func in list(vars(repository).items()):
+            if name.startswith("_") or not inspect.iscoroutinefunction(func):
+                continue
+            key = f"db:{repository.__name__}.{name}"
+            monkeypatch.setattr(repository, name, counting(counter, key, func))
+
+    return counter
+
+
+@pytest.fixture
+async def bot_harness():
+    """The fully wired bot with two users and one admin."""
+    async with BotHarness(users=2, admins=1, domains=3, subdomains_per_domain=3) as harness:
+        yield harness
+
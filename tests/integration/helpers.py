@@ -0,0 +1,52 @@
+"""Helpers shared by the integration tests."""
+
+import functools
+from collections import Counter
+from typing import Any, Callable
+
+import pytest
+
+
+class CallCounter:
+    """Counts Beget API calls per endpoint and repository calls per query.
+
+    Keys look like "beget:dns/getData" and
+    "db:PermissionsRepository.get_domain_users".
+    """
+
+    def __init__(self) -> None:
+        self.calls: Counter[str] = Counter()
+
+    def reset(self) -> None:
+        self.calls.clear()
+
+    def over_budget(self, budget: dict[str, int]) -> list[str]:
+        """Calls exceeding the budget. Calls missing from the budget allow zero."""
+        problems = []
+        for key, count in sorted(self.calls.items()):
+            allowed = budget.get(key, 0)
+            if count > allowed:
+                problems.append(f"{key}: {count} calls, budget {allowed}")
+        return problems
+
+    def assert_within(self, budget: dict[str, int], flow: str = "") -> None:
+        """Fail the test if any call is over its budget."""
+        problems = self.over_budget(budget)
+        if problems:
+            actual = "\n  ".join(f"{k}: {v}" for k, v in sorted(self.calls.items()))
+            pytest.fail(
+                f"Flow {flow or '?'} exceeded its call budget:\n  "
+                + "\n  ".join(problems)
+                + f"\nAll calls:\n  {actual}"
+            )
+
+
+def counting(counter: CallCounter, key: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a coroutine function to count its calls under key."""
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        counter.calls[key] += 1
+        return await func(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,92 @@
+"""Integration tests for Beget outages: circuit breaker and last known data."""
+
+import pytest
+
+from app.bot.responses import RENDERED
+from app.services.beget import (
+    BegetClientManager,
+    CircuitOpenError,
+    DnsService,
+    DomainsService,
+)
+from benchmarks.simulator import BegetSimulator
+
+
+@pytest.fixture
+async def simulator():
+    simulator = BegetSimulator(domains=2, subdomains_per_domain=2)
+    await simulator.start()
+    yield simulator
+    await simulator.stop()
+
+
+class TestBegetOutage:
+    """Tests for failing fast and serving last known answers."""
+
+    async def test_breaker_fails_fast_while_beget_is_down(self, simulator):
+        """Test that after the threshold no more requests reach the API."""
+        async with BegetClientManager(
+            "u", "p", base_url=simulator.api_url, cache_ttl=0, breaker_failures=2
+        ) as manager:
+            simulator.down = True
+            async with manager.client() as client:
+                for _ in range(2):
+                    with pytest.raises(Exception):
+                        await DomainsService(client).get_domains()
+                with pytest.raises(CircuitOpenError):
+                    await DomainsService(client).get_domains()
+
+            assert simulator.calls["domain/getList"] == 2
+            assert manager.breaker.state == "open"
+
+    async def test_reads_fall_back_to_last_known_answers(self, simulator):
+        """Test that domains, subdomains and DNS data are served from the last answers."""
+        async with BegetClientManager("u", "p", base_url=simulator.api_url, cache_ttl=0) as manager:
+            async with manager.client() as client:
+                domains = DomainsService(client)
+                dns = DnsService(client)
+                expected = (
+                    await domains.get_domains(),
+                    await domains.get_subdomains(101),
+                    await dns.get_dns_data("domain1.test"),
+                )
+
+                simulator.down = True
+                assert (
+                    await domains.get_domains(),
+                    await domains.get_subdomains(101),
+                    await dns.get_dns_data("domain1.test"),
+                ) == expected
+
+                # Read-modify-write never works on old data
+                with pytest.raises(Exception):
+                    await dns.get_dns_data("domain1.test", fresh=True)
+                # Nothing known: the error is raised
+                with pytest.raises(Exception):
+                    await dns.get_dns_data("domain2.test")
+
+    async def test_menu_notes_the_age_of_shown_data(self, bot_harness):
+        """Test that a menu built from last known data says so."""
+        harness = bot_harness
+        user_id = harness.user_ids[0]
+        domain_id, _ = harness.domains[0]
+        RENDERED.clear()
+        await harness.feed(harness.factory.callback(user_id, f"d:{domain_id}"))
+        # Only the last known answers remain
+        cache = harness.container.beget_manager.cache
+        cache.clear()
+        cache.l2 = None
+
+        harness.simulator.down = True
+        sent = []
+        make_request = harness.session.make_request
+
+        async def capture(bot, method, timeout=None):
+            if method.__api_method__ == "editMessageText":
+                sent.append(method.text)
+            return await make_request(bot, method, timeout)
+
+        harness.session.make_request = capture
+        await harness.feed(harness.factory.callback(user_id, f"d:{domain_id}"))
+
+        assert "Beget API is unavailable. Showing data as of" in sent[-1]
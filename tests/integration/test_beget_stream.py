@@ -0,0 +1,51 @@
+"""Integration tests for streamed list answers against the simulator."""
+
+import pytest
+
+from app.services.beget import BegetApiError, BegetClientManager, DomainsService
+from benchmarks.simulator import BegetSimulator, SimulatedApiError
+
+
+@pytest.fixture
+async def simulator():
+    sim = BegetSimulator(domains=3, subdomains_per_domain=4)
+    await sim.start()
+    yield sim
+    await sim.stop()
+
+
+class TestStreamedLists:
+    """Tests for BegetClient.stream and streamed subdomain reads."""
+
+    async def test_stream_filters_items(self, simulator):
+        """Test that only matching items are yielded, in API order."""
+        async with BegetClientManager("u", "p", base_url=simulator.api_url, cache_ttl=0) as manager:
+            async with manager.client() as client:
+                items = [
+                    item async for item in client.stream(
+                        "domain/getSubdomainList", predicate=lambda s: s["domain_id"] == 102
+                    )
+                ]
+        assert [item["fqdn"] for item in items] == [f"sub{i}.domain2.test" for i in range(1, 5)]
+
+    async def test_uncached_and_fresh_reads_stream(self, simulator):
+        """Test that streamed subdomain reads equal the cached full-list path."""
+        async with BegetClientManager("u", "p", base_url=simulator.api_url, cache_ttl=30) as manager:
+            async with manager.client() as client:
+                service = DomainsService(client)
+                cached = await service.get_subdomains(103)
+                streamed = await service.get_subdomains(103, fresh=True)
+        assert streamed == cached
+        assert len(streamed) == 4
+
+    async def test_errors_are_raised_after_the_body(self, simulator):
+        """Test that an error envelope raises BegetApiError."""
+
+        async def fail(params):
+            raise SimulatedApiError("LIMIT", "too many requests")
+
+        simulator._handlers["domain/getSubdomainList"] = fail
+        async with BegetClientManager("u", "p", base_url=simulator.api_url, cache_ttl=0) as manager:
+            async with manager.client() as client:
+                with pytest.raises(BegetApiError, match="too many requests"):
+                    await DomainsService(client).get_subdomains(101)
@@ -0,0 +1,53 @@
+"""Smoke tests for the offline benchmark harness."""
+
+from benchmarks.flows import FLOWS
+from benchmarks.harness import BotHarness
+from benchmarks.throughput import percentile, regressions, run_flow
+
+
+class TestBenchmarkHarness:
+    """Tests for running flows through the real dispatcher."""
+
+    async def test_every_flow_runs_without_errors(self):
+        """Test that each scripted flow reaches its handlers and succeeds."""
+        async with BotHarness(users=2, admins=2, domains=2, subdomains_per_domain=2) as harness:
+            for flow in FLOWS.values():
+                result = await run_flow(harness, flow, iterations=2)
+                assert result.errors == 0, flow.name
+                assert result.runs == 2
+
+            assert harness.simulator.calls["dns/changeRecords"] == 4  # 2 runs, domain + www
+            assert harness.session.calls["answerCallbackQuery"] > 0
+
+            users = await harness.container.permissions_repo.get_domain_users(harness.domains[0][1])
+            assert {u.chat_id for u in users} == set(harness.user_ids)
+
+    async def test_harness_can_be_rebuilt(self):
+        """Test that routers are detached so a second harness can mount them."""
+        async with BotHarness(users=1) as harness:
+            result = await run_flow(harness, FLOWS["browse_domains"], iterations=1)
+            assert result.errors == 0
+
+    async def test_restart_skips_command_registration(self, tmp_path):
+        """Test that a restart on the same data dir sends no setMyCommands."""
+        async with BotHarness(users=1, data_dir=tmp_path) as harness:
+            assert harness.session.calls["setMyCommands"] == 2
+        async with BotHarness(users=1, data_dir=tmp_path) as harness:
+            assert harness.session.calls["setMyCommands"] == 0
+
+
+class TestReport:
+    """Tests for report helpers."""
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 99) == 99.0
+        assert percentile([], 95) == 0.0
+
+    def test_regressions(self):
+        """Test that only drops beyond the threshold are reported."""
+        baseline = {"flows": {"a": {"updates_per_sec": 100.0}, "b": {"updates_per_sec": 100.0}}}
+        report = {"flows": {"a": {"updates_per_sec": 95.0}, "b": {"updates_per_sec": 70.0}}}
+        assert regressions(report, baseline, max_drop_pct=10) == ["b: 30.0% slower than baseline"]
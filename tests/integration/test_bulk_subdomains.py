@@ -0,0 +1,82 @@
+"""Integration tests for bulk subdomain creation and deletion."""
+
+from app.services.bulk import parse_names
+
+
+async def open_domain(harness, user_id: int, domain_id: int) -> None:
+    await harness.feed(harness.factory.callback(user_id, "md"))
+    await harness.feed(harness.factory.callback(user_id, f"d:{domain_id}"))
+    await harness.container.prefetcher.drain()
+
+
+def subdomain_names(simulator, domain_id: int) -> set[str]:
+    return {fqdn for d, fqdn in simulator.subdomains.values() if d == domain_id}
+
+
+class TestParseNames:
+    """Tests for reading a pasted list of names."""
+
+    def test_separators_case_and_duplicates(self):
+        assert parse_names("API, admin\nstatic;api  Admin.") == ["api", "admin", "static"]
+
+
+class TestBulkSubdomains:
+    """Tests for the bulk add/delete flow."""
+
+    async def test_bulk_create_records_creators_and_reports_once(self, bot_harness):
+        """Test that all names are created concurrently with one summary."""
+        harness = bot_harness
+        user_id = harness.user_ids[0]
+        domain_id, fqdn = harness.domains[0]
+        await open_domain(harness, user_id, domain_id)
+        names = [f"svc{i}" for i in range(12)]
+
+        await harness.feed(harness.factory.callback(user_id, f"bas:{domain_id}"))
+        await harness.feed(harness.factory.message(user_id, "\n".join(names)))
+        harness.simulator.calls.clear()
+        sends = harness.session.calls["sendMessage"]
+        await harness.feed(harness.factory.callback(user_id, f"bsc:{domain_id}"))
+
+        assert harness.simulator.calls["domain/addSubdomainVirtual"] == len(names)
+        assert {f"{n}.{fqdn}" for n in names} <= subdomain_names(harness.simulator, domain_id)
+        created = await harness.container.permissions_repo.get_user_created_subdomains(user_id)
+        assert sorted(created) == sorted(f"{n}.{fqdn}" for n in names)
+        assert harness.session.calls["sendMessage"] == sends
+
+    async def test_invalid_names_reject_the_whole_list(self, bot_harness):
+        """Test that validation runs before any API call."""
+        harness = bot_harness
+        user_id = harness.user_ids[0]
+        domain_id, fqdn = harness.domains[0]
+        await open_domain(harness, user_id, domain_id)
+
+        await harness.feed(harness.factory.callback(user_id, f"bas:{domain_id}"))
+        harness.simulator.calls.clear()
+        await harness.feed(harness.factory.message(user_id, "good\nbad_name\n-dash\nsub1"))
+
+        assert harness.simulator.calls["domain/addSubdomainVirtual"] == 0
+        state = await harness.dp.fsm.get_context(harness.bot, user_id, user_id).get_state()
+        assert state == "SubdomainStates:waiting_bulk_add_names"
+
+    async def test_bulk_delete(self, bot_harness):
+        """Test deleting existing subdomains given as labels or FQDNs."""
+        harness = bot_harness
+        user_id = harness.user_ids[0]
+        domain_id, fqdn = harness.domains[1]
+        await open_domain(harness, user_id, domain_id)
+        before = subdomain_names(harness.simulator, domain_id)
+
+        await harness.feed(harness.factory.callback(user_id, f"bds:{domain_id}"))
+        await harness.feed(harness.factory.message(user_id, f"sub1 sub2.{fqdn}"))
+        harness.simulator.calls.clear()
+        await harness.feed(harness.factory.callback(user_id, f"bsc:{domain_id}"))
+
+        assert harness.simulator.calls["domain/deleteSubdomain"] == 2
+        assert harness.simulator.calls["domain/getSubdomainList"] == 0
+        assert before - subdomain_names(harness.simulator, domain_id) == {
+            f"sub1.{fqdn}", f"sub2.{fqdn}"
+        }
+
+        # A repeated tap does not run the batch again
+        await harness.feed(harness.factory.callback(user_id, f"bsc:{domain_id}"))
+        assert harness.simulator.calls["domain/deleteSubdomain"] == 2
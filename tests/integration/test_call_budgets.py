@@ -0,0 +1,231 @@
+"""Beget API and database call budgets per user flow.
+
+Each flow is run once through the real dispatcher and every
+BegetClient.request and repository call is counted. A flow fails if it
+makes more calls than its budget allows, or calls anything that is not
+in its budget at all. Lower a budget when an optimization removes
+calls; raising one needs a reason in the commit.
+
+Opening a domain menu prefetches the subdomain list and the domain's DNS
+data in the background (PREFETCH_DOMAIN). Those calls are counted too,
+but the screens that follow read them from the response cache.
+
+Every Beget read that misses the in-memory cache also looks up and
+stores its answer in the persistent cache (ResponseCacheRepository),
+so those SQLite queries are budgeted alongside it.
+"""
+
+import pytest
+
+from benchmarks.flows import FLOWS, Flow, actor_for, callback, run_flow_once, steps
+
+# Permission lookup made by PermissionChecker.filter_domains for a non-admin user
+FILTER_DOMAINS = {
+    "db:PermissionsRepository.get_effective_permissions": 1,
+}
+
+# Background warm-up after d:<id>; the next screen then costs no Beget call
+PREFETCH_DOMAIN = {
+    "beget:domain/getSubdomainList": 1,
+    "beget:dns/getData": 1,
+}
+
+
+
+def persisted_reads(count: int) -> dict[str, int]:
+    """Persistent cache lookup and store for count uncached Beget reads."""
+    return {
+        "db:ResponseCacheRepository.get": count,
+        "db:ResponseCacheRepository.put": count,
+    }
+
+
+# A record change: the fresh read re-stores the unchanged answer (TTL only),
+# then the change drops the stored answers of the FQDN and its www twin
+PERSISTED_CHANGE = {
+    "db:ResponseCacheRepository.refresh": 1,
+    "db:ResponseCacheRepository.delete": 2,
+}
+
+BUDGETS: dict[str, dict[str, int]] = {
+    # md -> d:<id> -> ss:<id>
+    "browse_domains": {
+        "beget:domain/getList": 1,
+        **PREFETCH_DOMAIN,  # ss:<id> is served from cache
+        "db:ChatsRepository.is_allowed": 3,
+        "db:PermissionsRepository.get_capabilities": 2,
+        **FILTER_DOMAINS,
+        "db:PermissionsRepository.get_effective_permissions": 2,  # + filter_subdomains
+        **persisted_reads(3),
+    },
+    # md -> d:<id> -> dn:<id> -> dnv:<id>
+    "view_dns": {
+        "beget:domain/getList": 1,
+        **PREFETCH_DOMAIN,  # dnv:<id> is served from cache
+        "db:ChatsRepository.is_allowed": 4,
+        "db:PermissionsRepository.get_capabilities": 2,
+        **FILTER_DOMAINS,
+        **persisted_reads(3),
+    },
+    # md -> d:<id> -> dn:<id> -> aa:<id> -> "<ip>"
+    "add_a_record": {
+        "beget:domain/getList": 1,
+        **PREFETCH_DOMAIN,
+        "beget:dns/getData": 2,  # prefetch + uncached read-modify-write
+        "beget:dns/changeRecords": 2,  # domain + www twin
+        "db:ChatsRepository.is_allowed": 5,
+        "db:PermissionsRepository.get_capabilities": 3,
+        **FILTER_DOMAINS,
+        **persisted_reads(3),
+        **PERSISTED_CHANGE,
+    },
+    # ap -> pd -> pdo:<i> -> pi:d:0 -> pg:d -> "<chat id>" -> pdn:1:0 -> ps:1:0
+    "grant_permission": {
+        "beget:domain/getList": 1,
+        "beget:domain/getSubdomainList": 1,
+        "db:ChatsRepository.is_allowed": 1,
+        "db:ChatsRepository.get_all": 2,
+        "db:PermissionsRepository.get_domain_users": 2,
+        "db:PermissionsRepository.grant_domain_access": 1,
+        **persisted_reads(2),
+    },
+    # md -> d:<id> -> dn:<id> -> dna:<id> -> da:<id>:0 -> dda:<id>:0
+    "delete_a_record": {
+        "beget:domain/getList": 1,
+        **PREFETCH_DOMAIN,
+        "beget:dns/getData": 3,  # prefetch (serves the list), read-modify-write, refreshed list
+        "beget:dns/changeRecords": 2,
+        "db:ChatsRepository.is_allowed": 6,
+        "db:PermissionsRepository.get_capabilities": 3,
+        **FILTER_DOMAINS,
+        **persisted_reads(4),  # + the refreshed list after the change
+        **PERSISTED_CHANGE,
+    },
+    # md -> d:<id> -> ss:<id> -> s:<sub> -> sdn:<sub>
+    "subdomain_dns": {
+        "beget:domain/getList": 1,
+        **PREFETCH_DOMAIN,
+        "db:ChatsRepository.is_allowed": 5,
+        "db:PermissionsRepository.get_capabilities": 6,
+        **FILTER_DOMAINS,
+        "db:PermissionsRepository.get_effective_permissions": 2,  # + filter_subdomains
+        **persisted_reads(3),
+    },
+    # d:<id> with an empty FSM state falls back to a single getList
+    "open_domain_directly": {
+        "beget:domain/getList": 1,
+        **PREFETCH_DOMAIN,
+        "db:ChatsRepository.is_allowed": 1,
+        "db:PermissionsRepository.get_capabilities": 1,
+        **persisted_reads(3),
+    },
+}
+
+
+def _extra_flows(harness) -> dict[str, Flow]:
+    domain_id, _ = harness.domains[0]
+    subdomain_id = next(
+        sub_id
+        for sub_id, (parent_id, _) in harness.simulator.subdomains.items()
+        if parent_id == domain_id
+    )
+    return {
+        "delete_a_record": Flow("delete_a_record", admin=False, steps=steps(
+            callback("md"),
+            callback(f"d:{domain_id}"),
+            callback(f"dn:{domain_id}"),
+            callback(f"dna:{domain_id}"),
+            callback(f"da:{domain_id}:0"),
+            callback(f"dda:{domain_id}:0"),
+        )),
+        "subdomain_dns": Flow("subdomain_dns", admin=False, steps=steps(
+            callback("md"),
+            callback(f"d:{domain_id}"),
+            callback(f"ss:{domain_id}"),
+            callback(f"s:{subdomain_id}"),
+            callback(f"sdn:{subdomain_id}"),
+        )),
+        "open_domain_directly": Flow("open_domain_directly", admin=False, steps=steps(
+            callback(f"d:{domain_id}"),
+        )),
+    }
+
+
+class TestCallBudgets:
+    """Every scripted flow stays within its declared call budget."""
+
+    @pytest.mark.parametrize("flow_name", sorted(FLOWS))
+    async def test_benchmark_flows(self, bot_harness, call_counter, flow_name):
+        """Test the flows used by the throughput benchmark."""
+        flow = FLOWS[flow_name]
+        actor = actor_for(bot_harness, admin=flow.admin)
+        call_counter.reset()
+
+        await run_flow_once(bot_harness, flow, actor)
+
+        call_counter.assert_within(BUDGETS[flow_name], flow_name)
+
+    @pytest.mark.parametrize("flow_name", ["delete_a_record", "subdomain_dns"])
+    async def test_domain_flows(self, bot_harness, call_counter, flow_name):
+        """Test additional flows through app/modules/domains."""
+        flow = _extra_flows(bot_harness)[flow_name]
+        call_counter.reset()
+
+        await run_flow_once(bot_harness, flow, actor_for(bot_harness))
+
+        call_counter.assert_within(BUDGETS[flow_name], flow_name)
+
+    async def test_domain_menu_fallback_fetches_once(self, bot_harness, call_counter):
+        """Test that opening a domain without a cached list costs one getList."""
+        flow = _extra_flows(bot_harness)["open_domain_directly"]
+        call_counter.reset()
+
+        await run_flow_once(bot_harness, flow, actor_for(bot_harness, user_index=1))
+
+        call_counter.assert_within(BUDGETS["open_domain_directly"], flow.name)
+        assert call_counter.calls["beget:domain/getList"] == 1
+
+    async def test_prefetched_screens_cost_no_beget_calls(self, bot_harness, call_counter):
+        """Test that the screens after a domain menu are served from the prefetch."""
+        actor = actor_for(bot_harness)
+        domain_id = actor.domain_id
+        await run_flow_once(bot_harness, Flow("open", admin=False, steps=steps(
+            callback("md"),
+            callback(f"d:{domain_id}"),
+        )), actor)
+        call_counter.reset()
+
+        await run_flow_once(bot_harness, Flow("next", admin=False, steps=steps(
+            callback(f"ss:{domain_id}"),
+            callback(f"dn:{domain_id}"),
+            callback(f"dnv:{domain_id}"),
+        )), actor)
+
+        assert not [key for key in call_counter.calls if key.startswith("beget:")]
+
+    async def test_record_change_invalidates_cached_dns(self, bot_harness, call_counter):
+        """Test that DNS data is fetched again after a record change."""
+        flow = FLOWS["add_a_record"]
+        actor = actor_for(bot_harness)
+        await run_flow_once(bot_harness, flow, actor)
+        call_counter.reset()
+
+        await run_flow_once(bot_harness, Flow("view", admin=False, steps=steps(
+            callback(f"d:{actor.domain_id}"),
+            callback(f"dn:{actor.domain_id}"),
+            callback(f"dnv:{actor.domain_id}"),
+        )), actor)
+
+        # Refetched once (by the prefetch), then served from cache
+        assert call_counter.calls["beget:dns/getData"] == 1
+
+    async def test_budget_violation_is_reported(self, call_counter):
+        """Test that unbudgeted and excess calls are both reported."""
+        call_counter.calls.update({"beget:dns/getData": 2, "db:ChatsRepository.get_all": 1})
+
+        assert call_counter.over_budget({"beget:dns/getData": 1}) == [
+            "beget:dns/getData: 2 calls, budget 1",
+            "db:ChatsRepository.get_all: 1 calls, budget 0",
+        ]
+        with pytest.raises(pytest.fail.Exception, match="exceeded its call budget"):
+            call_counter.assert_within({}, "example")
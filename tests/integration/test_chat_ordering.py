@@ -0,0 +1,37 @@
+"""Integration tests for per-chat update ordering in the wired bot."""
+
+import asyncio
+
+from app.bot.responses import RENDERED
+from app.services.metrics import UPDATES_DROPPED
+
+
+class TestChatOrdering:
+    """Tests for rapid taps going through the real dispatcher."""
+
+    async def test_repeated_taps_on_a_menu_run_first_and_last(self, bot_harness):
+        """Test that taps queued behind a running one collapse into the newest."""
+        harness = bot_harness
+        user_id = harness.user_ids[0]
+        domain_id, _ = harness.domains[0]
+        dropped = UPDATES_DROPPED.value(reason="superseded_callback")
+        harness.session.calls.clear()
+
+        taps = [harness.factory.callback(user_id, f"d:{domain_id}") for _ in range(3)]
+        await asyncio.gather(*(harness.feed(update) for update in taps))
+
+        # Every tap is answered, the middle one without running its handler
+        assert harness.session.calls["answerCallbackQuery"] == 3
+        assert UPDATES_DROPPED.value(reason="superseded_callback") == dropped + 1
+
+    async def test_chats_are_handled_independently(self, bot_harness):
+        """Test that taps in different chats all run."""
+        harness = bot_harness
+        domain_id, _ = harness.domains[0]
+        RENDERED.clear()
+        harness.session.calls.clear()
+
+        taps = [harness.factory.callback(user_id, f"d:{domain_id}") for user_id in harness.user_ids]
+        await asyncio.gather(*(harness.feed(update) for update in taps))
+
+        assert harness.session.calls["editMessageText"] == len(harness.user_ids)
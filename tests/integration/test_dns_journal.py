@@ -0,0 +1,117 @@
+"""Integration tests for the DNS change journal against the simulator."""
+
+import asyncio
+
+import pytest
+
+from app.services.beget import DnsService
+from app.services.snapshot import JournalError
+
+
+def a_values(simulator, fqdn: str) -> list[str]:
+    return [r["value"] for r in simulator.records.get(fqdn, {}).get("A", [])]
+
+
+class TestDnsJournal:
+    """Tests for journaling and rolling back record changes."""
+
+    async def test_changes_are_journaled_as_deltas(self, bot_harness):
+        """Test that each change stores only what it removed and added."""
+        harness = bot_harness
+        journal = harness.container.dns_journal
+        old_ip = a_values(harness.simulator, "domain1.test")[0]
+
+        async with harness.container.beget_manager.client() as client:
+            await DnsService(client).update_a_record("domain1.test", old_ip, "198.51.100.1", sync_www=False)
+
+        [entry] = await journal.repo.get_entries("domain1.test")
+        assert entry.complete
+        assert entry.removed == [("A", old_ip, 10)]
+        assert entry.added == [("A", "198.51.100.1", 10)]
+        state = await journal.repo.get_state("domain1.test")
+        assert ("A", "198.51.100.1", 10) in state
+        assert {r[0] for r in state} == {"A", "MX", "TXT"}
+
+    async def test_rollback_restores_past_state_in_one_call(self, bot_harness):
+        """Test that rolling back several changes writes the original records once."""
+        harness = bot_harness
+        journal = harness.container.dns_journal
+        simulator = harness.simulator
+        original_a = a_values(simulator, "domain2.test")
+        original_txt = list(simulator.records["domain2.test"]["TXT"])
+
+        async with harness.container.beget_manager.client() as client:
+            dns_service = DnsService(client)
+            await dns_service.add_a_record("domain2.test", "198.51.100.2", sync_www=False)
+            await dns_service.add_txt_record("domain2.test", "verify=abc", sync_www=False)
+            await dns_service.delete_a_record("domain2.test", original_a[0], sync_www=False)
+
+        entries = await journal.repo.get_entries("domain2.test")
+        assert len(entries) == 3
+        simulator.calls.clear()
+
+        await journal.rollback("domain2.test", entries[-1].id)
+
+        assert simulator.calls["dns/changeRecords"] == 1
+        assert a_values(simulator, "domain2.test") == original_a
+        assert [r["value"] for r in simulator.records["domain2.test"]["TXT"]] == [
+            r["value"] for r in original_txt
+        ]
+        # The rollback is journaled and can itself be undone
+        latest = (await journal.repo.get_entries("domain2.test"))[0]
+        assert latest.removed == [("A", "198.51.100.2", 10), ("TXT", "verify=abc", 10)]
+
+    async def test_rollback_and_edit_do_not_interleave(self, bot_harness):
+        """Test that a rollback racing a queued edit of its FQDN keeps one of them whole."""
+        harness = bot_harness
+        journal = harness.container.dns_journal
+        simulator = harness.simulator
+        original_a = a_values(simulator, "domain2.test")
+
+        async with harness.container.beget_manager.client() as client:
+            dns_service = DnsService(client)
+            await dns_service.add_a_record("domain2.test", "198.51.100.2", sync_www=False)
+            [entry] = await journal.repo.get_entries("domain2.test")
+            simulator.latency_ms = 20
+
+            await asyncio.gather(
+                journal.rollback("domain2.test", entry.id),
+                dns_service.add_a_record("domain2.test", "198.51.100.9", sync_www=False),
+            )
+
+        # Rollback then edit, or edit then rollback; never the edit on a stale read
+        assert a_values(simulator, "domain2.test") in (original_a, original_a + ["198.51.100.9"])
+        state = await journal.repo.get_state("domain2.test")
+        assert [value for t, value, _ in state if t == "A"] == sorted(a_values(simulator, "domain2.test"))
+
+    async def test_www_sync_uses_known_state(self, bot_harness):
+        """Test that a synced www twin without prior state is journaled as incomplete."""
+        harness = bot_harness
+        journal = harness.container.dns_journal
+
+        async with harness.container.beget_manager.client() as client:
+            await DnsService(client).add_a_record("domain3.test", "198.51.100.3")
+
+        [entry] = await journal.repo.get_entries("www.domain3.test")
+        assert not entry.complete
+        with pytest.raises(JournalError):
+            await journal.rebuild("www.domain3.test", entry.id)
+
+    async def test_history_and_rollback_from_admin_chat(self, bot_harness):
+        """Test /history and the rollback buttons."""
+        harness = bot_harness
+        admin_user = harness.admin_user_ids[0]
+        chat_id = harness.admin_chat_id
+        original_a = a_values(harness.simulator, "domain1.test")
+
+        async with harness.container.beget_manager.client() as client:
+            await DnsService(client).add_a_record("domain1.test", "198.51.100.4", sync_www=False)
+        [entry] = await harness.container.dns_journal.repo.get_entries("domain1.test")
+
+        await harness.feed(harness.factory.message(chat_id, "/history domain1.test", admin_user))
+        await harness.feed(harness.factory.callback(chat_id, f"jrb:{entry.id}", admin_user))
+        await harness.feed(harness.factory.callback(chat_id, f"jrc:{entry.id}", admin_user))
+
+        assert harness.session.calls["sendMessage"] == 1
+        assert harness.session.calls["editMessageText"] == 2
+        assert a_values(harness.simulator, "domain1.test") == original_a
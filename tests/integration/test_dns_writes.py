@@ -0,0 +1,44 @@
+"""Integration tests for serialized DNS record edits against the simulator."""
+
+import asyncio
+
+from app.services.beget import DnsService
+
+
+def values(simulator, fqdn: str, record_type: str) -> list[str]:
+    return [r["value"] for r in simulator.records.get(fqdn, {}).get(record_type, [])]
+
+
+class TestDnsWrites:
+    """Tests for concurrent edits of one FQDN."""
+
+    async def test_concurrent_edits_are_not_lost(self, bot_harness):
+        """Test that concurrent edits all survive and share reads and writes."""
+        harness = bot_harness
+        simulator = harness.simulator
+        before = values(simulator, "domain1.test", "A")
+        simulator.calls.clear()
+
+        async def add(ip: str) -> bool:
+            async with harness.container.beget_manager.client() as client:
+                return await DnsService(client).add_a_record("domain1.test", ip, sync_www=False)
+
+        ips = [f"198.51.100.{i}" for i in range(1, 5)]
+        assert await asyncio.gather(*(add(ip) for ip in ips)) == [True] * 4
+
+        assert values(simulator, "domain1.test", "A") == before + ips
+        assert simulator.calls["dns/changeRecords"] < len(ips)
+        assert simulator.calls["dns/getData"] == simulator.calls["dns/changeRecords"]
+
+    async def test_noop_edits_skip_the_write(self, bot_harness):
+        """Test that deleting a missing record does not rewrite the zone."""
+        harness = bot_harness
+        simulator = harness.simulator
+        simulator.calls.clear()
+
+        async with harness.container.beget_manager.client() as client:
+            dns = DnsService(client)
+            assert not await dns.delete_txt_record("domain1.test", "missing", sync_www=False)
+            assert not await dns.update_a_record("domain1.test", "203.0.113.250", "198.51.100.1")
+
+        assert simulator.calls["dns/changeRecords"] == 0
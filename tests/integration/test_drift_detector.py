@@ -0,0 +1,102 @@
+"""Integration tests for DNS drift detection against the simulator."""
+
+import itertools
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.beget import DnsService
+from app.services.database import SnapshotEntry
+from app.services.snapshot import DriftDetector
+
+
+@pytest.fixture
+async def detector(bot_harness):
+    """A detector on the harness crawler after a full crawl."""
+    await bot_harness.container.dns_crawler.crawl()
+    bot_harness.simulator.calls.clear()
+    return DriftDetector(bot_harness.container.dns_crawler, calls_per_hour=12, interval=900)
+
+
+class TestDriftDetector:
+    """Tests for budgeted drift checks."""
+
+    async def test_budget_limits_calls_per_run(self, bot_harness, detector):
+        """Test that one run spends its share of the hourly budget."""
+        assert detector.budget == 3
+
+        changes = await detector.run_once()
+
+        assert changes == []
+        assert bot_harness.simulator.calls["dns/getData"] == 3
+
+    async def test_recently_used_fqdns_are_checked_first(self, bot_harness, detector):
+        """Test that a change on a recently used FQDN is found in the first run."""
+        simulator = bot_harness.simulator
+        fqdn = "sub2.domain3.test"
+        old_ip = simulator.records[fqdn]["A"][0]["value"]
+        simulator.records[fqdn]["A"] = [{"value": "203.0.113.9", "priority": 10}]
+        detector.touch(fqdn)
+
+        [change] = await detector.run_once()
+
+        assert change.fqdn == fqdn
+        assert change.removed == [("A", old_ip, 10)]
+        assert change.added == [("A", "203.0.113.9", 10)]
+        assert bot_harness.container.reverse_index.lookup("203.0.113.9") == {"A": [fqdn]}
+
+    async def test_priority_order(self, detector):
+        """Test recent FQDNs first (half the budget), then never fetched, then oldest fetch."""
+        def entry(fqdn, fetched_at):
+            return SnapshotEntry(fqdn, None, "hash", fetched_at, None)
+
+        entries = {
+            "new.test": entry("new.test", datetime(2024, 1, 3)),
+            "old.test": entry("old.test", datetime(2024, 1, 1)),
+            "failed.test": entry("failed.test", None),
+            "used.test": entry("used.test", datetime(2024, 1, 3)),
+        }
+        detector.touch("other.test")
+        detector.touch("used.test")
+
+        assert detector.budget == 3
+        assert detector.priority_order(entries) == [
+            "used.test", "failed.test", "other.test", "old.test", "new.test",
+        ]
+
+    async def test_recent_fqdns_do_not_starve_the_rest(self, bot_harness, detector, monkeypatch):
+        """Test that more recent FQDNs than the budget do not stop the rotation."""
+        clock = iter(datetime.now() + timedelta(minutes=i) for i in itertools.count(1))
+        monkeypatch.setattr("app.services.snapshot.drift.utcnow", lambda: next(clock))
+        checked: list[list[str]] = []
+        check_one = detector._check_one
+
+        async def spy(semaphore, fqdn, entry):
+            checked[-1].append(fqdn)
+            return await check_one(semaphore, fqdn, entry)
+
+        detector._check_one = spy
+        touched = [f"sub{i}.domain1.test" for i in (1, 2, 3)] + ["domain2.test", "domain3.test"]
+        for fqdn in touched:
+            detector.touch(fqdn)
+
+        for _ in range(3):
+            checked.append([])
+            await detector.run_once()
+
+        assert [run[0] for run in checked] == ["domain3.test", "sub3.domain1.test", "sub2.domain1.test"]
+        all_checked = [fqdn for run in checked for fqdn in run]
+        # Nothing is fetched twice, untouched FQDNs get their turn, and every
+        # touched FQDN leaves the recent list once checked
+        assert len(all_checked) == len(set(all_checked)) == 9
+        assert len(set(all_checked) - set(touched)) == 4
+        assert set(touched) <= set(all_checked)
+        assert not detector._recent
+
+    async def test_changes_made_through_the_bot_are_not_drift(self, bot_harness, detector):
+        """Test that the change listener keeps hashes current."""
+        async with bot_harness.container.beget_manager.client() as client:
+            await DnsService(client).add_txt_record("domain1.test", "verify=1", sync_www=False)
+        detector.touch("domain1.test")
+
+        assert await detector.run_once() == []
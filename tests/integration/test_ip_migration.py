@@ -0,0 +1,163 @@
+"""Integration tests for bulk IP migration jobs against the simulator."""
+
+import pytest
+
+from app.services.database.jobs import (
+    ITEM_DONE,
+    ITEM_FAILED,
+    ITEM_PENDING,
+    ITEM_SKIPPED,
+    JOB_CANCELLED,
+    JOB_DONE,
+    JOB_RUNNING,
+)
+from benchmarks.simulator import SimulatedApiError
+
+OLD_IP = "192.0.2.10"
+NEW_IP = "198.51.100.20"
+
+
+@pytest.fixture
+async def shared_ip(bot_harness):
+    """Point every domain and its www subdomain at OLD_IP and crawl the account."""
+    simulator = bot_harness.simulator
+    for domain_id, fqdn in bot_harness.domains:
+        simulator.add_subdomain(domain_id, "www")
+        for name in (fqdn, f"www.{fqdn}"):
+            simulator.records[name]["A"] = [{"value": OLD_IP, "priority": 10}]
+    await bot_harness.container.dns_crawler.crawl()
+    return bot_harness.container.ip_migrator.plan(OLD_IP)
+
+
+def a_values(simulator, fqdn: str) -> set[str]:
+    return {r["value"] for r in simulator.records[fqdn].get("A", [])}
+
+
+class TestIpMigrator:
+    """Tests for planning, running and resuming jobs."""
+
+    async def test_plan_comes_from_reverse_index(self, bot_harness, shared_ip):
+        """Test that the plan lists every FQDN pointing at the old IP."""
+        assert len(shared_ip) == 2 * len(bot_harness.domains)
+        assert "domain1.test" in shared_ip and "www.domain1.test" in shared_ip
+
+    async def test_run_updates_every_fqdn_once(self, bot_harness, shared_ip):
+        """Test one changeRecords per FQDN and that the index follows."""
+        harness = bot_harness
+        migrator = harness.container.ip_migrator
+        job = await migrator.create(OLD_IP, NEW_IP, "test")
+        harness.simulator.calls.clear()
+
+        job = await migrator.run(job.id)
+
+        assert job.status == JOB_DONE
+        assert job.counts == {ITEM_DONE: len(shared_ip)}
+        assert harness.simulator.calls["dns/changeRecords"] == len(shared_ip)
+        for fqdn in shared_ip:
+            assert a_values(harness.simulator, fqdn) == {NEW_IP}
+        assert migrator.plan(OLD_IP) == []
+        assert harness.container.reverse_index.lookup(NEW_IP)["A"] == shared_ip
+
+    async def test_resume_processes_only_pending_items(self, bot_harness, shared_ip):
+        """Test that a job interrupted after some items continues where it stopped."""
+        harness = bot_harness
+        migrator = harness.container.ip_migrator
+        jobs_repo = harness.container.jobs_repo
+        job = await migrator.create(OLD_IP, NEW_IP, "test")
+
+        # Simulate a crash after the first item was checkpointed
+        first = shared_ip[0]
+        await jobs_repo.set_status(job.id, JOB_RUNNING)
+        await jobs_repo.mark_item(job.id, first, ITEM_DONE)
+        assert [j.id for j in await jobs_repo.get_unfinished("ip_migration")] == [job.id]
+        harness.simulator.calls.clear()
+
+        job = await migrator.run(job.id)
+
+        assert job.counts == {ITEM_DONE: len(shared_ip)}
+        assert harness.simulator.calls["dns/getData"] == len(shared_ip) - 1
+        assert harness.simulator.calls["dns/changeRecords"] == len(shared_ip) - 1
+        assert await jobs_repo.get_unfinished("ip_migration") == []
+
+    async def test_fqdns_changed_since_planning_are_skipped(self, bot_harness, shared_ip):
+        """Test that an FQDN no longer pointing at the old IP is left alone."""
+        harness = bot_harness
+        migrator = harness.container.ip_migrator
+        job = await migrator.create(OLD_IP, NEW_IP, "test")
+        harness.simulator.records["domain2.test"]["A"] = [{"value": "203.0.113.5", "priority": 10}]
+
+        job = await migrator.run(job.id)
+
+        assert job.counts[ITEM_SKIPPED] == 1
+        assert a_values(harness.simulator, "domain2.test") == {"203.0.113.5"}
+
+    async def test_failures_are_recorded_per_item(self, bot_harness, shared_ip):
+        """Test that one failing FQDN does not stop the job."""
+        harness = bot_harness
+        migrator = harness.container.ip_migrator
+        job = await migrator.create(OLD_IP, NEW_IP, "test")
+        change_records = harness.simulator._handlers["dns/changeRecords"]
+
+        async def reject_domain3(params):
+            if params["fqdn"] == "domain3.test":
+                raise SimulatedApiError("INVALID_DATA", "Zone is locked")
+            return await change_records(params)
+
+        harness.simulator._handlers["dns/changeRecords"] = reject_domain3
+
+        job = await migrator.run(job.id)
+
+        assert job.status == JOB_DONE
+        assert job.counts.get(ITEM_PENDING, 0) == 0
+        failed = await harness.container.jobs_repo.get_items(job.id, ITEM_FAILED)
+        assert [item.fqdn for item in failed] == ["domain3.test"]
+
+
+class TestMigrateIpCommand:
+    """Tests for the /migrate_ip admin flow."""
+
+    async def test_plan_confirm_and_report(self, bot_harness, shared_ip):
+        """Test that confirming runs the job and edits the message with the summary."""
+        harness = bot_harness
+        admin_user = harness.admin_user_ids[0]
+        chat_id = harness.admin_chat_id
+
+        await harness.feed(harness.factory.message(chat_id, f"/migrate_ip {OLD_IP} {NEW_IP}", admin_user))
+        job = await harness.container.jobs_repo.get(1)
+        assert job.total == len(shared_ip)
+
+        await harness.feed(harness.factory.callback(chat_id, f"mgc:{job.id}", admin_user))
+        for task in list(harness.container.ip_migrator._tasks.values()):
+            await task
+
+        job = await harness.container.jobs_repo.get(job.id)
+        assert job.status == JOB_DONE
+        # "Starting..." and the final summary; progress edits are throttled
+        assert harness.session.calls["editMessageText"] == 2
+
+        # A finished job cannot be started again
+        await harness.feed(harness.factory.callback(chat_id, f"mgc:{job.id}", admin_user))
+        assert harness.container.ip_migrator._tasks == {}
+
+    async def test_invalid_ip_is_rejected(self, bot_harness):
+        """Test that nothing is planned for malformed IPs."""
+        harness = bot_harness
+        admin_user = harness.admin_user_ids[0]
+
+        await harness.feed(harness.factory.message(harness.admin_chat_id, "/migrate_ip 1.2.3 1.2.3.4", admin_user))
+
+        assert await harness.container.jobs_repo.get(1) is None
+        assert harness.session.calls["sendMessage"] == 1
+
+    async def test_cancel_planned_job(self, bot_harness, shared_ip):
+        """Test that a cancelled job writes nothing."""
+        harness = bot_harness
+        admin_user = harness.admin_user_ids[0]
+        chat_id = harness.admin_chat_id
+
+        await harness.feed(harness.factory.message(chat_id, f"/migrate_ip {OLD_IP} {NEW_IP}", admin_user))
+        harness.simulator.calls.clear()
+        await harness.feed(harness.factory.callback(chat_id, "mgx:1", admin_user))
+
+        assert (await harness.container.jobs_repo.get(1)).status == JOB_CANCELLED
+        assert harness.simulator.calls["dns/changeRecords"] == 0
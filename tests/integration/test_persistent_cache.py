@@ -0,0 +1,25 @@
+"""Integration tests for Beget answers surviving a restart."""
+
+from benchmarks.harness import BotHarness
+
+
+class TestPersistentCache:
+    """Tests for the SQLite response cache behind the wired bot."""
+
+    async def test_restart_serves_menus_without_beget(self, tmp_path):
+        """Test that screens opened before a restart need no Beget calls after it."""
+        async with BotHarness(users=1, data_dir=tmp_path) as harness:
+            user_id = harness.user_ids[0]
+            domain_id, _ = harness.domains[0]
+            await harness.feed(harness.factory.callback(user_id, "md"))
+            await harness.feed(harness.factory.callback(user_id, f"d:{domain_id}"))
+            await harness.container.prefetcher.drain()
+            assert harness.simulator.calls["domain/getList"] == 1
+
+        async with BotHarness(users=1, data_dir=tmp_path) as harness:
+            await harness.feed(harness.factory.callback(user_id, "md"))
+            await harness.feed(harness.factory.callback(user_id, f"d:{domain_id}"))
+            await harness.container.prefetcher.drain()
+
+            assert harness.simulator.calls["domain/getList"] == 0
+            assert harness.simulator.calls["dns/getData"] == 0
@@ -0,0 +1,81 @@
+"""Integration tests for the Beget services against the local simulator."""
+
+import pytest
+
+from app.services.beget import BegetApiError, BegetClientManager, DnsService, DomainsService
+from benchmarks.simulator import BegetSimulator
+
+
+@pytest.fixture
+async def simulator():
+    """Start a small simulated account on a free port."""
+    sim = BegetSimulator(domains=3, subdomains_per_domain=2, login="user", password="secret")
+    await sim.start()
+    yield sim
+    await sim.stop()
+
+
+@pytest.fixture
+async def manager(simulator):
+    """Client manager pointed at the simulator."""
+    async with BegetClientManager("user", "secret", base_url=simulator.api_url) as m:
+        yield m
+
+
+class TestSimulator:
+    """Tests for the simulated endpoints."""
+
+    async def test_domains_and_subdomains(self, manager, simulator):
+        """Test listing domains and filtering subdomains by domain."""
+        async with manager.client() as client:
+            service = DomainsService(client)
+            domains = await service.get_domains()
+            subdomains = await service.get_subdomains(domains[0].id)
+
+        assert [d.fqdn for d in domains] == ["domain1.test", "domain2.test", "domain3.test"]
+        assert [s.fqdn for s in subdomains] == ["sub1.domain1.test", "sub2.domain1.test"]
+        assert simulator.calls["domain/getList"] == 1
+        assert simulator.calls["domain/getSubdomainList"] == 1
+
+    async def test_add_and_delete_subdomain(self, manager):
+        """Test that subdomain mutations are visible on the next read."""
+        async with manager.client() as client:
+            service = DomainsService(client)
+            await service.add_subdomain(101, "api")
+            created = [s for s in await service.get_subdomains(101) if s.fqdn == "api.domain1.test"]
+            assert len(created) == 1
+
+            await service.delete_subdomain(created[0].id)
+            assert all(s.fqdn != "api.domain1.test" for s in await service.get_subdomains(101))
+
+    async def test_dns_round_trip(self, manager, simulator):
+        """Test that DnsService read-modify-write works against the simulator."""
+        async with manager.client() as client:
+            dns = DnsService(client)
+            before = await dns.get_dns_data("domain1.test")
+            await dns.add_a_record("domain1.test", "192.0.2.10")
+            after = await dns.get_dns_data("domain1.test")
+
+        assert [r.value for r in after.a] == [r.value for r in before.a] + ["192.0.2.10"]
+        assert [r.value for r in after.mx] == ["mx1.beget.com"]
+        assert after.txt == before.txt
+        assert simulator.calls["dns/changeRecords"] == 2  # domain and www twin
+
+    async def test_api_errors(self, manager):
+        """Test that simulated errors surface as BegetApiError."""
+        async with manager.client() as client:
+            with pytest.raises(BegetApiError, match="already exists"):
+                await DomainsService(client).add_subdomain(101, "sub1")
+
+    async def test_auth_and_error_rate(self, simulator):
+        """Test wrong credentials and injected failures."""
+        async with BegetClientManager("user", "wrong", base_url=simulator.api_url) as m:
+            async with m.client() as client:
+                with pytest.raises(BegetApiError, match="Authorization failed"):
+                    await DomainsService(client).get_domains()
+
+        simulator.error_rate = 1.0
+        async with BegetClientManager("user", "secret", base_url=simulator.api_url) as m:
+            async with m.client() as client:
+                with pytest.raises(BegetApiError, match="Simulated failure"):
+                    await DomainsService(client).get_domains()
@@ -0,0 +1,183 @@
+"""Integration tests for the DNS snapshot crawler against the simulator."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.beget import BegetClientManager, DnsService
+from app.services.database import Database, DnsSnapshotRepository
+from app.services.snapshot import DnsCrawler
+from benchmarks.simulator import BegetSimulator
+
+
+@pytest.fixture
+async def simulator():
+    """Three domains with two subdomains each."""
+    sim = BegetSimulator(domains=3, subdomains_per_domain=2, txt_records=1)
+    await sim.start()
+    yield sim
+    await sim.stop()
+
+
+@pytest.fixture
+async def repo(tmp_path):
+    db = Database(tmp_path / "bot.db")
+    await db.connect()
+    yield DnsSnapshotRepository(db)
+    await db.disconnect()
+
+
+@pytest.fixture
+async def crawler(simulator, repo):
+    async with BegetClientManager("login", "password", base_url=simulator.api_url) as manager:
+        yield DnsCrawler(manager, repo, concurrency=4, rate_per_sec=0)
+
+
+class TestDnsCrawler:
+    """Tests for full and incremental crawls."""
+
+    async def test_full_crawl_stores_every_fqdn(self, crawler, repo, simulator):
+        """Test that domains and subdomains are fetched once each and normalized."""
+        result = await crawler.crawl()
+
+        assert result.total == 9
+        assert (result.fetched, result.changed, result.failed) == (9, 9, 0)
+        assert simulator.calls["dns/getData"] == 9
+
+        records = await repo.get_records("domain1.test")
+        types = sorted({r.record_type for r in records})
+        assert types == ["A", "MX", "TXT"]
+        a_value = simulator.records["domain1.test"]["A"][0]["value"]
+        assert ("A", a_value) in {(r.record_type, r.value) for r in records}
+        assert (await repo.get_stats()).records == sum(
+            len(v) for rs in simulator.records.values() for v in rs.values()
+        )
+
+    async def test_incremental_crawl_fetches_only_stale(self, crawler, repo, simulator):
+        """Test that a re-crawl skips fresh entries and picks up new FQDNs."""
+        await crawler.crawl()
+        simulator.add_subdomain(101, "new")
+        simulator.calls.clear()
+
+        result = await crawler.crawl(stale_after=timedelta(hours=1))
+
+        assert (result.total, result.fetched) == (10, 1)
+        assert simulator.calls["dns/getData"] == 1
+        assert "new.domain1.test" in await repo.get_entries()
+
+    async def test_unchanged_content_is_not_rewritten(self, crawler, repo, simulator):
+        """Test that only FQDNs whose records changed count as changed."""
+        await crawler.crawl()
+        simulator.records["domain2.test"]["A"] = [{"value": "192.0.2.1", "priority": 10}]
+
+        result = await crawler.crawl()
+
+        assert (result.fetched, result.changed) == (9, 1)
+        values = {r.value for r in await repo.get_records("domain2.test") if r.record_type == "A"}
+        assert values == {"192.0.2.1"}
+
+    async def test_removed_fqdns_are_dropped(self, crawler, repo, simulator):
+        """Test that deleted subdomains leave the snapshot."""
+        await crawler.crawl()
+        sub_id = next(iter(simulator.subdomains))
+        _, fqdn = simulator.subdomains.pop(sub_id)
+
+        result = await crawler.crawl(stale_after=timedelta(hours=1))
+
+        assert result.removed == 1
+        assert fqdn not in await repo.get_entries()
+        assert await repo.get_records(fqdn) == []
+
+    async def test_failures_are_retried_by_incremental_crawl(self, crawler, repo, simulator):
+        """Test that failed FQDNs keep an error and are re-fetched next time."""
+        await crawler.crawl()
+        entries = await repo.get_entries()
+        await repo.save_error("domain3.test", 103, "timeout")
+        simulator.calls.clear()
+
+        result = await crawler.crawl(stale_after=timedelta(hours=1))
+
+        assert len(entries) == 9
+        assert result.fetched == 1
+        assert (await repo.get_entries())["domain3.test"].error is None
+
+
+class TestSnapshotRepository:
+    """Tests for snapshot writes sharing one connection."""
+
+    async def test_concurrent_saves_are_isolated(self, repo):
+        """Test that interleaved saves of many FQDNs each land complete."""
+        fetched_at = datetime(2024, 1, 1)
+
+        async def save(i: int) -> None:
+            records = [("A", f"192.0.2.{i % 250}", 0), ("TXT", f"v={i}", 0), ("MX", "mx.test", 10)]
+            await repo.save_records(f"h{i}.test", i, records, f"hash{i}", fetched_at)
+            await repo.save_records(f"h{i}.test", i, records[:2], f"hash{i}b", fetched_at)
+
+        await asyncio.gather(*(save(i) for i in range(200)))
+
+        entries = await repo.get_entries()
+        assert len(entries) == 200
+        assert {entry.content_hash for entry in entries.values()} == {
+            f"hash{i}b" for i in range(200)
+        }
+        records = await repo.get_all_records()
+        assert len(records) == 400
+        assert not repo.db.connection.in_transaction
+
+
+class TestSnapshotAdmin:
+    """Tests for the admin snapshot screen."""
+
+    async def test_full_crawl_from_admin_panel(self, bot_harness):
+        """Test that "Full Crawl" runs in the background and reports back."""
+        harness = bot_harness
+        admin_user = harness.admin_user_ids[0]
+        feed = harness.factory.callback
+
+        await harness.feed(feed(harness.admin_chat_id, "asf", admin_user))
+        await harness.container.dns_crawler._task
+        await harness.feed(feed(harness.admin_chat_id, "asn", admin_user))
+
+        stats = await harness.container.snapshots_repo.get_stats()
+        assert stats.fqdns == len(harness.simulator.domains) + len(harness.simulator.subdomains)
+        assert harness.session.calls["editMessageText"] == 3
+
+    async def test_lookup_command(self, bot_harness):
+        """Test that /lookup answers from the index after a crawl."""
+        harness = bot_harness
+        await harness.container.dns_crawler.crawl()
+        ip = harness.simulator.records["domain2.test"]["A"][0]["value"]
+
+        admin_user = harness.admin_user_ids[0]
+        await harness.feed(harness.factory.message(harness.admin_chat_id, f"/lookup {ip}", admin_user))
+
+        assert harness.session.calls["sendMessage"] == 1
+        assert harness.container.reverse_index.lookup(ip) == {"A": ["domain2.test"]}
+
+
+class TestSnapshotChangeListener:
+    """Tests for keeping the snapshot current on record changes."""
+
+    async def test_record_change_updates_snapshot_and_index(self, bot_harness):
+        """Test that an A record added through the bot is indexed immediately."""
+        harness = bot_harness
+        container = harness.container
+        await container.dns_crawler.crawl()
+        old_ip = harness.simulator.records["domain1.test"]["A"][0]["value"]
+
+        async with container.beget_manager.client() as client:
+            await DnsService(client).update_a_record("domain1.test", old_ip, "198.51.100.7")
+
+        index = container.reverse_index
+        assert index.lookup("198.51.100.7") == {"A": ["domain1.test", "www.domain1.test"]}
+        assert "domain1.test" not in index.lookup(old_ip).get("A", [])
+        assert index.lookup("mx1.beget.com")["MX"][0] == "domain1.test"
+
+        records = await container.snapshots_repo.get_records("domain1.test")
+        assert ("A", "198.51.100.7") in {(r.record_type, r.value) for r in records}
+
+        # A later crawl sees the same content and does not count it as changed
+        result = await container.dns_crawler.crawl()
+        assert result.changed == 0
@@ -0,0 +1,101 @@
+"""Integration tests for /export and /import against the simulator."""
+
+from app.bot.callback_data import CB_ZONE_IMPORT_CONFIRM
+from app.modules.admin.states import ZoneStates
+from app.services.zonefile import parse
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+async def _parse(content: bytes, filename: str):
+    return [record async for record in parse(_aiter([content]), filename)]
+
+
+async def _send(harness, text: str):
+    admin = harness.admin_user_ids[0]
+    await harness.feed(harness.factory.message(harness.admin_chat_id, text, user_id=admin))
+
+
+class TestZoneExport:
+    """Tests for streamed exports."""
+
+    async def test_snapshot_export_uses_no_api_calls(self, bot_harness):
+        """Test that a snapshot export streams every stored record without Beget calls."""
+        harness = bot_harness
+        await harness.container.dns_crawler.crawl()
+        stored = await harness.container.snapshots_repo.get_all_records()
+        harness.simulator.calls.clear()
+
+        await _send(harness, "/export csv")
+
+        assert sum(harness.simulator.calls.values()) == 0
+        [(filename, content)] = harness.session.documents
+        assert filename.endswith(".csv")
+        records = await _parse(content, filename)
+        assert sorted(records) == sorted(
+            (r.fqdn, (r.record_type, r.value, r.priority)) for r in stored
+        )
+
+    async def test_live_export_of_selected_fqdns(self, bot_harness):
+        """Test that a live export reads only the requested FQDNs."""
+        harness = bot_harness
+
+        await _send(harness, "/export bind live domain1.test sub1.domain2.test")
+
+        assert harness.simulator.calls["dns/getData"] == 2
+        [(filename, content)] = harness.session.documents
+        fqdns = {fqdn for fqdn, _ in await _parse(content, filename)}
+        assert fqdns == {"domain1.test", "sub1.domain2.test"}
+
+
+class TestZoneImport:
+    """Tests for diffed imports."""
+
+    async def _upload(self, harness, content: bytes, filename: str) -> None:
+        admin = harness.admin_user_ids[0]
+        harness.session.add_file("zone1", content)
+        await _send(harness, "/import")
+        await harness.feed(
+            harness.factory.document(harness.admin_chat_id, "zone1", filename, user_id=admin)
+        )
+
+    async def test_import_writes_only_changed_fqdns(self, bot_harness):
+        """Test that re-importing an export plus one edit costs one changeRecords call."""
+        harness = bot_harness
+        simulator = harness.simulator
+        await _send(harness, "/export csv live domain1.test domain2.test domain3.test")
+        [(_, content)] = harness.session.documents
+        old_ip = simulator.records["domain2.test"]["A"][0]["value"]
+        edited = content.replace(f"domain2.test,A,{old_ip},".encode(), b"domain2.test,A,198.51.100.7,")
+        assert edited != content
+        simulator.calls.clear()
+
+        await self._upload(harness, edited, "zone.csv")
+
+        assert simulator.calls["dns/changeRecords"] == 0
+        context = harness.dp.fsm.get_context(harness.bot, harness.admin_chat_id, harness.admin_user_ids[0])
+        assert await context.get_state() == ZoneStates.confirm_import.state
+
+        await harness.feed(
+            harness.factory.callback(
+                harness.admin_chat_id, CB_ZONE_IMPORT_CONFIRM, user_id=harness.admin_user_ids[0]
+            )
+        )
+
+        assert simulator.calls["dns/changeRecords"] == 1
+        assert [r["value"] for r in simulator.records["domain2.test"]["A"]] == ["198.51.100.7"]
+        assert await context.get_state() is None
+
+    async def test_parse_error_rejects_file_before_any_call(self, bot_harness):
+        """Test that an invalid line stops the import before the API is touched."""
+        harness = bot_harness
+        harness.simulator.calls.clear()
+
+        await self._upload(harness, b"domain1.test. IN A 192.0.2.1\nbroken line here\n", "zone.txt")
+
+        assert sum(harness.simulator.calls.values()) == 0
+        context = harness.dp.fsm.get_context(harness.bot, harness.admin_chat_id, harness.admin_user_ids[0])
+        assert await context.get_state() == ZoneStates.waiting_file.state
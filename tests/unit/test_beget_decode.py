@@ -0,0 +1,74 @@
+"""Tests for decoding Beget API results."""
+
+import pytest
+from pydantic import ValidationError
+
+from app.services.beget.dns import decode_dns_data
+from app.services.beget.domains import decode_domains, decode_subdomains
+from app.services.beget.types import DnsRecord, Domain, Subdomain, set_item_validation
+from benchmarks.parsing import dns_result, run_benchmark, subdomain_list
+
+
+@pytest.fixture
+def validation():
+    set_item_validation(True)
+    yield
+    set_item_validation(False)
+
+
+class TestDecode:
+    """Tests for the table-driven decoders."""
+
+    def test_dns_data_fields(self):
+        """Test that every record type lands in its field with normalized values."""
+        result = {
+            "is_subdomain": 1,
+            "set_type": 1,
+            "records": {
+                "A": [{"ttl": 600, "address": "192.0.2.1"}],
+                "MX": [{"ttl": 300, "exchange": "mx.example.com.", "preference": "20"}],
+                "TXT": [{"ttl": 300, "txtdata": "v=spf1 -all"}],
+                "CNAME": [{"cname": "target.example.com."}],
+                "NS": [{"value": "ns1.example.com"}],
+                "DNS": [{"value": "ns1.beget.com"}],
+            },
+        }
+        data = decode_dns_data("example.com", result)
+
+        assert data.is_subdomain is True
+        assert data.a == [DnsRecord("192.0.2.1", 10)]
+        assert data.mx == [DnsRecord("mx.example.com", 20)]
+        assert data.txt == [DnsRecord("v=spf1 -all", 10)]
+        assert data.cname == [DnsRecord("target.example.com", 10)]
+        assert data.ns == [DnsRecord("ns1.example.com", 10)]
+        assert data.dns == ["ns1.beget.com"]
+        assert data.aaaa == []
+
+    def test_lists(self):
+        """Test domain and grouped subdomain decoding."""
+        assert decode_domains([{"id": 1, "fqdn": "a.com", "extra": 0}]) == [Domain(1, "a.com")]
+        grouped = decode_subdomains(subdomain_list(4, domains=2))
+        assert grouped == {
+            0: [Subdomain(0, "sub0.domain0.test"), Subdomain(2, "sub2.domain0.test")],
+            1: [Subdomain(1, "sub1.domain1.test"), Subdomain(3, "sub3.domain1.test")],
+        }
+
+    def test_fast_path_skips_validation(self):
+        """Test that wrong field types pass through unless validation is on."""
+        assert decode_domains([{"id": "7", "fqdn": "a.com"}])[0].id == "7"
+
+    def test_validation_mode_rejects_wrong_types(self, validation):
+        """Test that debug validation is strict about field types."""
+        assert decode_dns_data("bench.test", dns_result(2)).mx[1] == DnsRecord("mx1.test", 1)
+        with pytest.raises(ValidationError):
+            decode_domains([{"id": "7", "fqdn": "a.com"}])
+        with pytest.raises(ValidationError):
+            decode_dns_data("a.com", {"records": {"TXT": [{"txtdata": 5}]}})
+
+    def test_benchmark_runs(self):
+        """Test that the parsing benchmark measures every decoder and leaves validation off."""
+        report = run_benchmark(subdomains=200, records=2, repeat=1)
+        for row in report.values():
+            assert set(row) == {"pydantic", "fast", "validated"}
+            assert all(value > 0 for value in row.values())
+        assert decode_domains([{"id": "7", "fqdn": "a.com"}])[0].id == "7"
@@ -0,0 +1,88 @@
+"""Tests for incremental decoding of Beget list answers."""
+
+import json
+import tracemalloc
+
+import pytest
+
+from app.services.beget.stream import ResultItemParser
+
+
+def envelope(result) -> dict:
+    return {"status": "success", "answer": {"status": "success", "result": result}}
+
+
+def feed_all(body: bytes, step: int) -> tuple[list, dict]:
+    parser = ResultItemParser()
+    items = []
+    for start in range(0, len(body), step):
+        items += parser.feed(body[start:start + step])
+    return items, parser.close()
+
+
+class TestResultItemParser:
+    """Tests for the push parser."""
+
+    def test_items_survive_any_split(self):
+        """Test that pieces split anywhere (strings, escapes, UTF-8) decode the same."""
+        result = [
+            {"id": 1, "fqdn": "a.test", "note": 'brackets ]}[{, and "quotes"'},
+            {"id": 2, "fqdn": "тест.рф", "domain_id": None},
+            12345,
+            [1, [2]],
+        ]
+        body = json.dumps(envelope(result), ensure_ascii=False, indent=1).encode()
+        for step in range(1, 25):
+            items, data = feed_all(body, step)
+            assert items == result, step
+            assert data == envelope([])
+
+    @pytest.mark.parametrize("pieces", [[b"[2.", b"5]"], [b"[-", b"1e", b"3,tr", b"ue]"]])
+    def test_scalar_items_split_across_pieces(self, pieces):
+        """Test that a number or literal is held back until its delimiter arrives."""
+        parser = ResultItemParser()
+        items = []
+        for piece in [b'{"answer":{"result":'] + pieces + [b"}}"]:
+            items += parser.feed(piece)
+        parser.close()
+
+        assert items == json.loads(b"".join(pieces))
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            b'{"status":"error","errors":[{"error_text":"bad"}]}',
+            b'{"status":"success","answer":{"status":"success","result":[]}}',
+        ],
+    )
+    def test_envelope_without_items(self, body):
+        """Test that error and empty answers come back from close()."""
+        items, data = feed_all(body, 7)
+        assert items == []
+        assert data == json.loads(body)
+
+    def test_truncated_body_is_rejected(self):
+        """Test that a body cut inside the array is an error, not a short list."""
+        parser = ResultItemParser()
+        assert parser.feed(b'{"answer":{"result":[{"id":1},{"id"') == [{"id": 1}]
+        with pytest.raises(ValueError):
+            parser.close()
+
+    def test_memory_scales_with_kept_items(self):
+        """Test that peak memory stays far below the body size."""
+        result = [{"id": i, "fqdn": f"sub{i}.domain{i % 100}.test", "domain_id": i % 100} for i in range(50000)]
+        body = json.dumps(envelope(result)).encode()
+
+        tracemalloc.start()
+        try:
+            parser = ResultItemParser()
+            kept = []
+            for start in range(0, len(body), 65536):
+                kept += [item for item in parser.feed(body[start:start + 65536]) if item["domain_id"] == 7]
+            parser.close()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert len(kept) == 500
+        assert peak < len(body) / 4
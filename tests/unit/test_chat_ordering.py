@@ -0,0 +1,138 @@
+"""Tests for per-chat update ordering."""
+
+import asyncio
+from datetime import datetime
+
+from aiogram.dispatcher.event.bases import UNHANDLED
+from aiogram.types import CallbackQuery, Chat, Update
+
+from app.bot.middlewares.ordering import ChatOrderingMiddleware
+from app.services.metrics import UPDATES_DROPPED
+
+update_ids = iter(range(1, 1_000_000))
+
+
+def message(chat_id: int) -> Update:
+    return Update.model_validate(
+        {
+            "update_id": next(update_ids),
+            "message": {
+                "message_id": 1,
+                "date": datetime.now(),
+                "chat": {"id": chat_id, "type": "private"},
+                "text": "hi",
+            },
+        }
+    )
+
+
+def callback(chat_id: int, message_id: int = 1) -> Update:
+    return Update.model_validate(
+        {
+            "update_id": next(update_ids),
+            "callback_query": {
+                "id": "1",
+                "from": {"id": chat_id, "is_bot": False, "first_name": "u"},
+                "chat_instance": "1",
+                "data": "d:1",
+                "message": {
+                    "message_id": message_id,
+                    "date": datetime.now(),
+                    "chat": {"id": chat_id, "type": "private"},
+                    "text": "menu",
+                },
+            },
+        }
+    )
+
+
+def data_for(update: Update) -> dict:
+    inner = update.message or update.callback_query.message
+    return {"event_chat": Chat(id=inner.chat.id, type="private")}
+
+
+class Recorder:
+    """Handler that records start/end order and concurrency."""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.log: list[tuple[str, int]] = []
+        self.active = 0
+        self.max_active = 0
+
+    async def __call__(self, event: Update, data: dict) -> str:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        self.log.append(("start", event.update_id))
+        await asyncio.sleep(self.delay)
+        self.log.append(("end", event.update_id))
+        self.active -= 1
+        return "handled"
+
+
+async def feed(middleware: ChatOrderingMiddleware, handler: Recorder, updates: list[Update]):
+    return await asyncio.gather(
+        *(middleware(handler, update, data_for(update)) for update in updates)
+    )
+
+
+class TestChatOrdering:
+    """Tests for ChatOrderingMiddleware."""
+
+    async def test_one_chat_runs_in_order(self):
+        """Test that updates of one chat never overlap and keep arrival order."""
+        handler = Recorder()
+        updates = [message(1) for _ in range(3)]
+
+        await feed(ChatOrderingMiddleware(), handler, updates)
+
+        assert handler.max_active == 1
+        assert [i for kind, i in handler.log if kind == "start"] == [u.update_id for u in updates]
+
+    async def test_chats_run_in_parallel_up_to_workers(self):
+        """Test that different chats overlap, bounded by the worker count."""
+        handler = Recorder()
+
+        await feed(ChatOrderingMiddleware(workers=2), handler, [message(i) for i in range(1, 5)])
+        assert handler.max_active == 2
+
+        handler = Recorder()
+        await feed(ChatOrderingMiddleware(), handler, [message(i) for i in range(1, 5)])
+        assert handler.max_active == 4
+
+    async def test_superseded_callback_is_dropped(self, monkeypatch):
+        """Test that a waiting tap is skipped once a newer tap on the same menu arrives."""
+        middleware = ChatOrderingMiddleware()
+        handler = Recorder()
+        dropped = UPDATES_DROPPED.value(reason="superseded_callback")
+        answered = []
+
+        async def answer(self, *args, **kwargs):
+            answered.append(self.id)
+
+        monkeypatch.setattr(CallbackQuery, "answer", answer)
+        # The running tap is not interrupted; of the two waiting, only the last runs
+        first, second, third = callback(1), callback(1), callback(1)
+        results = await feed(middleware, handler, [first, second, third])
+
+        assert results == ["handled", UNHANDLED, "handled"]
+        assert [i for kind, i in handler.log if kind == "start"] == [first.update_id, third.update_id]
+        assert answered == ["1"]
+        assert UPDATES_DROPPED.value(reason="superseded_callback") == dropped + 1
+
+    async def test_callbacks_on_other_messages_all_run(self):
+        """Test that taps on different menus of one chat are not dropped."""
+        handler = Recorder()
+
+        results = await feed(ChatOrderingMiddleware(), handler, [callback(1, 1), callback(1, 2)])
+
+        assert results == ["handled", "handled"]
+
+    async def test_state_is_released(self):
+        """Test that idle chats leave no locks or callback entries behind."""
+        middleware = ChatOrderingMiddleware()
+
+        await feed(middleware, Recorder(delay=0), [callback(1), callback(1), message(2)])
+
+        assert middleware._chats == {}
+        assert middleware._latest_callback == {}
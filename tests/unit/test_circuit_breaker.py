@@ -0,0 +1,129 @@
+"""Tests for the Beget circuit breaker and last known answers."""
+
+from datetime import datetime, timedelta
+
+from app.services.beget import CircuitBreaker
+from app.services.beget.cache import (
+    LastKnownAnswers,
+    cache_key,
+    mark_stale,
+    stale_as_of,
+    track_stale_reads,
+)
+from app.services.metrics import BEGET_CIRCUIT_OPEN
+
+
+def breaker_at(monkeypatch, now: list[float], **kwargs) -> CircuitBreaker:
+    monkeypatch.setattr("app.services.beget.breaker.time.monotonic", lambda: now[0])
+    return CircuitBreaker(**kwargs)
+
+
+class TestCircuitBreaker:
+    """Tests for opening, probing and closing."""
+
+    def test_opens_after_consecutive_failures(self, monkeypatch):
+        """Test that only an unbroken run of failures opens the breaker."""
+        breaker = breaker_at(monkeypatch, [0.0], failure_threshold=3)
+
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == "closed"
+        assert breaker.allow()
+
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert not breaker.allow()
+        assert BEGET_CIRCUIT_OPEN.value() == 1
+
+    def test_single_probe_after_reset_timeout(self, monkeypatch):
+        """Test that one probe goes through after the timeout and closes on success."""
+        now = [0.0]
+        breaker = breaker_at(monkeypatch, now, failure_threshold=1, reset_timeout=30)
+        breaker.record_failure()
+
+        now[0] = 29
+        assert not breaker.allow()
+        assert breaker.retry_in == 1
+        now[0] = 30
+        assert breaker.allow()
+        assert not breaker.allow()  # the probe is in flight
+        assert breaker.state == "half_open"
+
+        breaker.record_success()
+        assert breaker.state == "closed"
+        assert breaker.allow()
+        assert BEGET_CIRCUIT_OPEN.value() == 0
+
+    def test_failed_probe_reopens(self, monkeypatch):
+        """Test that a failed probe keeps the breaker open for another timeout."""
+        now = [0.0]
+        breaker = breaker_at(monkeypatch, now, failure_threshold=1, reset_timeout=30)
+        breaker.record_failure()
+
+        now[0] = 30
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open"
+        now[0] = 59
+        assert not breaker.allow()
+        now[0] = 60
+        assert breaker.allow()
+
+    def test_released_probe_can_be_retried(self, monkeypatch):
+        """Test that a cancelled probe does not block later probes."""
+        now = [30.0]
+        breaker = breaker_at(monkeypatch, now, failure_threshold=1, reset_timeout=30)
+        now[0] = 0
+        breaker.record_failure()
+        now[0] = 30
+
+        assert breaker.allow()
+        breaker.release(probe=True)
+        assert breaker.allow()
+
+    def test_released_request_keeps_the_probe(self, monkeypatch):
+        """Test that a cancelled ordinary request does not free the probe slot."""
+        now = [0.0]
+        breaker = breaker_at(monkeypatch, now, failure_threshold=1, reset_timeout=30)
+        assert breaker.allow()  # sent while closed, cancelled later
+        breaker.record_failure()
+        now[0] = 30
+
+        assert breaker.allow()
+        breaker.release(probe=False)
+        assert not breaker.allow()
+        assert breaker.state == "half_open"
+
+
+class TestLastKnownAnswers:
+    """Tests for the outage fallback store."""
+
+    def test_remembers_latest_answer_per_key(self):
+        """Test that the latest answer wins and the oldest key is evicted."""
+        answers = LastKnownAnswers(maxsize=2)
+        a, b, c = cache_key("a"), cache_key("b"), cache_key("c")
+
+        answers.remember(a, 1)
+        answers.remember(a, 2)
+        answers.remember(b, 3)
+        answers.remember(c, 4)
+
+        assert answers.recall(a) is None
+        assert answers.recall(b)[1] == 3
+        assert answers.recall(c)[1] == 4
+
+    def test_stale_reads_keep_oldest_time_per_update(self):
+        """Test that stale reads are collected per block and report the oldest."""
+        now = datetime.now()
+        mark_stale(now)  # outside an update: ignored
+        assert stale_as_of() is None
+
+        with track_stale_reads():
+            mark_stale(now)
+            mark_stale(now - timedelta(minutes=5))
+            assert stale_as_of() == now - timedelta(minutes=5)
+
+        assert stale_as_of() is None
@@ -0,0 +1,64 @@
+"""Tests for DNS journal deltas."""
+
+from datetime import datetime
+
+from app.services.database import JournalEntry
+from app.services.snapshot.journal import build_payload, diff_records, undo_entry
+
+
+def entry(removed, added, entry_id: int = 1) -> JournalEntry:
+    return JournalEntry(
+        id=entry_id,
+        fqdn="example.com",
+        record_types=["A", "MX", "TXT"],
+        removed=removed,
+        added=added,
+        complete=True,
+        created_at=datetime(2024, 1, 1),
+    )
+
+
+class TestDeltas:
+    """Tests for diffing and undoing record sets."""
+
+    def test_diff_keeps_only_changes(self):
+        """Test that unchanged records are not stored."""
+        before = [("A", "192.0.2.1", 10), ("TXT", "v=spf1 -all", 10)]
+        after = [("A", "192.0.2.2", 10), ("TXT", "v=spf1 -all", 10)]
+
+        removed, added = diff_records(before, after)
+
+        assert removed == [("A", "192.0.2.1", 10)]
+        assert added == [("A", "192.0.2.2", 10)]
+
+    def test_undo_restores_previous_state(self):
+        """Test that undoing entries newest first rebuilds the original set."""
+        original = [("A", "192.0.2.1", 10), ("MX", "mx.example.com", 10)]
+        second = sorted([("A", "192.0.2.2", 10), ("MX", "mx.example.com", 10)])
+        third = sorted(second + [("TXT", "token", 10)])
+        first_change = entry(*diff_records(original, second), entry_id=1)
+        second_change = entry(*diff_records(second, third), entry_id=2)
+
+        state = undo_entry(third, second_change)
+        assert state == second
+        assert undo_entry(state, first_change) == sorted(original)
+
+
+class TestBuildPayload:
+    """Tests for rollback payloads."""
+
+    def test_payload_numbers_priorities_except_mx(self):
+        """Test that A priorities are renumbered and MX priorities are kept."""
+        records = [
+            ("A", "192.0.2.1", 10),
+            ("A", "192.0.2.2", 10),
+            ("MX", "mx2.example.com", 20),
+            ("NS", "ns1.example.com", 10),
+        ]
+
+        payload = build_payload(records, {"A", "MX", "TXT"})
+
+        assert payload == {
+            "A": [{"value": "192.0.2.1", "priority": 10}, {"value": "192.0.2.2", "priority": 20}],
+            "MX": [{"value": "mx2.example.com", "priority": 20}],
+        }
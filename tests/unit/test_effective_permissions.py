@@ -0,0 +1,126 @@
+"""Tests for the materialized effective permissions."""
+
+import pytest
+
+from app.services.beget.types import Domain, Subdomain
+from app.services.database import Capability, Database, PermissionsRepository
+from app.services.database.versions import v007_effective_permissions
+from app.services.permissions import PermissionChecker
+
+ADMIN = 1
+USER = 100
+
+
+@pytest.fixture
+async def repo(tmp_path):
+    db = Database(tmp_path / "bot.db")
+    await db.connect()
+    yield PermissionsRepository(db)
+    await db.disconnect()
+
+
+async def grant_domain(repo, fqdn="example.com", edit=False, delete=False, create=False, remove=False):
+    assert await repo.grant_domain_access(USER, fqdn, edit, delete, create, remove, "admin")
+
+
+class TestEffectivePermissions:
+    """Tests for keeping effective_permissions in step with grants."""
+
+    async def test_domain_grant_is_inherited_by_subdomains(self, repo):
+        """Test that subdomains get the DNS and delete rights of their domain."""
+        await grant_domain(repo, edit=True, remove=True)
+
+        domain = await repo.get_capabilities(USER, "example.com")
+        subdomain = await repo.get_capabilities(USER, "api.example.com")
+
+        assert domain == Capability.DOMAIN | Capability.VIEW | Capability.EDIT_DNS
+        assert subdomain == Capability.VIEW | Capability.EDIT_DNS | Capability.DELETE_SUBDOMAIN
+        assert await repo.get_capabilities(USER, "example.org") == Capability(0)
+
+    async def test_grants_and_revokes_update_rows(self, repo):
+        """Test that a regrant replaces and a revoke removes capabilities."""
+        await grant_domain(repo, edit=True)
+        await grant_domain(repo, delete=True)
+        assert Capability.EDIT_DNS not in await repo.get_capabilities(USER, "api.example.com")
+        assert Capability.DELETE_DNS in await repo.get_capabilities(USER, "api.example.com")
+
+        assert await repo.revoke_domain_access(USER, "example.com")
+        assert await repo.get_effective_permissions(USER) == {}
+
+    async def test_subdomain_grant_adds_to_domain_grant(self, repo):
+        """Test that an explicit subdomain grant widens inherited rights."""
+        await grant_domain(repo)
+        assert await repo.grant_subdomain_access(USER, "api.example.com", False, True, False, "admin")
+
+        capabilities = await repo.get_capabilities(USER, "api.example.com")
+
+        assert capabilities == Capability.SUBDOMAIN | Capability.VIEW | Capability.DELETE_DNS
+        assert await repo.revoke_subdomain_access(USER, "api.example.com")
+        assert await repo.get_capabilities(USER, "api.example.com") == Capability.VIEW
+
+    async def test_creator_privileges_follow_create_permission(self, repo):
+        """Test that creators manage their subdomains only while they may create."""
+        await repo.record_subdomain_creation("api.example.com", USER)
+        assert await repo.get_capabilities(USER, "api.example.com") == Capability.CREATOR
+
+        await grant_domain(repo, create=True)
+        capabilities = await repo.get_capabilities(USER, "api.example.com")
+        assert {Capability.EDIT_DNS, Capability.DELETE_DNS, Capability.DELETE_SUBDOMAIN} <= set(capabilities)
+
+        await repo.delete_subdomain_records(["api.example.com"])
+        assert await repo.get_capabilities(USER, "api.example.com") == Capability.VIEW
+
+    async def test_migration_backfill_matches_repository(self, repo):
+        """Test that the migration resolves existing grants like the repository does."""
+        await grant_domain(repo, edit=True, create=True)
+        await grant_domain(repo, fqdn="example.org", delete=True, remove=True)
+        await repo.grant_subdomain_access(USER, "api.example.org", True, False, True, "admin")
+        await repo.record_subdomain_creations(["a.example.com", "b.example.net"], USER)
+        expected = await repo.get_effective_permissions(USER)
+
+        await v007_effective_permissions.upgrade(repo.db.connection)
+
+        assert await repo.get_effective_permissions(USER) == expected
+
+
+class TestPermissionChecker:
+    """Tests for checks and filters reading effective permissions."""
+
+    async def test_checks(self, repo):
+        """Test the can_* checks for domain, subdomain and admin."""
+        checker = PermissionChecker(repo, admin_chat_id=ADMIN)
+        await grant_domain(repo, edit=True, create=True)
+
+        assert await checker.can_view_domain(USER, "example.com")
+        assert not await checker.can_view_domain(USER, "api.example.com")
+        assert await checker.can_view_subdomain(USER, "api.example.com")
+        assert await checker.can_create_subdomain(USER, "example.com")
+        assert not await checker.can_create_subdomain(USER, "api.example.com")
+        assert await checker.can_edit_dns(USER, "api.example.com")
+        assert not await checker.can_delete_dns(USER, "api.example.com")
+        assert not await checker.can_delete_subdomain(USER, "api.example.com")
+        assert await checker.can_delete_dns(ADMIN, "example.org")
+
+    async def test_filters(self, repo):
+        """Test that domain and subdomain lists keep only reachable entries."""
+        checker = PermissionChecker(repo, admin_chat_id=ADMIN)
+        await repo.grant_subdomain_access(USER, "api.example.com", True, False, False, "admin")
+        await repo.record_subdomain_creation("own.example.com", USER)
+        await repo.record_subdomain_creation("new.example.org", USER)
+        domains = [Domain(1, "example.com"), Domain(2, "example.org"), Domain(3, "example.net")]
+        subdomains = [
+            Subdomain(1, "api.example.com"),
+            Subdomain(2, "own.example.com"),
+            Subdomain(3, "www.example.com"),
+        ]
+
+        assert [d.fqdn for d in await checker.filter_domains(USER, domains)] == [
+            "example.com",
+            "example.org",
+        ]
+        filtered = await checker.filter_subdomains(USER, "example.com", subdomains)
+        assert [s.fqdn for s in filtered] == ["api.example.com"]
+
+        await grant_domain(repo, create=True)
+        filtered = await checker.filter_subdomains(USER, "example.com", subdomains)
+        assert [s.fqdn for s in filtered] == [s.fqdn for s in subdomains]
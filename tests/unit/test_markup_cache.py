@@ -0,0 +1,92 @@
+"""Tests for catalog versioning and memoized keyboards."""
+
+import pytest
+
+from app.bot.keyboards.cache import MARKUP_CACHE, MarkupCache
+from app.modules.domains.dns.keyboards import dns_menu_keyboard
+from app.modules.domains.domain.keyboards import domains_list_keyboard
+from app.modules.domains.subdomain.keyboards import subdomains_list_keyboard
+from app.services.beget import CatalogVersion
+from app.services.beget.types import Domain, Subdomain
+
+
+@pytest.fixture(autouse=True)
+def clear_markup_cache():
+    MARKUP_CACHE.clear()
+    yield
+    MARKUP_CACHE.clear()
+
+
+class TestCatalogVersion:
+    """Tests for catalog version bumps."""
+
+    def test_unchanged_refresh_keeps_version(self):
+        """Test that refreshing identical content does not bump the version."""
+        catalog = CatalogVersion()
+        assert catalog.observe("domains", ((1, "a.com"),)) == 0
+        assert catalog.observe("domains", ((1, "a.com"),)) == 0
+        assert catalog.observe("subdomains", ((10, 1),)) == 0
+
+    def test_changed_refresh_bumps_version(self):
+        """Test that a refresh with different content bumps the version."""
+        catalog = CatalogVersion()
+        catalog.observe("domains", ((1, "a.com"),))
+        assert catalog.observe("domains", ((1, "a.com"), (2, "b.com"))) == 1
+
+    def test_invalidate(self):
+        """Test that mutations always bump the version."""
+        catalog = CatalogVersion()
+        catalog.observe("subdomains", ((10, 1),))
+        assert catalog.invalidate() == 1
+        assert catalog.observe("subdomains", ((10, 1),)) == 1
+
+
+class TestMarkupCache:
+    """Tests for keyboard memoization."""
+
+    def test_same_key_returns_same_markup(self):
+        """Test that a hit reuses the built markup object."""
+        domains = [Domain(id=1, fqdn="a.com"), Domain(id=2, fqdn="b.com")]
+        first = domains_list_keyboard(domains, catalog_version=0)
+        second = domains_list_keyboard(list(domains), catalog_version=0)
+        assert first is second
+        assert first == domains_list_keyboard(domains)  # uncached build is identical
+
+    def test_version_and_capabilities_are_part_of_key(self):
+        """Test that catalog version, visible items and flags change the key."""
+        subs = [Subdomain(id=10, fqdn="x.a.com")]
+        base = subdomains_list_keyboard(subs, 1, True, catalog_version=0)
+
+        assert subdomains_list_keyboard(subs, 1, True, catalog_version=1) is not base
+        assert subdomains_list_keyboard(subs, 1, False, catalog_version=0) is not base
+        assert subdomains_list_keyboard([], 1, True, catalog_version=0) is not base
+        assert subdomains_list_keyboard(subs, 1, can_create=True, catalog_version=0) is base
+
+    def test_unversioned_call_is_not_cached(self):
+        """Test that versioned builders bypass the cache without a version."""
+        domains = [Domain(id=1, fqdn="a.com")]
+        assert domains_list_keyboard(domains) is not domains_list_keyboard(domains)
+        assert len(MARKUP_CACHE) == 0
+
+    def test_unversioned_builder_is_always_cached(self):
+        """Test that argument-only keyboards are memoized by arguments."""
+        assert dns_menu_keyboard(5) is dns_menu_keyboard(5)
+        assert dns_menu_keyboard(5, back_callback="s:5") is not dns_menu_keyboard(5)
+
+    def test_lru_eviction(self):
+        """Test that the oldest entry is evicted past maxsize."""
+        cache = MarkupCache(maxsize=2)
+        built = []
+
+        def build():
+            built.append(1)
+            return dns_menu_keyboard.__wrapped__(len(built))
+
+        cache.get_or_build("a", build)
+        cache.get_or_build("b", build)
+        cache.get_or_build("a", build)  # refresh "a"
+        cache.get_or_build("c", build)  # evicts "b"
+        cache.get_or_build("a", build)
+        assert len(built) == 3
+        cache.get_or_build("b", build)
+        assert len(built) == 4
@@ -0,0 +1,105 @@
+"""Tests for the metrics registry and instrumentation."""
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from app.services.metrics import MetricsRegistry, MetricsServer
+from app.services.metrics.instruments import DB_QUERY_SECONDS, track_queries
+
+
+class TestMetricsRegistry:
+    """Tests for MetricsRegistry rendering."""
+
+    def test_counter_render(self):
+        """Test counter samples are rendered with labels."""
+        registry = MetricsRegistry()
+        counter = registry.counter("hits_total", "Hits.", ("cache",))
+        counter.inc(cache="domains")
+        counter.inc(2, cache="domains")
+
+        text = registry.render()
+        assert "# TYPE hits_total counter" in text
+        assert 'hits_total{cache="domains"} 3' in text
+
+    def test_counter_rejects_wrong_labels(self):
+        """Test that label names must match the declaration."""
+        registry = MetricsRegistry()
+        counter = registry.counter("hits_total", "Hits.", ("cache",))
+
+        with pytest.raises(ValueError):
+            counter.inc(queue="x")
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test histogram buckets, sum and count."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram(
+            "latency_seconds", "Latency.", ("endpoint",), buckets=(0.1, 1.0)
+        )
+        histogram.observe(0.05, endpoint="a")
+        histogram.observe(0.5, endpoint="a")
+        histogram.observe(5, endpoint="a")
+
+        text = registry.render()
+        assert 'latency_seconds_bucket{endpoint="a",le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{endpoint="a",le="1"} 2' in text
+        assert 'latency_seconds_bucket{endpoint="a",le="+Inf"} 3' in text
+        assert 'latency_seconds_sum{endpoint="a"} 5.55' in text
+        assert 'latency_seconds_count{endpoint="a"} 3' in text
+
+    def test_gauge_inc_dec(self):
+        """Test gauge goes up and down."""
+        registry = MetricsRegistry()
+        gauge = registry.gauge("depth", "Depth.", ("queue",))
+        gauge.inc(queue="q")
+        gauge.inc(queue="q")
+        gauge.dec(queue="q")
+
+        assert gauge.value(queue="q") == 1
+
+    def test_duplicate_registration_fails(self):
+        """Test that metric names are unique per registry."""
+        registry = MetricsRegistry()
+        registry.counter("x_total", "X.")
+
+        with pytest.raises(ValueError):
+            registry.gauge("x_total", "X.")
+
+
+@pytest.mark.asyncio
+class TestInstrumentation:
+    """Tests for repository instrumentation and the HTTP endpoint."""
+
+    async def test_track_queries_times_public_methods(self):
+        """Test that public coroutine methods are timed, private ones are not."""
+
+        @track_queries
+        class FakeRepository:
+            async def get_all(self):
+                return [1]
+
+            async def _helper(self):
+                return None
+
+        repo = FakeRepository()
+        before = DB_QUERY_SECONDS.count(repository="FakeRepository", method="get_all")
+
+        assert await repo.get_all() == [1]
+        await repo._helper()
+
+        after = DB_QUERY_SECONDS.count(repository="FakeRepository", method="get_all")
+        assert after == before + 1
+        assert DB_QUERY_SECONDS.count(repository="FakeRepository", method="_helper") == 0
+
+    async def test_metrics_endpoint(self):
+        """Test GET /metrics serves the registry in text format."""
+        registry = MetricsRegistry()
+        registry.counter("served_total", "Served.").inc()
+        server = MetricsServer("127.0.0.1", 0, registry=registry)
+
+        async with TestClient(TestServer(server.build_app())) as client:
+            response = await client.get("/metrics")
+            body = await response.text()
+
+        assert response.status == 200
+        assert response.headers["Content-Type"].startswith("text/plain")
+        assert "served_total 1" in body
@@ -1,9 +1,15 @@
 """Tests for database migrations."""
 
+from types import SimpleNamespace
+
 import pytest
 from app.services.database.migrations import MigrationManager
 
 
+async def _noop(connection):
+    pass
+
+
 @pytest.mark.asyncio
 class TestMigrationManager:
     """Tests for MigrationManager class."""
@@ -75,3 +81,71 @@ class TestMigrationManager:
         # Run again - should apply 0
         applied2 = await manager.run_migrations()
         assert applied2 == 0
+
+    async def test_manifest_matches_modules(self, test_db):
+        """Test that file-name versions agree with the modules' VERSION."""
+        manager = MigrationManager(test_db)
+        assert list(manager.manifest) == sorted(manager.manifest)
+        assert [m.VERSION for m in manager.discover_migrations()] == list(manager.manifest)
+
+    async def test_current_schema_imports_nothing(self, test_db, monkeypatch):
+        """Test that a boot with a current schema skips module discovery."""
+        await MigrationManager(test_db).run_migrations()
+
+        def fail(name):
+            raise AssertionError(f"imported {name}")
+
+        monkeypatch.setattr("app.services.database.migrations.importlib.import_module", fail)
+        assert await MigrationManager(test_db).run_migrations() == 0
+
+    async def test_pending_migrations_share_one_transaction(self, test_db):
+        """Test that a failing migration rolls back the ones before it."""
+
+        async def create_table(connection):
+            await connection.executescript(
+                "CREATE TABLE first (id INTEGER); INSERT INTO first VALUES (1);"
+            )
+            await connection.commit()
+
+        async def broken(connection):
+            await connection.execute("CREATE TABLE second (id INTEGER)")
+            raise RuntimeError("boom")
+
+        migrations = {
+            1: SimpleNamespace(VERSION=1, DESCRIPTION="first", upgrade=create_table),
+            2: SimpleNamespace(VERSION=2, DESCRIPTION="second", upgrade=broken),
+        }
+        manager = MigrationManager(test_db, manifest={1: "v001_first", 2: "v002_second"})
+        manager.load_migration = migrations.__getitem__
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await manager.run_migrations()
+
+        cursor = await test_db.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        assert {row[0] for row in await cursor.fetchall()} == {"schema_version"}
+        assert await manager.get_current_version() == 0
+
+        migrations[2].upgrade = _noop
+        assert await manager.run_migrations() == 2
+        cursor = await test_db.execute("SELECT COUNT(*) FROM first")
+        assert (await cursor.fetchone())[0] == 1
+
+    async def test_apply_migration_rolls_back_on_failure(self, test_db):
+        """Test that a single migration is applied in a transaction too."""
+
+        async def broken(connection):
+            await connection.executescript("CREATE TABLE half (id INTEGER);")
+            await connection.commit()
+            raise RuntimeError("boom")
+
+        manager = MigrationManager(test_db, manifest={})
+        await manager.init_schema_version_table()
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await manager.apply_migration(
+                SimpleNamespace(VERSION=1, DESCRIPTION="half", upgrade=broken)
+            )
+
+        cursor = await test_db.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        assert {row[0] for row in await cursor.fetchall()} == {"schema_version"}
+        assert await manager.get_current_version() == 0
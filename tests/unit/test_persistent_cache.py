@@ -0,0 +1,132 @@
+"""Tests for the persistent (SQLite) Beget response cache."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.beget import PersistentResponseCache, ResponseCache
+from app.services.beget.cache import cache_key
+from app.services.beget.persistent import decode_answer, encode_answer
+from app.services.database import Database, ResponseCacheRepository
+
+DOMAINS = {"status": "success", "result": [{"id": i, "fqdn": f"d{i}.test"} for i in range(50)]}
+
+
+@pytest.fixture
+async def repo(tmp_path):
+    db = Database(tmp_path / "bot.db")
+    await db.connect()
+    yield ResponseCacheRepository(db)
+    await db.disconnect()
+
+
+def clock(monkeypatch, start: float = 1_000_000.0) -> list[float]:
+    now = [start]
+    monkeypatch.setattr("app.services.beget.persistent.time.time", lambda: now[0])
+    return now
+
+
+class TestPersistentResponseCache:
+    """Tests for storing, expiring and invalidating answers."""
+
+    def test_payload_is_compressed(self):
+        """Test that answers round-trip and repetitive JSON shrinks."""
+        content_hash, payload = encode_answer(DOMAINS)
+
+        assert decode_answer(payload) == DOMAINS
+        assert len(payload) < len(str(DOMAINS)) / 3
+        assert encode_answer(DOMAINS)[0] == content_hash
+
+    async def test_hit_until_ttl_expires(self, repo, monkeypatch):
+        """Test that a stored answer is served until its TTL passes."""
+        now = clock(monkeypatch)
+        cache = PersistentResponseCache(repo, ttl=60)
+        key = cache_key("domain/getList")
+
+        assert await cache.get(key) == (False, None)
+        await cache.set(key, DOMAINS)
+        now[0] += 59
+        assert await cache.get(key) == (True, DOMAINS)
+        now[0] += 2
+        assert await cache.get(key) == (False, None)
+
+    async def test_unchanged_answer_only_extends_ttl(self, repo, monkeypatch):
+        """Test that re-storing the same content does not rewrite the payload."""
+        now = clock(monkeypatch)
+        cache = PersistentResponseCache(repo, ttl=60)
+        key = cache_key("dns/getData", {"fqdn": "a.test"})
+        put = AsyncMock(wraps=repo.put)
+        monkeypatch.setattr(repo, "put", put)
+
+        await cache.set(key, DOMAINS)
+        now[0] += 50
+        await cache.set(key, DOMAINS)
+        now[0] += 50
+        assert await cache.get(key) == (True, DOMAINS)
+        assert put.await_count == 1
+
+        await cache.set(key, {"changed": True})
+        assert put.await_count == 2
+
+    async def test_invalidation_hides_answers_at_once(self, repo, monkeypatch):
+        """Test that invalidated answers are skipped before and after the DELETE runs."""
+        clock(monkeypatch)
+        cache = PersistentResponseCache(repo)
+        a = cache_key("dns/getData", {"fqdn": "a.test"})
+        b = cache_key("dns/getData", {"fqdn": "b.test"})
+        await cache.set(a, 1)
+        await cache.set(b, 2)
+
+        cache.invalidate("dns/getData", a[1])
+        assert await cache.get(a) == (False, None)
+        await cache.drain()
+        assert await cache.get(a) == (False, None)
+        assert await cache.get(b) == (True, 2)
+
+        cache.invalidate("dns/getData")
+        assert await cache.get(b) == (False, None)
+
+    async def test_other_endpoints_are_not_persisted(self, repo):
+        """Test that only the read endpoints are handled."""
+        assert PersistentResponseCache.handles(cache_key("domain/getList"))
+        assert not PersistentResponseCache.handles(cache_key("dns/changeRecords", {}))
+
+    async def test_eviction_keeps_newest_within_size(self, repo):
+        """Test that expired and then oldest answers are evicted."""
+        await repo.put("dns/getData", "expired", "h", b"x" * 10, stored_at=1, expires_at=5)
+        for i in range(4):
+            await repo.put("dns/getData", f"p{i}", "h", b"x" * 100, stored_at=10 + i, expires_at=100)
+
+        assert await repo.evict(now=6, max_bytes=250) == 3
+        assert await repo.total_size() == 200
+        assert await repo.get("dns/getData", "p3", now=6) is not None
+        assert await repo.get("dns/getData", "p1", now=6) is None
+
+
+class TestResponseCacheWithL2:
+    """Tests for the in-memory cache reading through to SQLite."""
+
+    async def test_memory_miss_is_served_from_sqlite(self, repo):
+        """Test that a fresh in-memory cache (a restart) does not call the API."""
+        key = cache_key("domain/getList")
+        first = ResponseCache(ttl=30)
+        first.l2 = PersistentResponseCache(repo)
+        fetch = AsyncMock(return_value=DOMAINS)
+        assert await first.get_or_fetch(key, fetch) == DOMAINS
+
+        restarted = ResponseCache(ttl=30)
+        restarted.l2 = PersistentResponseCache(repo)
+        assert await restarted.get_or_fetch(key, fetch) == DOMAINS
+        assert fetch.await_count == 1
+
+    async def test_invalidation_reaches_sqlite(self, repo):
+        """Test that a mutation also drops the persisted answer."""
+        key = cache_key("domain/getSubdomainList")
+        cache = ResponseCache(ttl=30)
+        cache.l2 = PersistentResponseCache(repo)
+        await cache.put(key, [1])
+
+        cache.invalidate("domain/getSubdomainList")
+        await cache.l2.drain()
+
+        assert await repo.get(*key, now=0) is None
@@ -0,0 +1,68 @@
+"""Tests for the async rate limiter."""
+
+import asyncio
+
+from app.utils.rate_limit import RateLimiter
+
+
+class TestRateLimiter:
+    """Tests for token bucket timing."""
+
+    async def test_burst_is_immediate(self, monkeypatch):
+        """Test that up to `burst` acquisitions don't wait."""
+        sleeps = []
+        monkeypatch.setattr("app.utils.rate_limit.asyncio.sleep", _record(sleeps))
+        limiter = RateLimiter(rate=10, burst=3)
+
+        for _ in range(3):
+            await limiter.acquire()
+
+        assert sleeps == []
+
+    async def test_waits_when_bucket_is_empty(self, monkeypatch):
+        """Test that acquisitions past the burst wait about 1/rate."""
+        now = [0.0]
+        sleeps = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+            now[0] += delay
+
+        monkeypatch.setattr("app.utils.rate_limit.time.monotonic", lambda: now[0])
+        monkeypatch.setattr("app.utils.rate_limit.asyncio.sleep", fake_sleep)
+        limiter = RateLimiter(rate=4, burst=1)
+
+        await limiter.acquire()
+        await limiter.acquire()
+        await limiter.acquire()
+
+        assert sleeps == [0.25, 0.25]
+
+    async def test_multiple_tokens_are_borrowed(self, monkeypatch):
+        """Test that taking several tokens at once delays later callers by all of them."""
+        now = [0.0]
+        sleeps = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+            now[0] += delay
+
+        monkeypatch.setattr("app.utils.rate_limit.time.monotonic", lambda: now[0])
+        monkeypatch.setattr("app.utils.rate_limit.asyncio.sleep", fake_sleep)
+        limiter = RateLimiter(rate=4, burst=1)
+
+        await limiter.acquire(3)
+        await limiter.acquire()
+
+        assert sleeps == [0.75]
+
+    async def test_zero_rate_disables_limit(self):
+        """Test that rate=0 never waits."""
+        limiter = RateLimiter(rate=0)
+        await asyncio.wait_for(asyncio.gather(*(limiter.acquire() for _ in range(100))), 1)
+
+
+def _record(sleeps):
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+    return fake_sleep
@@ -0,0 +1,231 @@
+"""Tests for the Beget response cache and prefetch scheduler."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.beget import BegetClient, PrefetchScheduler, ResponseCache
+from app.services.beget.cache import cache_key
+
+
+class TestResponseCache:
+    """Tests for TTL, single-flight and invalidation."""
+
+    async def test_hit_until_ttl_expires(self, monkeypatch):
+        """Test that a value is reused until its TTL passes."""
+        now = [100.0]
+        monkeypatch.setattr("app.services.beget.cache.time.monotonic", lambda: now[0])
+        cache = ResponseCache(ttl=30)
+        fetch = AsyncMock(side_effect=[1, 2])
+        key = cache_key("domain/getList")
+
+        assert await cache.get_or_fetch(key, fetch) == 1
+        now[0] += 29
+        assert await cache.get_or_fetch(key, fetch) == 1
+        now[0] += 2
+        assert await cache.get_or_fetch(key, fetch) == 2
+
+    def test_key_ignores_param_order(self):
+        """Test that parameter order does not change the key."""
+        assert cache_key("x", {"a": 1, "b": 2}) == cache_key("x", {"b": 2, "a": 1})
+        assert cache_key("x") == cache_key("x", {})
+
+    async def test_concurrent_misses_share_one_fetch(self):
+        """Test single-flight for concurrent callers."""
+        cache = ResponseCache()
+        release = asyncio.Event()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await release.wait()
+            return "answer"
+
+        key = cache_key("dns/getData", {"fqdn": "a.test"})
+        waiters = [asyncio.create_task(cache.get_or_fetch(key, fetch)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*waiters) == ["answer"] * 3
+        assert len(calls) == 1
+
+    async def test_errors_are_not_cached(self):
+        """Test that a failed fetch is retried by the next caller."""
+        cache = ResponseCache()
+        fetch = AsyncMock(side_effect=[RuntimeError("boom"), "ok"])
+        key = cache_key("domain/getList")
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_fetch(key, fetch)
+        assert await cache.get_or_fetch(key, fetch) == "ok"
+
+    async def test_invalidation_during_fetch_discards_result(self):
+        """Test that a fetch started before a mutation does not store stale data."""
+        cache = ResponseCache()
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            return "stale"
+
+        key = cache_key("dns/getData", {"fqdn": "a.test"})
+        pending = asyncio.create_task(cache.get_or_fetch(key, slow))
+        await asyncio.sleep(0)
+        cache.invalidate("dns/getData", {"fqdn": "a.test"})
+        release.set()
+
+        assert await pending == "stale"
+        assert cache.get(key) == (False, None)
+
+    async def test_invalidate_whole_endpoint(self):
+        """Test that invalidation without params drops every call of an endpoint."""
+        cache = ResponseCache()
+        cache.set(cache_key("dns/getData", {"fqdn": "a.test"}), 1)
+        cache.set(cache_key("dns/getData", {"fqdn": "b.test"}), 2)
+        cache.set(cache_key("domain/getList"), 3)
+
+        cache.invalidate("dns/getData")
+
+        assert len(cache) == 1
+
+    async def test_cancelled_sole_waiter_cancels_fetch(self):
+        """Test that a fetch nobody waits for anymore is cancelled."""
+        cache = ResponseCache()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def fetch():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiter = asyncio.create_task(cache.get_or_fetch(cache_key("x"), fetch))
+        await started.wait()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+    async def test_cancelled_waiter_keeps_shared_fetch(self):
+        """Test that other waiters still get the answer."""
+        cache = ResponseCache()
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "answer"
+
+        key = cache_key("x")
+        first = asyncio.create_task(cache.get_or_fetch(key, fetch))
+        second = asyncio.create_task(cache.get_or_fetch(key, fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        assert await second == "answer"
+
+
+class TestClientFetch:
+    """Tests for BegetClient.fetch()."""
+
+    async def test_fresh_bypasses_and_refreshes(self, monkeypatch):
+        """Test that fresh reads always hit the API and update the cache."""
+        request = AsyncMock(side_effect=["v1", "v2"])
+        monkeypatch.setattr(BegetClient, "request", request)
+        client = BegetClient("login", "password", cache=ResponseCache())
+
+        assert await client.fetch("dns/getData", {"fqdn": "a.test"}) == "v1"
+        assert await client.fetch("dns/getData", {"fqdn": "a.test"}, fresh=True) == "v2"
+        assert await client.fetch("dns/getData", {"fqdn": "a.test"}) == "v2"
+        assert request.await_count == 2
+
+    async def test_without_cache_is_request(self, monkeypatch):
+        """Test that fetch() does not cache when the manager has no cache."""
+        request = AsyncMock(return_value="v")
+        monkeypatch.setattr(BegetClient, "request", request)
+        client = BegetClient("login", "password")
+
+        await client.fetch("domain/getList")
+        await client.fetch("domain/getList")
+        assert request.await_count == 2
+
+
+class FakeManager:
+    """Just enough of BegetClientManager for PrefetchScheduler."""
+
+    def __init__(self, gate: asyncio.Event | None = None):
+        self.cache = ResponseCache()
+        self.gate = gate
+        self.requests: list[str] = []
+
+    @asynccontextmanager
+    async def client(self):
+        manager = self
+
+        class Client(BegetClient):
+            async def request(self, endpoint, params=None):
+                manager.requests.append(endpoint)
+                if manager.gate is not None:
+                    await manager.gate.wait()
+                return {"result": []}
+
+        yield Client("login", "password", cache=self.cache)
+
+
+class TestPrefetchScheduler:
+    """Tests for background prefetching."""
+
+    async def test_prefetch_warms_cache(self):
+        """Test that the subdomain list and DNS data end up cached."""
+        manager = FakeManager()
+        prefetcher = PrefetchScheduler(manager)
+
+        prefetcher.prefetch_domain(1, 101, "a.test")
+        await prefetcher.drain()
+
+        assert sorted(manager.requests) == ["dns/getData", "domain/getSubdomainList"]
+        assert manager.cache.get(cache_key("dns/getData", {"fqdn": "a.test"}))[0]
+
+    async def test_same_domain_is_not_prefetched_twice(self):
+        """Test that repeated taps on the same domain reuse running prefetches."""
+        gate = asyncio.Event()
+        manager = FakeManager(gate)
+        prefetcher = PrefetchScheduler(manager)
+
+        prefetcher.prefetch_domain(1, 101, "a.test")
+        prefetcher.prefetch_domain(1, 101, "a.test")
+        await asyncio.sleep(0)
+        gate.set()
+        await prefetcher.drain()
+
+        assert len(manager.requests) == 2
+
+    async def test_cancel_stops_pending_work(self):
+        """Test that navigating away cancels prefetches that have not finished."""
+        manager = FakeManager(asyncio.Event())
+        prefetcher = PrefetchScheduler(manager, max_concurrency=1)
+
+        prefetcher.prefetch_domain(1, 101, "a.test")
+        while not manager.requests:
+            await asyncio.sleep(0)
+        prefetcher.cancel(1)
+        await prefetcher.drain()
+
+        assert len(manager.requests) == 1  # second one never got the semaphore
+        assert len(manager.cache) == 0
+
+    async def test_disabled_without_cache(self):
+        """Test that nothing is scheduled when caching is off."""
+        manager = FakeManager()
+        manager.cache = None
+        prefetcher = PrefetchScheduler(manager)
+
+        prefetcher.prefetch_domain(1, 101, "a.test")
+        await prefetcher.drain()
+
+        assert manager.requests == []
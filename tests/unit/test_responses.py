@@ -0,0 +1,151 @@
+"""Tests for handler response helpers."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.methods import EditMessageText
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from app.bot.responses import RENDERED, CallbackResponder, ThrottledEditor, edit_message
+
+
+def make_message(chat_id: int = 1, message_id: int = 10) -> SimpleNamespace:
+    return SimpleNamespace(
+        chat=SimpleNamespace(id=chat_id),
+        message_id=message_id,
+        edit_text=AsyncMock(),
+        answer=AsyncMock(),
+    )
+
+
+def markup(data: str) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(
+        inline_keyboard=[[InlineKeyboardButton(text="Back", callback_data=data)]]
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_rendered():
+    RENDERED.clear()
+    yield
+    RENDERED.clear()
+
+
+class TestEditMessage:
+    """Tests for deduplicated edits."""
+
+    async def test_identical_edit_is_skipped(self):
+        """Test that re-rendering the same content sends nothing."""
+        message = make_message()
+        assert await edit_message(message, "Domains", reply_markup=markup("mm")) is True
+        assert await edit_message(message, "Domains", reply_markup=markup("mm")) is False
+        assert message.edit_text.await_count == 1
+
+    async def test_changed_content_is_sent(self):
+        """Test that text, markup and options all count as changes."""
+        message = make_message()
+        await edit_message(message, "Domains", reply_markup=markup("mm"))
+        assert await edit_message(message, "Domains", reply_markup=markup("md")) is True
+        assert await edit_message(message, "Other", reply_markup=markup("md")) is True
+        assert await edit_message(message, "Other", reply_markup=markup("md"), parse_mode="HTML") is True
+        assert message.edit_text.await_count == 4
+
+    async def test_messages_are_tracked_separately(self):
+        """Test that hashes are per (chat, message)."""
+        first, second = make_message(message_id=1), make_message(message_id=2)
+        await edit_message(first, "Domains")
+        assert await edit_message(second, "Domains") is True
+
+    async def test_not_modified_error_is_swallowed(self):
+        """Test that Telegram's "message is not modified" is treated as a skip."""
+        message = make_message()
+        message.edit_text.side_effect = TelegramBadRequest(
+            method=EditMessageText(text="x"),
+            message="Bad Request: message is not modified",
+        )
+        assert await edit_message(message, "Domains") is False
+        assert await edit_message(message, "Domains") is False
+        assert message.edit_text.await_count == 1
+
+    async def test_other_errors_propagate(self):
+        """Test that other Telegram errors are raised and not remembered."""
+        message = make_message()
+        message.edit_text.side_effect = TelegramBadRequest(
+            method=EditMessageText(text="x"), message="Bad Request: message to edit not found"
+        )
+        with pytest.raises(TelegramBadRequest):
+            await edit_message(message, "Domains")
+        with pytest.raises(TelegramBadRequest):
+            await edit_message(message, "Domains")
+
+
+class TestCallbackResponder:
+    """Tests for answering callbacks once."""
+
+    async def test_loading_answers_once(self):
+        """Test that later plain answers are dropped after the loading toast."""
+        callback = SimpleNamespace(answer=AsyncMock(), message=make_message())
+        respond = CallbackResponder(callback)
+
+        await respond.loading()
+        await respond.loading()
+        await respond.answer()
+
+        callback.answer.assert_awaited_once_with("Loading...")
+        callback.message.answer.assert_not_awaited()
+
+    async def test_alert_after_loading_falls_back_to_message(self):
+        """Test that alerts are still delivered once the callback is answered."""
+        callback = SimpleNamespace(answer=AsyncMock(), message=make_message())
+        respond = CallbackResponder(callback)
+
+        await respond.loading()
+        await respond.answer("Error: timeout", show_alert=True)
+
+        callback.message.answer.assert_awaited_once_with("Error: timeout")
+
+    async def test_answer_without_loading(self):
+        """Test that the first answer goes to Telegram unchanged."""
+        callback = SimpleNamespace(answer=AsyncMock(), message=make_message())
+        respond = CallbackResponder(callback)
+
+        await respond.answer("Domain not found", show_alert=True)
+
+        callback.answer.assert_awaited_once_with("Domain not found", show_alert=True)
+
+
+class TestThrottledEditor:
+    """Tests for rate-limited progress edits."""
+
+    async def test_updates_within_interval_are_dropped(self):
+        """Test that only the first of a burst of updates is sent."""
+        message = make_message()
+        editor = ThrottledEditor(message, interval=60)
+
+        assert await editor.update("1/10") is True
+        assert await editor.update("2/10") is False
+        assert await editor.update("3/10") is False
+
+        message.edit_text.assert_awaited_once_with("1/10", reply_markup=None)
+
+    async def test_forced_update_is_always_sent(self):
+        """Test that the final summary is not throttled."""
+        message = make_message()
+        editor = ThrottledEditor(message, interval=60)
+
+        await editor.update("1/10")
+        assert await editor.update("Finished", force=True) is True
+
+        assert message.edit_text.await_count == 2
+
+    async def test_zero_interval_sends_every_change(self):
+        """Test that interval 0 disables throttling."""
+        message = make_message()
+        editor = ThrottledEditor(message, interval=0)
+
+        for i in range(3):
+            await editor.update(f"{i}/3")
+
+        assert message.edit_text.await_count == 3
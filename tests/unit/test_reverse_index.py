@@ -0,0 +1,66 @@
+"""Tests for the DNS value reverse index."""
+
+from app.services.snapshot import ReverseIndex
+from app.services.snapshot.crawler import records_from_change
+from app.services.snapshot.index import value_terms
+
+
+class TestReverseIndex:
+    """Tests for value lookups and updates."""
+
+    def test_lookup_by_value_and_type(self):
+        """Test that FQDNs are grouped by record type and sorted."""
+        index = ReverseIndex()
+        index.replace("b.test", [("A", "192.0.2.1", 10)])
+        index.replace("a.test", [("A", "192.0.2.1", 10), ("MX", "mx.a.test", 10)])
+
+        assert index.lookup("192.0.2.1") == {"A": ["a.test", "b.test"]}
+        assert index.lookup("MX.A.TEST.") == {"MX": ["a.test"]}
+        assert index.lookup("192.0.2.2") == {}
+
+    def test_txt_tokens(self):
+        """Test that TXT records are found by their tokens."""
+        index = ReverseIndex()
+        index.replace("a.test", [("TXT", "v=spf1 include:_spf.mail.test ~all", 10)])
+
+        assert index.lookup("include:_spf.mail.test") == {"TXT": ["a.test"]}
+        assert index.lookup("_spf.mail.test") == {"TXT": ["a.test"]}
+        assert index.lookup("spf1") == {"TXT": ["a.test"]}
+        assert "~all" in value_terms("TXT", "v=spf1 ~all")
+        assert value_terms("A", "192.0.2.1") == {"192.0.2.1"}
+
+    def test_replace_drops_old_values(self):
+        """Test that replacing records removes stale terms."""
+        index = ReverseIndex()
+        index.replace("a.test", [("A", "192.0.2.1", 10)])
+        index.replace("a.test", [("A", "192.0.2.2", 10)])
+
+        assert index.lookup("192.0.2.1") == {}
+        assert index.lookup("192.0.2.2") == {"A": ["a.test"]}
+
+    def test_partial_replace_keeps_other_types(self):
+        """Test that replacing some types keeps the rest."""
+        index = ReverseIndex()
+        index.replace("a.test", [("A", "192.0.2.1", 10), ("CNAME", "target.test", 10)])
+        index.replace("a.test", [("A", "192.0.2.9", 10)], record_types={"A", "MX", "TXT"})
+
+        assert index.lookup("target.test") == {"CNAME": ["a.test"]}
+        assert index.lookup("192.0.2.9") == {"A": ["a.test"]}
+        assert index.lookup("192.0.2.1") == {}
+
+    def test_remove(self):
+        """Test that removed FQDNs are no longer found."""
+        index = ReverseIndex()
+        index.replace("a.test", [("A", "192.0.2.1", 10)])
+        index.remove("a.test")
+
+        assert index.lookup("192.0.2.1") == {}
+        assert len(index) == 0
+
+    def test_change_payload_matches_read_back(self):
+        """Test that change payloads normalize like get_dns_data() results."""
+        records = records_from_change({
+            "A": [{"value": "192.0.2.1", "priority": 20}],
+            "MX": [{"value": "mx.test", "priority": 5}],
+        })
+        assert records == [("A", "192.0.2.1", 10), ("MX", "mx.test", 5)]
@@ -0,0 +1,66 @@
+"""Tests for the repository row mappers."""
+
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import pytest
+
+from app.services.database.rows import RowMapper
+
+
+@dataclass
+class Grant:
+    id: int
+    fqdn: str
+    can_edit: bool
+    created_at: datetime
+    tags: list[str] = field(default_factory=list)
+
+
+@pytest.fixture
+def connection():
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE grants (id INTEGER, fqdn TEXT, created_at TEXT)")
+    connection.executemany(
+        "INSERT INTO grants VALUES (?, ?, ?)",
+        [(1, "a.example.com", "2024-01-02 03:04:05"), (2, "b.example.com", "2024-01-03 00:00:00")],
+    )
+    yield connection
+    connection.close()
+
+
+class TestRowMapper:
+    """Tests for mapping rows to entities by position."""
+
+    def test_maps_rows_by_column_name(self, connection):
+        """Test that columns fill fields in any order, missing ones via converter or default."""
+        cursor = connection.execute("SELECT created_at, fqdn, id FROM grants ORDER BY id")
+        cursor.row_factory = RowMapper(Grant, can_edit=bool, created_at=datetime.fromisoformat)
+
+        grants = cursor.fetchall()
+
+        assert [(g.id, g.fqdn, g.can_edit, g.tags) for g in grants] == [
+            (1, "a.example.com", False, []),
+            (2, "b.example.com", False, []),
+        ]
+        assert grants[0].created_at == datetime(2024, 1, 2, 3, 4, 5)
+
+    def test_compiles_once_per_column_set(self, connection):
+        """Test that the constructor is built once for each query shape."""
+        mapper = RowMapper(Grant)
+        for _ in range(3):
+            cursor = connection.execute("SELECT * FROM grants")
+            cursor.row_factory = mapper
+            cursor.fetchall()
+        cursor = connection.execute("SELECT id, fqdn FROM grants")
+        cursor.row_factory = mapper
+        cursor.fetchall()
+
+        assert len(mapper._compiled) == 2
+
+
+    def test_fields_without_defaults_are_required(self):
+        """Test that the timestamp field stays a required dataclass field."""
+        with pytest.raises(TypeError):
+            Grant(1, "example.com", True)
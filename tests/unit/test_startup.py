@@ -0,0 +1,65 @@
+"""Tests for startup timing and conditional command registration."""
+
+import asyncio
+
+from app.bot import commands
+from app.bot.commands import commands_digest, register_bot_commands
+from app.core.startup import StartupTimer
+from app.services.metrics import STARTUP_PHASE_SECONDS
+
+
+class FakeBot:
+    id = 123456
+
+    def __init__(self):
+        self.calls = []
+
+    async def set_my_commands(self, commands, scope):
+        self.calls.append(scope.type)
+        return True
+
+
+class TestCommandRegistration:
+    """Tests for skipping unchanged command menus."""
+
+    async def test_unchanged_commands_are_not_sent_again(self, tmp_path):
+        """Test that the second boot with the same commands makes no calls."""
+        state = tmp_path / "bot_commands.sha256"
+        bot = FakeBot()
+
+        assert await register_bot_commands(bot, 42, state) is True
+        assert sorted(bot.calls) == ["chat", "default"]
+        assert await register_bot_commands(bot, 42, state) is False
+        assert len(bot.calls) == 2
+
+    async def test_changes_trigger_registration(self, tmp_path, monkeypatch):
+        """Test that a new admin chat or command set is registered again."""
+        state = tmp_path / "bot_commands.sha256"
+        bot = FakeBot()
+        await register_bot_commands(bot, 42, state)
+
+        assert await register_bot_commands(bot, 43, state) is True
+        monkeypatch.setattr(commands, "ADMIN_COMMANDS", commands.ADMIN_COMMANDS[:-1])
+        assert commands_digest(bot.id, 43) != state.read_text().strip()
+        assert await register_bot_commands(bot, 43, state) is True
+        assert len(bot.calls) == 6
+
+
+class TestStartupTimer:
+    """Tests for phase timing."""
+
+    async def test_phases_are_recorded(self):
+        """Test that concurrent and block phases are timed and exported."""
+        timer = StartupTimer()
+        await asyncio.gather(
+            timer.run("slow", asyncio.sleep(0.02)),
+            timer.run("fast", asyncio.sleep(0)),
+        )
+        with timer.phase("block"):
+            pass
+
+        assert set(timer.phases) == {"slow", "fast", "block"}
+        assert timer.phases["slow"] >= 0.02
+        assert timer.total < 0.04 + timer.phases["slow"]  # ran concurrently
+        assert STARTUP_PHASE_SECONDS.value(phase="slow") == timer.phases["slow"]
+        assert "slow" in timer.summary()
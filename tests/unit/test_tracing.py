@@ -0,0 +1,113 @@
+"""Tests for tracing spans and the slow trace writer."""
+
+import asyncio
+import json
+
+import pytest
+
+from app.services.tracing import (
+    SlowTraceWriter,
+    current_span,
+    span,
+    start_trace,
+    trace_methods,
+    trace_to_dict,
+)
+
+
+class TestSpans:
+    """Tests for span nesting."""
+
+    def test_span_outside_trace_is_noop(self):
+        """Test that spans without an active trace record nothing."""
+        with span("db.query") as s:
+            assert s is None
+        assert current_span() is None
+
+    def test_spans_nest_under_root(self):
+        """Test that child spans attach to the active parent."""
+        with start_trace("update", update_id=1) as root:
+            with span("middleware.auth"):
+                with span("db.ChatsRepository.is_allowed"):
+                    pass
+            with span("handler"):
+                pass
+
+        assert [c.name for c in root.children] == ["middleware.auth", "handler"]
+        assert root.children[0].children[0].name == "db.ChatsRepository.is_allowed"
+        assert root.end is not None
+        assert current_span() is None
+
+    def test_span_records_error(self):
+        """Test that exceptions are recorded on the span and re-raised."""
+        with pytest.raises(RuntimeError):
+            with start_trace("update") as root:
+                with span("beget.request"):
+                    raise RuntimeError("boom")
+
+        assert root.children[0].error == "RuntimeError"
+        assert root.error == "RuntimeError"
+
+    async def test_spans_follow_tasks(self):
+        """Test that tasks created inside a span attach to it."""
+
+        async def work():
+            with span("beget.request"):
+                await asyncio.sleep(0)
+
+        with start_trace("update") as root:
+            await asyncio.gather(work(), work())
+
+        assert [c.name for c in root.children] == ["beget.request", "beget.request"]
+
+    async def test_trace_methods(self):
+        """Test that the class decorator wraps public coroutine methods."""
+
+        @trace_methods("permission")
+        class Checker:
+            async def can_view(self):
+                return True
+
+        with start_trace("update") as root:
+            assert await Checker().can_view() is True
+
+        assert root.children[0].name == "permission.can_view"
+
+
+class TestSlowTraceWriter:
+    """Tests for slow trace serialization."""
+
+    def test_stage_breakdown_uses_self_time(self):
+        """Test that stages sum self time, not nested durations."""
+        with start_trace("update") as root:
+            with span("middleware.auth") as auth:
+                with span("beget.request") as beget:
+                    pass
+
+        data = trace_to_dict(root)
+        assert set(data["stages"]) == {"update", "middleware", "beget"}
+        assert [s["name"] for s in data["spans"]] == [
+            "update", "middleware.auth", "beget.request",
+        ]
+        assert auth.self_time <= auth.duration
+        assert beget.self_time == pytest.approx(beget.duration)
+
+    async def test_writes_only_slow_traces(self, tmp_path):
+        """Test that fast traces are skipped and slow ones appended as JSONL."""
+        path = tmp_path / "traces.jsonl"
+
+        with start_trace("update", update_id=1) as fast:
+            pass
+        assert await SlowTraceWriter(path, threshold_ms=10_000).maybe_write(fast) is False
+        assert not path.exists()
+
+        with start_trace("update", update_id=2) as slow:
+            with span("telegram.EditMessageText"):
+                await asyncio.sleep(0.01)
+        assert await SlowTraceWriter(path, threshold_ms=1).maybe_write(slow) is True
+
+        lines = path.read_text().splitlines()
+        assert len(lines) == 1
+        record = json.loads(lines[0])
+        assert record["attrs"] == {"update_id": 2}
+        assert "telegram" in record["stages"]
@@ -0,0 +1,154 @@
+"""Tests for the per-FQDN DNS write queue."""
+
+import asyncio
+
+import pytest
+
+from app.services.beget.writes import WriteQueue
+
+
+class FakeZone:
+    """Applies edits to an in-memory record list, counting writes."""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.records: dict[str, list[dict]] = {}
+        self.batches: list[int] = []
+        self.active = 0
+        self.max_active = 0
+
+    async def apply(self, fqdn: str, edits: list) -> list:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            records = {k: list(v) for k, v in self.records.items()}
+            results = []
+            for edit in edits:
+                try:
+                    results.append(edit(records))
+                except Exception as e:
+                    results.append(e)
+            await asyncio.sleep(self.delay)
+            self.records = records
+            self.batches.append(len(edits))
+            return results
+        finally:
+            self.active -= 1
+
+
+def add(value: str):
+    def edit(records):
+        records.setdefault("A", []).append({"value": value, "priority": 10})
+        return True
+
+    return edit
+
+
+class TestWriteQueue:
+    """Tests for serializing and merging record edits."""
+
+    async def test_edits_queued_behind_a_write_are_merged(self):
+        """Test that concurrent edits of one FQDN end up in two writes and none is lost."""
+        queue = WriteQueue()
+        zone = FakeZone()
+
+        first = asyncio.create_task(queue.submit("a.test", add("192.0.2.0"), zone.apply))
+        await asyncio.sleep(0)  # the first write is in flight
+        results = await asyncio.gather(
+            first, *(queue.submit("a.test", add(f"192.0.2.{i}"), zone.apply) for i in range(1, 5))
+        )
+
+        assert results == [True] * 5
+        assert zone.batches == [1, 4]
+        assert zone.max_active == 1
+        assert [r["value"] for r in zone.records["A"]] == [f"192.0.2.{i}" for i in range(5)]
+        assert queue.queued("a.test") == 0
+
+    async def test_window_merges_edits_into_one_write(self):
+        """Test that a window collects edits arriving at once into one write."""
+        queue = WriteQueue(window=0.01)
+        zone = FakeZone()
+
+        await asyncio.gather(*(queue.submit("a.test", add(str(i)), zone.apply) for i in range(3)))
+
+        assert zone.batches == [3]
+
+    async def test_fqdns_are_written_independently(self):
+        """Test that edits of different FQDNs run concurrently."""
+        queue = WriteQueue()
+        zones = {fqdn: FakeZone() for fqdn in ("a.test", "b.test")}
+        shared = FakeZone()
+
+        async def apply(fqdn, edits):
+            shared.active += 1
+            shared.max_active = max(shared.max_active, shared.active)
+            try:
+                return await zones[fqdn].apply(fqdn, edits)
+            finally:
+                shared.active -= 1
+
+        await asyncio.gather(*(queue.submit(fqdn, add("x"), apply) for fqdn in zones))
+
+        assert shared.max_active == 2
+
+    async def test_each_caller_gets_its_own_result(self):
+        """Test that a failing edit fails only its caller."""
+        queue = WriteQueue(window=0.01)
+        zone = FakeZone()
+
+        def broken(records):
+            raise ValueError("bad record")
+
+        results = await asyncio.gather(
+            queue.submit("a.test", add("1"), zone.apply),
+            queue.submit("a.test", broken, zone.apply),
+            queue.submit("a.test", lambda records: False, zone.apply),
+            return_exceptions=True,
+        )
+
+        assert results[0] is True
+        assert isinstance(results[1], ValueError)
+        assert results[2] is False
+
+    async def test_failed_write_fails_every_caller(self):
+        """Test that an error of the write itself reaches all merged callers."""
+        queue = WriteQueue(window=0.01)
+
+        async def apply(fqdn, edits):
+            raise RuntimeError("API down")
+
+        results = await asyncio.gather(
+            *(queue.submit("a.test", add(str(i)), apply) for i in range(2)),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    async def test_groups_are_not_merged(self):
+        """Test that edits of different groups (www sync on/off) get separate writes."""
+        queue = WriteQueue(window=0.01)
+        zone = FakeZone()
+
+        await asyncio.gather(
+            queue.submit("a.test", add("1"), zone.apply, group=True),
+            queue.submit("a.test", add("2"), zone.apply, group=True),
+            queue.submit("a.test", add("3"), zone.apply, group=False),
+        )
+
+        assert zone.batches == [2, 1]
+
+    async def test_stop_fails_waiting_callers(self):
+        """Test that stopping the queue does not leave callers hanging."""
+        queue = WriteQueue()
+        zone = FakeZone(delay=10)
+
+        waiting = [
+            asyncio.create_task(queue.submit("a.test", add(str(i)), zone.apply)) for i in range(2)
+        ]
+        await asyncio.sleep(0)
+        await queue.stop()
+
+        for task in waiting:
+            with pytest.raises(RuntimeError):
+                await task
+        assert queue.queued("a.test") == 0
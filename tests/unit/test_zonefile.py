@@ -0,0 +1,80 @@
+"""Tests for zone file rendering and parsing."""
+
+import pytest
+
+from app.services.zonefile import BIND, CSV, ZoneParseError, encode_chunks, parse, render
+
+
+RECORDS = [
+    ("example.com", ("A", "192.0.2.1", 10)),
+    ("example.com", ("MX", "mx1.example.net", 20)),
+    ("example.com", ("TXT", 'v=spf1 include:"quoted" ~all', 10)),
+    ("www.example.com", ("CNAME", "example.com", 10)),
+]
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+async def _collect(chunks, filename=None):
+    return [record async for record in parse(chunks, filename)]
+
+
+async def _export(fmt, records=RECORDS, chunk_size=65536):
+    return [chunk async for chunk in encode_chunks(render(_aiter(records), fmt), chunk_size)]
+
+
+class TestZoneFile:
+    """Tests for BIND/CSV round trips and parse errors."""
+
+    @pytest.mark.parametrize("fmt,filename", [(BIND, "zone.txt"), (CSV, "zone.csv")])
+    async def test_round_trip(self, fmt, filename):
+        """Test that an exported file parses back to the same records."""
+        chunks = await _export(fmt)
+        assert await _collect(_aiter(chunks), filename) == RECORDS
+
+    async def test_long_txt_is_split_and_joined(self):
+        """Test that TXT data over 255 characters survives a BIND round trip."""
+        records = [("example.com", ("TXT", "k=" + "a" * 600, 10))]
+        chunks = await _export(BIND, records)
+        assert chunks[0].count(b'" "') == 2
+        assert await _collect(_aiter(chunks)) == records
+
+    async def test_chunk_boundaries_do_not_matter(self):
+        """Test that lines and multi-byte characters split across chunks decode intact."""
+        records = [("example.com", ("TXT", "café ✓", 10))] * 3
+        data = b"".join(await _export(CSV, records))
+        chunks = [data[i:i + 3] for i in range(0, len(data), 3)]
+        assert await _collect(_aiter(chunks)) == records
+
+    async def test_bind_origin_and_owner_reuse(self):
+        """Test $ORIGIN, @, relative names, TTL/class and continuation lines."""
+        text = (
+            "$ORIGIN Example.com.\n"
+            "$TTL 3600\n"
+            "@ 300 IN A 192.0.2.1 ; main\n"
+            "  IN MX 10 mx.example.com.\n"
+            "mail IN A 192.0.2.2\n"
+        )
+        assert await _collect(_aiter([text.encode()])) == [
+            ("example.com", ("A", "192.0.2.1", 10)),
+            ("example.com", ("MX", "mx.example.com", 10)),
+            ("mail.example.com", ("A", "192.0.2.2", 10)),
+        ]
+
+    @pytest.mark.parametrize(
+        "text,line_no",
+        [
+            ("example.com. IN A 192.0.2.1\nexample.com. IN SRV 0 5 5060 sip\n", 2),
+            ("\n\nexample.com. IN MX mx.example.com.\n", 3),
+            ("www IN A 192.0.2.1\n", 1),
+            ("fqdn,type,value,priority\nexample.com,MX,mx.example.com,high\n", 2),
+        ],
+    )
+    async def test_parse_errors_report_line(self, text, line_no):
+        """Test that invalid lines reject the file with their line number."""
+        with pytest.raises(ZoneParseError) as exc:
+            await _collect(_aiter([text.encode()]))
+        assert exc.value.line_no == line_no